@@ -0,0 +1,114 @@
+import sys
+import os
+import time
+import json
+import logging
+import argparse
+from typing import Dict, Any, Callable
+from unittest.mock import patch
+
+# Dynamically adjust sys.path to allow imports from the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Local imports
+try:
+    import google.generativeai as genai
+    from src.utils.gemini_api import GeminiAPI, ModelRegistry
+    from src.agents.theorist_agent import TheoristAgent
+    from src.agents.data_scientist_agent import DataScientistAgent
+    from src.agents.experiment_agent import ExperimentAgent
+    from src.agents.critic_agent import CriticAgent
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+
+class StubResponse:
+    """Response returned by the stubbed backend."""
+
+    text = "1. Stub hypothesis"
+
+
+def stub_generate_content(self, *args, **kwargs) -> StubResponse:
+    """Replaces `GenerativeModel.generate_content` so no network call is made."""
+    return StubResponse()
+
+
+class UnpooledRegistry(ModelRegistry):
+    """Reproduces the previous behaviour: configure on every client and build a model per call."""
+
+    def configure(self, api_key: str) -> None:
+        genai.configure(api_key=api_key)
+
+    def get_model(self, model_name: str, generation_config: Dict[str, Any] = None) -> Any:
+        return genai.GenerativeModel(model_name, generation_config=generation_config)
+
+
+def measure(func: Callable[[], Any], iterations: int) -> float:
+    """Returns the mean wall time of `func` in microseconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def run(iterations: int) -> Dict[str, Dict[str, float]]:
+    """
+    Measures per-call and per-agent-construction overhead before and after pooling.
+
+    Args:
+        iterations: Number of iterations per measurement.
+
+    Returns:
+        A dictionary of {measurement: {"before_us": ..., "after_us": ...}}.
+    """
+    config = {'gemini_api_key': 'BENCHMARK_API_KEY', 'model_name': 'gemini-2.0-flash'}
+    agent_classes = (TheoristAgent, DataScientistAgent, ExperimentAgent, CriticAgent)
+    setup_iterations = max(1, iterations // 10)
+
+    with patch.object(genai.GenerativeModel, 'generate_content', stub_generate_content):
+        unpooled_api = GeminiAPI(api_key=config['gemini_api_key'], registry=UnpooledRegistry())
+        pooled_api = GeminiAPI(api_key=config['gemini_api_key'], registry=ModelRegistry())
+
+        def unpooled_agents():
+            for agent_class in agent_classes:
+                agent_class(config=config, gemini_api=GeminiAPI(api_key=config['gemini_api_key'], registry=UnpooledRegistry()))
+
+        shared_api = GeminiAPI.from_config(config)
+
+        def shared_agents():
+            for agent_class in agent_classes:
+                agent_class(config=config, gemini_api=shared_api)
+
+        return {
+            "per_call": {
+                "before_us": measure(lambda: unpooled_api.generate_content("prompt"), iterations),
+                "after_us": measure(lambda: pooled_api.generate_content("prompt"), iterations),
+            },
+            "agent_setup": {
+                "before_us": measure(unpooled_agents, setup_iterations),
+                "after_us": measure(shared_agents, setup_iterations),
+            },
+        }
+
+
+if __name__ == "__main__":
+    # Example Usage:
+    # Run this script: `python benchmarks/bench_model_overhead.py --iterations 2000`
+    parser = argparse.ArgumentParser(description="Measure GeminiAPI per-call overhead with a stubbed backend.")
+    parser.add_argument("--iterations", type=int, default=2000, help="Iterations per measurement.")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args()
+
+    # Keep log formatting out of the measurements.
+    logging.disable(logging.CRITICAL)
+
+    results = run(args.iterations)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, timings in results.items():
+            speedup = timings["before_us"] / timings["after_us"] if timings["after_us"] else float("inf")
+            print(f"{name:12s} before: {timings['before_us']:9.1f} us  after: {timings['after_us']:9.1f} us  ({speedup:.1f}x)")
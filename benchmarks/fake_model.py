@@ -0,0 +1,282 @@
+import sys
+import os
+import time
+import math
+import random
+import asyncio
+import hashlib
+import threading
+import contextlib
+from typing import Optional, Dict, Any, List, Iterator
+from unittest.mock import patch
+
+# Dynamically adjust sys.path to allow imports from the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Local imports
+try:
+    from google.api_core import exceptions as google_exceptions
+    from src.utils.gemini_api import get_model_registry
+    from src.utils.tokens import estimate_tokens
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+WORDS = (
+    "adaptive", "gradient", "curvature", "momentum", "stochastic", "manifold", "sparse", "spectral", "annealing",
+    "topology", "entropy", "variance", "kernel", "basin", "saddle", "landscape", "population", "trust", "region",
+    "surrogate", "bayesian", "evolutionary", "coordinate", "subspace", "preconditioner", "noise", "schedule",
+    "restart", "ensemble", "homotopy", "continuation", "barrier", "penalty", "lattice", "swarm", "quantum",
+)
+
+
+class LatencyProfile:
+    """
+    Latency, throughput and failure characteristics of the fake model.
+
+    A call takes a sampled base latency (time to first token) plus the response
+    length divided by the token rate; a fraction of calls fails with HTTP 429.
+    """
+
+    def __init__(self, distribution: str = "lognormal", median_ms: float = 20.0, sigma: float = 0.5,
+                 tokens_per_second: float = 20000.0, error_rate: float = 0.0):
+        """
+        Initializes the LatencyProfile.
+
+        Args:
+            distribution: "fixed" (always the median), "uniform" (0 to twice the median) or "lognormal".
+            median_ms: Median base latency in milliseconds.
+            sigma: Shape of the lognormal distribution (larger means a heavier tail).
+            tokens_per_second: Generation speed; 0 disables the per-token delay.
+            error_rate: Probability that a call fails with a retryable error.
+        """
+        if distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"distribution must be one of {LATENCY_DISTRIBUTIONS}, got {distribution!r}")
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.distribution = distribution
+        self.median_ms = median_ms
+        self.sigma = sigma
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+
+    def sample_seconds(self, rng: random.Random, response_tokens: int) -> float:
+        """
+        Samples the duration of one call.
+
+        Args:
+            rng: The random generator of the call.
+            response_tokens: Length of the response.
+
+        Returns:
+            The duration in seconds.
+        """
+        median = self.median_ms / 1000.0
+        if self.distribution == "fixed":
+            base = median
+        elif self.distribution == "uniform":
+            base = rng.uniform(0.0, 2.0 * median)
+        else:
+            base = median * math.exp(rng.gauss(0.0, self.sigma)) if median > 0 else 0.0
+        generation = response_tokens / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+        return base + generation
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the profile's settings."""
+        return {
+            "distribution": self.distribution, "median_ms": self.median_ms, "sigma": self.sigma,
+            "tokens_per_second": self.tokens_per_second, "error_rate": self.error_rate,
+        }
+
+
+class FakeUsageMetadata:
+    """Token usage reported with a fake response."""
+
+    def __init__(self, prompt_token_count: int, candidates_token_count: int):
+        self.prompt_token_count = prompt_token_count
+        self.candidates_token_count = candidates_token_count
+
+
+class FakeResponse:
+    """Response (or stream chunk) of the fake model."""
+
+    def __init__(self, text: str, usage_metadata: Optional[FakeUsageMetadata] = None):
+        self.text = text
+        self.usage_metadata = usage_metadata
+
+
+class FakeAsyncStream:
+    """Async iterator over response chunks, sleeping between chunks."""
+
+    def __init__(self, chunks: List[FakeResponse], delay: float):
+        self._chunks = list(chunks)
+        self._delay = delay
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> FakeResponse:
+        if not self._chunks:
+            raise StopAsyncIteration
+        await asyncio.sleep(self._delay)
+        return self._chunks.pop(0)
+
+
+class FakeModelBackend:
+    """
+    Deterministic stand-in for the Gemini backend.
+
+    Responses are numbered hypothesis lists whose wording is derived from a hash of
+    the prompt, so the same prompt always gets the same answer while different
+    prompts (e.g. successive refinement rounds) get different ones. Latency and
+    injected failures are drawn from a generator seeded with the seed, the prompt
+    and how often that prompt was sent before, which makes a run reproducible
+    regardless of how concurrent calls interleave.
+    """
+
+    def __init__(self, profile: Optional[LatencyProfile] = None, seed: int = 0, hypotheses: int = 5,
+                 words_per_hypothesis: int = 12, chunk_words: int = 8):
+        """
+        Initializes the FakeModelBackend.
+
+        Args:
+            profile: Latency and failure characteristics (default: LatencyProfile()).
+            seed: Seed of all randomness.
+            hypotheses: Number of hypotheses per response.
+            words_per_hypothesis: Words per hypothesis line.
+            chunk_words: Words per chunk of a streamed response.
+        """
+        self.profile = profile if profile is not None else LatencyProfile()
+        self.seed = seed
+        self.hypotheses = hypotheses
+        self.words_per_hypothesis = words_per_hypothesis
+        self.chunk_words = chunk_words
+        self.calls = 0
+        self.errors = 0
+        self._prompt_counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _rng(self, prompt: str) -> random.Random:
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        with self._lock:
+            count = self._prompt_counts.get(digest, 0)
+            self._prompt_counts[digest] = count + 1
+            self.calls += 1
+        return random.Random(f"{self.seed}:{digest}:{count}")
+
+    def respond(self, prompt: str) -> str:
+        """
+        Builds the response text for a prompt.
+
+        Args:
+            prompt: The prompt.
+
+        Returns:
+            A numbered list of hypotheses.
+        """
+        content = random.Random(hashlib.sha256(prompt.encode("utf-8")).digest())
+        lines = [
+            f"{i}. " + " ".join(content.choice(WORDS) for _ in range(self.words_per_hypothesis)).capitalize() + "."
+            for i in range(1, self.hypotheses + 1)
+        ]
+        return "\n".join(lines)
+
+    def _plan(self, prompt: str) -> tuple:
+        """Draws the outcome of one call: (text, usage, seconds, whether it fails)."""
+        rng = self._rng(prompt)
+        text = self.respond(prompt)
+        usage = FakeUsageMetadata(estimate_tokens(prompt), estimate_tokens(text))
+        seconds = self.profile.sample_seconds(rng, usage.candidates_token_count)
+        failed = rng.random() < self.profile.error_rate
+        return text, usage, seconds, failed
+
+    def _fail(self) -> None:
+        with self._lock:
+            self.errors += 1
+        raise google_exceptions.ResourceExhausted("429 injected by FakeModelBackend")
+
+    def _chunks(self, text: str, usage: FakeUsageMetadata) -> List[FakeResponse]:
+        words = text.split(" ")
+        pieces = [" ".join(words[i:i + self.chunk_words]) for i in range(0, len(words), self.chunk_words)]
+        pieces = [piece + (" " if i < len(pieces) - 1 else "") for i, piece in enumerate(pieces)]
+        # Like the real API, usage metadata arrives with the last chunk.
+        return [FakeResponse(piece, usage if i == len(pieces) - 1 else None) for i, piece in enumerate(pieces)]
+
+    def generate(self, prompt: str, stream: bool = False) -> Any:
+        """Synchronous call: sleeps for the sampled latency, then returns a response or chunk list."""
+        text, usage, seconds, failed = self._plan(prompt)
+        if failed:
+            time.sleep(seconds / 2)
+            self._fail()
+        if not stream:
+            time.sleep(seconds)
+            return FakeResponse(text, usage)
+        chunks = self._chunks(text, usage)
+        return self._iter_chunks(chunks, seconds / len(chunks))
+
+    @staticmethod
+    def _iter_chunks(chunks: List[FakeResponse], delay: float) -> Iterator[FakeResponse]:
+        for chunk in chunks:
+            time.sleep(delay)
+            yield chunk
+
+    async def agenerate(self, prompt: str, stream: bool = False) -> Any:
+        """Asynchronous counterpart of `generate`."""
+        text, usage, seconds, failed = self._plan(prompt)
+        if failed:
+            await asyncio.sleep(seconds / 2)
+            self._fail()
+        if not stream:
+            await asyncio.sleep(seconds)
+            return FakeResponse(text, usage)
+        chunks = self._chunks(text, usage)
+        return FakeAsyncStream(chunks, seconds / len(chunks))
+
+    @contextlib.contextmanager
+    def install(self) -> Iterator["FakeModelBackend"]:
+        """
+        Routes every `genai.GenerativeModel` created inside the block to this backend.
+
+        Pooled model handles are dropped on entry and exit so no real handle is reused
+        by the benchmark and no fake one outlives it.
+
+        Yields:
+            The backend.
+        """
+        backend = self
+
+        class FakeGenerativeModel:
+            def __init__(self, model_name: str, **kwargs):
+                self.model_name = model_name
+
+            def generate_content(self, prompt, stream=False, **kwargs):
+                return backend.generate(prompt, stream=stream)
+
+            async def generate_content_async(self, prompt, stream=False, **kwargs):
+                return await backend.agenerate(prompt, stream=stream)
+
+        registry = get_model_registry()
+        registry.clear()
+        try:
+            with patch('src.utils.gemini_api.genai.GenerativeModel', FakeGenerativeModel), \
+                    patch('src.utils.gemini_api.genai.configure'):
+                yield self
+        finally:
+            registry.clear()
+
+
+if __name__ == "__main__":
+    # Example Usage:
+    # Run this script: `python benchmarks/fake_model.py`
+    backend = FakeModelBackend(LatencyProfile(median_ms=5, error_rate=0.2), seed=42)
+    for attempt in range(3):
+        try:
+            print(backend.generate("Propose hypotheses about coral bleaching.").text)
+            break
+        except google_exceptions.ResourceExhausted as e:
+            print(f"Attempt {attempt + 1} failed: {e}")
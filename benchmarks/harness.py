@@ -0,0 +1,177 @@
+import sys
+import os
+import json
+import time
+import asyncio
+import platform
+import subprocess
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, Callable, Sequence
+
+import numpy as np
+
+# Dynamically adjust sys.path to allow imports from the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+PERCENTILES = (50, 95, 99)
+DEFAULT_REGRESSION_THRESHOLD = 0.10
+# Metrics compared between runs, and whether larger values are better.
+COMPARED_METRICS = (("p50_ms", False), ("p95_ms", False), ("p99_ms", False), ("throughput_per_second", True))
+
+
+def summarize_latencies(samples: Sequence[float]) -> Dict[str, float]:
+    """
+    Summarizes latency samples.
+
+    Args:
+        samples: Latencies in seconds.
+
+    Returns:
+        Mean, min, max and p50/p95/p99 in milliseconds (linear interpolation between samples).
+    """
+    if not len(samples):
+        return {}
+    values = np.asarray(samples, dtype=np.float64) * 1000.0
+    summary = {"mean_ms": float(values.mean()), "min_ms": float(values.min()), "max_ms": float(values.max())}
+    for percentile, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        summary[f"p{percentile}_ms"] = float(value)
+    return summary
+
+
+def run_benchmark(func: Callable[[], Any], iterations: int, warmup: int = 1,
+                  items_per_iteration: int = 1) -> Dict[str, Any]:
+    """
+    Times repeated calls of a function or coroutine function.
+
+    Args:
+        func: The operation to measure; coroutine functions are run with `asyncio.run`.
+        iterations: Number of measured calls.
+        warmup: Number of unmeasured calls made first.
+        items_per_iteration: Units of work per call (e.g. research problems in a batch), for throughput.
+
+    Returns:
+        Iteration count, errors (calls that raised) and their rate, total seconds, throughput
+        in items per second and the latency summary of the successful calls.
+    """
+    call = (lambda: asyncio.run(func())) if asyncio.iscoroutinefunction(func) else func
+    for _ in range(warmup):
+        try:
+            call()
+        except Exception:
+            pass
+    samples: List[float] = []
+    errors = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call_start = time.perf_counter()
+        try:
+            call()
+        except Exception:
+            errors += 1
+            continue
+        samples.append(time.perf_counter() - call_start)
+    total = time.perf_counter() - start
+    result = {
+        "iterations": iterations,
+        "errors": errors,
+        "error_rate": errors / iterations if iterations else 0.0,
+        "total_seconds": total,
+        "throughput_per_second": len(samples) * items_per_iteration / total if total > 0 else 0.0,
+    }
+    result.update(summarize_latencies(samples))
+    return result
+
+
+def git_revision() -> Dict[str, Any]:
+    """
+    Identifies the checked-out commit.
+
+    Returns:
+        The commit hash and whether the working tree has uncommitted changes (None outside a git checkout).
+    """
+    def git(*args: str) -> Optional[str]:
+        try:
+            return subprocess.run(["git", *args], cwd=PROJECT_ROOT, capture_output=True, text=True,
+                                  check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    commit = git("rev-parse", "HEAD")
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {"commit": commit, "dirty": bool(status) if status is not None else None}
+
+
+def environment_metadata(settings: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Describes the run, so result files of different commits and machines can be told apart.
+
+    Args:
+        settings: The benchmark settings (iterations, latency profile, ...).
+
+    Returns:
+        Git revision, timestamp, Python version, platform and the settings.
+    """
+    return {
+        "git": git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": settings,
+    }
+
+
+def save_results(path: str, results: Dict[str, Any]) -> None:
+    """
+    Writes benchmark results as JSON.
+
+    Args:
+        path: The output file; its directory is created if needed.
+        results: The results document.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    """Reads a results document written by `save_results`."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any],
+                    threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Compares the benchmarks two result documents have in common.
+
+    Args:
+        baseline: Results of the reference commit.
+        current: Results of the commit under test.
+        threshold: Relative change beyond which a worse value counts as a regression.
+
+    Returns:
+        One entry per benchmark and metric with both values, the relative change and
+        whether it is a regression.
+    """
+    comparisons = []
+    for name, current_result in current["benchmarks"].items():
+        baseline_result = baseline["benchmarks"].get(name)
+        if baseline_result is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS:
+            before, after = baseline_result.get(metric), current_result.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            worse = -change if higher_is_better else change
+            comparisons.append({
+                "benchmark": name, "metric": metric, "baseline": before, "current": after,
+                "change": change, "regression": worse > threshold,
+            })
+    return comparisons
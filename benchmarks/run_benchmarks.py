@@ -0,0 +1,280 @@
+import sys
+import os
+import json
+import shutil
+import logging
+import argparse
+import tempfile
+import itertools
+from typing import Optional, Dict, Any, List, Callable
+
+import yaml
+
+# Dynamically adjust sys.path to allow imports from the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Local imports
+try:
+    from benchmarks.fake_model import FakeModelBackend, LatencyProfile, LATENCY_DISTRIBUTIONS, WORDS
+    from benchmarks.harness import (
+        run_benchmark, environment_metadata, save_results, load_results, compare_results,
+        DEFAULT_REGRESSION_THRESHOLD
+    )
+    from src.main import main as ares_main, run_batch
+    from src.agents.hypothesis_parser import HypothesisStreamParser, extract_hypotheses
+    from src.knowledge_retrieval.local_index import LocalPaperIndex
+    from src.knowledge_retrieval.arxiv_retriever import ArxivRetriever
+    from src.knowledge_retrieval.multi_source_retriever import MultiSourceRetriever
+    from src.knowledge_retrieval.context_builder import ContextBuilder
+    from src.utils.metrics import get_metrics_registry
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+
+SUITES = ("main", "pipeline", "retrieval", "context", "parsing")
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "benchmarks", "results")
+
+
+def benchmark_config(work_dir: str, stage_workers: int) -> Dict[str, Any]:
+    """
+    Builds an ARES configuration for benchmarking against the fake backend.
+
+    Response caching, rate limiting and retrieval are off so every iteration does the
+    same work; retries back off for milliseconds so injected errors cost little wall time.
+    """
+    return {
+        'gemini_api_key': 'BENCHMARK_API_KEY',
+        'model_name': 'gemini-2.0-flash',
+        'resilience': {
+            'retry': {'max_retries': 3, 'base_delay': 0.001, 'max_delay': 0.01, 'budget_ratio': 1.0},
+            'circuit_breaker': {'failure_threshold': 0},
+        },
+        'response_cache': {'enabled': False},
+        'pipeline': {'workers': {stage: stage_workers for stage in
+                                 ("theorist", "data_scientist", "experiment", "critic")}},
+        'refinement': {'max_rounds': 3, 'similarity_threshold': 0.9},
+        'retrieval': {'enabled': False},
+        'metrics': {'summary_path': os.path.join(work_dir, 'metrics_summary.json'),
+                    'prometheus_path': os.path.join(work_dir, 'metrics.prom')},
+    }
+
+
+def synthetic_text(rng_index: int, words: int) -> str:
+    """Deterministic pseudo-abstract built from the fake model's vocabulary."""
+    return " ".join(WORDS[(rng_index * 7 + i * 13 + i * i) % len(WORDS)] for i in range(words))
+
+
+def synthetic_papers(count: int) -> List[Dict[str, Any]]:
+    """Creates `count` distinct papers with titles and multi-sentence abstracts."""
+    return [
+        {
+            "paper_id": f"arxiv:bench.{i:06d}",
+            "source": "arxiv",
+            "title": f"{synthetic_text(i, 6).title()} {i}",
+            "abstract": ". ".join(synthetic_text(i + s, 18) for s in range(6)) + ".",
+            "categories": "math.OC",
+            "url": f"https://arxiv.org/abs/bench.{i:06d}",
+            "doi": "",
+        }
+        for i in range(count)
+    ]
+
+
+class IterationFailed(Exception):
+    """Raised when an iteration ran to the end without producing its result."""
+
+
+def model_call_errors() -> int:
+    """Counts the model calls the process-wide metrics registry recorded as failed (after retries)."""
+    calls = get_metrics_registry().calls
+    status = calls.labelnames.index("status")
+    return int(sum(count for labels, count in calls.samples().items() if labels[status] == "error"))
+
+
+def checked(func: Callable[[], Any], succeeded: Callable[[Any], bool] = lambda result: True) -> Callable[[], Any]:
+    """
+    Makes an iteration raise, and so count as an error, when it degraded instead of failing loudly.
+
+    `main()` and the pipeline log agent failures and carry on, so an iteration fails if
+    a model call failed during it or `succeeded` rejects its result.
+    """
+    def run():
+        errors_before = model_call_errors()
+        result = func()
+        failed_calls = model_call_errors() - errors_before
+        if failed_calls:
+            raise IterationFailed(f"{failed_calls} model call(s) failed")
+        if not succeeded(result):
+            raise IterationFailed("the iteration produced no hypotheses")
+        return result
+    return run
+
+
+def bench_main(config_path: str) -> Callable[[], Any]:
+    """Runs the single-problem flow of `src/main.py` end to end."""
+    return checked(lambda: ares_main(["--config", config_path]))
+
+
+def bench_pipeline(config: Dict[str, Any], problems_path: str) -> Callable[[], Any]:
+    """Runs a batch of problems through the staged pipeline, as `main.py --problems` does."""
+    return checked(lambda: run_batch(config, problems_path),
+                   lambda results: all(result.get("hypotheses") and "error" not in result for result in results))
+
+
+def bench_retrieval(work_dir: str, papers: int) -> Callable[[], Any]:
+    """Searches a local paper index through the multi-source retriever (fusion included)."""
+    index_path = os.path.join(work_dir, "papers.sqlite")
+    index = LocalPaperIndex(index_path)
+    index.add_papers(synthetic_papers(papers))
+    index.close()
+    retriever = MultiSourceRetriever({"arxiv": ArxivRetriever(index_path=index_path, mode="local").search_arxiv})
+    queries = itertools.cycle([synthetic_text(i, 3) for i in range(50)])
+    return lambda: retriever.search(next(queries), 10)
+
+
+def bench_context(papers: int) -> Callable[[], Any]:
+    """Compresses retrieved papers into the token-budgeted DataScientist context."""
+    builder = ContextBuilder()
+    corpus = synthetic_papers(papers)
+    query = synthetic_text(3, 40)
+    return lambda: builder.build(corpus, query=query)
+
+
+def bench_parsing(backend: FakeModelBackend) -> Callable[[], Any]:
+    """Parses a long hypothesis list, both whole and as a stream of small chunks."""
+    response = "\n".join(backend.respond(f"prompt {i}") for i in range(10))
+    chunks = [response[i:i + 16] for i in range(0, len(response), 16)]
+
+    def parse():
+        extract_hypotheses(response)
+        parser = HypothesisStreamParser()
+        for chunk in chunks:
+            parser.feed(chunk)
+        parser.close()
+    return parse
+
+
+def run_suites(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Runs the selected suites against the fake backend.
+
+    Args:
+        args: Parsed command-line arguments.
+
+    Returns:
+        The results document: run metadata plus one entry per benchmark.
+    """
+    profile = LatencyProfile(distribution=args.latency_distribution, median_ms=args.latency_ms,
+                             sigma=args.latency_sigma, tokens_per_second=args.tokens_per_second,
+                             error_rate=args.error_rate)
+    backend = FakeModelBackend(profile, seed=args.seed)
+    settings = {key: value for key, value in vars(args).items()
+                if key not in ("output", "compare", "fail_on_regression", "threshold")}
+    settings["latency_profile"] = profile.to_dict()
+
+    work_dir = tempfile.mkdtemp(prefix="ares-bench-")
+    benchmarks: Dict[str, Dict[str, Any]] = {}
+    try:
+        config = benchmark_config(work_dir, args.stage_workers)
+        config_path = os.path.join(work_dir, "config.yaml")
+        with open(config_path, "w", encoding="utf-8") as f:
+            yaml.safe_dump(config, f)
+        problems_path = os.path.join(work_dir, "problems.jsonl")
+        with open(problems_path, "w", encoding="utf-8") as f:
+            for i in range(args.problems):
+                f.write(json.dumps(f"Find a nonconvex optimizer for {synthetic_text(i, 4)}.") + "\n")
+
+        suites = {
+            "main": (lambda: bench_main(config_path), args.iterations, 1),
+            "pipeline": (lambda: bench_pipeline(config, problems_path), args.iterations, args.problems),
+            "retrieval": (lambda: bench_retrieval(work_dir, args.papers), args.iterations * 20, 1),
+            "context": (lambda: bench_context(30), args.iterations * 20, 1),
+            "parsing": (lambda: bench_parsing(backend), args.iterations * 100, 1),
+        }
+        with backend.install():
+            for name in args.suites:
+                make, iterations, items = suites[name]
+                calls_before, errors_before = backend.calls, backend.errors
+                print(f"Running {name} ({iterations} iterations)...", file=sys.stderr)
+                result = run_benchmark(make(), iterations, warmup=args.warmup, items_per_iteration=items)
+                runs = iterations + args.warmup
+                result["model_calls_per_iteration"] = (backend.calls - calls_before) / runs
+                result["injected_errors_per_iteration"] = (backend.errors - errors_before) / runs
+                benchmarks[name] = result
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return {"metadata": environment_metadata(settings), "benchmarks": benchmarks}
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parses command-line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark ARES against a deterministic fake Gemini backend.")
+    parser.add_argument("--suites", nargs="+", choices=SUITES, default=list(SUITES), help="Suites to run.")
+    parser.add_argument("--iterations", type=int, default=5, help="Measured iterations of the main and pipeline "
+                        "suites (the cheaper suites scale this up).")
+    parser.add_argument("--warmup", type=int, default=1, help="Unmeasured iterations per suite.")
+    parser.add_argument("--problems", type=int, default=8, help="Research problems per pipeline batch.")
+    parser.add_argument("--stage-workers", type=int, default=2, help="Pipeline workers per stage.")
+    parser.add_argument("--papers", type=int, default=5000, help="Papers in the retrieval suite's local index.")
+    parser.add_argument("--latency-distribution", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Median model latency in milliseconds.")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Lognormal shape (tail heaviness).")
+    parser.add_argument("--tokens-per-second", type=float, default=20000.0, help="Fake generation speed.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of model calls failing with 429.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the fake backend.")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<commit>.json).")
+    parser.add_argument("--compare", help="Baseline results file to compare against.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="Relative slowdown reported as a regression.")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 on regressions.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Runs the benchmarks, writes the results and optionally compares them to a baseline.
+
+    Args:
+        argv: Command-line arguments (default: sys.argv).
+
+    Returns:
+        The exit status.
+    """
+    args = parse_args(argv)
+    # Keep log formatting out of the measurements.
+    logging.disable(logging.CRITICAL)
+    results = run_suites(args)
+
+    output = args.output
+    if output is None:
+        commit = results["metadata"]["git"]["commit"] or "unknown"
+        suffix = "-dirty" if results["metadata"]["git"]["dirty"] else ""
+        output = os.path.join(RESULTS_DIR, f"{commit[:12]}{suffix}.json")
+    save_results(output, results)
+
+    for name, result in results["benchmarks"].items():
+        print(f"{name:10s} p50 {result.get('p50_ms', 0):9.2f} ms  p95 {result.get('p95_ms', 0):9.2f} ms  "
+              f"p99 {result.get('p99_ms', 0):9.2f} ms  {result['throughput_per_second']:10.1f}/s  "
+              f"errors {result['errors']} ({result['error_rate']:.0%})")
+    print(f"Results written to {output}")
+
+    if args.compare:
+        comparisons = compare_results(load_results(args.compare), results, args.threshold)
+        for entry in comparisons:
+            flag = "  REGRESSION" if entry["regression"] else ""
+            print(f"{entry['benchmark']:10s} {entry['metric']:22s} {entry['baseline']:12.3f} -> "
+                  f"{entry['current']:12.3f} ({entry['change']:+.1%}){flag}")
+        if args.fail_on_regression and any(entry["regression"] for entry in comparisons):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    # Example Usage:
+    # 1. Record a baseline: `python benchmarks/run_benchmarks.py --output baseline.json`
+    # 2. After a change: `python benchmarks/run_benchmarks.py --compare baseline.json --fail-on-regression`
+    # 3. Model a slow, flaky backend: `--latency-ms 800 --latency-sigma 1.0 --error-rate 0.1`
+    sys.exit(main())
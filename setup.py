@@ -22,8 +22,8 @@ setuptools.setup(
     install_requires=[
         "google-generativeai",
         "arxiv",
-        "pubmed_parser",
         "PyYAML",
+        "numpy",
         "requests",
         "pytest",
         "python-dotenv"
@@ -1,23 +1,18 @@
 import sys
-import os
 import logging
-from typing import List, Dict, Any
-
-# Dynamically adjust sys.path to allow imports from the project root
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-if PROJECT_ROOT not in sys.path:
-    sys.path.insert(0, PROJECT_ROOT)
+from typing import List, Dict, Any, Optional, Iterator, AsyncIterator
 
 # Local imports
 try:
+    from src.agents.hypothesis_parser import HypothesisStreamParser, extract_hypotheses
     from src.utils.gemini_api import GeminiAPI
-    from src.utils.logging_config import setup_logging
+    from src.utils.response_cache import is_cache_enabled
+    from src.utils.logging_config import setup_logging, Truncated
+    from src.utils.tracing import traced
 except ImportError as e:
     print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
     sys.exit(1)
 
-# Configure logging
-setup_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -26,25 +21,28 @@ class CriticAgent:
     Critic AI agent responsible for refining hypotheses and experimental designs using the Gemini API.
     """
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], gemini_api: Optional[GeminiAPI] = None):
         """
         Initializes the CriticAgent with a configuration.
 
         Args:
             config: A dictionary containing configuration parameters, including API keys.
+            gemini_api: Optional shared GeminiAPI client; one is created from `config` if omitted.
         """
         try:
-            self.gemini_api = GeminiAPI(api_key=config['gemini_api_key'])
+            self.gemini_api = gemini_api if gemini_api is not None else GeminiAPI.from_config(config)
+            self.use_cache = is_cache_enabled(config, agent_name='critic')
             self.model_name = config.get('model_name', 'gemini-2.0-flash')  # Default model name
         except KeyError as e:
-            logger.error(f"Missing configuration key: {e}")
+            logger.error("Missing configuration key: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Error initializing GeminiAPI: {e}")
+            logger.error("Error initializing GeminiAPI: %s", e)
             raise
 
         logger.info("CriticAgent initialized.")
 
+    @traced("critic.refine_hypotheses", record_args=("hypotheses", "experiment_results"))
     def refine_hypotheses(self, hypotheses: List[str], experiment_results: str) -> List[str]:
         """
         Refines the given hypotheses based on the experiment results using the Gemini API.
@@ -57,24 +55,113 @@ class CriticAgent:
             A list of strings representing the refined hypotheses.
         """
         try:
-            prompt = f"""
-            You are an expert scientific critic. Based on the following hypotheses and experiment results,
-            refine the hypotheses to be more accurate and testable.
-            Hypotheses: {hypotheses}
-            Experiment Results: {experiment_results}
-            Provide the refined hypotheses as a numbered list.
-            """
-            response = self.gemini_api.generate_content(prompt, model_name=self.model_name)
+            prompt = self._build_prompt(hypotheses, experiment_results)
+            response = self.gemini_api.generate_content(prompt, model_name=self.model_name, use_cache=self.use_cache, agent='critic')
 
             # Process the response to extract refined hypotheses
             refined_hypotheses = self._extract_hypotheses(response)
-            logger.info(f"Refined hypotheses: {refined_hypotheses}")
+            logger.info("Refined hypotheses: %s", Truncated(refined_hypotheses))
+            return refined_hypotheses
+
+        except Exception as e:
+            logger.exception("Error refining hypotheses: %s", e)
+            return []
+
+    @traced("critic.refine_hypotheses", record_args=("hypotheses", "experiment_results"))
+    async def arefine_hypotheses(self, hypotheses: List[str], experiment_results: str) -> List[str]:
+        """
+        Asynchronous counterpart of `refine_hypotheses`.
+
+        Args:
+            hypotheses: A list of strings representing the hypotheses to be refined.
+            experiment_results: A string containing the results of the experiment.
+
+        Returns:
+            A list of strings representing the refined hypotheses.
+        """
+        try:
+            prompt = self._build_prompt(hypotheses, experiment_results)
+            response = await self.gemini_api.agenerate_content(prompt, model_name=self.model_name, use_cache=self.use_cache, agent='critic')
+
+            refined_hypotheses = self._extract_hypotheses(response)
+            logger.info("Refined hypotheses: %s", Truncated(refined_hypotheses))
             return refined_hypotheses
 
         except Exception as e:
-            logger.exception(f"Error refining hypotheses: {e}")
+            logger.exception("Error refining hypotheses: %s", e)
             return []
 
+    @traced("critic.stream_refined_hypotheses", record_args=("hypotheses", "experiment_results"))
+    def stream_refined_hypotheses(self, hypotheses: List[str], experiment_results: str) -> Iterator[str]:
+        """
+        Streams refined hypotheses as soon as each one is generated.
+
+        Args:
+            hypotheses: A list of strings representing the hypotheses to be refined.
+            experiment_results: A string containing the results of the experiment.
+
+        Yields:
+            Each refined hypothesis once its line of the response is complete.
+
+        Raises:
+            Exception: If the model stream fails; the hypotheses already yielded are then incomplete.
+        """
+        parser = HypothesisStreamParser()
+        try:
+            prompt = self._build_prompt(hypotheses, experiment_results)
+            for chunk in self.gemini_api.generate_content_stream(prompt, model_name=self.model_name, use_cache=self.use_cache, agent='critic'):
+                yield from parser.feed(chunk)
+            yield from parser.close()
+        except Exception as e:
+            logger.exception("Error streaming refined hypotheses: %s", e)
+            raise
+
+    @traced("critic.stream_refined_hypotheses", record_args=("hypotheses", "experiment_results"))
+    async def astream_refined_hypotheses(self, hypotheses: List[str], experiment_results: str) -> AsyncIterator[str]:
+        """
+        Asynchronous counterpart of `stream_refined_hypotheses`.
+
+        Args:
+            hypotheses: A list of strings representing the hypotheses to be refined.
+            experiment_results: A string containing the results of the experiment.
+
+        Yields:
+            Each refined hypothesis once its line of the response is complete.
+
+        Raises:
+            Exception: If the model stream fails; the hypotheses already yielded are then incomplete.
+        """
+        parser = HypothesisStreamParser()
+        try:
+            prompt = self._build_prompt(hypotheses, experiment_results)
+            async for chunk in self.gemini_api.agenerate_content_stream(prompt, model_name=self.model_name, use_cache=self.use_cache, agent='critic'):
+                for hypothesis in parser.feed(chunk):
+                    yield hypothesis
+            for hypothesis in parser.close():
+                yield hypothesis
+        except Exception as e:
+            logger.exception("Error streaming refined hypotheses: %s", e)
+            raise
+
+    def _build_prompt(self, hypotheses: List[str], experiment_results: str) -> str:
+        """
+        Builds the refinement prompt for the given hypotheses and experiment results.
+
+        Args:
+            hypotheses: A list of strings representing the hypotheses to be refined.
+            experiment_results: A string containing the results of the experiment.
+
+        Returns:
+            The prompt to send to the Gemini API.
+        """
+        return f"""
+            You are an expert scientific critic. Based on the following hypotheses and experiment results,
+            refine the hypotheses to be more accurate and testable.
+            Hypotheses: {hypotheses}
+            Experiment Results: {experiment_results}
+            Provide the refined hypotheses as a numbered list.
+            """
+
     def _extract_hypotheses(self, response: str) -> List[str]:
         """
         Extracts hypotheses from the Gemini API response.
@@ -87,22 +174,18 @@ class CriticAgent:
         """
         hypotheses = []
         try:
-            lines = response.strip().split('\n')
-            for line in lines:
-                line = line.strip()
-                if line and (line[0].isdigit() or line.startswith('-')):  # Check if the line starts with a number or a dash
-                    # Remove numbering or bullet points
-                    hypothesis = line.split(' ', 1)[1].strip() if len(line.split(' ', 1)) > 1 else line.strip()
-                    hypotheses.append(hypothesis)
+            hypotheses = extract_hypotheses(response)
         except Exception as e:
-            logger.error(f"Error extracting hypotheses from response: {e}")
+            logger.error("Error extracting hypotheses from response: %s", e)
         return hypotheses
 
 
 if __name__ == "__main__":
+    setup_logging()
+
     # Example Usage:
     # 1. Create a `configs/config.yaml` file with your Gemini API key.
-    # 2. Run this script: `python src/agents/critic_agent.py`
+    # 2. Run this script: `python -m src.agents.critic_agent`
 
     # Load a dummy config for testing
     dummy_config = {
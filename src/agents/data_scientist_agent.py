@@ -1,23 +1,18 @@
 import sys
-import os
 import logging
-from typing import List, Dict, Any
-
-# Dynamically adjust sys.path to allow imports from the project root
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-if PROJECT_ROOT not in sys.path:
-    sys.path.insert(0, PROJECT_ROOT)
+from typing import List, Dict, Any, Optional
 
 # Local imports
 try:
     from src.utils.gemini_api import GeminiAPI
-    from src.utils.logging_config import setup_logging
+    from src.utils.response_cache import is_cache_enabled
+    from src.knowledge_retrieval.context_builder import ContextBuilder
+    from src.utils.logging_config import setup_logging, Truncated
+    from src.utils.tracing import traced
 except ImportError as e:
     print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
     sys.exit(1)
 
-# Configure logging
-setup_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -26,57 +21,110 @@ class DataScientistAgent:
     Data Scientist AI agent responsible for data analysis and interpretation using the Gemini API.
     """
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], gemini_api: Optional[GeminiAPI] = None):
         """
         Initializes the DataScientistAgent with a configuration.
 
         Args:
             config: A dictionary containing configuration parameters, including API keys.
+            gemini_api: Optional shared GeminiAPI client; one is created from `config` if omitted.
         """
         try:
-            self.gemini_api = GeminiAPI(api_key=config['gemini_api_key'])
+            self.gemini_api = gemini_api if gemini_api is not None else GeminiAPI.from_config(config)
+            self.use_cache = is_cache_enabled(config, agent_name='data_scientist')
             self.model_name = config.get('model_name', 'gemini-2.0-flash')  # Default model name
+            self.context_builder = ContextBuilder.from_config(config)
         except KeyError as e:
-            logger.error(f"Missing configuration key: {e}")
+            logger.error("Missing configuration key: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Error initializing GeminiAPI: {e}")
+            logger.error("Error initializing GeminiAPI: %s", e)
             raise
 
         logger.info("DataScientistAgent initialized.")
 
-    def analyze_data(self, research_problem: str, hypotheses: List[str]) -> str:
+    @traced("data_scientist.analyze_data", record_args=("research_problem", "hypotheses", "papers"))
+    def analyze_data(self, research_problem: str, hypotheses: List[str],
+                     papers: Optional[List[Dict[str, Any]]] = None) -> str:
         """
         Analyzes existing data related to the research problem and hypotheses using the Gemini API.
 
         Args:
             research_problem: A string describing the research problem.
             hypotheses: A list of strings representing the hypotheses to be analyzed.
+            papers: Optional retrieved papers (e.g. from MultiSourceRetriever) to ground the analysis in.
 
         Returns:
             A string containing the analysis results.
         """
         try:
-            prompt = f"""
+            prompt = self._build_prompt(research_problem, hypotheses, papers)
+            response = self.gemini_api.generate_content(prompt, model_name=self.model_name, use_cache=self.use_cache, agent='data_scientist')
+            logger.info("Data analysis results: %s", Truncated(response))
+            return response
+
+        except Exception as e:
+            logger.exception("Error analyzing data: %s", e)
+            return ""
+
+    @traced("data_scientist.analyze_data", record_args=("research_problem", "hypotheses", "papers"))
+    async def aanalyze_data(self, research_problem: str, hypotheses: List[str],
+                            papers: Optional[List[Dict[str, Any]]] = None) -> str:
+        """
+        Asynchronous counterpart of `analyze_data`.
+
+        Args:
+            research_problem: A string describing the research problem.
+            hypotheses: A list of strings representing the hypotheses to be analyzed.
+            papers: Optional retrieved papers (e.g. from MultiSourceRetriever) to ground the analysis in.
+
+        Returns:
+            A string containing the analysis results.
+        """
+        try:
+            prompt = self._build_prompt(research_problem, hypotheses, papers)
+            response = await self.gemini_api.agenerate_content(prompt, model_name=self.model_name, use_cache=self.use_cache, agent='data_scientist')
+            logger.info("Data analysis results: %s", Truncated(response))
+            return response
+
+        except Exception as e:
+            logger.exception("Error analyzing data: %s", e)
+            return ""
+
+    def _build_prompt(self, research_problem: str, hypotheses: List[str],
+                      papers: Optional[List[Dict[str, Any]]] = None) -> str:
+        """
+        Builds the data analysis prompt for the given research problem and hypotheses.
+
+        Args:
+            research_problem: A string describing the research problem.
+            hypotheses: A list of strings representing the hypotheses to be analyzed.
+            papers: Optional retrieved papers, best first; they are deduplicated and compressed
+                to the `retrieval.context` token budget.
+
+        Returns:
+            The prompt to send to the Gemini API.
+        """
+        literature = ""
+        if papers:
+            context = self.context_builder.build(papers, query=" ".join([research_problem] + list(hypotheses)))
+            if context:
+                literature = "\n            Relevant Literature:\n" + context
+        return f"""
             You are an expert data scientist. Analyze the following research problem and hypotheses,
             and provide insights based on existing knowledge and data.
             Research Problem: {research_problem}
-            Hypotheses: {hypotheses}
+            Hypotheses: {hypotheses}{literature}
             Provide a detailed analysis of the hypotheses in relation to the research problem.
             """
-            response = self.gemini_api.generate_content(prompt, model_name=self.model_name)
-            logger.info(f"Data analysis results: {response}")
-            return response
-
-        except Exception as e:
-            logger.exception(f"Error analyzing data: {e}")
-            return ""
 
 
 if __name__ == "__main__":
+    setup_logging()
+
     # Example Usage:
     # 1. Create a `configs/config.yaml` file with your Gemini API key.
-    # 2. Run this script: `python src/agents/data_scientist_agent.py`
+    # 2. Run this script: `python -m src.agents.data_scientist_agent`
 
     # Load a dummy config for testing
     dummy_config = {
@@ -1,50 +1,129 @@
 import sys
-import os
+import re
+import asyncio
 import logging
-from typing import List, Dict, Any
-
-# Dynamically adjust sys.path to allow imports from the project root
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-if PROJECT_ROOT not in sys.path:
-    sys.path.insert(0, PROJECT_ROOT)
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
 
 # Local imports
 try:
     from src.utils.gemini_api import GeminiAPI
-    from src.utils.logging_config import setup_logging
+    from src.utils.rate_limiter import is_retryable
+    from src.utils.response_cache import is_cache_enabled
+    from src.utils.logging_config import setup_logging, Truncated
+    from src.utils.tracing import traced
 except ImportError as e:
     print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
     sys.exit(1)
 
-# Configure logging
-setup_logging()
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_FAN_OUT_CONCURRENCY = 4
+DEFAULT_FAN_OUT_RETRIES = 1
+DEFAULT_MAX_ANALYSIS_CHARS = 2000
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]{4,}")
+
+
+def select_relevant_analysis(hypothesis: str, index: int, data_analysis_results: str,
+                             max_chars: int = DEFAULT_MAX_ANALYSIS_CHARS) -> str:
+    """
+    Selects the parts of the data analysis that relate to a single hypothesis.
+
+    Paragraphs are scored by the words they share with the hypothesis, with a bonus
+    for explicitly naming it ("Hypothesis 2"). The best paragraphs are kept in their
+    original order until `max_chars` is reached.
+
+    Args:
+        hypothesis: The hypothesis to select analysis for.
+        index: Zero-based position of the hypothesis in the hypothesis list.
+        data_analysis_results: The full data analysis text.
+        max_chars: Maximum length of the returned slice.
+
+    Returns:
+        The relevant slice of the analysis (the leading text if nothing matches).
+    """
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", data_analysis_results) if p.strip()]
+    if len(paragraphs) <= 1:
+        paragraphs = [line.strip() for line in data_analysis_results.splitlines() if line.strip()]
+
+    keywords = set(_WORD_PATTERN.findall(hypothesis.lower()))
+    label = re.compile(rf"hypothesis\s*#?\s*{index + 1}\b", re.IGNORECASE)
+    scored = []
+    for position, paragraph in enumerate(paragraphs):
+        score = len(keywords & set(_WORD_PATTERN.findall(paragraph.lower())))
+        if label.search(paragraph):
+            score += len(keywords) + 1
+        if score > 0:
+            scored.append((score, position))
+
+    if not scored:
+        return data_analysis_results[:max_chars]
+
+    selected, length = [], 0
+    for score, position in sorted(scored, key=lambda item: (-item[0], item[1])):
+        paragraph = paragraphs[position]
+        if selected and length + len(paragraph) > max_chars:
+            continue
+        selected.append(position)
+        length += len(paragraph)
+    return "\n\n".join(paragraphs[position] for position in sorted(selected))[:max_chars]
+
+
+def merge_simulation_results(results: List[Dict[str, Any]]) -> str:
+    """
+    Merges per-hypothesis simulation results into a single report.
+
+    Args:
+        results: Records with the `index`, `hypothesis` and `result` of each simulation,
+            as returned by `ExperimentAgent.run_simulation_per_hypothesis`.
+
+    Returns:
+        The results concatenated under one heading per hypothesis, in index order.
+    """
+    sections = []
+    for record in sorted(results, key=lambda record: record["index"]):
+        sections.append(f"Hypothesis {record['index'] + 1}: {record['hypothesis']}\n"
+                        f"{record['result'] or 'No simulation results.'}")
+    return "\n\n".join(sections)
+
+
 class ExperimentAgent:
     """
     Experiment AI agent responsible for designing and running simulations and experiments using the Gemini API.
     """
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], gemini_api: Optional[GeminiAPI] = None):
         """
         Initializes the ExperimentAgent with a configuration.
 
         Args:
             config: A dictionary containing configuration parameters, including API keys.
+            gemini_api: Optional shared GeminiAPI client; one is created from `config` if omitted.
         """
         try:
-            self.gemini_api = GeminiAPI(api_key=config['gemini_api_key'])
+            self.gemini_api = gemini_api if gemini_api is not None else GeminiAPI.from_config(config)
+            self.use_cache = is_cache_enabled(config, agent_name='experiment')
             self.model_name = config.get('model_name', 'gemini-2.0-flash')  # Default model name
+            fan_out_config = (config.get('experiment_agent') or {})
+            self.fan_out = fan_out_config.get('fan_out', False)
+            self.fan_out_concurrency = int(fan_out_config.get('max_concurrency', DEFAULT_FAN_OUT_CONCURRENCY))
+            if self.fan_out_concurrency < 1:
+                raise ValueError("experiment_agent.max_concurrency must be at least 1")
+            self.fan_out_retries = fan_out_config.get('max_retries', DEFAULT_FAN_OUT_RETRIES)
+            self.max_analysis_chars = fan_out_config.get('max_analysis_chars', DEFAULT_MAX_ANALYSIS_CHARS)
         except KeyError as e:
-            logger.error(f"Missing configuration key: {e}")
+            logger.error("Missing configuration key: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Error initializing GeminiAPI: {e}")
+            logger.error("Error initializing GeminiAPI: %s", e)
             raise
 
         logger.info("ExperimentAgent initialized.")
 
+    @traced("experiment.run_simulation", record_args=("hypotheses", "data_analysis_results"))
     def run_simulation(self, hypotheses: List[str], data_analysis_results: str) -> str:
         """
         Designs and runs a simulation based on the given hypotheses and data analysis results using the Gemini API.
@@ -57,7 +136,162 @@ class ExperimentAgent:
             A string containing the simulation results.
         """
         try:
-            prompt = f"""
+            if self.fan_out:
+                return merge_simulation_results(self.run_simulation_per_hypothesis(hypotheses, data_analysis_results))
+            prompt = self._build_prompt(hypotheses, data_analysis_results)
+            response = self.gemini_api.generate_content(prompt, model_name=self.model_name, use_cache=self.use_cache, agent='experiment')
+            logger.info("Simulation results: %s", Truncated(response))
+            return response
+
+        except Exception as e:
+            logger.exception("Error running simulation: %s", e)
+            return ""
+
+    @traced("experiment.run_simulation", record_args=("hypotheses", "data_analysis_results"))
+    async def arun_simulation(self, hypotheses: List[str], data_analysis_results: str) -> str:
+        """
+        Asynchronous counterpart of `run_simulation`.
+
+        Args:
+            hypotheses: A list of strings representing the hypotheses to be tested.
+            data_analysis_results: A string containing the results of the data analysis.
+
+        Returns:
+            A string containing the simulation results.
+        """
+        try:
+            if self.fan_out:
+                return merge_simulation_results(await self.arun_simulation_per_hypothesis(hypotheses, data_analysis_results))
+            prompt = self._build_prompt(hypotheses, data_analysis_results)
+            response = await self.gemini_api.agenerate_content(prompt, model_name=self.model_name, use_cache=self.use_cache, agent='experiment')
+            logger.info("Simulation results: %s", Truncated(response))
+            return response
+
+        except Exception as e:
+            logger.exception("Error running simulation: %s", e)
+            return ""
+
+    @traced("experiment.run_simulation_per_hypothesis", record_args=("hypotheses", "data_analysis_results"))
+    def run_simulation_per_hypothesis(self, hypotheses: List[str],
+                                      data_analysis_results: str) -> List[Dict[str, Any]]:
+        """
+        Runs one bounded-concurrency simulation request per hypothesis.
+
+        Each request only carries the slice of the analysis relevant to its hypothesis.
+        Empty responses and transient errors that outlast the GeminiAPI retry policy
+        are retried individually; any other error gives up on that hypothesis at once.
+
+        Args:
+            hypotheses: A list of strings representing the hypotheses to be tested.
+            data_analysis_results: A string containing the results of the data analysis.
+
+        Returns:
+            One record per hypothesis, in the order of `hypotheses`, with its `index`,
+            `hypothesis` and simulation `result` ("" if every attempt failed).
+        """
+        if not hypotheses:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.fan_out_concurrency, len(hypotheses))) as executor:
+            # Each request runs in a copy of the caller's context so its spans nest under this call.
+            futures = [
+                executor.submit(contextvars.copy_context().run, self._simulate_hypothesis,
+                                index, hypothesis, data_analysis_results)
+                for index, hypothesis in enumerate(hypotheses)
+            ]
+            return [{"index": index, "hypothesis": hypothesis, "result": future.result()}
+                    for index, (hypothesis, future) in enumerate(zip(hypotheses, futures))]
+
+    @traced("experiment.run_simulation_per_hypothesis", record_args=("hypotheses", "data_analysis_results"))
+    async def arun_simulation_per_hypothesis(self, hypotheses: List[str],
+                                             data_analysis_results: str) -> List[Dict[str, Any]]:
+        """
+        Asynchronous counterpart of `run_simulation_per_hypothesis`.
+
+        Args:
+            hypotheses: A list of strings representing the hypotheses to be tested.
+            data_analysis_results: A string containing the results of the data analysis.
+
+        Returns:
+            One record per hypothesis, in the order of `hypotheses`, with its `index`,
+            `hypothesis` and simulation `result` ("" if every attempt failed).
+        """
+        semaphore = asyncio.Semaphore(self.fan_out_concurrency)
+
+        async def simulate(index: int, hypothesis: str) -> Dict[str, Any]:
+            async with semaphore:
+                result = await self._asimulate_hypothesis(index, hypothesis, data_analysis_results)
+            return {"index": index, "hypothesis": hypothesis, "result": result}
+
+        return list(await asyncio.gather(*(simulate(i, h) for i, h in enumerate(hypotheses))))
+
+    def _simulate_hypothesis(self, index: int, hypothesis: str, data_analysis_results: str) -> str:
+        """Runs the simulation request for a single hypothesis, retrying empty responses and transient errors."""
+        prompt = self._build_hypothesis_prompt(index, hypothesis, data_analysis_results)
+        for attempt in range(self.fan_out_retries + 1):
+            try:
+                response = self.gemini_api.generate_content(prompt, model_name=self.model_name, use_cache=self.use_cache, agent='experiment')
+                if response:
+                    return response
+                logger.warning("Empty simulation response for hypothesis %s (attempt %s).", index + 1, attempt + 1)
+            except Exception as e:
+                if not is_retryable(e):
+                    logger.error("Simulation failed for hypothesis %s: %s", index + 1, e)
+                    return ""
+                logger.warning("Simulation failed for hypothesis %s (attempt %s): %s", index + 1, attempt + 1, e)
+        logger.error("Giving up on hypothesis %s after %s attempts.", index + 1, self.fan_out_retries + 1)
+        return ""
+
+    async def _asimulate_hypothesis(self, index: int, hypothesis: str, data_analysis_results: str) -> str:
+        """Asynchronously runs the simulation request for a single hypothesis, retrying like `_simulate_hypothesis`."""
+        prompt = self._build_hypothesis_prompt(index, hypothesis, data_analysis_results)
+        for attempt in range(self.fan_out_retries + 1):
+            try:
+                response = await self.gemini_api.agenerate_content(prompt, model_name=self.model_name, use_cache=self.use_cache, agent='experiment')
+                if response:
+                    return response
+                logger.warning("Empty simulation response for hypothesis %s (attempt %s).", index + 1, attempt + 1)
+            except Exception as e:
+                if not is_retryable(e):
+                    logger.error("Simulation failed for hypothesis %s: %s", index + 1, e)
+                    return ""
+                logger.warning("Simulation failed for hypothesis %s (attempt %s): %s", index + 1, attempt + 1, e)
+        logger.error("Giving up on hypothesis %s after %s attempts.", index + 1, self.fan_out_retries + 1)
+        return ""
+
+    def _build_hypothesis_prompt(self, index: int, hypothesis: str, data_analysis_results: str) -> str:
+        """
+        Builds the simulation design prompt for a single hypothesis.
+
+        Args:
+            index: Zero-based position of the hypothesis in the hypothesis list.
+            hypothesis: The hypothesis to be tested.
+            data_analysis_results: The full data analysis text; only the relevant slice is included.
+
+        Returns:
+            The prompt to send to the Gemini API.
+        """
+        relevant_analysis = select_relevant_analysis(hypothesis, index, data_analysis_results, self.max_analysis_chars)
+        return f"""
+            You are an expert in designing and running scientific simulations.
+            Based on the following hypothesis and data analysis results, design and run a simulation to test the hypothesis.
+            Hypothesis: {hypothesis}
+            Data Analysis Results: {relevant_analysis}
+            Provide a detailed description of the simulation setup, parameters, and the expected results.
+            Also, provide the actual simulation results.
+            """
+
+    def _build_prompt(self, hypotheses: List[str], data_analysis_results: str) -> str:
+        """
+        Builds the simulation design prompt for the given hypotheses and analysis results.
+
+        Args:
+            hypotheses: A list of strings representing the hypotheses to be tested.
+            data_analysis_results: A string containing the results of the data analysis.
+
+        Returns:
+            The prompt to send to the Gemini API.
+        """
+        return f"""
             You are an expert in designing and running scientific simulations.
             Based on the following hypotheses and data analysis results, design and run a simulation to test the hypotheses.
             Hypotheses: {hypotheses}
@@ -65,19 +299,14 @@ class ExperimentAgent:
             Provide a detailed description of the simulation setup, parameters, and the expected results.
             Also, provide the actual simulation results.
             """
-            response = self.gemini_api.generate_content(prompt, model_name=self.model_name)
-            logger.info(f"Simulation results: {response}")
-            return response
-
-        except Exception as e:
-            logger.exception(f"Error running simulation: {e}")
-            return ""
 
 
 if __name__ == "__main__":
+    setup_logging()
+
     # Example Usage:
     # 1. Create a `configs/config.yaml` file with your Gemini API key.
-    # 2. Run this script: `python src/agents/experiment_agent.py`
+    # 2. Run this script: `python -m src.agents.experiment_agent`
 
     # Load a dummy config for testing
     dummy_config = {
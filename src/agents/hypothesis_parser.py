@@ -0,0 +1,70 @@
+from typing import List, Optional
+
+
+def parse_hypothesis_line(line: str) -> Optional[str]:
+    """
+    Parses a single response line into a hypothesis.
+
+    Args:
+        line: One line of a Gemini API response.
+
+    Returns:
+        The hypothesis without its numbering or bullet, or None if the line is not a list item.
+    """
+    line = line.strip()
+    if line and (line[0].isdigit() or line.startswith('-')):  # Check if the line starts with a number or a dash
+        # Remove numbering or bullet points
+        parts = line.split(' ', 1)
+        return parts[1].strip() if len(parts) > 1 else line
+    return None
+
+
+class HypothesisStreamParser:
+    """
+    Incremental parser that emits each numbered or bulleted hypothesis as soon as its line completes.
+    """
+
+    def __init__(self):
+        """
+        Initializes the HypothesisStreamParser with an empty buffer.
+        """
+        self._buffer = ""
+
+    def feed(self, chunk: str) -> List[str]:
+        """
+        Consumes a chunk of streamed text.
+
+        Args:
+            chunk: The next piece of the response.
+
+        Returns:
+            The hypotheses whose lines were completed by this chunk.
+        """
+        self._buffer += chunk
+        *lines, self._buffer = self._buffer.split('\n')
+        return [h for h in (parse_hypothesis_line(line) for line in lines) if h is not None]
+
+    def close(self) -> List[str]:
+        """
+        Flushes the final, unterminated line.
+
+        Returns:
+            The hypothesis on the last line, if any.
+        """
+        line, self._buffer = self._buffer, ""
+        hypothesis = parse_hypothesis_line(line)
+        return [hypothesis] if hypothesis is not None else []
+
+
+def extract_hypotheses(response: str) -> List[str]:
+    """
+    Extracts all hypotheses from a complete response.
+
+    Args:
+        response: The string response from the Gemini API.
+
+    Returns:
+        A list of hypotheses extracted from the response.
+    """
+    parser = HypothesisStreamParser()
+    return parser.feed(response) + parser.close()
@@ -1,24 +1,19 @@
 import sys
-import os
 import logging
-from typing import List, Dict, Any
-
-# Dynamically adjust sys.path to allow imports from the project root
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-if PROJECT_ROOT not in sys.path:
-    sys.path.insert(0, PROJECT_ROOT)
+from typing import List, Dict, Any, Optional, Iterator, AsyncIterator
 
 # Local imports
 try:
+    from src.agents.hypothesis_parser import HypothesisStreamParser, extract_hypotheses
     from src.utils.gemini_api import GeminiAPI
-    from src.utils.logging_config import setup_logging
+    from src.utils.response_cache import is_cache_enabled
+    from src.utils.logging_config import setup_logging, Truncated
+    from src.utils.tracing import traced
 except ImportError as e:
     print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
     sys.exit(1)
 
 
-# Configure logging
-setup_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -27,25 +22,28 @@ class TheoristAgent:
     Theorist AI agent responsible for generating hypotheses using the Gemini API.
     """
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], gemini_api: Optional[GeminiAPI] = None):
         """
         Initializes the TheoristAgent with a configuration.
 
         Args:
             config: A dictionary containing configuration parameters, including API keys.
+            gemini_api: Optional shared GeminiAPI client; one is created from `config` if omitted.
         """
         try:
-            self.gemini_api = GeminiAPI(api_key=config['gemini_api_key'])
+            self.gemini_api = gemini_api if gemini_api is not None else GeminiAPI.from_config(config)
+            self.use_cache = is_cache_enabled(config, agent_name='theorist')
             self.model_name = config.get('model_name', 'gemini-2.0-flash')  # Default model name
         except KeyError as e:
-            logger.error(f"Missing configuration key: {e}")
+            logger.error("Missing configuration key: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Error initializing GeminiAPI: {e}")
+            logger.error("Error initializing GeminiAPI: %s", e)
             raise
 
         logger.info("TheoristAgent initialized.")
 
+    @traced("theorist.generate_hypotheses", record_args=("research_problem",))
     def generate_hypotheses(self, research_problem: str) -> List[str]:
         """
         Generates hypotheses based on the given research problem using the Gemini API.
@@ -57,22 +55,107 @@ class TheoristAgent:
             A list of strings, where each string is a generated hypothesis.
         """
         try:
-            prompt = f"""
-            You are a brilliant scientist. Generate a few testable hypotheses for the following research problem:
-            {research_problem}
-            Provide the hypotheses as a numbered list.
-            """
-            response = self.gemini_api.generate_content(prompt, model_name=self.model_name)
+            prompt = self._build_prompt(research_problem)
+            response = self.gemini_api.generate_content(prompt, model_name=self.model_name, use_cache=self.use_cache, agent='theorist')
 
             # Process the response to extract hypotheses
             hypotheses = self._extract_hypotheses(response)
-            logger.info(f"Generated hypotheses: {hypotheses}")
+            logger.info("Generated hypotheses: %s", Truncated(hypotheses))
+            return hypotheses
+
+        except Exception as e:
+            logger.exception("Error generating hypotheses: %s", e)
+            return []
+
+    @traced("theorist.generate_hypotheses", record_args=("research_problem",))
+    async def agenerate_hypotheses(self, research_problem: str) -> List[str]:
+        """
+        Asynchronous counterpart of `generate_hypotheses`.
+
+        Args:
+            research_problem: A string describing the research problem.
+
+        Returns:
+            A list of strings, where each string is a generated hypothesis.
+        """
+        try:
+            prompt = self._build_prompt(research_problem)
+            response = await self.gemini_api.agenerate_content(prompt, model_name=self.model_name, use_cache=self.use_cache, agent='theorist')
+
+            hypotheses = self._extract_hypotheses(response)
+            logger.info("Generated hypotheses: %s", Truncated(hypotheses))
             return hypotheses
 
         except Exception as e:
-            logger.exception(f"Error generating hypotheses: {e}")
+            logger.exception("Error generating hypotheses: %s", e)
             return []
 
+    @traced("theorist.stream_hypotheses", record_args=("research_problem",))
+    def stream_hypotheses(self, research_problem: str) -> Iterator[str]:
+        """
+        Streams hypotheses for the given research problem as soon as each one is generated.
+
+        Args:
+            research_problem: A string describing the research problem.
+
+        Yields:
+            Each hypothesis once its line of the response is complete.
+
+        Raises:
+            Exception: If the model stream fails; the hypotheses already yielded are then incomplete.
+        """
+        parser = HypothesisStreamParser()
+        try:
+            prompt = self._build_prompt(research_problem)
+            for chunk in self.gemini_api.generate_content_stream(prompt, model_name=self.model_name, use_cache=self.use_cache, agent='theorist'):
+                yield from parser.feed(chunk)
+            yield from parser.close()
+        except Exception as e:
+            logger.exception("Error streaming hypotheses: %s", e)
+            raise
+
+    @traced("theorist.stream_hypotheses", record_args=("research_problem",))
+    async def astream_hypotheses(self, research_problem: str) -> AsyncIterator[str]:
+        """
+        Asynchronous counterpart of `stream_hypotheses`.
+
+        Args:
+            research_problem: A string describing the research problem.
+
+        Yields:
+            Each hypothesis once its line of the response is complete.
+
+        Raises:
+            Exception: If the model stream fails; the hypotheses already yielded are then incomplete.
+        """
+        parser = HypothesisStreamParser()
+        try:
+            prompt = self._build_prompt(research_problem)
+            async for chunk in self.gemini_api.agenerate_content_stream(prompt, model_name=self.model_name, use_cache=self.use_cache, agent='theorist'):
+                for hypothesis in parser.feed(chunk):
+                    yield hypothesis
+            for hypothesis in parser.close():
+                yield hypothesis
+        except Exception as e:
+            logger.exception("Error streaming hypotheses: %s", e)
+            raise
+
+    def _build_prompt(self, research_problem: str) -> str:
+        """
+        Builds the hypothesis generation prompt for the given research problem.
+
+        Args:
+            research_problem: A string describing the research problem.
+
+        Returns:
+            The prompt to send to the Gemini API.
+        """
+        return f"""
+            You are a brilliant scientist. Generate a few testable hypotheses for the following research problem:
+            {research_problem}
+            Provide the hypotheses as a numbered list.
+            """
+
     def _extract_hypotheses(self, response: str) -> List[str]:
         """
         Extracts hypotheses from the Gemini API response.
@@ -85,22 +168,18 @@ class TheoristAgent:
         """
         hypotheses = []
         try:
-            lines = response.strip().split('\n')
-            for line in lines:
-                line = line.strip()
-                if line and (line[0].isdigit() or line.startswith('-')):  # Check if the line starts with a number or a dash
-                    # Remove numbering or bullet points
-                    hypothesis = line.split(' ', 1)[1].strip() if len(line.split(' ', 1)) > 1 else line.strip()
-                    hypotheses.append(hypothesis)
+            hypotheses = extract_hypotheses(response)
         except Exception as e:
-            logger.error(f"Error extracting hypotheses from response: {e}")
+            logger.error("Error extracting hypotheses from response: %s", e)
         return hypotheses
 
 
 if __name__ == "__main__":
+    setup_logging()
+
     # Example Usage:
     # 1. Create a `configs/config.yaml` file with your Gemini API key.
-    # 2. Run this script: `python src/agents/theorist_agent.py`
+    # 2. Run this script: `python -m src.agents.theorist_agent`
 
     # Load a dummy config for testing
     dummy_config = {
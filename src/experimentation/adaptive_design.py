@@ -0,0 +1,201 @@
+import sys
+import math
+import logging
+from typing import Dict, Any, Optional, List
+
+import numpy as np
+
+# Local imports
+try:
+    from src.utils.logging_config import setup_logging
+    from src.experimentation.models import get_simulation_model
+    from src.experimentation.simulation_engine import SimulationEngine, parameter_table, z_value
+    from src.experimentation.parameter_sweep import Space, make_design
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CANDIDATES = 27
+DEFAULT_MIN_REPLICATES = 16
+DEFAULT_MAX_REPLICATES = 1296
+DEFAULT_ETA = 3
+
+
+class AdaptiveDesign:
+    """
+    Tests hypotheses with successive halving instead of simulating every parameter set at full precision.
+
+    A hypothesis holds over a parameter space only if it holds at the parameter set
+    least favourable to it, so the search concentrates replicates there. Every rung
+    simulates the candidates that are still undecided with `eta` times more
+    replicates than the last:
+
+    - a candidate whose effect is significant in the predicted direction is cleared;
+    - a candidate whose effect is significant in the opposite direction refutes the
+      hypothesis, which stops the search;
+    - of the remaining candidates, only the 1/eta with the weakest evidence for the
+      hypothesis go on to the next rung.
+
+    The hypothesis is confirmed once no undecided candidates remain, and the verdict
+    is inconclusive if `max_replicates` is reached first. Significance uses a
+    Bonferroni correction over candidates and rungs, so the overall verdict holds at
+    `confidence` despite the repeated looks at the data.
+    """
+
+    def __init__(self, engine: Optional[SimulationEngine] = None, confidence: Optional[float] = None,
+                 candidates: int = DEFAULT_CANDIDATES, min_replicates: int = DEFAULT_MIN_REPLICATES,
+                 max_replicates: int = DEFAULT_MAX_REPLICATES, eta: int = DEFAULT_ETA,
+                 design: str = "latin_hypercube"):
+        """
+        Initializes the AdaptiveDesign.
+
+        Args:
+            engine: The SimulationEngine to run (default: a SimulationEngine with default settings).
+            confidence: Confidence at which hypotheses are confirmed or refuted (default: the engine's).
+            candidates: Parameter sets drawn from the space at the first rung.
+            min_replicates: Replicates per candidate at the first rung.
+            max_replicates: Replicates per candidate at which the search gives up.
+            eta: Factor by which replicates grow and candidates shrink per rung.
+            design: Design of the candidates (see `parameter_sweep.DESIGNS`).
+        """
+        if eta < 2:
+            raise ValueError("eta must be at least 2")
+        if not 2 <= min_replicates <= max_replicates:
+            raise ValueError("replicates must satisfy 2 <= min_replicates <= max_replicates")
+        self.engine = engine or SimulationEngine()
+        self.confidence = confidence or self.engine.confidence
+        z_value(self.confidence)
+        self.candidates = candidates
+        self.min_replicates = min_replicates
+        self.max_replicates = max_replicates
+        self.eta = eta
+        self.design = design
+        logger.info("AdaptiveDesign initialized.")
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], engine: Optional[SimulationEngine] = None) -> "AdaptiveDesign":
+        """
+        Creates an AdaptiveDesign using the `experimentation.adaptive` section of the configuration.
+
+        Args:
+            config: The loaded configuration dictionary.
+            engine: Optional SimulationEngine (default: one created from the same configuration).
+
+        Returns:
+            A configured AdaptiveDesign.
+        """
+        adaptive_config = (config.get('experimentation') or {}).get('adaptive') or {}
+        return cls(
+            engine=engine or SimulationEngine.from_config(config),
+            confidence=adaptive_config.get('confidence'),
+            candidates=adaptive_config.get('candidates', DEFAULT_CANDIDATES),
+            min_replicates=adaptive_config.get('min_replicates', DEFAULT_MIN_REPLICATES),
+            max_replicates=adaptive_config.get('max_replicates', DEFAULT_MAX_REPLICATES),
+            eta=adaptive_config.get('eta', DEFAULT_ETA),
+            design=adaptive_config.get('design', "latin_hypercube")
+        )
+
+    @property
+    def rungs(self) -> int:
+        """The largest number of rungs a search can take."""
+        return int(math.floor(math.log(self.max_replicates / self.min_replicates, self.eta) + 1e-9)) + 1
+
+    def test_hypothesis(self, hypothesis: str, space: Optional[Space] = None,
+                        parameters: Optional[Dict[str, Any]] = None, seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Confirms or refutes a hypothesis over a parameter space.
+
+        Args:
+            hypothesis: The hypothesis text.
+            space: Parameters to search over (see `parameter_sweep.make_design`); without one,
+                the hypothesis is tested sequentially at `parameters` alone.
+            parameters: Parameters shared by every candidate, including HYPOTHESIS_KEYS overrides.
+            seed: Random seed of the candidates and simulations (default: the engine's seed).
+
+        Returns:
+            The test specification, the verdict, `supported`, the decisive candidate (the
+            refuting one, or the last one cleared) with its effect, the rungs, and the
+            replicate evaluations used compared with simulating every candidate at
+            `max_replicates`.
+        """
+        resolved = self.engine.resolve_hypothesis(hypothesis, parameters)
+        if resolved is None:
+            return {"hypothesis": hypothesis, "verdict": "untestable", "supported": False,
+                    "reason": "no simulation model parameter is mentioned"}
+        spec, base = resolved
+        if spec["direction"] is None:
+            return {"hypothesis": hypothesis, **spec, "verdict": "untestable", "supported": False,
+                    "reason": "the hypothesis predicts no direction"}
+        seed = self.engine.seed if seed is None else seed
+        table = self._candidates(spec["model"], space, base, seed)
+        count = len(table[spec["parameter"]])
+        threshold = z_value(1.0 - (1.0 - self.confidence) / (count * self.rungs))
+
+        alive = np.arange(count)
+        replicates = self.min_replicates
+        rungs: List[Dict[str, Any]] = []
+        evaluations = 0
+        verdict, decisive = "inconclusive", None
+        for rung in range(self.rungs):
+            columns = self.engine.effects(spec, {name: column[alive] for name, column in table.items()},
+                                          replicates, seed + rung)
+            evaluations += 2 * len(alive) * replicates
+            score = spec["direction"] * columns["effect_mean"] / np.maximum(columns["effect_sem"], 1e-300)
+            refuted, cleared = score <= -threshold, score >= threshold
+            rungs.append({"replicates": replicates, "candidates": len(alive),
+                          "cleared": int(cleared.sum()), "refuted": int(refuted.sum())})
+            logger.debug("Rung %s of %r: %s", rung, hypothesis, rungs[-1])
+            if refuted.any():
+                verdict, decisive = "refuted", self._row(columns, int(np.argmin(score)))
+                break
+            if cleared.all():
+                verdict, decisive = "supported", self._row(columns, int(np.argmin(score)))
+                break
+            undecided = np.flatnonzero(~cleared)
+            keep = undecided[np.argsort(score[undecided], kind="stable")[:max(1, math.ceil(len(undecided) / self.eta))]]
+            decisive = self._row(columns, int(keep[0]))
+            alive = alive[np.sort(keep)]
+            replicates *= self.eta
+
+        brute_force = 2 * count * self.max_replicates
+        logger.info("Adaptive test of %r: %s after %s rungs and %s of %s brute-force evaluations.",
+                    hypothesis, verdict, len(rungs), evaluations, brute_force)
+        return {"hypothesis": hypothesis, **spec, "verdict": verdict, "supported": verdict == "supported",
+                "confidence": self.confidence, "decisive": decisive, "rungs": rungs,
+                "evaluations": evaluations, "brute_force_evaluations": brute_force}
+
+    def _candidates(self, model_name: str, space: Optional[Space], base: Dict[str, float],
+                    seed: int) -> Dict[str, np.ndarray]:
+        """Builds the candidate parameter table; binary parameters are rounded to 0 or 1."""
+        model = get_simulation_model(model_name)
+        if not space:
+            return parameter_table(model, [base])
+        columns = make_design(self.design, space, self.candidates, seed)
+        for name in model.binary_parameters:
+            if name in columns:
+                columns[name] = np.round(np.clip(columns[name], 0.0, 1.0))
+        return parameter_table(model, {**base, **columns})
+
+    @staticmethod
+    def _row(columns: Dict[str, np.ndarray], index: int) -> Dict[str, Any]:
+        return {name: (column[index].item() if column.dtype.kind != "U" else str(column[index]))
+                for name, column in columns.items() if name != "verdict"}
+
+
+if __name__ == "__main__":
+    setup_logging()
+
+    # Example Usage:
+    # 1. Run this script: `python -m src.experimentation.adaptive_design`
+
+    adaptive = AdaptiveDesign(SimulationEngine(seed=1))
+    space = {"transmission_rate": (0.15, 0.6), "recovery_rate": (0.05, 0.2)}
+    for hypothesis in ["Higher vaccination coverage reduces the attack rate.",
+                       "Higher vaccination coverage increases the attack rate.",
+                       "Increasing the temperature will increase the reaction rate."]:
+        outcome = adaptive.test_hypothesis(hypothesis, space if "vaccination" in hypothesis else None)
+        print(f"{hypothesis} -> {outcome['verdict']} after {len(outcome['rungs'])} rungs, "
+              f"{outcome['evaluations']} of {outcome['brute_force_evaluations']} brute-force evaluations")
@@ -1,84 +1,189 @@
 import sys
-import os
 import logging
-from typing import List, Dict, Any
-import time  # For demonstration purposes
-
-# Dynamically adjust sys.path to allow imports from the project root
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-if PROJECT_ROOT not in sys.path:
-    sys.path.insert(0, PROJECT_ROOT)
+import threading
+from typing import List, Dict, Any, Optional, Iterable, Iterator
 
 # Local imports
 try:
-    from src.utils.logging_config import setup_logging
+    from src.utils.logging_config import setup_logging, Truncated
+    from src.experimentation.job_scheduler import JobScheduler, Job, DEFAULT_CAPACITY
+    from src.experimentation.result_store import ResultStore, get_result_store, result_key
 except ImportError as e:
     print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
     sys.exit(1)
 
-# Configure logging
-setup_logging()
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_EXPERIMENT_DURATION = 5.0
+
+
 class ExperimentRunner:
     """
     Module for executing real-world experiments (if applicable).
 
+    Experiments are submitted to a JobScheduler and run in the background, up to
+    `max_concurrent` resource units at a time, so callers (and agents) can keep
+    working while they run and collect results as they complete. With a
+    ResultStore, an experiment whose hypotheses and parameters were already run
+    returns the stored results instead of running again.
+
+    Attributes:
+        version: Bump whenever the experimental procedure changes, so stored results are invalidated.
+
     Note: This is a highly simplified example and assumes a controlled environment.
     Real-world experiment execution would involve complex hardware interfaces,
     data acquisition systems, and safety protocols.  This example provides a
     framework and placeholder for such functionality.
     """
 
-    def __init__(self):
+    name = "experiment_runner"
+    version = "1"
+
+    def __init__(self, duration: float = DEFAULT_EXPERIMENT_DURATION, max_concurrent: int = DEFAULT_CAPACITY,
+                 default_timeout: Optional[float] = None, scheduler: Optional[JobScheduler] = None,
+                 store: Optional[ResultStore] = None):
         """
         Initializes the ExperimentRunner.
+
+        Args:
+            duration: Seconds a (placeholder) experiment takes.
+            max_concurrent: Resource units available to concurrently running experiments.
+            default_timeout: Seconds an experiment may run before it is stopped (None: no limit).
+            scheduler: Optional JobScheduler to share with other runners (overrides `max_concurrent`).
+            store: Optional ResultStore memoizing experiment results.
         """
+        self.duration = duration
+        self.default_timeout = default_timeout
+        self.scheduler = scheduler or JobScheduler(capacity=max_concurrent, name="experiment")
+        self.store = store
         logger.info("ExperimentRunner initialized.")
 
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "ExperimentRunner":
+        """
+        Creates an ExperimentRunner using the `experimentation.runner` section of the configuration.
+
+        Args:
+            config: The loaded configuration dictionary.
+
+        Returns:
+            A configured ExperimentRunner.
+        """
+        runner_config = (config.get('experimentation') or {}).get('runner') or {}
+        return cls(
+            duration=runner_config.get('duration', DEFAULT_EXPERIMENT_DURATION),
+            max_concurrent=runner_config.get('max_concurrent', DEFAULT_CAPACITY),
+            default_timeout=runner_config.get('timeout'),
+            store=get_result_store(config)
+        )
+
+    def submit(self, hypotheses: List[str], parameters: Dict[str, Any], priority: int = 0,
+               timeout: Optional[float] = None, resources: int = 1) -> Job:
+        """
+        Queues an experiment and returns immediately.
+
+        Args:
+            hypotheses: A list of strings representing the hypotheses to be tested.
+            parameters: A dictionary containing the experiment parameters.
+            priority: Higher priorities start first.
+            timeout: Seconds the experiment may run (default: the runner's default timeout).
+            resources: Resource units (e.g. instruments) the experiment occupies while running.
+
+        Returns:
+            The experiment's Job handle; `job.result()` returns the experiment results.
+        """
+        key = None
+        if self.store is not None:
+            key = result_key({"model": self.name, "version": self.version,
+                              "hypotheses": list(hypotheses), "parameters": parameters})
+            stored = self.store.load(self.name, self.version, key)
+            if stored is not None:
+                logger.info("Reusing stored results of experiment with parameters: %s", Truncated(parameters))
+                return self.scheduler.completed(stored, name="experiment")
+        return self.scheduler.submit(self._execute, list(hypotheses), dict(parameters), key, name="experiment",
+                                     priority=priority, resources=resources,
+                                     timeout=self.default_timeout if timeout is None else timeout)
+
+    def as_completed(self, jobs: Iterable[Job], timeout: Optional[float] = None) -> Iterator[Job]:
+        """Yields experiment jobs as they finish (see `JobScheduler.as_completed`)."""
+        return self.scheduler.as_completed(jobs, timeout)
+
     def run_experiment(self, hypotheses: List[str], parameters: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Executes a real-world experiment based on the given hypotheses and parameters.
+        Executes a real-world experiment based on the given hypotheses and parameters, waiting for the results.
 
         Args:
             hypotheses: A list of strings representing the hypotheses to be tested.
             parameters: A dictionary containing the experiment parameters.
 
         Returns:
-            A dictionary containing the experiment results.
+            A dictionary containing the experiment results (empty if the experiment failed).
         """
         try:
-            logger.info(f"Running experiment with hypotheses: {hypotheses} and parameters: {parameters}")
+            return self.submit(hypotheses, parameters).result()
+        except Exception as e:
+            logger.exception("Error running experiment: %s", e)
+            return {}
 
-            # This is a placeholder for the actual experiment execution logic.
-            # In a real implementation, this would involve controlling hardware,
-            # acquiring data, and monitoring the experiment.
+    async def arun_experiment(self, hypotheses: List[str], parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Asynchronous counterpart of `run_experiment`; the event loop keeps running while the experiment does.
 
-            # For demonstration purposes, we'll simulate the experiment by
-            # pausing for a short time and generating some dummy results.
+        Args:
+            hypotheses: A list of strings representing the hypotheses to be tested.
+            parameters: A dictionary containing the experiment parameters.
 
-            print("Starting experiment...")
-            time.sleep(5)  # Simulate experiment duration
+        Returns:
+            A dictionary containing the experiment results (empty if the experiment failed).
+        """
+        try:
+            return await self.submit(hypotheses, parameters).aresult()
+        except Exception as e:
+            logger.exception("Error running experiment: %s", e)
+            return {}
 
-            # Simulate data acquisition
-            results = {
-                "temperature": parameters.get("temperature", 25) + 2,  # Simulate temperature increase
-                "reaction_rate": 0.8 if parameters.get("catalyst_present", False) else 0.2  # Simulate reaction rate
-            }
+    def shutdown(self, cancel: bool = False) -> None:
+        """Waits for submitted experiments (or cancels them) and stops the scheduler's threads."""
+        self.scheduler.shutdown(cancel=cancel)
 
-            print("Experiment completed.")
-            logger.info(f"Experiment results: {results}")
-            return results
+    def _execute(self, hypotheses: List[str], parameters: Dict[str, Any], key: Optional[str],
+                 cancel_event: threading.Event) -> Dict[str, Any]:
+        """
+        Runs one experiment on a scheduler thread and stores its results under `key`.
 
-        except Exception as e:
-            logger.exception(f"Error running experiment: {e}")
+        Returns early, without storing anything, if the experiment is cancelled or times out.
+        """
+        logger.info("Running experiment with hypotheses: %s and parameters: %s",
+                    Truncated(hypotheses), Truncated(parameters))
+
+        # This is a placeholder for the actual experiment execution logic.
+        # In a real implementation, this would involve controlling hardware,
+        # acquiring data, and monitoring the experiment.
+
+        # For demonstration purposes, we'll simulate the experiment by
+        # waiting for a short time and generating some dummy results.
+        if cancel_event.wait(self.duration):  # Simulate experiment duration
+            logger.info("Experiment stopped before completion.")
             return {}
 
+        # Simulate data acquisition
+        results = {
+            "temperature": parameters.get("temperature", 25) + 2,  # Simulate temperature increase
+            "reaction_rate": 0.8 if parameters.get("catalyst_present", False) else 0.2  # Simulate reaction rate
+        }
+
+        logger.info("Experiment results: %s", Truncated(results))
+        if key is not None:
+            self.store.save(self.name, self.version, key, results)
+        return results
+
 
 if __name__ == "__main__":
+    setup_logging()
+
     # Example Usage:
-    # 1. Run this script: `python src/experimentation/experiment_runner.py`
+    # 1. Run this script: `python -m src.experimentation.experiment_runner`
 
     # Instantiate the ExperimentRunner
     experiment_runner = ExperimentRunner()
@@ -89,15 +194,13 @@ if __name__ == "__main__":
         "Adding a catalyst will decrease the activation energy."
     ]
 
-    # Define some experiment parameters
-    parameters = {
-        "temperature": 25,
-        "catalyst_present": True
-    }
-
-    # Run the experiment
-    experiment_results = experiment_runner.run_experiment(hypotheses, parameters)
+    # Submit a batch of experiments; they run concurrently in the background
+    jobs = [experiment_runner.submit(hypotheses, {"temperature": 20 + i, "catalyst_present": i % 2 == 0},
+                                     priority=i % 3)
+            for i in range(100)]
+    print(f"Submitted {len(jobs)} experiments.")
 
-    # Print the experiment results
-    print("Experiment Results:")
-    print(experiment_results)
\ No newline at end of file
+    # Print the experiment results as they complete
+    for job in experiment_runner.as_completed(jobs):
+        print(f"Experiment {job.job_id} ({job.status}): {job.result()}")
+    experiment_runner.shutdown()
@@ -0,0 +1,312 @@
+import sys
+import time
+import heapq
+import asyncio
+import logging
+import itertools
+import threading
+import concurrent.futures
+from concurrent.futures import Future, ThreadPoolExecutor, CancelledError
+from typing import Optional, Dict, Any, List, Callable, Iterable, Iterator
+
+# Local imports
+try:
+    from src.utils.logging_config import setup_logging
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CAPACITY = 64
+JOB_STATES = ("pending", "running", "completed", "failed", "cancelled", "timed_out")
+
+
+class JobTimeoutError(TimeoutError):
+    """Raised by a job's result when the job ran longer than its timeout."""
+
+
+class Job:
+    """
+    Handle of a job submitted to a JobScheduler.
+
+    Attributes:
+        job_id: Sequential ID of the job within its scheduler.
+        name: Human-readable label used in logs.
+        priority: Higher priorities start first; equal priorities start in submission order.
+        resources: Units of the scheduler's capacity the job occupies while running.
+        timeout: Seconds the job may run before it is stopped, or None.
+        status: One of JOB_STATES.
+        future: A concurrent.futures.Future resolved with the job's result.
+        cancel_event: Set when the job is cancelled or times out; long-running jobs should poll it.
+    """
+
+    def __init__(self, scheduler: "JobScheduler", job_id: int, function: Callable[..., Any], args: tuple,
+                 name: str, priority: int, resources: int, timeout: Optional[float]):
+        self.scheduler = scheduler
+        self.job_id = job_id
+        self.function = function
+        self.args = args
+        self.name = name
+        self.priority = priority
+        self.resources = resources
+        self.timeout = timeout
+        self.status = "pending"
+        self.future: Future = Future()
+        self.cancel_event = threading.Event()
+        self.submitted_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        """
+        Waits for the job and returns its result.
+
+        Args:
+            timeout: Seconds to wait, or None to wait until the job finishes.
+
+        Raises:
+            CancelledError: If the job was cancelled.
+            JobTimeoutError: If the job exceeded its own timeout.
+            TimeoutError: If the job did not finish within `timeout`.
+        """
+        return self.future.result(timeout)
+
+    async def aresult(self) -> Any:
+        """Asynchronous counterpart of `result`; awaiting does not block the event loop."""
+        return await asyncio.wrap_future(self.future)
+
+    def done(self) -> bool:
+        """Whether the job has completed, failed, been cancelled or timed out."""
+        return self.future.done()
+
+    def cancel(self) -> bool:
+        """
+        Cancels the job: a pending job never starts, a running job is signalled through `cancel_event`.
+
+        Returns:
+            True if the job was cancelled, False if it had already finished.
+        """
+        return self.scheduler._stop(self, "cancelled")
+
+    def __repr__(self) -> str:
+        return f"<Job {self.job_id} {self.name!r} priority={self.priority} {self.status}>"
+
+
+class JobScheduler:
+    """
+    Runs jobs on background threads, as many at a time as its capacity allows.
+
+    Each job occupies `resources` units of capacity while it runs. When capacity
+    frees up, the highest-priority pending job starts; a large job at the head of
+    the queue is not overtaken by smaller ones, so it cannot starve. Cancelled and
+    timed-out jobs resolve their future immediately; their capacity is released
+    once the job function actually returns.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, name: str = "jobs"):
+        """
+        Initializes the JobScheduler.
+
+        Args:
+            capacity: Total resource units available to running jobs.
+            name: Prefix of the worker thread names.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.name = name
+        self._lock = threading.Lock()
+        self._queue: List[tuple] = []
+        self._ids = itertools.count(1)
+        self._in_use = 0
+        self._jobs: Dict[int, Job] = {}
+        self._timers: Dict[int, threading.Timer] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._closed = False
+        logger.info("JobScheduler initialized with capacity %s.", capacity)
+
+    def submit(self, function: Callable[..., Any], *args: Any, name: Optional[str] = None, priority: int = 0,
+               resources: int = 1, timeout: Optional[float] = None) -> Job:
+        """
+        Queues a job and returns its handle without waiting for it.
+
+        Args:
+            function: Called as `function(*args, cancel_event=event)` on a worker thread.
+            *args: Positional arguments of `function`.
+            name: Label used in logs (default: the function name).
+            priority: Higher priorities start first.
+            resources: Capacity units the job occupies while running.
+            timeout: Seconds the job may run once started (None: no limit).
+
+        Returns:
+            The job's handle.
+
+        Raises:
+            ValueError: If the job needs more resources than the scheduler has.
+            RuntimeError: If the scheduler has been shut down.
+        """
+        if not 1 <= resources <= self.capacity:
+            raise ValueError(f"resources must be between 1 and the capacity ({self.capacity}), got {resources}")
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("cannot submit jobs after shutdown")
+            job_id = next(self._ids)
+            job = Job(self, job_id, function, args, name or getattr(function, "__name__", "job"),
+                      priority, resources, timeout)
+            heapq.heappush(self._queue, (-priority, job_id, job))
+            self._jobs[job_id] = job
+        logger.debug("Queued %r.", job)
+        self._dispatch()
+        return job
+
+    def completed(self, result: Any, name: str = "job") -> Job:
+        """
+        Returns the handle of a job that is already done, e.g. because its result was stored earlier.
+
+        Args:
+            result: The job's result.
+            name: Label used in logs.
+
+        Returns:
+            A completed Job that never occupies capacity.
+        """
+        with self._lock:
+            job = Job(self, next(self._ids), lambda cancel_event=None: result, (), name, 0, 0, None)
+        job.status = "completed"
+        job.started_at = job.finished_at = job.submitted_at
+        job.future.set_running_or_notify_cancel()
+        job.future.set_result(result)
+        return job
+
+    def as_completed(self, jobs: Iterable[Job], timeout: Optional[float] = None) -> Iterator[Job]:
+        """
+        Yields jobs as they finish (completed, failed, cancelled or timed out).
+
+        Args:
+            jobs: Job handles of this scheduler.
+            timeout: Seconds to wait for all jobs, or None.
+
+        Raises:
+            TimeoutError: If not all jobs finish within `timeout`.
+        """
+        by_future = {job.future: job for job in jobs}
+        for future in concurrent.futures.as_completed(by_future, timeout):
+            yield by_future[future]
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the number of pending jobs and the capacity in use."""
+        with self._lock:
+            pending = sum(1 for _, _, job in self._queue if job.status == "pending")
+            return {"pending": pending, "resources_in_use": self._in_use, "capacity": self.capacity}
+
+    def shutdown(self, cancel: bool = False) -> None:
+        """
+        Stops accepting jobs and waits until every job has finished and the worker threads have exited.
+
+        Args:
+            cancel: Cancel pending and running jobs instead of letting them run to completion.
+        """
+        with self._lock:
+            self._closed = True
+            jobs = list(self._jobs.values())
+        if cancel:
+            for job in jobs:
+                job.cancel()
+        concurrent.futures.wait([job.future for job in jobs])
+        with self._lock:
+            executor = self._executor
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _dispatch(self) -> None:
+        """Starts pending jobs, highest priority first, while they fit in the free capacity."""
+        with self._lock:
+            while self._queue:
+                job = self._queue[0][2]
+                if job.status != "pending":
+                    heapq.heappop(self._queue)
+                    self._jobs.pop(job.job_id, None)
+                    continue
+                if self._in_use + job.resources > self.capacity:
+                    break
+                heapq.heappop(self._queue)
+                job.status = "running"
+                job.started_at = time.monotonic()
+                job.future.set_running_or_notify_cancel()
+                self._in_use += job.resources
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.capacity, thread_name_prefix=self.name)
+                if job.timeout is not None:
+                    timer = threading.Timer(job.timeout, self._stop, (job, "timed_out"))
+                    timer.daemon = True
+                    self._timers[job.job_id] = timer
+                    timer.start()
+                self._executor.submit(self._run, job)
+
+    def _run(self, job: Job) -> None:
+        """Runs a job on a worker thread and resolves its future, unless it was stopped meanwhile."""
+        logger.debug("Starting %r.", job)
+        try:
+            result = job.function(*job.args, cancel_event=job.cancel_event)
+            error = None
+        except BaseException as e:
+            result, error = None, e
+        with self._lock:
+            job.finished_at = job.finished_at or time.monotonic()
+            self._in_use -= job.resources
+            self._jobs.pop(job.job_id, None)
+            timer = self._timers.pop(job.job_id, None)
+            if job.status == "running":
+                job.status = "completed" if error is None else "failed"
+                if error is None:
+                    job.future.set_result(result)
+                else:
+                    job.future.set_exception(error)
+        if timer is not None:
+            timer.cancel()
+        if error is not None and job.status == "failed":
+            logger.error("%r failed: %s", job, error)
+        else:
+            logger.debug("Finished %r in %.3f s.", job, job.finished_at - job.started_at)
+        self._dispatch()
+
+    def _stop(self, job: Job, status: str) -> bool:
+        """Cancels or times out a job that has not finished yet."""
+        with self._lock:
+            if job.status not in ("pending", "running"):
+                return False
+            was_running = job.status == "running"
+            job.status = status
+            job.finished_at = time.monotonic()
+            job.cancel_event.set()
+            if status == "timed_out":
+                job.future.set_exception(JobTimeoutError(f"{job.name} exceeded its timeout of {job.timeout} s"))
+            elif was_running:
+                job.future.set_exception(CancelledError())
+            else:
+                # Wakes up waiters such as as_completed, which only see cancellations once notified.
+                job.future.cancel()
+                job.future.set_running_or_notify_cancel()
+        logger.info("%s %r.", "Timed out" if status == "timed_out" else "Cancelled", job)
+        return True
+
+
+if __name__ == "__main__":
+    setup_logging()
+
+    # Example Usage:
+    # 1. Run this script: `python -m src.experimentation.job_scheduler`
+
+    def measure(value: int, cancel_event: threading.Event) -> int:
+        cancel_event.wait(0.5)
+        return value * value
+
+    scheduler = JobScheduler(capacity=4)
+    jobs = [scheduler.submit(measure, i, priority=i % 3, timeout=2.0) for i in range(10)]
+    jobs[-1].cancel()
+    for finished in scheduler.as_completed(jobs):
+        outcome = finished.result() if finished.status == "completed" else finished.status
+        print(f"{finished.name} #{finished.job_id} (priority {finished.priority}): {outcome}")
+    scheduler.shutdown()
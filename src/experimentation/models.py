@@ -0,0 +1,317 @@
+import sys
+import logging
+from typing import Dict, Any, Tuple
+
+import numpy as np
+
+# Local imports
+try:
+    from src.utils.logging_config import setup_logging
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+
+GAS_CONSTANT = 8.314  # J / (mol K)
+DEFAULT_ODE_STEPS = 100
+
+
+class SimulationModel:
+    """
+    A parameterized model evaluated on whole batches of parameter sets at once.
+
+    A model first draws its random inputs (`draw_noise`), which depend only on the
+    random generator and the number of replicates, and then maps a batch of parameter
+    sets plus that noise to observables (`evaluate`). Because the noise never depends
+    on the parameters, every parameter set of a batch sees the same replicates
+    (common random numbers): differences between parameter sets are not drowned in
+    sampling noise, and the result for one parameter set does not depend on which
+    other sets were evaluated with it.
+
+    Attributes:
+        name: Registry name of the model.
+        version: Bump whenever the model's equations change, so stored results are invalidated.
+        defaults: Default value of every parameter.
+        binary_parameters: Parameters that are switched off (0) or on (1) rather than scaled.
+        observables: Names of the quantities `evaluate` returns.
+        parameter_keywords: Phrases that identify each parameter in a hypothesis.
+        observable_keywords: Phrases that identify each observable in a hypothesis.
+    """
+
+    name = "model"
+    version = "1"
+    defaults: Dict[str, float] = {}
+    binary_parameters: Tuple[str, ...] = ()
+    observables: Tuple[str, ...] = ()
+    parameter_keywords: Dict[str, Tuple[str, ...]] = {}
+    observable_keywords: Dict[str, Tuple[str, ...]] = {}
+
+    def draw_noise(self, rng: np.random.Generator, replicates: int) -> Dict[str, np.ndarray]:
+        """
+        Draws the random inputs of `replicates` independent replicates.
+
+        Args:
+            rng: The random generator.
+            replicates: Number of replicates.
+
+        Returns:
+            Named arrays whose first axis has length `replicates`.
+        """
+        return {}
+
+    def evaluate(self, params: Dict[str, np.ndarray], noise: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Evaluates a batch of parameter sets.
+
+        Args:
+            params: One (batch, 1) float array per parameter, broadcasting against the replicates.
+            noise: The output of `draw_noise`.
+
+        Returns:
+            One (batch, replicates) array per observable.
+        """
+        raise NotImplementedError
+
+    def describe(self) -> Dict[str, Any]:
+        """Returns the model's name, version, parameter defaults and observables."""
+        return {"name": self.name, "version": self.version, "defaults": dict(self.defaults),
+                "observables": list(self.observables)}
+
+
+class MonteCarloModel(SimulationModel):
+    """Model whose replicates are independent random draws (measurement noise, random inputs)."""
+
+
+class ODEModel(SimulationModel):
+    """
+    Model defined by an ODE system, integrated with fixed-step RK4 for all parameter sets and replicates at once.
+
+    Replicates differ by their parameter uncertainty: each parameter listed in
+    `uncertain_parameters` is multiplied by a lognormal factor with the relative
+    spread given in the `uncertainty` parameter.
+
+    Attributes:
+        state_names: Names of the state variables.
+        uncertain_parameters: Parameters perturbed per replicate.
+        steps: Number of RK4 steps over the `duration` parameter.
+    """
+
+    state_names: Tuple[str, ...] = ()
+    uncertain_parameters: Tuple[str, ...] = ()
+    steps = DEFAULT_ODE_STEPS
+
+    def draw_noise(self, rng: np.random.Generator, replicates: int) -> Dict[str, np.ndarray]:
+        return {name: rng.standard_normal(replicates) for name in self.uncertain_parameters}
+
+    def initial_state(self, params: Dict[str, np.ndarray]) -> Tuple[np.ndarray, ...]:
+        """Returns the initial value of each state variable, broadcastable to (batch, replicates)."""
+        raise NotImplementedError
+
+    def derivatives(self, t: np.ndarray, y: Tuple[np.ndarray, ...],
+                    params: Dict[str, np.ndarray]) -> Tuple[np.ndarray, ...]:
+        """Returns the time derivative of each state variable."""
+        raise NotImplementedError
+
+    def observe(self, final: Dict[str, np.ndarray], mean: Dict[str, np.ndarray], peak: Dict[str, np.ndarray],
+                params: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Maps summaries of the trajectory to the observables.
+
+        The trajectory itself is not kept (it would need `steps` times the memory of the state).
+
+        Args:
+            final: Each state variable at the end of the integration.
+            mean: The time average of each state variable over the integration steps.
+            peak: The maximum of each state variable over the integration steps.
+            params: The parameters, broadcastable to (batch, replicates).
+
+        Returns:
+            One (batch, replicates) array per observable.
+        """
+        raise NotImplementedError
+
+    def evaluate(self, params: Dict[str, np.ndarray], noise: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        params = dict(params)
+        spread = params.get("uncertainty", 0.0)
+        for name in self.uncertain_parameters:
+            params[name] = params[name] * np.exp(spread * noise[name][np.newaxis, :])
+        shape = np.broadcast_shapes(*(np.shape(value) for value in params.values()))
+
+        # One contiguous (batch, replicates) array per state variable keeps every RK4 update elementwise.
+        y = tuple(np.broadcast_to(value, shape).copy() for value in self.initial_state(params))
+        dt = params["duration"] / self.steps
+        t = np.zeros_like(dt)
+        total = [value.copy() for value in y]
+        peak = [value.copy() for value in y]
+        for _ in range(self.steps):
+            k1 = self.derivatives(t, y, params)
+            k2 = self.derivatives(t + dt / 2, tuple(a + dt / 2 * b for a, b in zip(y, k1)), params)
+            k3 = self.derivatives(t + dt / 2, tuple(a + dt / 2 * b for a, b in zip(y, k2)), params)
+            k4 = self.derivatives(t + dt, tuple(a + dt * b for a, b in zip(y, k3)), params)
+            y = tuple(a + dt / 6 * (b1 + 2 * b2 + 2 * b3 + b4) for a, b1, b2, b3, b4 in zip(y, k1, k2, k3, k4))
+            t = t + dt
+            for i, value in enumerate(y):
+                total[i] += value
+                np.maximum(peak[i], value, out=peak[i])
+        return self.observe(dict(zip(self.state_names, y)),
+                            {name: value / (self.steps + 1) for name, value in zip(self.state_names, total)},
+                            dict(zip(self.state_names, peak)), params)
+
+
+class LogisticGrowthModel(ODEModel):
+    """Population growing logistically towards its carrying capacity: dN/dt = r N (1 - N / K)."""
+
+    name = "logistic_growth"
+    defaults = {"growth_rate": 0.5, "capacity": 100.0, "initial_population": 5.0, "duration": 10.0,
+                "uncertainty": 0.1}
+    state_names = ("population",)
+    uncertain_parameters = ("growth_rate", "capacity")
+    observables = ("final_population", "mean_population")
+    parameter_keywords = {
+        "growth_rate": ("growth rate", "reproduction", "birth rate", "fertility"),
+        "capacity": ("carrying capacity", "capacity", "resource", "habitat"),
+        "initial_population": ("initial population", "starting population", "founder"),
+        "duration": ("time", "duration"),
+    }
+    observable_keywords = {
+        "final_population": ("population", "abundance", "biomass"),
+        "mean_population": ("average population", "mean population"),
+    }
+
+    def initial_state(self, params):
+        return (params["initial_population"],)
+
+    def derivatives(self, t, y, params):
+        population, = y
+        return (params["growth_rate"] * population * (1.0 - population / params["capacity"]),)
+
+    def observe(self, final, mean, peak, params):
+        return {"final_population": final["population"], "mean_population": mean["population"]}
+
+
+class SIRModel(ODEModel):
+    """SIR epidemic in population fractions: dS = -b S I, dI = b S I - g I, dR = g I."""
+
+    name = "sir_epidemic"
+    defaults = {"transmission_rate": 0.3, "recovery_rate": 0.1, "initial_infected": 0.01, "vaccinated": 0.0,
+                "duration": 160.0, "uncertainty": 0.1}
+    state_names = ("susceptible", "infected", "recovered")
+    uncertain_parameters = ("transmission_rate", "recovery_rate")
+    observables = ("peak_infected", "attack_rate")
+    parameter_keywords = {
+        "transmission_rate": ("transmission", "contact", "spread", "infectious"),
+        "recovery_rate": ("recovery", "treatment"),
+        "vaccinated": ("vaccin", "immuni"),
+        "initial_infected": ("initial infect", "imported case"),
+    }
+    observable_keywords = {
+        "peak_infected": ("peak", "prevalence", "hospital"),
+        "attack_rate": ("attack rate", "final size", "total infection", "outbreak size", "infections", "cases"),
+    }
+
+    def initial_state(self, params):
+        infected, vaccinated = params["initial_infected"], params["vaccinated"]
+        return 1.0 - infected - vaccinated, infected, vaccinated
+
+    def derivatives(self, t, y, params):
+        susceptible, infected, _ = y
+        infections = params["transmission_rate"] * susceptible * infected
+        recoveries = params["recovery_rate"] * infected
+        return -infections, infections - recoveries, recoveries
+
+    def observe(self, final, mean, peak, params):
+        return {"peak_infected": peak["infected"],
+                "attack_rate": 1.0 - final["susceptible"] - params["vaccinated"]}
+
+
+class ReactionRateModel(MonteCarloModel):
+    """
+    Arrhenius reaction kinetics, k = A exp(-Ea / (R T)), measured with lognormal noise.
+
+    A catalyst lowers the activation energy by the fraction `catalyst_effect`; the
+    measured temperature and activation energy also fluctuate between replicates.
+    """
+
+    name = "reaction_rate"
+    defaults = {"temperature": 25.0, "catalyst_present": 0.0, "activation_energy": 50.0,
+                "catalyst_effect": 0.3, "pre_exponential": 1e7, "temperature_jitter": 0.5,
+                "measurement_noise": 0.05}
+    binary_parameters = ("catalyst_present",)
+    observables = ("reaction_rate", "effective_activation_energy")
+    parameter_keywords = {
+        "temperature": ("temperature", "heat", "warm", "cool"),
+        "catalyst_present": ("catalyst", "catalys"),
+        "activation_energy": ("activation energy", "energy barrier"),
+    }
+    observable_keywords = {
+        "reaction_rate": ("reaction rate", "rate", "yield", "conversion", "speed"),
+        "effective_activation_energy": ("activation energy", "energy barrier"),
+    }
+
+    def draw_noise(self, rng, replicates):
+        return {"temperature": rng.standard_normal(replicates), "measurement": rng.standard_normal(replicates)}
+
+    def evaluate(self, params, noise):
+        kelvin = params["temperature"] + 273.15 + params["temperature_jitter"] * noise["temperature"]
+        energy = params["activation_energy"] * (1.0 - params["catalyst_effect"] * params["catalyst_present"])
+        rate = params["pre_exponential"] * np.exp(-energy * 1000.0 / (GAS_CONSTANT * kelvin))
+        rate = rate * np.exp(params["measurement_noise"] * noise["measurement"])
+        return {"reaction_rate": rate, "effective_activation_energy": np.broadcast_to(energy, rate.shape)}
+
+
+MODEL_REGISTRY: Dict[str, SimulationModel] = {}
+
+
+def register_model(model: SimulationModel) -> SimulationModel:
+    """
+    Makes a model available to the SimulationEngine under its name.
+
+    Args:
+        model: The model instance.
+
+    Returns:
+        The model.
+    """
+    MODEL_REGISTRY[model.name] = model
+    return model
+
+
+def get_simulation_model(name: str) -> SimulationModel:
+    """
+    Looks up a registered model.
+
+    Args:
+        name: The model name.
+
+    Returns:
+        The model.
+
+    Raises:
+        KeyError: If no model of that name is registered.
+    """
+    try:
+        return MODEL_REGISTRY[name]
+    except KeyError:
+        raise KeyError(f"Unknown simulation model {name!r}; registered: {sorted(MODEL_REGISTRY)}") from None
+
+
+for _model in (LogisticGrowthModel(), SIRModel(), ReactionRateModel()):
+    register_model(_model)
+
+
+if __name__ == "__main__":
+    setup_logging()
+
+    # Example Usage:
+    # 1. Run this script: `python -m src.experimentation.models`
+
+    model = get_simulation_model("sir_epidemic")
+    rng = np.random.default_rng(0)
+    transmission = np.linspace(0.15, 0.45, 4)[:, np.newaxis]
+    params = {name: np.full((4, 1), value) for name, value in model.defaults.items()}
+    params["transmission_rate"] = transmission
+    observables = model.evaluate(params, model.draw_noise(rng, 100))
+    for value, peak in zip(transmission[:, 0], observables["peak_infected"].mean(axis=1)):
+        print(f"transmission {value:.2f}: mean peak prevalence {peak:.3f}")
@@ -0,0 +1,300 @@
+import sys
+import os
+import math
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, Optional, Sequence, Tuple, Callable, Union
+
+import numpy as np
+
+# Local imports
+try:
+    from src.utils.logging_config import setup_logging
+    from src.experimentation.models import SimulationModel, get_simulation_model
+    from src.experimentation.simulation_engine import SimulationEngine
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+
+DESIGNS = ("grid", "random", "latin_hypercube")
+DEFAULT_SAMPLES = 1000
+# Tasks per worker when the chunk size is not set: enough to balance load, few enough to amortize pickling.
+TASKS_PER_WORKER = 4
+
+Space = Dict[str, Union[Sequence[float], Tuple[float, float]]]
+ProgressCallback = Callable[[int, int], None]
+
+
+def grid_design(space: Space) -> Dict[str, np.ndarray]:
+    """
+    Builds the Cartesian product of the values listed for each parameter.
+
+    Args:
+        space: Maps each parameter to the values it takes.
+
+    Returns:
+        One column per parameter; the last parameter varies fastest.
+    """
+    names = list(space)
+    values = [np.asarray(space[name], dtype=np.float64).ravel() for name in names]
+    mesh = np.meshgrid(*values, indexing="ij")
+    return {name: axis.ravel() for name, axis in zip(names, mesh)}
+
+
+def _bounds(space: Space) -> Tuple[list, np.ndarray, np.ndarray]:
+    names = list(space)
+    bounds = np.array([space[name] for name in names], dtype=np.float64).reshape(len(names), -1)
+    if bounds.shape[1] != 2:
+        raise ValueError("random and latin_hypercube designs take (low, high) bounds for every parameter")
+    return names, bounds[:, 0], bounds[:, 1]
+
+
+def random_design(space: Space, samples: int, seed: int = 0) -> Dict[str, np.ndarray]:
+    """
+    Draws parameter sets uniformly at random within bounds.
+
+    Args:
+        space: Maps each parameter to its (low, high) bounds.
+        samples: Number of parameter sets.
+        seed: Random seed of the design.
+
+    Returns:
+        One column of `samples` values per parameter.
+    """
+    names, low, high = _bounds(space)
+    unit = np.random.default_rng(seed).random((samples, len(names)))
+    points = low + unit * (high - low)
+    return {name: points[:, i] for i, name in enumerate(names)}
+
+
+def latin_hypercube_design(space: Space, samples: int, seed: int = 0) -> Dict[str, np.ndarray]:
+    """
+    Draws a Latin hypercube sample within bounds.
+
+    Each parameter's range is split into `samples` equal strata and every stratum
+    is hit exactly once, which covers the space more evenly than random sampling.
+
+    Args:
+        space: Maps each parameter to its (low, high) bounds.
+        samples: Number of parameter sets.
+        seed: Random seed of the design.
+
+    Returns:
+        One column of `samples` values per parameter.
+    """
+    names, low, high = _bounds(space)
+    rng = np.random.default_rng(seed)
+    strata = rng.permuted(np.tile(np.arange(samples), (len(names), 1)), axis=1).T
+    unit = (strata + rng.random((samples, len(names)))) / samples
+    points = low + unit * (high - low)
+    return {name: points[:, i] for i, name in enumerate(names)}
+
+
+def make_design(design: str, space: Space, samples: Optional[int] = None, seed: int = 0) -> Dict[str, np.ndarray]:
+    """
+    Builds the parameter sets of a sweep.
+
+    Args:
+        design: One of DESIGNS.
+        space: Values per parameter for "grid", (low, high) bounds otherwise.
+        samples: Number of parameter sets of random designs (default: DEFAULT_SAMPLES).
+        seed: Random seed of random designs.
+
+    Returns:
+        One equally long column per parameter.
+
+    Raises:
+        ValueError: If the design is unknown.
+    """
+    if design == "grid":
+        return grid_design(space)
+    if design == "random":
+        return random_design(space, samples or DEFAULT_SAMPLES, seed)
+    if design == "latin_hypercube":
+        return latin_hypercube_design(space, samples or DEFAULT_SAMPLES, seed)
+    raise ValueError(f"Unknown design {design!r}; expected one of {DESIGNS}")
+
+
+def to_structured(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """Packs equally long columns into a NumPy structured array with one field per column."""
+    names = list(columns)
+    rows = len(columns[names[0]]) if names else 0
+    result = np.empty(rows, dtype=[(name, np.asarray(columns[name]).dtype) for name in names])
+    for name in names:
+        result[name] = columns[name]
+    return result
+
+
+def _run_chunk(engine: SimulationEngine, target: Union[SimulationModel, Dict[str, Any]],
+               parameter_sets: Dict[str, np.ndarray], replicates: Optional[int],
+               seed: Optional[int]) -> Dict[str, np.ndarray]:
+    """Evaluates one chunk of a sweep in a worker process: model statistics, or hypothesis effects for a spec."""
+    if isinstance(target, dict):
+        return engine.effects(target, parameter_sets, replicates, seed)
+    return engine.simulate(target, parameter_sets, replicates, seed)
+
+
+class ParameterSweep:
+    """
+    Sweeps simulation models and hypotheses across parameter designs on all cores.
+
+    Parameter sets are split into chunks that run in a ProcessPoolExecutor, each
+    chunk being one vectorized SimulationEngine call. Every chunk is seeded with the
+    sweep's seed: the engine gives all parameter sets the same replicate draws, so a
+    row's result depends only on its parameters and the seed, never on the chunk
+    size, the number of workers or the order in which chunks finish.
+    """
+
+    def __init__(self, engine: Optional[SimulationEngine] = None, workers: Optional[int] = None,
+                 chunk_size: Optional[int] = None):
+        """
+        Initializes the ParameterSweep.
+
+        Args:
+            engine: The SimulationEngine to run (default: a SimulationEngine with default settings).
+            workers: Worker processes (default: one per CPU; 0 or 1 runs in this process).
+            chunk_size: Parameter sets per task (default: spread over TASKS_PER_WORKER tasks per worker).
+        """
+        self.engine = engine or SimulationEngine()
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.chunk_size = chunk_size
+        logger.info("ParameterSweep initialized with %s workers.", self.workers)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], engine: Optional[SimulationEngine] = None) -> "ParameterSweep":
+        """
+        Creates a ParameterSweep using the `experimentation.sweep` section of the configuration.
+
+        Args:
+            config: The loaded configuration dictionary.
+            engine: Optional SimulationEngine (default: one created from the same configuration).
+
+        Returns:
+            A configured ParameterSweep.
+        """
+        sweep_config = (config.get('experimentation') or {}).get('sweep') or {}
+        return cls(engine=engine or SimulationEngine.from_config(config),
+                   workers=sweep_config.get('workers'), chunk_size=sweep_config.get('chunk_size'))
+
+    def run(self, model: Union[str, SimulationModel], space: Space, design: str = "grid",
+            samples: Optional[int] = None, fixed: Optional[Dict[str, Any]] = None,
+            replicates: Optional[int] = None, seed: Optional[int] = None,
+            progress: Optional[ProgressCallback] = None) -> np.ndarray:
+        """
+        Simulates a model at every parameter set of a design.
+
+        Args:
+            model: A registered model name or a SimulationModel.
+            space: The swept parameters (see `make_design`).
+            design: One of DESIGNS.
+            samples: Number of parameter sets of random designs.
+            fixed: Parameters shared by every set (other parameters keep the model defaults).
+            replicates: Replicates per parameter set (default: the engine's setting).
+            seed: Random seed of the design and the simulation (default: the engine's seed).
+            progress: Called with (completed parameter sets, total) as chunks finish.
+
+        Returns:
+            A structured array with one row per parameter set: every model parameter,
+            then `<observable>_<statistic>` fields (see `SimulationEngine.simulate`).
+        """
+        model = get_simulation_model(model) if isinstance(model, str) else model
+        return self._sweep(model, space, design, samples, fixed, replicates, seed, progress)
+
+    def run_hypothesis(self, hypothesis: str, space: Space, design: str = "grid",
+                       samples: Optional[int] = None, parameters: Optional[Dict[str, Any]] = None,
+                       replicates: Optional[int] = None, seed: Optional[int] = None,
+                       progress: Optional[ProgressCallback] = None) -> np.ndarray:
+        """
+        Tests a hypothesis at every parameter set of a design, i.e. sweeps the `parameters`
+        dict of `SimulationEngine.run_simulation`.
+
+        Args:
+            hypothesis: The hypothesis text.
+            space: The swept parameters (see `make_design`).
+            design: One of DESIGNS.
+            samples: Number of parameter sets of random designs.
+            parameters: Parameters shared by every set, including HYPOTHESIS_KEYS overrides.
+            replicates: Replicates per arm (default: the engine's setting).
+            seed: Random seed of the design and the simulation (default: the engine's seed).
+            progress: Called with (completed parameter sets, total) as chunks finish.
+
+        Returns:
+            A structured array with one row per parameter set: every model parameter, then
+            the fields of `SimulationEngine.effects` (including the verdict).
+
+        Raises:
+            ValueError: If the hypothesis does not name a parameter of any simulation model.
+        """
+        resolved = self.engine.resolve_hypothesis(hypothesis, parameters)
+        if resolved is None:
+            raise ValueError(f"Hypothesis names no simulation model parameter: {hypothesis!r}")
+        spec, base = resolved
+        return self._sweep(spec, space, design, samples, base, replicates, seed, progress)
+
+    def _sweep(self, target: Union[SimulationModel, Dict[str, Any]], space: Space, design: str,
+               samples: Optional[int], fixed: Optional[Dict[str, Any]], replicates: Optional[int],
+               seed: Optional[int], progress: Optional[ProgressCallback]) -> np.ndarray:
+        seed = self.engine.seed if seed is None else seed
+        columns = make_design(design, space, samples, seed)
+        rows = len(next(iter(columns.values()))) if columns else 1
+        parameter_sets = {**(fixed or {}), **columns}
+        chunk_size = self.chunk_size or max(1, math.ceil(rows / (max(1, self.workers) * TASKS_PER_WORKER)))
+        chunks = [(start, min(rows, start + chunk_size)) for start in range(0, rows, chunk_size)]
+        logger.info("Sweeping %s parameter sets (%s design) in %s chunks on %s workers.",
+                    rows, design, len(chunks), self.workers)
+
+        def chunk_of(start: int, stop: int) -> Dict[str, Any]:
+            return {name: value[start:stop] if name in columns else value for name, value in parameter_sets.items()}
+
+        results: Dict[int, Dict[str, np.ndarray]] = {}
+        done = 0
+        if self.workers <= 1 or len(chunks) == 1:
+            for start, stop in chunks:
+                results[start] = _run_chunk(self.engine, target, chunk_of(start, stop), replicates, seed)
+                done += stop - start
+                self._report(progress, done, rows)
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(chunks))) as executor:
+                futures = {executor.submit(_run_chunk, self.engine, target, chunk_of(start, stop), replicates, seed):
+                           (start, stop) for start, stop in chunks}
+                for future in as_completed(futures):
+                    start, stop = futures[future]
+                    results[start] = future.result()
+                    done += stop - start
+                    self._report(progress, done, rows)
+
+        ordered = [results[start] for start, _ in chunks]
+        return to_structured({name: np.concatenate([chunk[name] for chunk in ordered]) for name in ordered[0]})
+
+    @staticmethod
+    def _report(progress: Optional[ProgressCallback], done: int, total: int) -> None:
+        logger.debug("Sweep progress: %s/%s parameter sets.", done, total)
+        if progress is not None:
+            progress(done, total)
+
+
+if __name__ == "__main__":
+    setup_logging()
+
+    # Example Usage:
+    # 1. Run this script: `python -m src.experimentation.parameter_sweep`
+
+    sweep = ParameterSweep(SimulationEngine(replicates=100))
+
+    # Latin hypercube over two SIR parameters, spread over all cores
+    results = sweep.run("sir_epidemic", {"transmission_rate": (0.1, 0.6), "vaccinated": (0.0, 0.5)},
+                        design="latin_hypercube", samples=5000,
+                        progress=lambda done, total: print(f"\r{done}/{total} parameter sets", end=""))
+    print()
+    worst = results[np.argmax(results["peak_infected_mean"])]
+    print(f"Worst peak prevalence {worst['peak_infected_mean']:.3f} at transmission rate "
+          f"{worst['transmission_rate']:.3f} and vaccination {worst['vaccinated']:.3f}")
+
+    # Where does "Increasing the temperature will increase the reaction rate." hold?
+    effects = sweep.run_hypothesis("Increasing the temperature will increase the reaction rate.",
+                                   {"temperature": [0, 25, 50, 100], "catalyst_present": [0, 1]})
+    for row in effects:
+        print(f"temperature {row['temperature']:5.1f}, catalyst {int(row['catalyst_present'])}: {row['verdict']}")
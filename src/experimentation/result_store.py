@@ -0,0 +1,290 @@
+import sys
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+from typing import Optional, Dict, Any, List, Sequence, Tuple
+
+import numpy as np
+
+# Local imports
+try:
+    from src.utils.logging_config import setup_logging
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_RESULT_STORE_PATH = "cache/simulations.sqlite"
+# Keys per SELECT ... IN (...) query; stays below SQLite's limit on bound variables.
+LOOKUP_BATCH_SIZE = 500
+
+_shared_stores: Dict[str, "ResultStore"] = {}
+_shared_stores_lock = threading.Lock()
+
+
+def result_key(fields: Dict[str, Any]) -> str:
+    """
+    Computes the content address of a simulation or experiment.
+
+    Args:
+        fields: JSON-serializable description of everything the result depends on
+            (model and version, parameters, seed, replicates, ...).
+
+    Returns:
+        A hex SHA-256 digest of the canonical JSON encoding.
+    """
+    payload = json.dumps(fields, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def row_keys(fields: Dict[str, Any], table: Dict[str, np.ndarray]) -> List[str]:
+    """
+    Computes one result key per row of a parameter table.
+
+    Args:
+        fields: Settings shared by every row (model, version, seed, ...).
+        table: Equally long parameter columns.
+
+    Returns:
+        The key of each row: `result_key` of the shared fields plus the row's parameters.
+    """
+    names = sorted(table)
+    rows = zip(*(table[name].tolist() for name in names))
+    return [result_key({**fields, "parameters": dict(zip(names, row))}) for row in rows]
+
+
+class ResultStore:
+    """
+    SQLite store of simulation and experiment results, keyed by a hash of their inputs.
+
+    Numeric results are stored as float64 BLOBs (one per parameter set), other
+    results as JSON. Every entry records the model and model version it was
+    computed with; the version is part of the key, so a result is never served
+    for a changed model, and the first lookup for a model version deletes the
+    entries of other versions.
+    """
+
+    def __init__(self, path: str = DEFAULT_RESULT_STORE_PATH):
+        """
+        Initializes the ResultStore.
+
+        Args:
+            path: Path to the SQLite file (":memory:" for a throwaway store).
+        """
+        self.path = path
+        self._open()
+        logger.info("ResultStore opened at %s.", path)
+
+    def _open(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._checked_versions: set = set()
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, model TEXT NOT NULL, version TEXT NOT NULL, "
+            "payload BLOB NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_model ON results (model, version)")
+        self._conn.commit()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Worker processes (e.g. of a ParameterSweep) open their own connection to the same file.
+        return {"path": self.path}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.path = state["path"]
+        self._open()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "ResultStore":
+        """
+        Creates a ResultStore using the `experimentation.result_store` section of the configuration.
+
+        Args:
+            config: The loaded configuration dictionary.
+
+        Returns:
+            A ResultStore at `experimentation.result_store.path`.
+        """
+        store_config = (config.get('experimentation') or {}).get('result_store') or {}
+        return cls(store_config.get('path', DEFAULT_RESULT_STORE_PATH))
+
+    def invalidate(self, model: str, version: str) -> int:
+        """
+        Deletes the stored results of every other version of a model.
+
+        Args:
+            model: The model name.
+            version: The model's current version.
+
+        Returns:
+            The number of deleted results.
+        """
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM results WHERE model = ? AND version != ?",
+                                         (model, version)).rowcount
+            self._conn.commit()
+            self._checked_versions.add((model, version))
+        if deleted:
+            logger.info("Invalidated %s stored results of %s (now at version %s).", deleted, model, version)
+        return deleted
+
+    def _check_version(self, model: str, version: str) -> None:
+        if (model, version) not in self._checked_versions:
+            self.invalidate(model, version)
+
+    def load_rows(self, model: str, version: str, keys: Sequence[str], width: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Looks up numeric results, one row of `width` values per key.
+
+        Args:
+            model: The model name.
+            version: The model version.
+            keys: Row keys (see `row_keys`).
+            width: Number of values per row.
+
+        Returns:
+            A (len(keys), width) array (NaN where missing) and a boolean mask of the rows found.
+        """
+        self._check_version(model, version)
+        values = np.full((len(keys), width), np.nan)
+        found = np.zeros(len(keys), dtype=bool)
+        positions = {key: i for i, key in enumerate(keys)}
+        with self._lock:
+            for start in range(0, len(keys), LOOKUP_BATCH_SIZE):
+                batch = keys[start:start + LOOKUP_BATCH_SIZE]
+                query = f"SELECT key, payload FROM results WHERE key IN ({','.join('?' * len(batch))})"
+                for key, payload in self._conn.execute(query, list(batch)):
+                    row = np.frombuffer(payload, dtype=np.float64)
+                    if len(row) == width:
+                        values[positions[key]] = row
+                        found[positions[key]] = True
+            self.hits += int(found.sum())
+            self.misses += len(keys) - int(found.sum())
+        return values, found
+
+    def save_rows(self, model: str, version: str, keys: Sequence[str], values: np.ndarray) -> None:
+        """
+        Stores numeric results.
+
+        Args:
+            model: The model name.
+            version: The model version.
+            keys: Row keys (see `row_keys`).
+            values: A (len(keys), width) array.
+        """
+        now = time.time()
+        values = np.ascontiguousarray(values, dtype=np.float64)
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO results (key, model, version, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+                ((key, model, version, row.tobytes(), now) for key, row in zip(keys, values))
+            )
+            self._conn.commit()
+
+    def load(self, model: str, version: str, key: str) -> Optional[Any]:
+        """
+        Looks up a JSON result.
+
+        Args:
+            model: The model (or procedure) name.
+            version: Its version.
+            key: The result key (see `result_key`).
+
+        Returns:
+            The stored result, or None on a miss.
+        """
+        self._check_version(model, version)
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def save(self, model: str, version: str, key: str, result: Any) -> None:
+        """
+        Stores a JSON-serializable result.
+
+        Args:
+            model: The model (or procedure) name.
+            version: Its version.
+            key: The result key (see `result_key`).
+            result: The result.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, model, version, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+                (key, model, version, json.dumps(result, default=str), time.time())
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the hit and miss counters and the number of stored results."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def clear(self) -> None:
+        """Removes every stored result."""
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def get_result_store(config: Dict[str, Any]) -> Optional[ResultStore]:
+    """
+    Returns the process-wide result store described by the `experimentation.result_store` config section.
+
+    Args:
+        config: The loaded configuration dictionary.
+
+    Returns:
+        The ResultStore shared by every engine and runner using the same path, or None if it is disabled.
+    """
+    store_config = (config.get('experimentation') or {}).get('result_store') or {}
+    if not store_config.get('enabled', False):
+        return None
+    path = store_config.get('path', DEFAULT_RESULT_STORE_PATH)
+    with _shared_stores_lock:
+        store = _shared_stores.get(path)
+        if store is None:
+            store = ResultStore(path)
+            _shared_stores[path] = store
+        return store
+
+
+if __name__ == "__main__":
+    setup_logging()
+
+    # Example Usage:
+    # 1. Set `experimentation.result_store.enabled: true` in `configs/config.yaml`; the SimulationEngine
+    #    and ExperimentRunner created from the configuration then reuse stored results.
+    # 2. Run this script: `python -m src.experimentation.result_store`
+
+    store = ResultStore(":memory:")
+    table = {"temperature": np.array([20.0, 25.0]), "catalyst_present": np.array([0.0, 1.0])}
+    keys = row_keys({"model": "reaction_rate", "version": "1", "seed": 0}, table)
+    store.save_rows("reaction_rate", "1", keys, np.array([[1.0, 0.1], [2.0, 0.2]]))
+    values, found = store.load_rows("reaction_rate", "1", keys, width=2)
+    print(f"Found {found.sum()} of {len(keys)} rows: {values.tolist()}")
+    store.invalidate("reaction_rate", "2")
+    print(store.stats())
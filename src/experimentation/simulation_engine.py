@@ -1,78 +1,473 @@
 import sys
-import os
+import re
+import zlib
 import logging
-from typing import List, Dict, Any
-import random  # For demonstration purposes
+from statistics import NormalDist
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Union, Callable
 
-# Dynamically adjust sys.path to allow imports from the project root
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-if PROJECT_ROOT not in sys.path:
-    sys.path.insert(0, PROJECT_ROOT)
+import numpy as np
 
 # Local imports
 try:
-    from src.utils.logging_config import setup_logging
+    from src.utils.logging_config import setup_logging, Truncated
+    from src.experimentation.models import SimulationModel, MODEL_REGISTRY, get_simulation_model
+    from src.experimentation.result_store import ResultStore, get_result_store, row_keys
 except ImportError as e:
     print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
     sys.exit(1)
 
-# Configure logging
-setup_logging()
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_REPLICATES = 200
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_PERTURBATION = 0.2
+DEFAULT_SEED = 0
+# Parameter sets times replicates evaluated per vectorized call; keeps the temporary arrays cache-sized.
+DEFAULT_MAX_BATCH_ELEMENTS = 1 << 16
+STATISTICS = ("mean", "std", "sem", "ci_low", "ci_high")
+# Keys of the `parameters` dict that select what a hypothesis is tested against instead of setting a model parameter.
+HYPOTHESIS_KEYS = ("model", "parameter", "observable", "direction")
+VERDICTS = ("supported", "refuted", "inconclusive", "untestable")
+EFFECT_COLUMNS = ("low", "high", "baseline_mean", "effect_mean", "effect_sem", "effect_ci_low", "effect_ci_high")
+
+_WORD_PATTERN = re.compile(r"[a-z]+")
+_INCREASE_PREFIXES = ("increas", "higher", "rais", "more", "faster", "boost", "enhanc", "accelerat", "add",
+                      "grow", "improv", "larger", "greater", "amplif", "promot", "strength")
+_DECREASE_PREFIXES = ("decreas", "lower", "reduc", "less", "slow", "fewer", "remov", "inhibit", "suppress",
+                      "smaller", "declin", "shrink", "weaken", "limit", "prevent", "cut")
+
+ParameterSets = Union[Sequence[Dict[str, Any]], Dict[str, Any]]
+
+
+def z_value(confidence: float) -> float:
+    """Returns the two-sided standard normal quantile for a confidence level (1.96 for 0.95)."""
+    if not 0.0 < confidence < 1.0:
+        raise ValueError("confidence must be in (0, 1)")
+    return NormalDist().inv_cdf(0.5 + confidence / 2.0)
+
+
+def summarize(samples: np.ndarray, confidence: float = DEFAULT_CONFIDENCE) -> Dict[str, np.ndarray]:
+    """
+    Summarizes replicates along the last axis.
+
+    Confidence intervals use the normal approximation, which is accurate for the
+    replicate counts (tens to thousands) the engine runs with.
+
+    Args:
+        samples: A (..., replicates) array.
+        confidence: Confidence level of the interval around the mean.
+
+    Returns:
+        Arrays of the mean, standard deviation, standard error and confidence interval bounds.
+    """
+    replicates = samples.shape[-1]
+    mean = samples.mean(axis=-1)
+    std = samples.std(axis=-1, ddof=1) if replicates > 1 else np.zeros_like(mean)
+    sem = std / np.sqrt(replicates)
+    half_width = z_value(confidence) * sem
+    return {"mean": mean, "std": std, "sem": sem, "ci_low": mean - half_width, "ci_high": mean + half_width}
+
+
+def parameter_table(model: SimulationModel, parameter_sets: ParameterSets) -> Dict[str, np.ndarray]:
+    """
+    Builds one float column per model parameter, filling in the model's defaults.
+
+    Args:
+        model: The simulation model.
+        parameter_sets: A list of parameter dicts, or a dict mapping parameter names to
+            columns (sequences or arrays) and/or scalars shared by every row.
+
+    Returns:
+        A dict of equally long 1-D float arrays, one per model parameter.
+
+    Raises:
+        ValueError: If a parameter is unknown to the model or the columns differ in length.
+    """
+    if isinstance(parameter_sets, dict):
+        columns = {name: np.atleast_1d(np.asarray(value, dtype=np.float64)) for name, value in parameter_sets.items()}
+        lengths = {len(column) for column in columns.values() if len(column) != 1}
+        if len(lengths) > 1:
+            raise ValueError(f"Parameter columns differ in length: {sorted(lengths)}")
+        rows = lengths.pop() if lengths else 1
+    else:
+        parameter_sets = list(parameter_sets)
+        names = {name for parameter_set in parameter_sets for name in parameter_set}
+        columns = {name: np.array([parameter_set.get(name, model.defaults.get(name, np.nan))
+                                   for parameter_set in parameter_sets], dtype=np.float64)
+                   for name in names}
+        rows = len(parameter_sets)
+    unknown = set(columns) - set(model.defaults)
+    if unknown:
+        raise ValueError(f"Unknown parameters for model {model.name}: {sorted(unknown)}")
+    return {name: np.broadcast_to(columns.get(name, np.float64(default)), (rows,)).astype(np.float64)
+            for name, default in model.defaults.items()}
+
+
+def _direction_sign(word: str) -> int:
+    if word.startswith(_INCREASE_PREFIXES):
+        return 1
+    if word.startswith(_DECREASE_PREFIXES):
+        return -1
+    return 0
+
+
 class SimulationEngine:
     """
-    Module for running simulations based on generated hypotheses.
+    Runs parameterized simulation models (see `src.experimentation.models`) on batches of parameter sets.
+
+    Every parameter set is evaluated with the same `replicates` random draws, seeded
+    from `seed` and the model name, so a result is a deterministic function of the
+    model, its parameters, the replicate count and the seed. Thousands of parameter
+    sets are evaluated per NumPy call; `max_batch_elements` bounds the memory used.
+    With a ResultStore, `simulate` and `effects` only compute the parameter sets
+    whose results are not stored yet.
 
-    Note: This is a simplified example. A real simulation engine would involve
-    more complex logic and potentially external libraries or APIs.
+    Hypotheses are mapped to a model, a parameter (the cause) and an observable
+    (the effect) by keyword, and tested by comparing the observable just below and
+    just above the parameter's value.
     """
 
-    def __init__(self):
+    def __init__(self, replicates: int = DEFAULT_REPLICATES, confidence: float = DEFAULT_CONFIDENCE,
+                 perturbation: float = DEFAULT_PERTURBATION, seed: int = DEFAULT_SEED,
+                 max_batch_elements: int = DEFAULT_MAX_BATCH_ELEMENTS, store: Optional[ResultStore] = None):
         """
         Initializes the SimulationEngine.
+
+        Args:
+            replicates: Default number of random replicates per parameter set.
+            confidence: Confidence level of intervals and hypothesis verdicts.
+            perturbation: Relative change of a parameter when testing its effect.
+            seed: Default random seed.
+            max_batch_elements: Maximum parameter sets times replicates per vectorized evaluation.
+            store: Optional ResultStore memoizing per-parameter-set results.
         """
+        if replicates < 2:
+            raise ValueError("replicates must be at least 2")
+        z_value(confidence)
+        self.replicates = replicates
+        self.confidence = confidence
+        self.perturbation = perturbation
+        self.seed = seed
+        self.max_batch_elements = max_batch_elements
+        self.store = store
         logger.info("SimulationEngine initialized.")
 
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "SimulationEngine":
+        """
+        Creates a SimulationEngine using the `experimentation.simulation` section of the configuration.
+
+        Args:
+            config: The loaded configuration dictionary.
+
+        Returns:
+            A configured SimulationEngine.
+        """
+        simulation_config = (config.get('experimentation') or {}).get('simulation') or {}
+        return cls(
+            replicates=simulation_config.get('replicates', DEFAULT_REPLICATES),
+            confidence=simulation_config.get('confidence', DEFAULT_CONFIDENCE),
+            perturbation=simulation_config.get('perturbation', DEFAULT_PERTURBATION),
+            seed=simulation_config.get('seed', DEFAULT_SEED),
+            max_batch_elements=simulation_config.get('max_batch_elements', DEFAULT_MAX_BATCH_ELEMENTS),
+            store=get_result_store(config)
+        )
+
+    @staticmethod
+    def _model(model: Union[str, SimulationModel]) -> SimulationModel:
+        return get_simulation_model(model) if isinstance(model, str) else model
+
+    def rng(self, model: SimulationModel, seed: Optional[int] = None) -> np.random.Generator:
+        """Returns the generator of a model's replicates for a seed (default: the engine's seed)."""
+        seed = self.seed if seed is None else seed
+        return np.random.default_rng(np.random.SeedSequence([seed, zlib.crc32(model.name.encode("utf-8"))]))
+
+    def sample(self, model: Union[str, SimulationModel], parameter_sets: ParameterSets,
+               replicates: Optional[int] = None, seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Evaluates every replicate of a batch of parameter sets.
+
+        Args:
+            model: A registered model name or a SimulationModel.
+            parameter_sets: Parameter sets (see `parameter_table`).
+            replicates: Replicates per parameter set (default: the engine's setting).
+            seed: Random seed (default: the engine's seed).
+
+        Returns:
+            One (parameter sets, replicates) array per observable.
+        """
+        model = self._model(model)
+        replicates = replicates or self.replicates
+        table = parameter_table(model, parameter_sets)
+        samples = {name: np.empty((len(table[next(iter(table))]), replicates)) for name in model.observables}
+        for start, stop, observed in self._evaluate(model, table, replicates, seed):
+            for name in model.observables:
+                samples[name][start:stop] = observed[name]
+        return samples
+
+    def simulate(self, model: Union[str, SimulationModel], parameter_sets: ParameterSets,
+                 replicates: Optional[int] = None, seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Evaluates a batch of parameter sets and summarizes each observable over the replicates.
+
+        Args:
+            model: A registered model name or a SimulationModel.
+            parameter_sets: Parameter sets (see `parameter_table`).
+            replicates: Replicates per parameter set (default: the engine's setting).
+            seed: Random seed (default: the engine's seed).
+
+        Returns:
+            Columns of equal length: every model parameter, then `<observable>_<statistic>`
+            for each observable and each of STATISTICS.
+        """
+        model = self._model(model)
+        replicates = replicates or self.replicates
+        seed = self.seed if seed is None else seed
+        table = parameter_table(model, parameter_sets)
+        names = [f"{name}_{statistic}" for name in model.observables for statistic in STATISTICS]
+
+        def compute(subtable: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+            rows = len(subtable[next(iter(subtable))])
+            columns = {name: np.empty(rows) for name in names}
+            for start, stop, observed in self._evaluate(model, subtable, replicates, seed):
+                for name in model.observables:
+                    for statistic, values in summarize(observed[name], self.confidence).items():
+                        columns[f"{name}_{statistic}"][start:stop] = values
+            logger.debug("Simulated %s parameter sets of %s with %s replicates.", rows, model.name, replicates)
+            return columns
+
+        settings = {"replicates": replicates, "seed": seed, "confidence": self.confidence}
+        return {**table, **self._memoized("simulate", model, table, settings, names, compute)}
+
+    def _memoized(self, kind: str, model: SimulationModel, table: Dict[str, np.ndarray], settings: Dict[str, Any],
+                  names: Sequence[str], compute: Callable[[Dict[str, np.ndarray]], Dict[str, np.ndarray]]
+                  ) -> Dict[str, np.ndarray]:
+        """
+        Returns the named result columns for every row of a parameter table, computing only the
+        rows missing from the result store.
+
+        Rows can be computed separately because a row's result depends only on its own
+        parameters and the settings (see the class docstring).
+        """
+        if self.store is None:
+            return compute(table)
+        keys = row_keys({"kind": kind, "model": model.name, "version": model.version, **settings}, table)
+        values, found = self.store.load_rows(model.name, model.version, keys, len(names))
+        missing = np.flatnonzero(~found)
+        if len(missing):
+            computed = compute({name: column[missing] for name, column in table.items()})
+            fresh = np.column_stack([computed[name] for name in names])
+            values[missing] = fresh
+            self.store.save_rows(model.name, model.version, [keys[i] for i in missing], fresh)
+        logger.debug("Reused %s of %s stored %s results of %s.", len(keys) - len(missing), len(keys), kind, model.name)
+        return {name: values[:, i] for i, name in enumerate(names)}
+
+    def _evaluate(self, model: SimulationModel, table: Dict[str, np.ndarray], replicates: int,
+                  seed: Optional[int]):
+        """Yields (start, stop, observables) for consecutive chunks of the parameter table."""
+        noise = model.draw_noise(self.rng(model, seed), replicates)
+        rows = len(table[next(iter(table))])
+        chunk = max(1, self.max_batch_elements // replicates)
+        for start in range(0, rows, chunk):
+            stop = min(rows, start + chunk)
+            params = {name: column[start:stop, np.newaxis] for name, column in table.items()}
+            observed = model.evaluate(params, noise)
+            yield start, stop, {name: np.broadcast_to(observed[name], (stop - start, replicates))
+                                for name in model.observables}
+
+    def match_hypothesis(self, hypothesis: str, model: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Maps a hypothesis to the model, parameter and observable it makes a claim about.
+
+        The parameter is the model parameter mentioned first, the observable the model
+        observable mentioned last (defaulting to the model's first observable), and the
+        predicted direction is the product of the signs of the first and last
+        direction words ("Increasing X will reduce Y" predicts a negative effect).
+
+        Args:
+            hypothesis: The hypothesis text.
+            model: Optional model name to restrict the match to.
+
+        Returns:
+            A dict with model, parameter, observable and direction (+1, -1 or None),
+            or None if no model parameter is mentioned.
+        """
+        text = hypothesis.lower()
+        candidates = [get_simulation_model(model)] if model else list(MODEL_REGISTRY.values())
+        best, best_score = None, 0
+        for candidate in candidates:
+            causes = [(text.find(keyword), -len(keyword), name, keyword)
+                      for name, keywords in candidate.parameter_keywords.items()
+                      for keyword in keywords if keyword in text]
+            if not causes:
+                continue
+            position, _, parameter, keyword = min(causes)
+            cause_span = range(position, position + len(keyword))
+            effects = [(text.rfind(keyword), len(keyword), name)
+                       for name, keywords in candidate.observable_keywords.items()
+                       for keyword in keywords if keyword in text and text.rfind(keyword) not in cause_span]
+            observable = max(effects)[2] if effects else candidate.observables[0]
+            score = 2 if effects else 1
+            if score > best_score:
+                best, best_score = {"model": candidate.name, "parameter": parameter, "observable": observable}, score
+
+        if best is None:
+            return None
+        signs = [sign for sign in map(_direction_sign, _WORD_PATTERN.findall(text)) if sign]
+        best["direction"] = (signs[0] * signs[-1] if len(signs) > 1 else signs[0]) if signs else None
+        return best
+
+    def resolve_hypothesis(self, hypothesis: str, parameters: Optional[Dict[str, Any]] = None
+                           ) -> Optional[Tuple[Dict[str, Any], Dict[str, float]]]:
+        """
+        Works out what a hypothesis is tested against and around which parameter values.
+
+        Args:
+            hypothesis: The hypothesis text.
+            parameters: Model parameters to test around; the keys in HYPOTHESIS_KEYS override
+                the keyword match (direction as +1/-1 or "increase"/"decrease").
+
+        Returns:
+            The test specification (model, parameter, observable, direction) and the model
+            parameters to test around, or None if no model parameter is mentioned.
+        """
+        parameters = dict(parameters or {})
+        overrides = {key: parameters.pop(key) for key in HYPOTHESIS_KEYS if key in parameters}
+        spec = self.match_hypothesis(hypothesis, overrides.get("model"))
+        if spec is None and not {"model", "parameter"} <= set(overrides):
+            return None
+        spec = {**(spec or {"observable": None, "direction": None}), **overrides}
+        if isinstance(spec["direction"], str):
+            spec["direction"] = _direction_sign(spec["direction"].lower()) or None
+        model = get_simulation_model(spec["model"])
+        spec["observable"] = spec["observable"] or model.observables[0]
+
+        base = {name: float(value) for name, value in parameters.items() if name in model.defaults}
+        ignored = sorted(set(parameters) - set(base))
+        if ignored:
+            logger.debug("Ignoring parameters unknown to model %s: %s", model.name, ignored)
+        return spec, base
+
+    def effects(self, spec: Dict[str, Any], parameter_sets: ParameterSets, replicates: Optional[int] = None,
+                seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Estimates the effect a hypothesis claims at each of a batch of parameter sets.
+
+        The named parameter is set just below and just above its value in each set
+        (to 0 and 1 if it is binary). Both arms use the same replicates, so the effect
+        is estimated from paired differences. The verdict is "supported" if the
+        confidence interval of the effect excludes zero on the predicted side,
+        "refuted" if it excludes zero on the other side, and "inconclusive" otherwise
+        (or when no direction is predicted).
+
+        Args:
+            spec: A test specification from `resolve_hypothesis` or `match_hypothesis`.
+            parameter_sets: Parameter sets to test around (see `parameter_table`).
+            replicates: Replicates per arm (default: the engine's setting).
+            seed: Random seed (default: the engine's seed).
+
+        Returns:
+            Columns of equal length: every model parameter, then low, high, baseline_mean,
+            effect_mean, effect_sem, effect_ci_low, effect_ci_high and verdict.
+        """
+        model = get_simulation_model(spec["model"])
+        parameter, observable = spec["parameter"], spec["observable"] or model.observables[0]
+        replicates = replicates or self.replicates
+        seed = self.seed if seed is None else seed
+        table = parameter_table(model, parameter_sets)
+
+        def compute(subtable: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+            value = subtable[parameter]
+            if parameter in model.binary_parameters:
+                low, high = np.zeros_like(value), np.ones_like(value)
+            else:
+                delta = np.where(value != 0.0, self.perturbation * np.abs(value), self.perturbation)
+                low, high = value - delta, value + delta
+            below = self.sample(model, {**subtable, parameter: low}, replicates, seed)[observable]
+            above = self.sample(model, {**subtable, parameter: high}, replicates, seed)[observable]
+            effect = summarize(above - below, self.confidence)
+            return {"low": low, "high": high, "baseline_mean": below.mean(axis=-1), "effect_mean": effect["mean"],
+                    "effect_sem": effect["sem"], "effect_ci_low": effect["ci_low"], "effect_ci_high": effect["ci_high"]}
+
+        settings = {"parameter": parameter, "observable": observable, "perturbation": self.perturbation,
+                    "replicates": replicates, "seed": seed, "confidence": self.confidence}
+        columns = self._memoized("effects", model, table, settings, EFFECT_COLUMNS, compute)
+        excludes_zero = (columns["effect_ci_low"] > 0.0) | (columns["effect_ci_high"] < 0.0)
+        if spec["direction"] is None:
+            verdict = np.full(len(excludes_zero), "inconclusive")
+        else:
+            agrees = (columns["effect_ci_low"] > 0.0) == (spec["direction"] > 0)
+            verdict = np.where(excludes_zero, np.where(agrees, "supported", "refuted"), "inconclusive")
+        return {**table, **columns, "verdict": verdict}
+
+    def test_hypothesis(self, hypothesis: str, parameters: Optional[Dict[str, Any]] = None,
+                        replicates: Optional[int] = None, seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Tests a hypothesis by perturbing the parameter it names and measuring the observable (see `effects`).
+
+        Args:
+            hypothesis: The hypothesis text.
+            parameters: Model parameters to test around (see `resolve_hypothesis`).
+            replicates: Replicates per arm (default: the engine's setting).
+            seed: Random seed (default: the engine's seed).
+
+        Returns:
+            The model, parameter, observable, predicted direction, both parameter values,
+            the effect's mean and confidence interval, the verdict and `supported`.
+        """
+        resolved = self.resolve_hypothesis(hypothesis, parameters)
+        if resolved is None:
+            return {"hypothesis": hypothesis, "verdict": "untestable", "supported": False,
+                    "reason": "no simulation model parameter is mentioned"}
+        spec, base = resolved
+        columns = self.effects(spec, [base], replicates, seed)
+        verdict = str(columns["verdict"][0])
+        return {
+            "hypothesis": hypothesis, **spec, "low": float(columns["low"][0]), "high": float(columns["high"][0]),
+            "baseline_mean": float(columns["baseline_mean"][0]), "effect_mean": float(columns["effect_mean"][0]),
+            "effect_ci": [float(columns["effect_ci_low"][0]), float(columns["effect_ci_high"][0])],
+            "replicates": replicates or self.replicates, "verdict": verdict, "supported": verdict == "supported",
+        }
+
     def run_simulation(self, hypotheses: List[str], parameters: Dict[str, Any]) -> Dict[str, Any]:
         """
         Runs a simulation based on the given hypotheses and parameters.
 
         Args:
             hypotheses: A list of strings representing the hypotheses to be tested.
-            parameters: A dictionary containing the simulation parameters.
+            parameters: A dictionary containing the simulation parameters (see `test_hypothesis`).
 
         Returns:
-            A dictionary containing the simulation results.
+            A dictionary containing the simulation results: `hypothesis_<i>_result` (whether the
+            hypothesis was supported) and `hypothesis_<i>` (the full test outcome) per hypothesis.
         """
         try:
-            logger.info(f"Running simulation with hypotheses: {hypotheses} and parameters: {parameters}")
-
-            # This is a placeholder for the actual simulation logic.
-            # In a real implementation, this would involve running a simulation
-            # based on the hypotheses and parameters.
+            logger.info("Running simulation with hypotheses: %s and parameters: %s",
+                        Truncated(hypotheses), Truncated(parameters))
 
-            # For demonstration purposes, we'll generate some random results.
             results = {}
             for i, hypothesis in enumerate(hypotheses):
-                # Simulate a binary outcome (True/False) for each hypothesis
-                results[f"hypothesis_{i+1}_result"] = random.choice([True, False])
+                outcome = self.test_hypothesis(hypothesis, parameters)
+                results[f"hypothesis_{i+1}_result"] = outcome["supported"]
+                results[f"hypothesis_{i+1}"] = outcome
 
-            logger.info(f"Simulation results: {results}")
+            logger.info("Simulation results: %s", Truncated(results))
             return results
 
         except Exception as e:
-            logger.exception(f"Error running simulation: {e}")
+            logger.exception("Error running simulation: %s", e)
             return {}
 
 
 if __name__ == "__main__":
+    setup_logging()
+
     # Example Usage:
-    # 1. Run this script: `python src/experimentation/simulation_engine.py`
+    # 1. Run this script: `python -m src.experimentation.simulation_engine`
 
     # Instantiate the SimulationEngine
-    simulation_engine = SimulationEngine()
+    simulation_engine = SimulationEngine(replicates=500)
 
     # Define some hypotheses
     hypotheses = [
@@ -92,4 +487,13 @@ if __name__ == "__main__":
 
     # Print the simulation results
     print("Simulation Results:")
-    print(simulation_results)
\ No newline at end of file
+    for i in range(len(hypotheses)):
+        outcome = simulation_results[f"hypothesis_{i+1}"]
+        print(f"{outcome['hypothesis']} -> {outcome['verdict']} "
+              f"(effect {outcome['effect_mean']:.4g}, CI {outcome['effect_ci'][0]:.4g} to {outcome['effect_ci'][1]:.4g})")
+
+    # Evaluate 10,000 transmission rates of the SIR model in a few vectorized calls
+    columns = simulation_engine.simulate("sir_epidemic", {"transmission_rate": np.linspace(0.1, 0.5, 10000)},
+                                         replicates=50)
+    print(f"Peak prevalence ranges from {columns['peak_infected_mean'].min():.3f} "
+          f"to {columns['peak_infected_mean'].max():.3f}")
@@ -1,36 +1,75 @@
 import sys
-import os
 import logging
-import arxiv
-from typing import List, Dict, Any
-
-# Dynamically adjust sys.path to allow imports from the project root
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-if PROJECT_ROOT not in sys.path:
-    sys.path.insert(0, PROJECT_ROOT)
+from typing import List, Dict, Any, Optional
 
 # Local imports
 try:
     from src.utils.logging_config import setup_logging
+    from src.knowledge_retrieval.local_index import LocalPaperIndex
+    from src.knowledge_retrieval.retrieval_cache import RetrievalCache, get_retrieval_cache
+    from src.utils.lazy_import import LazyModule
 except ImportError as e:
     print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
     sys.exit(1)
 
-# Configure logging
-setup_logging()
 logger = logging.getLogger(__name__)
 
+arxiv = LazyModule("arxiv", install_hint="arxiv")
+
+RETRIEVAL_MODES = ("api", "local", "local_first")
+
 
 class ArxivRetriever:
     """
     Module for retrieving research papers from ArXiv.
+
+    In "api" mode every query goes to the ArXiv API. In "local" mode queries are
+    answered from a LocalPaperIndex built with `python -m src.knowledge_retrieval.ingest arxiv`,
+    which takes milliseconds and works offline. "local_first" uses the index and
+    falls back to the API when it has no matches.
     """
 
-    def __init__(self):
+    def __init__(self, index_path: Optional[str] = None, mode: str = "api",
+                 cache: Optional[RetrievalCache] = None):
         """
         Initializes the ArxivRetriever.
+
+        Args:
+            index_path: Path to the local paper index; required for the "local" and "local_first" modes.
+            mode: One of "api", "local" or "local_first".
+            cache: Optional RetrievalCache for repeated or near-identical queries.
+        """
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"mode must be one of {RETRIEVAL_MODES}, got {mode!r}")
+        if mode != "api" and not index_path:
+            raise ValueError(f"index_path is required for mode {mode!r}")
+        self.mode = mode
+        self.cache = cache
+        self.index = LocalPaperIndex(index_path) if mode != "api" else None
+        self._client = None
+        logger.info("ArxivRetriever initialized (mode: %s).", mode)
+
+    @property
+    def client(self) -> Any:
+        """The ArXiv API client, created (importing the `arxiv` package) on first use."""
+        if self._client is None:
+            self._client = arxiv.Client()
+        return self._client
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "ArxivRetriever":
+        """
+        Creates an ArxivRetriever using the `arxiv` section of the configuration.
+
+        Args:
+            config: The loaded configuration dictionary.
+
+        Returns:
+            A configured ArxivRetriever.
         """
-        logger.info("ArxivRetriever initialized.")
+        arxiv_config = config.get('arxiv') or {}
+        return cls(index_path=arxiv_config.get('index_path'), mode=arxiv_config.get('mode', 'api'),
+                   cache=get_retrieval_cache(config))
 
     def search_arxiv(self, query: str, max_results: int = 10) -> List[Dict[str, str]]:
         """
@@ -41,7 +80,61 @@ class ArxivRetriever:
             max_results: The maximum number of results to return.
 
         Returns:
-            A list of dictionaries, where each dictionary represents a paper and contains its title, abstract, and URL.
+            A list of dictionaries, where each dictionary represents a paper and contains its title, abstract, URL and DOI.
+        """
+        cache_source = f"arxiv/{self.mode}"
+        if self.cache is not None:
+            cached = self.cache.get(cache_source, query, max_results)
+            if cached is not None:
+                logger.info("Retrieved %s cached ArXiv papers for query: %s", len(cached), query)
+                return cached
+
+        results = []
+        if self.index is not None:
+            results = self.search_local(query, max_results)
+            if not results and self.mode == "local_first":
+                logger.info("No local ArXiv matches for query: %s; falling back to the ArXiv API.", query)
+        if self.mode == "api" or (self.mode == "local_first" and not results):
+            results = self.search_api(query, max_results)
+
+        # Errors surface as empty lists, so only non-empty results are cached.
+        if self.cache is not None and results:
+            self.cache.set(cache_source, query, max_results, results)
+        return results
+
+    def search_local(self, query: str, max_results: int = 10) -> List[Dict[str, str]]:
+        """
+        Searches the local paper index.
+
+        Args:
+            query: The search query.
+            max_results: The maximum number of results to return.
+
+        Returns:
+            A list of paper dictionaries ordered by BM25 relevance.
+        """
+        try:
+            papers = self.index.search(query, max_results=max_results, source="arxiv")
+        except Exception as e:
+            logger.exception("Error searching the local ArXiv index: %s", e)
+            return []
+        results = [
+            {"title": paper["title"], "abstract": paper["abstract"], "url": paper["url"], "doi": paper["doi"]}
+            for paper in papers
+        ]
+        logger.info("Retrieved %s papers from the local ArXiv index for query: %s", len(results), query)
+        return results
+
+    def search_api(self, query: str, max_results: int = 10) -> List[Dict[str, str]]:
+        """
+        Searches the ArXiv API.
+
+        Args:
+            query: The search query.
+            max_results: The maximum number of results to return.
+
+        Returns:
+            A list of paper dictionaries ordered by ArXiv relevance.
         """
         try:
             search = arxiv.Search(
@@ -50,23 +143,26 @@ class ArxivRetriever:
                 sort_by=arxiv.SortCriterion.Relevance
             )
             results = []
-            for result in search.results():
+            for result in self.client.results(search):
                 paper_info = {
                     "title": result.title,
                     "abstract": result.summary,
-                    "url": result.pdf_url
+                    "url": result.pdf_url,
+                    "doi": (result.doi or "").lower()
                 }
                 results.append(paper_info)
-            logger.info(f"Retrieved {len(results)} papers from ArXiv for query: {query}")
+            logger.info("Retrieved %s papers from ArXiv for query: %s", len(results), query)
             return results
         except Exception as e:
-            logger.exception(f"Error searching ArXiv: {e}")
+            logger.exception("Error searching ArXiv: %s", e)
             return []
 
-
 if __name__ == "__main__":
+    setup_logging()
+
     # Example Usage:
-    # 1. Run this script: `python src/knowledge_retrieval/arxiv_retriever.py`
+    # 1. Run this script: `python -m src.knowledge_retrieval.arxiv_retriever`
+    #    (for offline search, ingest a metadata dump first and pass `index_path` and `mode="local"`)
 
     # Instantiate the ArxivRetriever
     arxiv_retriever = ArxivRetriever()
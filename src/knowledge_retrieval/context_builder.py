@@ -0,0 +1,195 @@
+import sys
+import re
+import logging
+from typing import List, Dict, Any, Iterable, Set
+
+# Local imports
+try:
+    from src.utils.logging_config import setup_logging
+    from src.utils.tokens import estimate_tokens
+    from src.knowledge_retrieval.papers import normalize_title, normalize_doi
+    from src.knowledge_retrieval.retrieval_cache import STOPWORDS
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CONTEXT_MAX_TOKENS = 1500
+DEFAULT_CONTEXT_MAX_PAPERS = 8
+DEFAULT_MAX_ABSTRACT_TOKENS = 200
+# Papers are skipped once less than this many tokens of budget remain.
+MIN_ENTRY_TOKENS = 24
+
+_SENTENCE_SPLIT_PATTERN = re.compile(r"(?<=[.!?])\s+")
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+ELLIPSIS = "..."
+
+
+def _terms(text: str) -> Set[str]:
+    return set(_WORD_PATTERN.findall(text.casefold())) - STOPWORDS
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Cuts text at a word boundary so that it fits a token budget.
+
+    Args:
+        text: The text to shorten.
+        max_tokens: The token budget.
+
+    Returns:
+        `text` unchanged if it fits, otherwise a prefix ending in "...".
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    words = text.split()
+    kept: List[str] = []
+    for word in words:
+        if estimate_tokens(" ".join(kept + [word]) + ELLIPSIS) > max_tokens:
+            break
+        kept.append(word)
+    return " ".join(kept) + ELLIPSIS if kept else ""
+
+
+def compress_abstract(abstract: str, query_terms: Set[str], max_tokens: int) -> str:
+    """
+    Shrinks an abstract to a token budget by keeping its most query-relevant sentences.
+
+    Sentences are ranked by how many query terms they contain (earlier sentences win
+    ties) and kept while they fit; the survivors are emitted in their original order.
+
+    Args:
+        abstract: The abstract text.
+        query_terms: Case-folded content words of the query.
+        max_tokens: The token budget.
+
+    Returns:
+        The compressed abstract.
+    """
+    abstract = " ".join(abstract.split())
+    if estimate_tokens(abstract) <= max_tokens:
+        return abstract
+    sentences = _SENTENCE_SPLIT_PATTERN.split(abstract)
+    ranked = sorted(range(len(sentences)), key=lambda i: (-len(_terms(sentences[i]) & query_terms), i))
+    chosen: List[int] = []
+    for i in ranked:
+        if estimate_tokens(" ".join(sentences[j] for j in sorted(chosen + [i]))) <= max_tokens:
+            chosen.append(i)
+    if not chosen:
+        return truncate_to_tokens(sentences[ranked[0]], max_tokens)
+    return " ".join(sentences[i] for i in sorted(chosen))
+
+
+class ContextBuilder:
+    """
+    Assembles retrieved papers into a prompt section that fits a token budget.
+
+    Papers are deduplicated (by DOI or normalized title, keeping the first, i.e.
+    best-ranked, copy), taken in rank order, and their abstracts compressed to
+    the sentences most relevant to the query until the budget is spent.
+    """
+
+    def __init__(self, max_tokens: int = DEFAULT_CONTEXT_MAX_TOKENS,
+                 max_papers: int = DEFAULT_CONTEXT_MAX_PAPERS,
+                 max_abstract_tokens: int = DEFAULT_MAX_ABSTRACT_TOKENS):
+        """
+        Initializes the ContextBuilder.
+
+        Args:
+            max_tokens: Token budget of the whole literature section.
+            max_papers: Maximum number of papers to include.
+            max_abstract_tokens: Token budget of a single abstract.
+        """
+        self.max_tokens = max_tokens
+        self.max_papers = max_papers
+        self.max_abstract_tokens = max_abstract_tokens
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "ContextBuilder":
+        """
+        Creates a ContextBuilder using the `retrieval.context` section of the configuration.
+
+        Args:
+            config: The loaded configuration dictionary.
+
+        Returns:
+            A configured ContextBuilder.
+        """
+        context_config = (config.get('retrieval') or {}).get('context') or {}
+        return cls(
+            max_tokens=context_config.get('max_tokens', DEFAULT_CONTEXT_MAX_TOKENS),
+            max_papers=context_config.get('max_papers', DEFAULT_CONTEXT_MAX_PAPERS),
+            max_abstract_tokens=context_config.get('max_abstract_tokens', DEFAULT_MAX_ABSTRACT_TOKENS)
+        )
+
+    def select_papers(self, papers: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Deduplicates papers that share a DOI or a normalized title, keeping the first copy.
+
+        Args:
+            papers: Papers in rank order, possibly from several rankings concatenated.
+
+        Returns:
+            The distinct papers, in order.
+        """
+        seen_dois, seen_titles = set(), set()
+        selected = []
+        for paper in papers:
+            doi, title = normalize_doi(paper), normalize_title(paper.get('title') or '')
+            if (doi and doi in seen_dois) or (title and title in seen_titles) or not (title or paper.get('abstract')):
+                continue
+            seen_dois.add(doi)
+            seen_titles.add(title)
+            selected.append(paper)
+        return selected
+
+    def build(self, papers: Iterable[Dict[str, Any]], query: str = "") -> str:
+        """
+        Renders papers as numbered "[i] Title: abstract" lines within the token budget.
+
+        Args:
+            papers: Papers in rank order.
+            query: Text the abstracts are compressed towards (e.g. problem and hypotheses).
+
+        Returns:
+            The literature section, or an empty string if no paper fits.
+        """
+        query_terms = _terms(query)
+        lines: List[str] = []
+        remaining = self.max_tokens
+        for paper in self.select_papers(papers):
+            if len(lines) >= self.max_papers or remaining < MIN_ENTRY_TOKENS:
+                break
+            prefix = f"[{len(lines) + 1}] {paper.get('title', '')}: "
+            # One token for the newline joining this entry to the previous one.
+            separator = 1 if lines else 0
+            budget = min(self.max_abstract_tokens, remaining - estimate_tokens(prefix) - separator)
+            if budget <= 0:
+                prefix = truncate_to_tokens(prefix, remaining - separator)
+                if not prefix:
+                    break
+                abstract = ""
+            else:
+                abstract = compress_abstract(paper.get('abstract') or "", query_terms, budget)
+            # Estimates round up per piece, so the joined text never exceeds the sum of the parts.
+            lines.append(prefix + abstract)
+            remaining = self.max_tokens - estimate_tokens("\n".join(lines))
+        context = "\n".join(lines)
+        logger.info("Built literature context with %s papers (~%s tokens).", len(lines), estimate_tokens(context))
+        return context
+
+
+if __name__ == "__main__":
+    setup_logging()
+
+    # Example Usage:
+    # 1. Set `retrieval.context.max_tokens` in `configs/config.yaml`.
+    # 2. Run this script: `python -m src.knowledge_retrieval.context_builder`
+
+    builder = ContextBuilder(max_tokens=60)
+    print(builder.build([
+        {"title": "Coral bleaching", "abstract": "Reefs are diverse. Heat stress expels algae. Recovery takes years."},
+        {"title": "Reef acidification", "abstract": "Lower pH slows calcification in corals."},
+    ], query="heat stress and coral bleaching"))
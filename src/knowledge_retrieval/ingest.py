@@ -0,0 +1,131 @@
+import sys
+import time
+import argparse
+import logging
+from typing import List, Optional
+
+# Local imports
+try:
+    from src.utils.logging_config import setup_logging
+    from src.knowledge_retrieval.local_index import (
+        LocalPaperIndex, iter_arxiv_metadata, iter_pubmed_articles, DEFAULT_INDEX_PATH, DEFAULT_BATCH_SIZE
+    )
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+
+def ingest_arxiv(dump_paths: List[str], index_path: str = DEFAULT_INDEX_PATH,
+                 batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Bulk-loads arXiv metadata dumps into the local paper index.
+
+    Args:
+        dump_paths: Paths to arXiv metadata snapshots (JSON lines, optionally gzipped).
+        index_path: Path to the local paper index.
+        batch_size: Number of papers per transaction.
+
+    Returns:
+        The number of papers written.
+    """
+    index = LocalPaperIndex(index_path)
+    try:
+        total = 0
+        for dump_path in dump_paths:
+            start = time.perf_counter()
+            count = index.add_papers(iter_arxiv_metadata(dump_path), batch_size=batch_size)
+            logger.info("Ingested %s arXiv papers from %s in %.1fs.", count, dump_path, time.perf_counter() - start)
+            total += count
+        index.optimize()
+        return total
+    finally:
+        index.close()
+
+
+def ingest_pubmed(xml_paths: List[str], index_path: str = DEFAULT_INDEX_PATH,
+                  batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Streams MEDLINE/PubMed XML files into the local paper index.
+
+    Files are applied in the given order, so baseline files should come before
+    update files; citations deleted by an update file are removed from the index.
+
+    Args:
+        xml_paths: Paths to PubMed XML files (optionally gzipped).
+        index_path: Path to the local paper index.
+        batch_size: Number of papers per transaction.
+
+    Returns:
+        The number of papers written.
+    """
+    index = LocalPaperIndex(index_path)
+    try:
+        total = 0
+        for xml_path in xml_paths:
+            start = time.perf_counter()
+            deleted: List[str] = []
+            count = index.add_papers(iter_pubmed_articles(xml_path, deleted=deleted), batch_size=batch_size)
+            removed = index.delete_papers(deleted) if deleted else 0
+            logger.info("Ingested %s PubMed papers (%s deleted) from %s in %.1fs.",
+                        count, removed, xml_path, time.perf_counter() - start)
+            total += count
+        index.optimize()
+        return total
+    finally:
+        index.close()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parses command-line arguments.
+
+    Args:
+        argv: Optional list of arguments (defaults to sys.argv).
+
+    Returns:
+        The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Build the local paper index used for offline retrieval.")
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH, help="Path to the local paper index.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Papers per transaction.")
+    subparsers = parser.add_subparsers(dest="source", required=True)
+
+    arxiv_parser = subparsers.add_parser("arxiv", help="Ingest arXiv metadata snapshots (JSON lines, .gz supported).")
+    arxiv_parser.add_argument("dumps", nargs="+", help="Paths to arXiv metadata dumps.")
+
+    pubmed_parser = subparsers.add_parser("pubmed", help="Ingest MEDLINE/PubMed XML files (.gz supported).")
+    pubmed_parser.add_argument("files", nargs="+", help="Paths to PubMed XML files, baseline before updates.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Entry point for the ingestion command.
+
+    Args:
+        argv: Optional list of arguments (defaults to sys.argv).
+
+    Returns:
+        The number of papers written.
+    """
+    args = parse_args(argv)
+    if args.source == "arxiv":
+        total = ingest_arxiv(args.dumps, index_path=args.index, batch_size=args.batch_size)
+    else:
+        total = ingest_pubmed(args.files, index_path=args.index, batch_size=args.batch_size)
+    print(f"Indexed {total} papers into {args.index}.")
+    return total
+
+
+if __name__ == "__main__":
+    setup_logging()
+
+    # Example Usage:
+    # 1. Download the arXiv metadata snapshot (arxiv-metadata-oai-snapshot.json).
+    # 2. Run: `python -m src.knowledge_retrieval.ingest --index data/index/papers.sqlite arxiv arxiv-metadata-oai-snapshot.json`
+    # 3. Set `arxiv.mode: local` in `configs/config.yaml`.
+    # PubMed baseline/update files: `python -m src.knowledge_retrieval.ingest pubmed pubmed25n0001.xml.gz ...`
+
+    main()
@@ -0,0 +1,366 @@
+import sys
+import os
+import re
+import gzip
+import json
+import sqlite3
+import logging
+import threading
+import xml.etree.ElementTree as ET
+from typing import List, Dict, Any, Optional, Iterable, Iterator
+
+# Local imports
+try:
+    from src.utils.logging_config import setup_logging
+    from src.knowledge_retrieval.retrieval_cache import STOPWORDS
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_INDEX_PATH = "data/index/papers.sqlite"
+DEFAULT_BATCH_SIZE = 5000
+
+# BM25 column weights for (title, abstract, categories).
+TITLE_WEIGHT = 10.0
+ABSTRACT_WEIGHT = 1.0
+CATEGORIES_WEIGHT = 0.5
+
+_QUERY_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    rowid INTEGER PRIMARY KEY,
+    paper_id TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL,
+    title TEXT NOT NULL,
+    abstract TEXT NOT NULL,
+    categories TEXT NOT NULL DEFAULT '',
+    url TEXT NOT NULL DEFAULT '',
+    doi TEXT NOT NULL DEFAULT ''
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+    title, abstract, categories, content='papers', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS papers_ai AFTER INSERT ON papers BEGIN
+    INSERT INTO papers_fts(rowid, title, abstract, categories)
+    VALUES (new.rowid, new.title, new.abstract, new.categories);
+END;
+CREATE TRIGGER IF NOT EXISTS papers_ad AFTER DELETE ON papers BEGIN
+    INSERT INTO papers_fts(papers_fts, rowid, title, abstract, categories)
+    VALUES ('delete', old.rowid, old.title, old.abstract, old.categories);
+END;
+CREATE TRIGGER IF NOT EXISTS papers_au AFTER UPDATE ON papers BEGIN
+    INSERT INTO papers_fts(papers_fts, rowid, title, abstract, categories)
+    VALUES ('delete', old.rowid, old.title, old.abstract, old.categories);
+    INSERT INTO papers_fts(rowid, title, abstract, categories)
+    VALUES (new.rowid, new.title, new.abstract, new.categories);
+END;
+"""
+
+
+def build_match_query(query: str) -> str:
+    """
+    Turns free text into a safe FTS5 MATCH expression.
+
+    Every word is quoted (so FTS5 operators in user input are treated as text) and
+    the words are OR-ed together; BM25 ranking puts papers matching most words first.
+    Stopwords are dropped, since OR-ing them in matches nearly every paper; a query
+    made only of stopwords keeps them.
+
+    Args:
+        query: The free-text search query.
+
+    Returns:
+        The FTS5 query, or an empty string if the query has no words.
+    """
+    tokens = list(dict.fromkeys(_QUERY_TOKEN_PATTERN.findall(query.lower())))
+    content_tokens = [token for token in tokens if token not in STOPWORDS]
+    return " OR ".join(f'"{token}"' for token in content_tokens or tokens)
+
+
+def _clean(text: Optional[str]) -> str:
+    """Collapses the line breaks and runs of whitespace found in metadata dumps."""
+    return " ".join((text or "").split())
+
+
+class LocalPaperIndex:
+    """
+    On-disk full-text index of paper metadata backed by SQLite FTS5.
+
+    Papers from any source (arXiv, PubMed, ...) share one index and are ranked
+    with BM25, weighting title matches above abstract and category matches.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        """
+        Opens (or creates) the index at `path`.
+
+        Args:
+            path: Path to the SQLite index file.
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        logger.info("LocalPaperIndex opened at %s.", path)
+
+    def add_papers(self, papers: Iterable[Dict[str, Any]], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """
+        Bulk-inserts or updates papers.
+
+        Papers are written in batches inside transactions, so arbitrarily large
+        iterables are ingested with bounded memory.
+
+        Args:
+            papers: Dictionaries with `paper_id`, `source`, `title` and `abstract`, and
+                optionally `categories`, `url` and `doi`.
+            batch_size: Number of papers per transaction.
+
+        Returns:
+            The number of papers written.
+        """
+        sql = (
+            "INSERT INTO papers (paper_id, source, title, abstract, categories, url, doi) "
+            "VALUES (:paper_id, :source, :title, :abstract, :categories, :url, :doi) "
+            "ON CONFLICT(paper_id) DO UPDATE SET source = excluded.source, title = excluded.title, "
+            "abstract = excluded.abstract, categories = excluded.categories, url = excluded.url, doi = excluded.doi"
+        )
+        total = 0
+        batch: List[Dict[str, str]] = []
+        with self._lock:
+            self._conn.execute("PRAGMA synchronous=OFF")
+            try:
+                for paper in papers:
+                    batch.append({
+                        "paper_id": paper["paper_id"],
+                        "source": paper["source"],
+                        "title": _clean(paper.get("title")),
+                        "abstract": _clean(paper.get("abstract")),
+                        "categories": _clean(paper.get("categories")),
+                        "url": paper.get("url") or "",
+                        "doi": (paper.get("doi") or "").lower(),
+                    })
+                    if len(batch) >= batch_size:
+                        total += self._write_batch(sql, batch)
+                        batch = []
+                if batch:
+                    total += self._write_batch(sql, batch)
+            finally:
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+        logger.info("Indexed %s papers into %s.", total, self.path)
+        return total
+
+    def delete_papers(self, paper_ids: Iterable[str]) -> int:
+        """
+        Removes papers from the index.
+
+        Args:
+            paper_ids: Identifiers of the papers to remove.
+
+        Returns:
+            The number of papers removed.
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.executemany("DELETE FROM papers WHERE paper_id = ?", ((pid,) for pid in paper_ids))
+            return cursor.rowcount
+
+    def _write_batch(self, sql: str, batch: List[Dict[str, str]]) -> int:
+        with self._conn:
+            self._conn.executemany(sql, batch)
+        return len(batch)
+
+    def search(self, query: str, max_results: int = 10, source: Optional[str] = None) -> List[Dict[str, str]]:
+        """
+        Searches the index.
+
+        Args:
+            query: The free-text search query.
+            max_results: The maximum number of results to return.
+            source: Optional source to restrict results to (e.g. "arxiv").
+
+        Returns:
+            A list of paper dictionaries ordered by relevance, each with paper_id,
+            source, title, abstract, categories, url, doi and score.
+        """
+        match = build_match_query(query)
+        if not match or max_results <= 0:
+            return []
+        sql = (
+            "SELECT p.paper_id, p.source, p.title, p.abstract, p.categories, p.url, p.doi, "
+            f"bm25(papers_fts, {TITLE_WEIGHT}, {ABSTRACT_WEIGHT}, {CATEGORIES_WEIGHT}) AS score "
+            "FROM papers_fts JOIN papers p ON p.rowid = papers_fts.rowid "
+            "WHERE papers_fts MATCH ?"
+        )
+        params: List[Any] = [match]
+        if source is not None:
+            sql += " AND p.source = ?"
+            params.append(source)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(max_results)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        columns = ("paper_id", "source", "title", "abstract", "categories", "url", "doi")
+        # bm25() is lower-is-better; negate it so larger scores mean more relevant.
+        return [dict(zip(columns, row[:-1]), score=-row[-1]) for row in rows]
+
+    def count(self, source: Optional[str] = None) -> int:
+        """
+        Counts the indexed papers.
+
+        Args:
+            source: Optional source to restrict the count to.
+
+        Returns:
+            The number of papers.
+        """
+        with self._lock:
+            if source is None:
+                return self._conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM papers WHERE source = ?", (source,)).fetchone()[0]
+
+    def optimize(self) -> None:
+        """Merges FTS5 index segments; run after large ingestions for faster queries."""
+        with self._lock, self._conn:
+            self._conn.execute("INSERT INTO papers_fts(papers_fts) VALUES ('optimize')")
+
+    def close(self) -> None:
+        """Closes the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def _open_text(path: str):
+    """Opens a plain or gzip-compressed text file."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def _open_binary(path: str):
+    """Opens a plain or gzip-compressed file for byte-level parsing."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def iter_arxiv_metadata(path: str) -> Iterator[Dict[str, str]]:
+    """
+    Streams papers from an arXiv metadata dump.
+
+    The dump is the JSON-lines snapshot published by arXiv (one object per line
+    with `id`, `title`, `abstract`, `categories` and optionally `doi`), plain or gzipped.
+
+    Args:
+        path: Path to the dump file.
+
+    Yields:
+        Paper dictionaries ready for `LocalPaperIndex.add_papers`.
+    """
+    with _open_text(path) as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                arxiv_id = record["id"]
+            except (ValueError, KeyError) as e:
+                logger.warning("Skipping malformed arXiv record on line %s: %s", line_number, e)
+                continue
+            yield {
+                "paper_id": f"arxiv:{arxiv_id}",
+                "source": "arxiv",
+                "title": record.get("title", ""),
+                "abstract": record.get("abstract", ""),
+                "categories": record.get("categories", ""),
+                "url": f"https://arxiv.org/abs/{arxiv_id}",
+                "doi": record.get("doi") or "",
+            }
+
+
+def _element_text(element: Optional[ET.Element]) -> str:
+    """Returns all text inside an element, including text in inline markup such as <i>."""
+    if element is None:
+        return ""
+    return "".join(element.itertext())
+
+
+def _parse_pubmed_article(article: ET.Element) -> Optional[Dict[str, str]]:
+    """Converts a <PubmedArticle> element into a paper dictionary."""
+    pmid = article.findtext("MedlineCitation/PMID")
+    if not pmid:
+        return None
+    pmid = pmid.strip()
+    sections = []
+    for abstract_text in article.iterfind("MedlineCitation/Article/Abstract/AbstractText"):
+        text = _element_text(abstract_text)
+        label = abstract_text.get("Label")
+        sections.append(f"{label}: {text}" if label else text)
+    doi = ""
+    for article_id in article.iterfind("PubmedData/ArticleIdList/ArticleId"):
+        if article_id.get("IdType") == "doi":
+            doi = (article_id.text or "").strip()
+            break
+    mesh_terms = [_element_text(d) for d in article.iterfind("MedlineCitation/MeshHeadingList/MeshHeading/DescriptorName")]
+    return {
+        "paper_id": f"pubmed:{pmid}",
+        "source": "pubmed",
+        "title": _element_text(article.find("MedlineCitation/Article/ArticleTitle")),
+        "abstract": " ".join(sections),
+        "categories": "; ".join(mesh_terms),
+        "url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
+        "doi": doi,
+    }
+
+
+def iter_pubmed_articles(path: str, deleted: Optional[List[str]] = None) -> Iterator[Dict[str, str]]:
+    """
+    Streams papers from a MEDLINE/PubMed XML file (baseline, update or search export).
+
+    The file is parsed incrementally and each <PubmedArticle> is discarded once it
+    has been converted, so memory stays bounded regardless of the file size.
+
+    Args:
+        path: Path to the XML file, optionally gzipped.
+        deleted: Optional list that receives the `paper_id`s listed in <DeleteCitation>
+            blocks of update files.
+
+    Yields:
+        Paper dictionaries ready for `LocalPaperIndex.add_papers`.
+    """
+    with _open_binary(path) as f:
+        root = None
+        for event, element in ET.iterparse(f, events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = element
+                continue
+            if element.tag == "PubmedArticle":
+                paper = _parse_pubmed_article(element)
+                if paper is not None:
+                    yield paper
+                # Drop the finished article (and its reference from the root) to bound memory.
+                root.clear()
+            elif element.tag == "DeleteCitation":
+                if deleted is not None:
+                    deleted.extend(f"pubmed:{(pmid.text or '').strip()}" for pmid in element.iterfind("PMID"))
+                root.clear()
+
+
+if __name__ == "__main__":
+    setup_logging()
+
+    # Example Usage:
+    # 1. Ingest a dump: `python -m src.knowledge_retrieval.ingest arxiv arxiv-metadata-oai-snapshot.json`
+    # 2. Run this script: `python -m src.knowledge_retrieval.local_index`
+
+    index = LocalPaperIndex(DEFAULT_INDEX_PATH)
+    print(f"Indexed papers: {index.count()}")
+    for paper in index.search("quantum computing", max_results=5):
+        print(f"{paper['score']:.2f}  {paper['title']}  ({paper['url']})")
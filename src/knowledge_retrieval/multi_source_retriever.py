@@ -0,0 +1,293 @@
+import sys
+import time
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Callable, Union
+
+# Local imports
+try:
+    from src.utils.logging_config import setup_logging
+    from src.utils.tracing import traced, get_tracer
+    from src.knowledge_retrieval.arxiv_retriever import ArxivRetriever
+    from src.knowledge_retrieval.pubmed_retriever import PubmedRetriever
+    from src.knowledge_retrieval.papers import normalize_title, normalize_doi
+    from src.knowledge_retrieval.vector_index import VectorIndex, create_vector_index
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_TIMEOUT_SECONDS = 10.0
+DEFAULT_RRF_K = 60
+DEFAULT_EVIDENCE_TOP_K = 3
+
+SearchFunction = Callable[[str, int], List[Dict[str, str]]]
+
+
+def reciprocal_rank_fusion(rankings: Dict[str, List[Dict[str, str]]], k: int = DEFAULT_RRF_K) -> List[Dict[str, Any]]:
+    """
+    Merges per-source rankings with reciprocal rank fusion, deduplicating papers.
+
+    Papers are the same if they share a DOI or a normalized title. Each paper scores
+    sum(1 / (k + rank)) over the sources that returned it, so papers found by several
+    sources rise to the top without needing comparable per-source scores.
+
+    Args:
+        rankings: Mapping of source name to that source's results, best first.
+        k: The RRF smoothing constant.
+
+    Returns:
+        The fused papers, best first. Each keeps the fields of its best-ranked copy
+        (missing fields are filled from the other copies) and gains `sources` and `score`.
+    """
+    fused: List[Dict[str, Any]] = []
+    by_doi: Dict[str, Dict[str, Any]] = {}
+    by_title: Dict[str, Dict[str, Any]] = {}
+
+    # Visit papers rank by rank across sources, so every paper's base copy is its best-ranked one.
+    depth = max((len(papers) for papers in rankings.values()), default=0)
+    for rank in range(depth):
+        for source, papers in rankings.items():
+            if rank >= len(papers):
+                continue
+            paper = papers[rank]
+            doi = normalize_doi(paper)
+            title = normalize_title(paper.get("title") or "")
+            entry = (by_doi.get(doi) if doi else None) or (by_title.get(title) if title else None)
+            if entry is None:
+                entry = dict(paper, sources=[], score=0.0)
+                fused.append(entry)
+            else:
+                for field, value in paper.items():
+                    if value and not entry.get(field):
+                        entry[field] = value
+            if source not in entry["sources"]:
+                entry["sources"].append(source)
+                entry["score"] += 1.0 / (k + rank + 1)
+            if doi:
+                by_doi.setdefault(doi, entry)
+            if title:
+                by_title.setdefault(title, entry)
+
+    fused.sort(key=lambda entry: entry["score"], reverse=True)
+    return fused
+
+
+def interleave_evidence(papers: List[Dict[str, Any]], evidence: List[List[Dict[str, Any]]],
+                        top_k: int = DEFAULT_EVIDENCE_TOP_K) -> List[Dict[str, Any]]:
+    """
+    Appends per-query evidence to already retrieved papers.
+
+    Args:
+        papers: Papers retrieved for the research problem, best first.
+        evidence: One list of evidence papers per query, best first.
+        top_k: Number of evidence papers kept per query.
+
+    Returns:
+        `papers` followed by the evidence, interleaved across queries by rank;
+        duplicates are left for the ContextBuilder to drop.
+    """
+    interleaved = [hits[rank] for rank in range(top_k) for hits in evidence if rank < len(hits)]
+    return list(papers) + interleaved
+
+
+class MultiSourceRetriever:
+    """
+    Queries several paper sources concurrently and fuses their rankings.
+
+    Every source runs in its own worker thread under its own timeout, so total
+    latency is that of the slowest source (capped by its timeout) rather than the
+    sum over sources. A source that fails or times out simply contributes nothing.
+    With a VectorIndex attached, every fused paper is embedded into it so later
+    lookups (`search_evidence`) are answered locally by semantic similarity.
+    """
+
+    def __init__(self, sources: Dict[str, SearchFunction],
+                 timeouts: Union[float, Dict[str, float]] = DEFAULT_TIMEOUT_SECONDS,
+                 rrf_k: int = DEFAULT_RRF_K, vector_index: Optional[VectorIndex] = None):
+        """
+        Initializes the MultiSourceRetriever.
+
+        Args:
+            sources: Mapping of source name to a `search(query, max_results)` function.
+            timeouts: Timeout in seconds for every source, or a mapping of source name to timeout.
+            rrf_k: The reciprocal rank fusion constant.
+            vector_index: Optional VectorIndex that accumulates retrieved papers.
+        """
+        if not sources:
+            raise ValueError("At least one retrieval source is required")
+        self.sources = dict(sources)
+        if isinstance(timeouts, dict):
+            self.timeouts = {name: float(timeouts.get(name, DEFAULT_TIMEOUT_SECONDS)) for name in self.sources}
+        else:
+            self.timeouts = {name: float(timeouts) for name in self.sources}
+        self.rrf_k = rrf_k
+        self.vector_index = vector_index
+        # A dedicated pool: timed-out searches keep running in the background without
+        # blocking event loop shutdown the way the default executor would, and spare
+        # threads let later queries proceed while a stuck search finishes.
+        self._executor = ThreadPoolExecutor(max_workers=4 * len(self.sources), thread_name_prefix="retrieval")
+        logger.info("MultiSourceRetriever initialized with sources: %s", sorted(self.sources))
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "MultiSourceRetriever":
+        """
+        Creates a MultiSourceRetriever using the `retrieval` section of the configuration.
+
+        Args:
+            config: The loaded configuration dictionary.
+
+        Returns:
+            A configured MultiSourceRetriever.
+        """
+        retrieval_config = config.get('retrieval') or {}
+        names = retrieval_config.get('sources') or ['arxiv', 'pubmed']
+        sources: Dict[str, SearchFunction] = {}
+        for name in names:
+            if name == 'arxiv':
+                sources[name] = ArxivRetriever.from_config(config).search_arxiv
+            elif name == 'pubmed':
+                sources[name] = PubmedRetriever.from_config(config).search_pubmed
+            else:
+                raise ValueError(f"Unknown retrieval source: {name}")
+        return cls(
+            sources,
+            timeouts=retrieval_config.get('timeout_seconds', DEFAULT_TIMEOUT_SECONDS),
+            rrf_k=retrieval_config.get('rrf_k', DEFAULT_RRF_K),
+            vector_index=create_vector_index(config)
+        )
+
+    async def _asearch_source(self, name: str, query: str, max_results: int) -> List[Dict[str, str]]:
+        """Runs one source in the worker pool, returning an empty list on error or timeout."""
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        with get_tracer().span("retrieval.source", source=name, timeout_seconds=self.timeouts[name]) as span:
+            try:
+                papers = await asyncio.wait_for(
+                    loop.run_in_executor(self._executor, self.sources[name], query, max_results),
+                    timeout=self.timeouts[name]
+                )
+            except asyncio.TimeoutError:
+                logger.warning("Retrieval source %s timed out after %ss for query: %s",
+                               name, self.timeouts[name], query)
+                span.set_attribute("timed_out", True)
+                return []
+            except Exception as e:
+                logger.exception("Retrieval source %s failed: %s", name, e)
+                span.record_exception(e)
+                return []
+            papers = papers or []
+            span.set_attribute("result.count", len(papers))
+        logger.info("Retrieval source %s returned %s papers in %.2fs.", name, len(papers), time.perf_counter() - start)
+        return papers
+
+    @traced("retrieval.search", record_args=("query", "max_results"))
+    async def asearch(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
+        """
+        Searches every source concurrently and fuses the results.
+
+        Args:
+            query: The search query.
+            max_results: The maximum number of results per source and after fusion.
+
+        Returns:
+            The fused, deduplicated papers, best first.
+        """
+        names = list(self.sources)
+        results = await asyncio.gather(*(self._asearch_source(name, query, max_results) for name in names))
+        fused = reciprocal_rank_fusion(dict(zip(names, results)), k=self.rrf_k)[:max_results]
+        logger.info("Fused %s results into %s papers for query: %s", sum(len(r) for r in results), len(fused), query)
+        if self.vector_index is not None and fused:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self.vector_index.add_papers, fused)
+        return fused
+
+    def search(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
+        """
+        Synchronous wrapper around `asearch`.
+
+        Args:
+            query: The search query.
+            max_results: The maximum number of results per source and after fusion.
+
+        Returns:
+            The fused, deduplicated papers, best first.
+        """
+        return asyncio.run(self.asearch(query, max_results))
+
+    def search_evidence(self, queries: List[str], top_k: int = 5) -> List[List[Dict[str, Any]]]:
+        """
+        Finds the previously retrieved papers most similar to each query, without contacting any source.
+
+        Args:
+            queries: The query texts (e.g. hypotheses).
+            top_k: The number of papers per query.
+
+        Returns:
+            One list of papers per query, most similar first; empty lists if no vector index is attached.
+        """
+        if self.vector_index is None:
+            return [[] for _ in queries]
+        return self.vector_index.search_batch(queries, top_k)
+
+    async def asearch_evidence(self, queries: List[str], top_k: int = 5) -> List[List[Dict[str, Any]]]:
+        """Asynchronous counterpart of `search_evidence`; the lookup runs in the worker pool."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.search_evidence, queries, top_k)
+
+    @traced("retrieval.expand_with_evidence", record_args=("papers", "queries", "top_k"))
+    def expand_with_evidence(self, papers: List[Dict[str, Any]], queries: List[str],
+                             top_k: int = DEFAULT_EVIDENCE_TOP_K) -> List[Dict[str, Any]]:
+        """
+        Appends locally stored evidence for each query to already retrieved papers.
+
+        Args:
+            papers: Papers retrieved for the research problem, best first.
+            queries: Additional query texts, e.g. the hypotheses under analysis.
+            top_k: Number of evidence papers per query.
+
+        Returns:
+            `papers` followed by the evidence, interleaved across queries by rank;
+            duplicates are left for the ContextBuilder to drop.
+        """
+        evidence = self.search_evidence(queries, top_k) if queries else []
+        return interleave_evidence(papers, evidence, top_k)
+
+    async def aexpand_with_evidence(self, papers: List[Dict[str, Any]], queries: List[str],
+                                    top_k: int = DEFAULT_EVIDENCE_TOP_K) -> List[Dict[str, Any]]:
+        """Asynchronous counterpart of `expand_with_evidence`; the lookup runs in the worker pool."""
+        evidence = await self.asearch_evidence(queries, top_k) if queries else []
+        return interleave_evidence(papers, evidence, top_k)
+
+    def close(self) -> None:
+        """Shuts down the worker pool without waiting for timed-out searches."""
+        self._executor.shutdown(wait=False)
+
+
+def create_retriever(config: Dict[str, Any]) -> Optional[MultiSourceRetriever]:
+    """
+    Creates the multi-source retriever if retrieval is enabled in the configuration.
+
+    Args:
+        config: The loaded configuration dictionary.
+
+    Returns:
+        A MultiSourceRetriever, or None if `retrieval.enabled` is false.
+    """
+    if not (config.get('retrieval') or {}).get('enabled', False):
+        return None
+    return MultiSourceRetriever.from_config(config)
+
+
+if __name__ == "__main__":
+    setup_logging()
+
+    # Example Usage:
+    # 1. Set `retrieval.enabled: true` in `configs/config.yaml`.
+    # 2. Run this script: `python -m src.knowledge_retrieval.multi_source_retriever`
+
+    retriever = MultiSourceRetriever.from_config({'retrieval': {'timeout_seconds': {'arxiv': 10, 'pubmed': 5}}})
+    for paper in retriever.search("cancer immunotherapy", max_results=5):
+        print(f"{paper['score']:.4f} {paper['sources']} {paper['title']}")
+    retriever.close()
@@ -0,0 +1,44 @@
+import re
+from typing import Dict, Any
+
+_NON_WORD_PATTERN = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize_title(title: str) -> str:
+    """
+    Normalizes a title for cross-source duplicate detection.
+
+    Args:
+        title: The paper title.
+
+    Returns:
+        The case-folded title with punctuation removed and whitespace collapsed.
+    """
+    return " ".join(_NON_WORD_PATTERN.sub(" ", title.casefold()).split())
+
+
+def normalize_doi(paper: Dict[str, Any]) -> str:
+    """
+    Returns a paper's DOI in canonical (stripped, lower-case) form.
+
+    Args:
+        paper: A paper dictionary.
+
+    Returns:
+        The DOI, or an empty string if the paper has none.
+    """
+    return (paper.get("doi") or "").strip().lower()
+
+
+def paper_key(paper: Dict[str, Any]) -> str:
+    """
+    Returns the identity used to deduplicate papers across sources.
+
+    Args:
+        paper: A paper dictionary.
+
+    Returns:
+        "doi:<doi>" if the paper has a DOI, otherwise "title:<normalized title>".
+    """
+    doi = normalize_doi(paper)
+    return f"doi:{doi}" if doi else f"title:{normalize_title(paper.get('title') or '')}"
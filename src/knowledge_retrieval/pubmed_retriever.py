@@ -1,92 +1,130 @@
 import sys
 import os
 import logging
-from typing import List, Dict, Any
-from pubmed_parser import parse_medline_xml, parse_pubmed_paragraph
-
-# Dynamically adjust sys.path to allow imports from the project root
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-if PROJECT_ROOT not in sys.path:
-    sys.path.insert(0, PROJECT_ROOT)
+import threading
+from typing import List, Dict, Any, Optional
 
 # Local imports
 try:
     from src.utils.logging_config import setup_logging
+    from src.knowledge_retrieval.local_index import LocalPaperIndex, iter_pubmed_articles, DEFAULT_INDEX_PATH
+    from src.knowledge_retrieval.retrieval_cache import RetrievalCache, get_retrieval_cache
 except ImportError as e:
     print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
     sys.exit(1)
 
-# Configure logging
-setup_logging()
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_XML_FILE = "data/pubmed_result.xml"
+
+
 class PubmedRetriever:
     """
     Module for retrieving research papers from PubMed.
+
+    Queries are answered from a persistent LocalPaperIndex. MEDLINE baseline and
+    update files are loaded with `python -m src.knowledge_retrieval.ingest pubmed`;
+    a small PubMed XML export at `xml_file` is streamed into the index on first use
+    if the index has no PubMed records yet.
     """
 
-    def __init__(self):
+    def __init__(self, index_path: str = DEFAULT_INDEX_PATH, xml_file: Optional[str] = DEFAULT_XML_FILE,
+                 cache: Optional[RetrievalCache] = None):
         """
         Initializes the PubmedRetriever.
+
+        Args:
+            index_path: Path to the local paper index.
+            xml_file: Optional PubMed XML file (optionally gzipped) to ingest when the index holds no PubMed records.
+            cache: Optional RetrievalCache for repeated or near-identical queries.
         """
+        self.index_path = index_path
+        self.xml_file = xml_file
+        self.cache = cache
+        self._index: Optional[LocalPaperIndex] = None
+        self._index_lock = threading.Lock()
         logger.info("PubmedRetriever initialized.")
 
-    def search_pubmed(self, query: str, max_results: int = 10) -> List[Dict[str, str]]:
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "PubmedRetriever":
         """
-        Searches PubMed for papers matching the given query.
+        Creates a PubmedRetriever using the `pubmed` section of the configuration.
 
         Args:
-            query: The search query.
-            max_results: The maximum number of results to return.  Note: PubMed API limits and requires handling.  This example uses a local XML file for demonstration.  A full implementation would require using the Entrez API with proper rate limiting and error handling.
+            config: The loaded configuration dictionary.
 
         Returns:
-            A list of dictionaries, where each dictionary represents a paper and contains its title, abstract, and PubMed ID.
+            A configured PubmedRetriever.
         """
-        try:
-            # This is a placeholder.  A real implementation would use the Entrez API.
-            # For demonstration purposes, we'll load data from a local XML file.
-            # Replace 'pubmed_result.xml' with the path to your PubMed XML file.
-            # You can obtain this XML file by searching PubMed and saving the results in XML format.
-
-            # Example using a dummy XML file (replace with your actual file)
-            xml_file = "data/pubmed_result.xml"  # Ensure this file exists or create a dummy one
+        pubmed_config = config.get('pubmed') or {}
+        return cls(index_path=pubmed_config.get('index_path', DEFAULT_INDEX_PATH),
+                   xml_file=pubmed_config.get('xml_file', DEFAULT_XML_FILE),
+                   cache=get_retrieval_cache(config))
+
+    def _get_index(self) -> LocalPaperIndex:
+        """Opens the index, building it from `xml_file` the first time if it has no PubMed records."""
+        # Searches of several sources run on worker threads; only the first one opens (and builds) the index.
+        if self._index is None:
+            with self._index_lock:
+                if self._index is None:
+                    index = LocalPaperIndex(self.index_path)
+                    if index.count(source="pubmed") == 0:
+                        if self.xml_file and os.path.exists(self.xml_file):
+                            logger.info("Building the PubMed index from %s.", self.xml_file)
+                            index.add_papers(iter_pubmed_articles(self.xml_file))
+                        else:
+                            logger.warning("PubMed index is empty. Ingest PubMed XML with "
+                                           "`python -m src.knowledge_retrieval.ingest pubmed`.")
+                    self._index = index
+        return self._index
 
-            if not os.path.exists(xml_file):
-                logger.warning("PubMed XML file not found. Returning empty list.  Please create a dummy file or implement Entrez API integration.")
-                return []
+    def search_pubmed(self, query: str, max_results: int = 10) -> List[Dict[str, str]]:
+        """
+        Searches PubMed for papers matching the given query.
 
-            with open(xml_file, 'r', encoding='utf-8') as f:
-                xml_data = f.read()
+        Args:
+            query: The search query.
+            max_results: The maximum number of results to return.
 
-            parsed_results = parse_medline_xml(xml_data, year_info_only=False)
+        Returns:
+            A list of dictionaries, where each dictionary represents a paper and contains its title, abstract, PubMed ID, URL and DOI.
+        """
+        if self.cache is not None:
+            cached = self.cache.get("pubmed", query, max_results)
+            if cached is not None:
+                logger.info("Retrieved %s cached PubMed papers for query: %s", len(cached), query)
+                return cached
 
+        try:
+            papers = self._get_index().search(query, max_results=max_results, source="pubmed")
             results = []
-            for i, paper in enumerate(parsed_results):
-                if i >= max_results:
-                    break
+            for paper in papers:
                 paper_info = {
-                    "title": paper.get('title', 'N/A'),
-                    "abstract": paper.get('abstract', 'N/A'),
-                    "pmid": paper.get('pmid', 'N/A')
+                    "title": paper["title"],
+                    "abstract": paper["abstract"],
+                    "pmid": paper["paper_id"].split(":", 1)[1],
+                    "url": paper["url"],
+                    "doi": paper["doi"]
                 }
                 results.append(paper_info)
 
-            logger.info(f"Retrieved {len(results)} papers from PubMed (using local XML) for query: {query}")
+            logger.info("Retrieved %s papers from the PubMed index for query: %s", len(results), query)
+            if self.cache is not None and results:
+                self.cache.set("pubmed", query, max_results, results)
             return results
 
-        except FileNotFoundError:
-            logger.error("PubMed XML file not found.  Please create a dummy file or implement Entrez API integration.")
-            return []
         except Exception as e:
-            logger.exception(f"Error searching PubMed: {e}")
+            logger.exception("Error searching PubMed: %s", e)
             return []
 
-
 if __name__ == "__main__":
+    setup_logging()
+
     # Example Usage:
-    # 1.  Create a dummy `data/pubmed_result.xml` file (or replace with a real PubMed XML file).
-    # 2.  Run this script: `python src/knowledge_retrieval/pubmed_retriever.py`
+    # 1.  Ingest PubMed XML: `python -m src.knowledge_retrieval.ingest pubmed pubmed25n0001.xml.gz`
+    #     (or place a PubMed XML export at `data/pubmed_result.xml`).
+    # 2.  Run this script: `python -m src.knowledge_retrieval.pubmed_retriever`
 
     # Instantiate the PubmedRetriever
     pubmed_retriever = PubmedRetriever()
@@ -0,0 +1,180 @@
+import sys
+import re
+import json
+import hashlib
+import logging
+import threading
+from typing import List, Dict, Any, Optional
+
+# Local imports
+try:
+    from src.utils.logging_config import setup_logging
+    from src.utils.response_cache import ResponseCache, DEFAULT_MAX_MEMORY_ENTRIES, DEFAULT_MAX_DISK_BYTES
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_RETRIEVAL_CACHE_PATH = "cache/retrieval.sqlite"
+DEFAULT_RETRIEVAL_TTL_SECONDS = 24 * 60 * 60
+
+STOPWORDS = frozenset("""
+a about above after again against all an and any are as at be because been before being below between both
+but by can did do does doing down during each few for from further had has have having how i if in into is
+it its itself just more most no nor not of off on once only or other our out over own same should so some
+such than that the their them then there these they this those through to too under until up very was we
+were what when where which while who whom why will with you your
+""".split())
+
+_QUERY_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalizes a search query so that near-identical queries share a cache entry.
+
+    Args:
+        query: The free-text search query.
+
+    Returns:
+        The distinct case-folded words of the query, minus stopwords, sorted and space-separated.
+        A query made only of stopwords keeps them rather than collapsing to an empty key.
+    """
+    tokens = set(_QUERY_TOKEN_PATTERN.findall(query.casefold()))
+    content_tokens = tokens - STOPWORDS
+    return " ".join(sorted(content_tokens or tokens))
+
+
+class RetrievalCache:
+    """
+    Cache of paper search results keyed by source and normalized query.
+
+    Storage, LRU eviction, TTL expiry and persistence are provided by a ResponseCache.
+    Each entry remembers the `max_results` it was fetched with, so a cached result
+    also answers any request for fewer papers (and any request at all if the source
+    returned fewer papers than were asked for).
+    """
+
+    def __init__(self, cache: ResponseCache):
+        """
+        Initializes the RetrievalCache.
+
+        Args:
+            cache: The underlying two-tier cache.
+        """
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        logger.info("RetrievalCache initialized.")
+
+    @staticmethod
+    def make_key(source: str, query: str) -> str:
+        """
+        Computes the cache key of a search.
+
+        Args:
+            source: The retrieval source (e.g. "arxiv/api").
+            query: The search query; it is normalized before hashing.
+
+        Returns:
+            A hex SHA-256 digest identifying the search.
+        """
+        payload = json.dumps({"source": source, "query": normalize_query(query)}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, source: str, query: str, max_results: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Looks up cached search results.
+
+        Args:
+            source: The retrieval source.
+            query: The search query.
+            max_results: The number of results requested.
+
+        Returns:
+            At most `max_results` cached papers, or None if no cached search covers the request.
+        """
+        value = self.cache.get(self.make_key(source, query))
+        papers = None
+        if value is not None:
+            entry = json.loads(value)
+            complete = len(entry["papers"]) < entry["max_results"]
+            if entry["max_results"] >= max_results or complete:
+                papers = entry["papers"][:max_results]
+        with self._lock:
+            if papers is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return papers
+
+    def set(self, source: str, query: str, max_results: int, papers: List[Dict[str, Any]]) -> None:
+        """
+        Stores search results.
+
+        Args:
+            source: The retrieval source.
+            query: The search query.
+            max_results: The number of results that was requested from the source.
+            papers: The papers the source returned.
+        """
+        value = json.dumps({"max_results": max_results, "papers": papers})
+        self.cache.set(self.make_key(source, query), value)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns hit/miss counters.
+
+        Returns:
+            A dictionary with hits and misses.
+        """
+        return {"hits": self.hits, "misses": self.misses}
+
+
+_shared_caches: Dict[Optional[str], RetrievalCache] = {}
+_shared_caches_lock = threading.Lock()
+
+
+def get_retrieval_cache(config: Dict[str, Any]) -> Optional[RetrievalCache]:
+    """
+    Returns the process-wide retrieval cache described by the `retrieval_cache` config section.
+
+    Args:
+        config: The loaded configuration dictionary.
+
+    Returns:
+        The shared RetrievalCache, or None if retrieval caching is disabled.
+    """
+    cache_config = config.get('retrieval_cache') or {}
+    if not cache_config.get('enabled', False):
+        return None
+
+    path = cache_config.get('path', DEFAULT_RETRIEVAL_CACHE_PATH)
+    with _shared_caches_lock:
+        cache = _shared_caches.get(path)
+        if cache is None:
+            cache = RetrievalCache(ResponseCache(
+                path=path,
+                max_memory_entries=cache_config.get('max_memory_entries', DEFAULT_MAX_MEMORY_ENTRIES),
+                max_disk_bytes=cache_config.get('max_disk_bytes', DEFAULT_MAX_DISK_BYTES),
+                ttl_seconds=cache_config.get('ttl_seconds', DEFAULT_RETRIEVAL_TTL_SECONDS)
+            ))
+            _shared_caches[path] = cache
+        return cache
+
+
+if __name__ == "__main__":
+    setup_logging()
+
+    # Example Usage:
+    # 1. Run this script: `python -m src.knowledge_retrieval.retrieval_cache`
+
+    cache = RetrievalCache(ResponseCache(path=None))
+    cache.set("arxiv/api", "Quantum Computing", 10, [{"title": f"Paper {i}"} for i in range(10)])
+    print(normalize_query("The state of quantum computing"))
+    print(cache.get("arxiv/api", "computing, quantum", 3))
+    print(cache.get("arxiv/api", "quantum computing", 20))
+    print(f"Cache stats: {cache.stats()}")
@@ -0,0 +1,353 @@
+import sys
+import os
+import re
+import json
+import zlib
+import logging
+import threading
+from typing import List, Dict, Any, Optional, Iterable
+
+# Local imports
+try:
+    from src.utils.logging_config import setup_logging
+    from src.knowledge_retrieval.papers import paper_key
+    from src.utils.lazy_import import LazyModule
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+np = LazyModule("numpy", install_hint="numpy")
+
+DEFAULT_VECTOR_INDEX_PATH = "data/index/vectors"
+DEFAULT_HASHING_DIM = 1024
+DEFAULT_SENTENCE_TRANSFORMER_MODEL = "all-MiniLM-L6-v2"
+DEFAULT_EMBED_BATCH_SIZE = 256
+# Rows scored per matrix product; bounds the temporary score matrix for large indexes.
+SEARCH_CHUNK_ROWS = 65536
+# Per-query ranking fields (fusion score, contributing sources, similarity) that are not stored.
+RANKING_FIELDS = ("score", "sources", "similarity")
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def _normalize_rows(vectors: "np.ndarray") -> "np.ndarray":
+    """L2-normalizes each row in place (zero rows stay zero) and returns the array."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+
+class HashingEmbedder:
+    """
+    Dependency-free embedder based on the hashing trick.
+
+    Words and word bigrams are hashed (with a stable CRC32, so vectors are identical
+    across processes) into `dim` signed buckets. Semantically weaker than a neural
+    model, but instant, deterministic and good enough for keyword-heavy abstracts.
+    """
+
+    def __init__(self, dim: int = DEFAULT_HASHING_DIM):
+        """
+        Initializes the HashingEmbedder.
+
+        Args:
+            dim: The embedding dimension.
+        """
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _features(self, text: str) -> List[str]:
+        tokens = _TOKEN_PATTERN.findall(text.casefold())
+        return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    def embed(self, texts: List[str]) -> "np.ndarray":
+        """
+        Embeds a batch of texts.
+
+        Args:
+            texts: The texts to embed.
+
+        Returns:
+            A (len(texts), dim) float32 array.
+        """
+        rows, columns, signs = [], [], []
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = zlib.crc32(feature.encode("utf-8"))
+                rows.append(row)
+                columns.append(digest % self.dim)
+                signs.append(1.0 if digest & 0x80000000 else -1.0)
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        if rows:
+            np.add.at(vectors, (np.array(rows), np.array(columns)), np.array(signs, dtype=np.float32))
+        # Sublinear term frequency, so repeated words do not dominate.
+        np.copyto(vectors, np.sign(vectors) * np.log1p(np.abs(vectors)))
+        return vectors
+
+
+class SentenceTransformerEmbedder:
+    """
+    CPU-friendly neural embedder backed by a local sentence-transformers model.
+
+    Requires the optional `sentence-transformers` package.
+    """
+
+    def __init__(self, model_name: str = DEFAULT_SENTENCE_TRANSFORMER_MODEL, device: str = "cpu"):
+        """
+        Initializes the SentenceTransformerEmbedder.
+
+        Args:
+            model_name: The sentence-transformers model to load.
+            device: The torch device to run on.
+        """
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "The sentence_transformers embedder requires `pip install sentence-transformers`; "
+                "use the hashing embedder otherwise."
+            ) from e
+        self.model = SentenceTransformer(model_name, device=device)
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = f"sentence-transformers-{model_name}"
+
+    def embed(self, texts: List[str]) -> "np.ndarray":
+        """
+        Embeds a batch of texts.
+
+        Args:
+            texts: The texts to embed.
+
+        Returns:
+            A (len(texts), dim) float32 array.
+        """
+        return np.asarray(self.model.encode(texts, convert_to_numpy=True), dtype=np.float32)
+
+
+def get_embedder(config: Dict[str, Any]) -> Any:
+    """
+    Creates the embedder described by the `vector_index` config section.
+
+    Args:
+        config: The loaded configuration dictionary.
+
+    Returns:
+        A HashingEmbedder or SentenceTransformerEmbedder.
+    """
+    index_config = config.get('vector_index') or {}
+    embedder = index_config.get('embedder', 'hashing')
+    if embedder == 'hashing':
+        return HashingEmbedder(dim=index_config.get('dim', DEFAULT_HASHING_DIM))
+    if embedder == 'sentence_transformers':
+        return SentenceTransformerEmbedder(model_name=index_config.get('model_name', DEFAULT_SENTENCE_TRANSFORMER_MODEL))
+    raise ValueError(f"Unknown embedder: {embedder}")
+
+
+class VectorIndex:
+    """
+    Append-only semantic index over paper titles and abstracts.
+
+    Unit-normalized float32 vectors are appended to `<path>/vectors.f32` and searched
+    through a read-only memory map, so the index costs 4 * dim bytes per paper on disk
+    and is paged in by the OS rather than loaded up front. Paper metadata is kept
+    alongside in `<path>/papers.jsonl`. With `path=None` the index lives in memory.
+    """
+
+    def __init__(self, embedder: Any, path: Optional[str] = DEFAULT_VECTOR_INDEX_PATH):
+        """
+        Opens (or creates) the index.
+
+        Args:
+            embedder: Object with a `dim`, a `name` and an `embed(texts) -> ndarray` method.
+            path: Directory holding the index files, or None for an in-memory index.
+        """
+        self.embedder = embedder
+        self.dim = embedder.dim
+        self.path = path
+        self._lock = threading.Lock()
+        self._papers: List[Dict[str, Any]] = []
+        self._keys = set()
+        self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+
+        if path:
+            os.makedirs(path, exist_ok=True)
+            self._vectors_path = os.path.join(path, "vectors.f32")
+            self._papers_path = os.path.join(path, "papers.jsonl")
+            info_path = os.path.join(path, "index.json")
+            info = {"embedder": embedder.name, "dim": self.dim}
+            if os.path.exists(info_path):
+                with open(info_path, "r", encoding="utf-8") as f:
+                    stored = json.load(f)
+                if stored != info:
+                    raise ValueError(f"Vector index at {path} was built with {stored}, not {info}; rebuild it.")
+            else:
+                with open(info_path, "w", encoding="utf-8") as f:
+                    json.dump(info, f)
+            self._load()
+        logger.info("VectorIndex opened at %s with %s papers.", path, len(self))
+
+    def _load(self) -> None:
+        """Reads paper metadata and maps the stored vectors."""
+        if os.path.exists(self._papers_path):
+            with open(self._papers_path, "r", encoding="utf-8") as f:
+                self._papers = [json.loads(line) for line in f if line.strip()]
+        stored_rows = os.path.getsize(self._vectors_path) // (4 * self.dim) if os.path.exists(self._vectors_path) else 0
+        # An interrupted write may leave one file ahead of the other; cut both back to the shorter one.
+        count = min(stored_rows, len(self._papers))
+        if stored_rows > count:
+            os.truncate(self._vectors_path, count * 4 * self.dim)
+        if len(self._papers) > count:
+            self._papers = self._papers[:count]
+            with open(self._papers_path, "w", encoding="utf-8") as f:
+                for paper in self._papers:
+                    f.write(json.dumps(paper) + "\n")
+        self._keys = {paper_key(paper) for paper in self._papers}
+        self._remap(count)
+
+    def _remap(self, count: int) -> None:
+        """Maps the first `count` stored vectors read-only."""
+        if count == 0:
+            self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+        else:
+            self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(count, self.dim))
+
+    def __len__(self) -> int:
+        return len(self._papers)
+
+    def add_papers(self, papers: Iterable[Dict[str, Any]], batch_size: int = DEFAULT_EMBED_BATCH_SIZE) -> int:
+        """
+        Embeds and stores papers that are not yet in the index.
+
+        A paper only counts as indexed once its vector and metadata are written, so
+        papers of a batch whose embedding fails are embedded again on the next call.
+
+        Args:
+            papers: Paper dictionaries with `title` and `abstract`.
+            batch_size: Number of papers embedded per call to the embedder.
+
+        Returns:
+            The number of papers added.
+        """
+        with self._lock:
+            new_keys, new_papers, seen = [], [], set()
+            for paper in papers:
+                key = paper_key(paper)
+                if key not in self._keys and key not in seen:
+                    seen.add(key)
+                    new_keys.append(key)
+                    new_papers.append({field: value for field, value in paper.items() if field not in RANKING_FIELDS})
+            if not new_papers:
+                return 0
+
+            added = 0
+            try:
+                for start in range(0, len(new_papers), batch_size):
+                    batch = new_papers[start:start + batch_size]
+                    vectors = self.embedder.embed([f"{p.get('title', '')}. {p.get('abstract', '')}" for p in batch])
+                    vectors = _normalize_rows(np.ascontiguousarray(vectors, dtype=np.float32))
+                    if self.path:
+                        with open(self._vectors_path, "ab") as f:
+                            f.write(vectors.tobytes())
+                        with open(self._papers_path, "a", encoding="utf-8") as f:
+                            for paper in batch:
+                                f.write(json.dumps(paper) + "\n")
+                    else:
+                        self._vectors = np.concatenate([self._vectors, vectors])
+                    self._papers.extend(batch)
+                    self._keys.update(new_keys[start:start + batch_size])
+                    added += len(batch)
+            finally:
+                if self.path and added:
+                    self._remap(len(self._papers))
+        logger.info("Added %s papers to the vector index (%s total).", len(new_papers), len(self))
+        return len(new_papers)
+
+    def search(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
+        """
+        Finds the papers most similar to a query.
+
+        Args:
+            query: The query text.
+            top_k: The number of papers to return.
+
+        Returns:
+            Up to `top_k` paper dictionaries, most similar first, each with a cosine `similarity`.
+        """
+        return self.search_batch([query], top_k)[0]
+
+    def search_batch(self, queries: List[str], top_k: int = 5) -> List[List[Dict[str, Any]]]:
+        """
+        Finds the papers most similar to each of several queries in one pass over the index.
+
+        Args:
+            queries: The query texts.
+            top_k: The number of papers to return per query.
+
+        Returns:
+            One list of up to `top_k` papers per query, most similar first.
+        """
+        if not queries:
+            return []
+        query_vectors = _normalize_rows(np.ascontiguousarray(self.embedder.embed(queries), dtype=np.float32))
+        with self._lock:
+            vectors, papers = self._vectors, self._papers
+        count = min(len(vectors), len(papers))
+        k = min(top_k, count)
+        if k <= 0:
+            return [[] for _ in queries]
+
+        # Keep a running top-k per query while scoring the index chunk by chunk.
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+        for start in range(0, count, SEARCH_CHUNK_ROWS):
+            chunk = np.asarray(vectors[start:min(start + SEARCH_CHUNK_ROWS, count)])
+            scores = np.concatenate([best_scores, query_vectors @ chunk.T], axis=1)
+            rows = np.concatenate([best_rows, np.broadcast_to(
+                np.arange(start, start + len(chunk)), (len(queries), len(chunk)))], axis=1)
+            if scores.shape[1] > k:
+                keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                scores = np.take_along_axis(scores, keep, axis=1)
+                rows = np.take_along_axis(rows, keep, axis=1)
+            best_scores, best_rows = scores, rows
+
+        order = np.argsort(-best_scores, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+        return [
+            [dict(papers[row], similarity=float(score)) for row, score in zip(row_ids, row_scores)]
+            for row_ids, row_scores in zip(best_rows, best_scores)
+        ]
+
+
+def create_vector_index(config: Dict[str, Any]) -> Optional[VectorIndex]:
+    """
+    Creates the vector index if it is enabled in the configuration.
+
+    Args:
+        config: The loaded configuration dictionary.
+
+    Returns:
+        A VectorIndex, or None if `vector_index.enabled` is false.
+    """
+    index_config = config.get('vector_index') or {}
+    if not index_config.get('enabled', False):
+        return None
+    return VectorIndex(get_embedder(config), path=index_config.get('path', DEFAULT_VECTOR_INDEX_PATH))
+
+
+if __name__ == "__main__":
+    setup_logging()
+
+    # Example Usage:
+    # 1. Run this script: `python -m src.knowledge_retrieval.vector_index`
+
+    index = VectorIndex(HashingEmbedder(), path=None)
+    index.add_papers([
+        {"title": "Coral bleaching under ocean warming", "abstract": "Heat stress expels symbiotic algae."},
+        {"title": "Graph neural networks", "abstract": "Message passing over molecular graphs."},
+        {"title": "Ocean acidification and reef calcification", "abstract": "Lower pH slows coral growth."},
+    ])
+    for paper in index.search("why do corals bleach when the ocean warms", top_k=2):
+        print(f"{paper['similarity']:.3f}  {paper['title']}")
@@ -1,13 +1,10 @@
 import sys
-import os
+import json
+import asyncio
 import logging
+import argparse
 import yaml
-from typing import Dict, Any
-
-# Dynamically adjust sys.path to allow imports from the project root
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-if PROJECT_ROOT not in sys.path:
-    sys.path.insert(0, PROJECT_ROOT)
+from typing import Dict, Any, List, Tuple, Optional, AsyncIterator
 
 # Local imports
 try:
@@ -15,16 +12,26 @@ try:
     from src.agents.data_scientist_agent import DataScientistAgent
     from src.agents.experiment_agent import ExperimentAgent
     from src.agents.critic_agent import CriticAgent
-    from src.utils.logging_config import setup_logging
+    from src.pipeline.refinement_loop import RefinementLoop
+    from src.pipeline.research_pipeline import ResearchPipeline, load_research_problems
+    from src.pipeline.run_store import RunStore, RunCheckpoint, new_run_id, run_stage, astream_stage
+    from src.knowledge_retrieval.multi_source_retriever import create_retriever
+    from src.utils.gemini_api import GeminiAPI
+    from src.utils.metrics import get_metrics_registry
+    from src.utils.tracing import configure_tracing, get_tracer
+    from src.utils.logging_config import setup_logging, shutdown_logging, Truncated
 except ImportError as e:
     print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
     sys.exit(1)
 
 
-# Configure logging
-setup_logging()
 logger = logging.getLogger(__name__)
 
+DEFAULT_METRICS_SUMMARY_PATH = "logs/metrics_summary.json"
+DEFAULT_METRICS_PROMETHEUS_PATH = "logs/metrics.prom"
+DEFAULT_RESEARCH_PROBLEM = "create a nonconvex optimizer algorithm that humankind does not know about."
+LATEST_RUN = "latest"
+
 
 def load_config(config_path: str) -> Dict[str, Any]:
     """Loads configuration from a YAML file.
@@ -40,48 +47,273 @@ def load_config(config_path: str) -> Dict[str, Any]:
             config = yaml.safe_load(f)
         return config
     except FileNotFoundError:
-        logger.error(f"Configuration file not found: {config_path}")
+        logger.error("Configuration file not found: %s", config_path)
         raise
     except yaml.YAMLError as e:
-        logger.error(f"Error parsing configuration file: {e}")
+        logger.error("Error parsing configuration file: %s", e)
         raise
 
 
-def main():
-    """Main function to orchestrate the ARES system."""
+def create_agents(config: Dict[str, Any]) -> Tuple[TheoristAgent, DataScientistAgent, ExperimentAgent, CriticAgent]:
+    """Creates the four agents around a single shared GeminiAPI client.
+
+    Args:
+        config: The loaded configuration dictionary.
+
+    Returns:
+        A (theorist, data_scientist, experiment_agent, critic) tuple.
+    """
+    gemini_api = GeminiAPI.from_config(config)
+    return (
+        TheoristAgent(config=config, gemini_api=gemini_api),
+        DataScientistAgent(config=config, gemini_api=gemini_api),
+        ExperimentAgent(config=config, gemini_api=gemini_api),
+        CriticAgent(config=config, gemini_api=gemini_api),
+    )
+
+
+async def run_iteration_async(theorist: TheoristAgent, data_scientist: DataScientistAgent,
+                              experiment_agent: ExperimentAgent, critic: CriticAgent,
+                              research_problem: str) -> Dict[str, Any]:
+    """Runs one Theorist -> DataScientist -> Experiment -> Critic iteration asynchronously.
+
+    Many iterations can be awaited together (e.g. with `asyncio.gather`); the shared
+    GeminiAPI's request semaphore bounds how many model calls are in flight.
+
+    Args:
+        theorist: The TheoristAgent instance.
+        data_scientist: The DataScientistAgent instance.
+        experiment_agent: The ExperimentAgent instance.
+        critic: The CriticAgent instance.
+        research_problem: A string describing the research problem.
+
+    Returns:
+        A dictionary with the outputs of every stage.
+    """
+    hypotheses = await theorist.agenerate_hypotheses(research_problem)
+    data_analysis_results = await data_scientist.aanalyze_data(research_problem, hypotheses)
+    experiment_results = await experiment_agent.arun_simulation(hypotheses, data_analysis_results)
+    refined_hypotheses = await critic.arefine_hypotheses(hypotheses, experiment_results)
+    return {
+        "research_problem": research_problem,
+        "hypotheses": hypotheses,
+        "data_analysis_results": data_analysis_results,
+        "experiment_results": experiment_results,
+        "refined_hypotheses": refined_hypotheses,
+    }
+
+
+async def run_problems_async(config: Dict[str, Any], research_problems: List[str]) -> List[Dict[str, Any]]:
+    """Runs one iteration for each research problem concurrently.
+
+    Args:
+        config: The loaded configuration dictionary.
+        research_problems: A list of research problem descriptions.
+
+    Returns:
+        A list of per-problem iteration results, in input order.
+    """
+    theorist, data_scientist, experiment_agent, critic = create_agents(config)
+    return await asyncio.gather(*(
+        run_iteration_async(theorist, data_scientist, experiment_agent, critic, problem)
+        for problem in research_problems
+    ))
+
+
+def run_batch(config: Dict[str, Any], problems_path: str, output_path: Optional[str] = None,
+              checkpoint: Optional[RunCheckpoint] = None) -> List[Dict[str, Any]]:
+    """Runs every research problem in `problems_path` through the staged pipeline.
+
+    Args:
+        config: The loaded configuration dictionary.
+        problems_path: Path to a JSONL or YAML file of research problems.
+        output_path: Optional path of a JSONL file to write per-problem results to.
+        checkpoint: Optional RunCheckpoint; stages completed by an earlier attempt of the run are skipped.
+
+    Returns:
+        A list of per-problem results, in input order.
+    """
+    research_problems = load_research_problems(problems_path)
+    retriever = create_retriever(config)
     try:
-        config = load_config("configs/config.yaml")
+        pipeline = ResearchPipeline.from_config(config, *create_agents(config), retriever=retriever,
+                                                checkpoint=checkpoint)
+        results = pipeline.run(research_problems)
+    finally:
+        if retriever is not None:
+            retriever.close()
 
-        # Initialize agents
-        theorist = TheoristAgent(config=config)
-        data_scientist = DataScientistAgent(config=config)
-        experiment_agent = ExperimentAgent(config=config)
-        critic = CriticAgent(config=config)
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+        logger.info("Wrote %s results to %s", len(results), output_path)
+    return results
 
-        # Example usage: Define a research problem
-        research_problem = "create a nonconvex optimizer algorithm that humankind does not know about."
-        logger.info(f"Research Problem: {research_problem}")
 
-        # Theorist generates hypotheses
-        hypotheses = theorist.generate_hypotheses(research_problem)
-        logger.info(f"Generated Hypotheses: {hypotheses}")
+def run_single(config: Dict[str, Any], research_problem: str = DEFAULT_RESEARCH_PROBLEM,
+               checkpoint: Optional[RunCheckpoint] = None) -> Dict[str, Any]:
+    """Runs one research problem: retrieval, then the refinement loop fed by the streamed Theorist hypotheses.
 
-        # Data Scientist analyzes existing data
-        data_analysis_results = data_scientist.analyze_data(research_problem, hypotheses)
-        logger.info(f"Data Analysis Results: {data_analysis_results}")
+    Args:
+        config: The loaded configuration dictionary.
+        research_problem: A string describing the research problem.
+        checkpoint: Optional RunCheckpoint; stages completed by an earlier attempt of the run are skipped.
 
-        # Experiment Agent designs and runs simulations
-        experiment_results = experiment_agent.run_simulation(hypotheses, data_analysis_results)
-        logger.info(f"Experiment Results: {experiment_results}")
+    Returns:
+        The refinement loop's outcome.
+    """
+    theorist, data_scientist, experiment_agent, critic = create_agents(config)
+    logger.info("Research Problem: %s", research_problem)
 
-        # Critic refines hypotheses based on results
-        refined_hypotheses = critic.refine_hypotheses(hypotheses, experiment_results)
-        logger.info(f"Refined Hypotheses: {refined_hypotheses}")
+    # Retrieve related papers from all enabled sources concurrently
+    papers = None
+    retriever = create_retriever(config)
+    try:
+        if retriever is not None:
+            max_results = (config.get('retrieval') or {}).get('max_results', 10)
+            papers = run_stage(checkpoint, "retrieval",
+                               {"research_problem": research_problem, "max_results": max_results},
+                               lambda: {"papers": retriever.search(research_problem, max_results)})["papers"]
+            logger.info("Retrieved %s papers: %s", len(papers),
+                        Truncated([paper['title'] for paper in papers]))
+
+        # Theorist streams hypotheses; each is analysed and simulated as soon as it is complete
+        async def generate_hypotheses() -> AsyncIterator[str]:
+            count = 0
+            async for hypothesis in theorist.astream_hypotheses(research_problem):
+                count += 1
+                logger.info("Hypothesis %s: %s", count, Truncated(hypothesis))
+                yield hypothesis
+
+        hypotheses = astream_stage(checkpoint, "theorist", {"research_problem": research_problem}, "hypotheses",
+                                   generate_hypotheses)
+
+        # Add locally indexed evidence for the hypotheses under analysis; the DataScientist prompt is token-budgeted.
+        add_evidence = None
+        if retriever is not None:
+            add_evidence = lambda analysed: retriever.aexpand_with_evidence(papers, analysed)
+
+        # Data Scientist, Experiment Agent and Critic refine the hypotheses over several rounds
+        refinement = RefinementLoop.from_config(config, data_scientist, experiment_agent, critic)
+        outcome = refinement.run(research_problem, hypotheses, papers=papers, checkpoint=checkpoint,
+                                 add_evidence=add_evidence)
+    finally:
+        if retriever is not None:
+            retriever.close()
+    for round_info in outcome["rounds"]:
+        logger.info("Round %s Experiment Results: %s", round_info['round'],
+                    Truncated(round_info['experiment_results']))
+        logger.info("Round %s Refined Hypotheses: %s", round_info['round'],
+                    Truncated(round_info['refined_hypotheses']))
+
+    logger.info("ARES system completed %s iterations (%s).", len(outcome['rounds']), outcome['stop_reason'])
+    return outcome
+
+
+def open_run(config: Dict[str, Any], args: argparse.Namespace) -> Tuple[Optional[RunStore], Optional[RunCheckpoint]]:
+    """Opens the run store and starts (or, with `--resume`, resumes) a checkpointed run.
+
+    Checkpointing is on when `checkpoint.enabled` is set or `--resume` is given. A resumed
+    batch run reuses the problems and output files it was started with unless new ones are given.
+
+    Args:
+        config: The loaded configuration dictionary.
+        args: The parsed command-line arguments; `problems` and `output` may be filled in.
+
+    Returns:
+        The RunStore and the run's RunCheckpoint, or (None, None) when checkpointing is off.
+    """
+    if not ((config.get('checkpoint') or {}).get('enabled', False) or args.resume):
+        return None, None
+    store = RunStore.from_config(config)
+    if args.resume:
+        run_id = store.latest_run_id() if args.resume == LATEST_RUN else args.resume
+        run = store.get_run(run_id) if run_id else None
+        if run is None:
+            store.close()
+            raise ValueError(f"No run {args.resume!r} to resume in {store.path}")
+        args.problems = args.problems or run["metadata"].get("problems")
+        args.output = args.output or run["metadata"].get("output")
+        logger.info("Resuming run %s (completed stages: %s).", run_id, len(store.completed_stages(run_id)))
+    else:
+        run_id = new_run_id()
+        logger.info("Started run %s (resume it with: --resume %s).", run_id, run_id)
+    store.start_run(run_id, {"mode": "batch" if args.problems else "single",
+                             "problems": args.problems, "output": args.output})
+    return store, store.checkpoint(run_id)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parses command-line arguments.
+
+    Args:
+        argv: Optional argument list (defaults to `sys.argv[1:]`).
+
+    Returns:
+        The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="ARES: Autonomous Research & Experimentation System")
+    parser.add_argument("--config", default="configs/config.yaml", help="Path to the YAML configuration file.")
+    parser.add_argument("--problems", help="JSONL or YAML file of research problems to run as a pipelined batch.")
+    parser.add_argument("--output", help="JSONL file to write batch results to.")
+    parser.add_argument("--resume", nargs="?", const=LATEST_RUN, metavar="RUN_ID",
+                        help="Resume a checkpointed run (default: the latest), skipping its completed stages.")
+    return parser.parse_args(argv)
+
+
+def report_metrics(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Logs the model-call metrics summary and writes it to the files named in the `metrics` config section.
+
+    Args:
+        config: The loaded configuration dictionary.
+
+    Returns:
+        The metrics summary.
+    """
+    metrics_config = config.get('metrics') or {}
+    registry = get_metrics_registry()
+    summary = registry.summary()
+    logger.info("Model call metrics: %s", json.dumps(summary))
+    try:
+        registry.write(summary_path=metrics_config.get('summary_path', DEFAULT_METRICS_SUMMARY_PATH),
+                       prometheus_path=metrics_config.get('prometheus_path', DEFAULT_METRICS_PROMETHEUS_PATH))
+    except OSError as e:
+        logger.error("Error writing metrics: %s", e)
+    return summary
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main function to orchestrate the ARES system."""
+    setup_logging()
+    args = parse_args(argv)
+    config: Dict[str, Any] = {}
+    store, checkpoint = None, None
+    status = "failed"
+    try:
+        config = load_config(args.config)
+        setup_logging(settings=config.get('logging'), force=True)
+        store, checkpoint = open_run(config, args)
 
-        logger.info("ARES system completed one iteration.")
+        tracer = configure_tracing(config)
+        with tracer.span("ares.run", mode="batch" if args.problems else "single",
+                         run_id=checkpoint.run_id if checkpoint else None):
+            if args.problems:
+                run_batch(config, args.problems, args.output, checkpoint=checkpoint)
+            else:
+                run_single(config, checkpoint=checkpoint)
+        status = "completed"
 
     except Exception as e:
-        logger.exception(f"An error occurred: {e}")
+        logger.exception("An error occurred: %s", e)
+    finally:
+        if store is not None:
+            store.finish_run(checkpoint.run_id, status)
+            store.close()
+        report_metrics(config or {})
+        get_tracer().shutdown()
+        shutdown_logging()
 
 
 if __name__ == "__main__":
@@ -89,5 +321,7 @@ if __name__ == "__main__":
 
     # Example Usage:
     # 1. Ensure you have a `configs/config.yaml` file with necessary API keys and settings.
-    # 2. Run the script: `python src/main.py`
+    # 2. Run the script: `python -m src.main`
+    #    or run a pipelined batch: `python -m src.main --problems problems.jsonl --output results.jsonl`
+    #    With `checkpoint.enabled: true`, continue an interrupted run with: `python -m src.main --resume`
     # 3. Check the logs for the output of each agent and the overall process.
\ No newline at end of file
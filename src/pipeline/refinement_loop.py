@@ -0,0 +1,375 @@
+import sys
+import time
+import asyncio
+import logging
+from difflib import SequenceMatcher
+from typing import List, Dict, Any, Optional, Tuple, Union, Callable, Awaitable, AsyncIterable
+
+# Local imports
+try:
+    from src.utils.logging_config import setup_logging
+    from src.utils.tracing import traced, get_current_span
+    from src.utils.tokens import estimate_tokens, estimate_tokens_many
+    from src.pipeline.run_store import RunCheckpoint, arun_stage, inputs_digest
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_MAX_ROUNDS = 3
+DEFAULT_SIMILARITY_THRESHOLD = 0.9
+DEFAULT_STREAM_BATCH_SIZE = 3
+
+Papers = Optional[List[Dict[str, Any]]]
+AddEvidence = Callable[[List[str]], Awaitable[Papers]]
+
+
+def hypothesis_similarity(a: str, b: str) -> float:
+    """
+    Returns a similarity ratio in [0, 1] between two hypotheses.
+
+    Args:
+        a: The first hypothesis.
+        b: The second hypothesis.
+
+    Returns:
+        1.0 for identical hypotheses (ignoring case and surrounding whitespace), lower for less similar ones.
+    """
+    a, b = a.strip().lower(), b.strip().lower()
+    if a == b:
+        return 1.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def best_match(hypothesis: str, candidates: List[str]) -> Tuple[Optional[str], float]:
+    """
+    Finds the candidate most similar to `hypothesis`.
+
+    Args:
+        hypothesis: The hypothesis to match.
+        candidates: The hypotheses to compare against.
+
+    Returns:
+        A (best candidate, similarity) tuple, or (None, 0.0) if there are no candidates.
+    """
+    best, best_score = None, 0.0
+    for candidate in candidates:
+        score = hypothesis_similarity(hypothesis, candidate)
+        if score > best_score:
+            best, best_score = candidate, score
+            if score == 1.0:
+                break
+    return best, best_score
+
+
+class RefinementLoop:
+    """
+    Multi-round DataScientist -> Experiment -> Critic refinement loop.
+
+    Each round the Critic's refined hypotheses are fed back in. Hypotheses that are
+    (nearly) unchanged reuse the analysis and experiment results of their previous
+    version, so only new or reworded hypotheses are re-evaluated. The loop stops when
+    the hypothesis set is stable, or when the round, token or time budget runs out.
+
+    The initial hypotheses may be an async stream (e.g. `TheoristAgent.astream_hypotheses`).
+    The first round then analyses and simulates them in batches of `stream_batch_size`
+    as they arrive, while the later ones are still being generated. Each batch costs one
+    DataScientist and one Experiment call, so smaller batches start work sooner but make
+    more paid calls than evaluating the whole list at once.
+
+    With a RunCheckpoint, every agent call of every round is stored, so a resumed
+    run replays completed rounds from the store instead of calling the agents again.
+    """
+
+    def __init__(self, data_scientist: Any, experiment_agent: Any, critic: Any,
+                 max_rounds: int = DEFAULT_MAX_ROUNDS,
+                 similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+                 max_tokens: Optional[int] = None, max_seconds: Optional[float] = None,
+                 stream_batch_size: int = DEFAULT_STREAM_BATCH_SIZE):
+        """
+        Initializes the RefinementLoop.
+
+        Args:
+            data_scientist: The DataScientistAgent instance.
+            experiment_agent: The ExperimentAgent instance.
+            critic: The CriticAgent instance.
+            max_rounds: Maximum number of refinement rounds.
+            similarity_threshold: Similarity at which a hypothesis counts as unchanged.
+            max_tokens: Optional budget of estimated prompt and response tokens.
+            max_seconds: Optional wall-clock budget in seconds.
+            stream_batch_size: Streamed hypotheses evaluated together in the first round.
+        """
+        if max_rounds < 1:
+            raise ValueError("max_rounds must be at least 1")
+        if stream_batch_size < 1:
+            raise ValueError("stream_batch_size must be at least 1")
+        if not 0.0 < similarity_threshold <= 1.0:
+            raise ValueError("similarity_threshold must be in (0, 1]")
+        self.data_scientist = data_scientist
+        self.experiment_agent = experiment_agent
+        self.critic = critic
+        self.max_rounds = max_rounds
+        self.similarity_threshold = similarity_threshold
+        self.max_tokens = max_tokens
+        self.max_seconds = max_seconds
+        self.stream_batch_size = stream_batch_size
+        logger.info("RefinementLoop initialized.")
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], data_scientist: Any, experiment_agent: Any,
+                    critic: Any) -> "RefinementLoop":
+        """
+        Creates a RefinementLoop using the `refinement` section of the configuration.
+
+        Args:
+            config: The loaded configuration dictionary.
+            data_scientist: The DataScientistAgent instance.
+            experiment_agent: The ExperimentAgent instance.
+            critic: The CriticAgent instance.
+
+        Returns:
+            A configured RefinementLoop.
+        """
+        refinement_config = config.get('refinement') or {}
+        return cls(
+            data_scientist, experiment_agent, critic,
+            max_rounds=refinement_config.get('max_rounds', DEFAULT_MAX_ROUNDS),
+            similarity_threshold=refinement_config.get('similarity_threshold', DEFAULT_SIMILARITY_THRESHOLD),
+            max_tokens=refinement_config.get('max_tokens'),
+            max_seconds=refinement_config.get('max_seconds'),
+            stream_batch_size=refinement_config.get('stream_batch_size', DEFAULT_STREAM_BATCH_SIZE)
+        )
+
+    def is_converged(self, previous: List[str], current: List[str]) -> bool:
+        """
+        Checks whether two hypothesis sets are the same up to the similarity threshold.
+
+        Args:
+            previous: The hypotheses of the previous round.
+            current: The hypotheses of the current round.
+
+        Returns:
+            True if both sets have the same size and every hypothesis has a close match.
+        """
+        if len(previous) != len(current):
+            return False
+        return all(best_match(h, previous)[1] >= self.similarity_threshold for h in current)
+
+    @traced("refinement.run", record_args=("research_problem", "hypotheses", "papers"))
+    async def arun(self, research_problem: str, hypotheses: Union[List[str], AsyncIterable[str]],
+                   papers: Papers = None, checkpoint: Optional[RunCheckpoint] = None,
+                   add_evidence: Optional[AddEvidence] = None) -> Dict[str, Any]:
+        """
+        Runs refinement rounds starting from the given hypotheses.
+
+        Args:
+            research_problem: A string describing the research problem.
+            hypotheses: The initial hypotheses (typically from the TheoristAgent), as a list or an async stream.
+            papers: Optional retrieved papers passed to every DataScientist analysis.
+            checkpoint: Optional RunCheckpoint storing (and, on resume, reusing) each round's agent outputs.
+            add_evidence: Optional coroutine function returning `papers` plus evidence for the given
+                hypotheses; every analysis then sees the evidence for the hypotheses it analyses.
+
+        Returns:
+            A dictionary with the final hypotheses, per-round details, the stop reason
+            and the estimated token usage.
+        """
+        start = time.perf_counter()
+        tokens_used = 0
+        # Evaluated hypothesis -> (analysis, experiment results) of the batch it was evaluated in.
+        evaluated: Dict[str, Tuple[str, str]] = {}
+        rounds = []
+        stop_reason = "max_rounds"
+        stream = None if isinstance(hypotheses, list) else hypotheses
+        current = [] if stream is not None else list(hypotheses)
+
+        for round_number in range(1, self.max_rounds + 1):
+            changed: List[str] = []
+            reused: Dict[str, str] = {}
+            if stream is not None and round_number == 1:
+                batches = await self._evaluate_stream(research_problem, stream, papers, add_evidence, checkpoint)
+                for batch, (analysis, experiment_results) in batches:
+                    current.extend(batch)
+                    tokens_used += estimate_tokens_many([research_problem, analysis, experiment_results])
+                    tokens_used += 2 * estimate_tokens_many(batch)
+                    for hypothesis in batch:
+                        evaluated[hypothesis] = (analysis, experiment_results)
+                changed = list(current)
+            if not current:
+                stop_reason = "no_hypotheses"
+                break
+
+            if not changed:
+                # Reuse results for hypotheses that closely match an already evaluated one.
+                for hypothesis in current:
+                    match, score = best_match(hypothesis, list(evaluated))
+                    if match is not None and score >= self.similarity_threshold:
+                        reused[hypothesis] = match
+                    else:
+                        changed.append(hypothesis)
+
+                if changed:
+                    analysis, experiment_results = await self._evaluate(
+                        f"round{round_number}", research_problem, changed, papers, add_evidence, checkpoint)
+                    tokens_used += estimate_tokens_many([research_problem, analysis, experiment_results])
+                    tokens_used += 2 * estimate_tokens_many(changed)
+                    for hypothesis in changed:
+                        evaluated[hypothesis] = (analysis, experiment_results)
+
+            # Combine the distinct experiment results covering the current hypotheses.
+            combined_results = []
+            for hypothesis in current:
+                result = evaluated[reused.get(hypothesis, hypothesis)][1]
+                if result and result not in combined_results:
+                    combined_results.append(result)
+            experiment_results = "\n\n".join(combined_results)
+
+            refined = (await arun_stage(
+                checkpoint, f"round{round_number}.critic",
+                {"hypotheses": current, "experiment_results": experiment_results},
+                lambda: self._refine(current, experiment_results)))["refined_hypotheses"]
+            tokens_used += estimate_tokens_many(current) + estimate_tokens(experiment_results)
+            tokens_used += estimate_tokens_many(refined)
+
+            rounds.append({
+                "round": round_number,
+                "hypotheses": current,
+                "reevaluated": changed,
+                "reused": sorted(reused),
+                "experiment_results": experiment_results,
+                "refined_hypotheses": refined,
+            })
+            logger.info("Refinement round %s: re-evaluated %s of %s hypotheses.",
+                        round_number, len(changed), len(current))
+
+            if not refined:
+                stop_reason = "no_hypotheses"
+                break
+            previous, current = current, refined
+            if self.is_converged(previous, current):
+                stop_reason = "converged"
+                break
+            if self.max_tokens is not None and tokens_used >= self.max_tokens:
+                stop_reason = "token_budget"
+                break
+            if self.max_seconds is not None and time.perf_counter() - start >= self.max_seconds:
+                stop_reason = "time_budget"
+                break
+
+        logger.info("Refinement loop stopped after %s rounds (%s).", len(rounds), stop_reason)
+        get_current_span().set_attributes({"rounds": len(rounds), "stop_reason": stop_reason,
+                                           "estimated_tokens": tokens_used})
+        return {
+            "research_problem": research_problem,
+            "hypotheses": current,
+            "rounds": rounds,
+            "stop_reason": stop_reason,
+            "estimated_tokens": tokens_used,
+            "elapsed_seconds": time.perf_counter() - start,
+        }
+
+    async def _evaluate(self, stage_prefix: str, research_problem: str, hypotheses: List[str], papers: Papers,
+                        add_evidence: Optional[AddEvidence],
+                        checkpoint: Optional[RunCheckpoint]) -> Tuple[str, str]:
+        """Analyses and simulates a batch of hypotheses, returning (analysis, experiment results)."""
+        if add_evidence is not None:
+            papers = await add_evidence(hypotheses)
+        analysis = (await arun_stage(
+            checkpoint, f"{stage_prefix}.data_scientist",
+            {"research_problem": research_problem, "hypotheses": hypotheses, "papers": inputs_digest(papers)},
+            lambda: self._analyze(research_problem, hypotheses, papers)))["analysis"]
+        experiment_results = (await arun_stage(
+            checkpoint, f"{stage_prefix}.experiment",
+            {"hypotheses": hypotheses, "analysis": analysis},
+            lambda: self._simulate(hypotheses, analysis)))["experiment_results"]
+        return analysis, experiment_results
+
+    async def _evaluate_stream(self, research_problem: str, stream: AsyncIterable[str], papers: Papers,
+                               add_evidence: Optional[AddEvidence],
+                               checkpoint: Optional[RunCheckpoint]) -> List[Tuple[List[str], Tuple[str, str]]]:
+        """
+        Evaluates streamed hypotheses in batches of `stream_batch_size` as they arrive.
+
+        Returns:
+            Each batch, in stream order, with its (analysis, experiment results).
+        """
+        batches: List[List[str]] = []
+        pending: List[str] = []
+        tasks = []
+
+        def start_batch() -> None:
+            batches.append(list(pending))
+            tasks.append(asyncio.create_task(self._evaluate(
+                f"round1.batch{len(batches)}", research_problem, batches[-1], papers, add_evidence, checkpoint)))
+            pending.clear()
+
+        try:
+            async for hypothesis in stream:
+                pending.append(hypothesis)
+                if len(pending) >= self.stream_batch_size:
+                    start_batch()
+            if pending:
+                start_batch()
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return list(zip(batches, results))
+
+    async def _analyze(self, research_problem: str, hypotheses: List[str], papers: Papers) -> Dict[str, Any]:
+        return {"analysis": await self.data_scientist.aanalyze_data(research_problem, hypotheses, papers=papers)}
+
+    async def _simulate(self, hypotheses: List[str], analysis: str) -> Dict[str, Any]:
+        return {"experiment_results": await self.experiment_agent.arun_simulation(hypotheses, analysis)}
+
+    async def _refine(self, hypotheses: List[str], experiment_results: str) -> Dict[str, Any]:
+        return {"refined_hypotheses": await self.critic.arefine_hypotheses(hypotheses, experiment_results)}
+
+    def run(self, research_problem: str, hypotheses: Union[List[str], AsyncIterable[str]],
+            papers: Papers = None, checkpoint: Optional[RunCheckpoint] = None,
+            add_evidence: Optional[AddEvidence] = None) -> Dict[str, Any]:
+        """
+        Synchronous wrapper around `arun`.
+
+        Args:
+            research_problem: A string describing the research problem.
+            hypotheses: The initial hypotheses (typically from the TheoristAgent), as a list or an async stream.
+            papers: Optional retrieved papers passed to every DataScientist analysis.
+            checkpoint: Optional RunCheckpoint storing (and, on resume, reusing) each round's agent outputs.
+            add_evidence: Optional coroutine function returning `papers` plus evidence for the given hypotheses.
+
+        Returns:
+            A dictionary with the final hypotheses, per-round details, the stop reason
+            and the estimated token usage.
+        """
+        return asyncio.run(self.arun(research_problem, hypotheses, papers, checkpoint, add_evidence))
+
+
+if __name__ == "__main__":
+    setup_logging()
+
+    # Example Usage:
+    # 1. Set `refinement.max_rounds` in `configs/config.yaml`.
+    # 2. Run the main application: `python -m src.main`
+
+    class ConvergingAgent:
+        """Stand-in agent whose Critic stops changing hypotheses after one round."""
+
+        async def aanalyze_data(self, research_problem, hypotheses, papers=None):
+            return f"analysis of {len(hypotheses)} hypotheses"
+
+        async def arun_simulation(self, hypotheses, data_analysis_results):
+            return f"results for {len(hypotheses)} hypotheses"
+
+        async def arefine_hypotheses(self, hypotheses, experiment_results):
+            return [h if h.startswith("Refined") else f"Refined: {h}" for h in hypotheses]
+
+    agent = ConvergingAgent()
+    loop = RefinementLoop(agent, agent, agent, max_rounds=5)
+    outcome = loop.run("coral reef bleaching", ["Warming increases bleaching.", "Acidity slows growth."])
+    print(f"Stopped after {len(outcome['rounds'])} rounds: {outcome['stop_reason']}")
+    print(outcome["hypotheses"])
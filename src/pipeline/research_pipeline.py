@@ -0,0 +1,324 @@
+import sys
+import json
+import time
+import asyncio
+import logging
+import yaml
+from typing import List, Dict, Any, Optional, Callable, Awaitable
+
+# Local imports
+try:
+    from src.utils.logging_config import setup_logging
+    from src.utils.tracing import Span, STATUS_ERROR, traced, get_tracer
+    from src.pipeline.run_store import RunCheckpoint, arun_stage, inputs_digest
+    from src.knowledge_retrieval.multi_source_retriever import interleave_evidence, DEFAULT_EVIDENCE_TOP_K
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+
+STAGES = ("theorist", "data_scientist", "experiment", "critic")
+# Record fields each stage reads and writes; they are what a RunCheckpoint stores per stage.
+STAGE_INPUTS = {
+    "theorist": ("research_problem",),
+    "data_scientist": ("research_problem", "hypotheses", "papers"),
+    "experiment": ("hypotheses", "data_analysis_results"),
+    "critic": ("hypotheses", "experiment_results"),
+}
+STAGE_OUTPUTS = {
+    "theorist": ("hypotheses", "papers"),
+    "data_scientist": ("data_analysis_results",),
+    "experiment": ("experiment_results",),
+    "critic": ("refined_hypotheses",),
+}
+# Outputs that must be non-empty for a stage to be stored as completed (retrieval may legitimately find no papers).
+STAGE_REQUIRED = {
+    "theorist": ("hypotheses",),
+    "data_scientist": ("data_analysis_results",),
+    "experiment": ("experiment_results",),
+    "critic": ("refined_hypotheses",),
+}
+DEFAULT_STAGE_WORKERS = 1
+DEFAULT_MAX_PAPERS = 10
+
+
+def load_research_problems(path: str) -> List[str]:
+    """
+    Loads research problems from a JSONL or YAML file.
+
+    JSONL files contain one problem per line, either as a JSON string or as an
+    object with a `research_problem` key. YAML files contain a list of such
+    entries, optionally under a top-level `research_problems` key.
+
+    Args:
+        path: Path to a `.jsonl`, `.yaml` or `.yml` file.
+
+    Returns:
+        A list of research problem descriptions.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            entries = [json.loads(line) for line in f if line.strip()]
+        elif path.endswith(('.yaml', '.yml')):
+            entries = yaml.safe_load(f) or []
+            if isinstance(entries, dict):
+                entries = entries.get('research_problems', [])
+        else:
+            raise ValueError(f"Unsupported research problem file format: {path}")
+
+    problems = []
+    for entry in entries:
+        problem = entry.get('research_problem') if isinstance(entry, dict) else entry
+        if not isinstance(problem, str) or not problem.strip():
+            raise ValueError(f"Invalid research problem entry in {path}: {entry!r}")
+        problems.append(problem.strip())
+    logger.info("Loaded %s research problems from %s", len(problems), path)
+    return problems
+
+
+class ResearchPipeline:
+    """
+    Staged pipeline running many research problems through the four agents.
+
+    Each stage owns a pool of workers fed by an asyncio queue, so while the Critic
+    refines problem k, the ExperimentAgent can already work on problem k+1, the
+    DataScientistAgent on problem k+2, and so on. With a RunCheckpoint, each stage's
+    outputs are stored as it completes and reused when the batch is resumed.
+    """
+
+    def __init__(self, theorist: Any, data_scientist: Any, experiment_agent: Any, critic: Any,
+                 stage_workers: Optional[Dict[str, int]] = None, retriever: Any = None,
+                 max_papers: int = DEFAULT_MAX_PAPERS, checkpoint: Optional[RunCheckpoint] = None):
+        """
+        Initializes the ResearchPipeline.
+
+        Args:
+            theorist: The TheoristAgent instance.
+            data_scientist: The DataScientistAgent instance.
+            experiment_agent: The ExperimentAgent instance.
+            critic: The CriticAgent instance.
+            stage_workers: Optional mapping of stage name to worker count (default: 1 per stage).
+            retriever: Optional MultiSourceRetriever; its papers are fetched while the Theorist
+                runs and passed to the DataScientistAgent.
+            max_papers: Number of fused papers to retrieve per problem.
+            checkpoint: Optional RunCheckpoint storing (and, on resume, reusing) every stage's outputs.
+        """
+        stage_workers = stage_workers or {}
+        unknown = set(stage_workers) - set(STAGES)
+        if unknown:
+            raise ValueError(f"Unknown pipeline stages: {sorted(unknown)}")
+        self.stage_workers = {stage: int(stage_workers.get(stage, DEFAULT_STAGE_WORKERS)) for stage in STAGES}
+        if any(count < 1 for count in self.stage_workers.values()):
+            raise ValueError("Each pipeline stage needs at least one worker")
+
+        self.theorist = theorist
+        self.data_scientist = data_scientist
+        self.experiment_agent = experiment_agent
+        self.critic = critic
+        self.retriever = retriever
+        self.max_papers = max_papers
+        self.checkpoint = checkpoint
+        self._stage_funcs: Dict[str, Callable[[Dict[str, Any]], Awaitable[None]]] = {
+            "theorist": self._run_theorist,
+            "data_scientist": self._run_data_scientist,
+            "experiment": self._run_experiment,
+            "critic": self._run_critic,
+        }
+        logger.info("ResearchPipeline initialized with stage workers: %s", self.stage_workers)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], theorist: Any, data_scientist: Any,
+                    experiment_agent: Any, critic: Any, retriever: Any = None,
+                    checkpoint: Optional[RunCheckpoint] = None) -> "ResearchPipeline":
+        """
+        Creates a ResearchPipeline using the `pipeline.workers` section of the configuration.
+
+        Args:
+            config: The loaded configuration dictionary.
+            theorist: The TheoristAgent instance.
+            data_scientist: The DataScientistAgent instance.
+            experiment_agent: The ExperimentAgent instance.
+            critic: The CriticAgent instance.
+            retriever: Optional MultiSourceRetriever (see `retrieval.max_results` for the paper count).
+            checkpoint: Optional RunCheckpoint of the batch run.
+
+        Returns:
+            A configured ResearchPipeline.
+        """
+        stage_workers = (config.get('pipeline') or {}).get('workers') or {}
+        max_papers = (config.get('retrieval') or {}).get('max_results', DEFAULT_MAX_PAPERS)
+        return cls(theorist, data_scientist, experiment_agent, critic, stage_workers=stage_workers,
+                   retriever=retriever, max_papers=max_papers, checkpoint=checkpoint)
+
+    async def _run_theorist(self, record: Dict[str, Any]) -> None:
+        research_problem = record["research_problem"]
+        if self.retriever is None:
+            record["hypotheses"] = [h async for h in self.theorist.astream_hypotheses(research_problem)]
+            return
+        # Retrieval does not depend on the hypotheses, so overlap it with the Theorist stream; each
+        # hypothesis's evidence is looked up as soon as it and the retrieved papers are in.
+        search = asyncio.create_task(self.retriever.asearch(research_problem, self.max_papers))
+        lookups = []
+        try:
+            hypotheses = []
+            async for hypothesis in self.theorist.astream_hypotheses(research_problem):
+                hypotheses.append(hypothesis)
+                lookups.append(asyncio.create_task(self._lookup_evidence(search, hypothesis)))
+            papers = await search
+            evidence = await asyncio.gather(*lookups)
+        except BaseException:
+            for task in [search, *lookups]:
+                task.cancel()
+            await asyncio.gather(search, *lookups, return_exceptions=True)
+            raise
+        record["hypotheses"] = hypotheses
+        record["papers"] = interleave_evidence(papers, evidence, DEFAULT_EVIDENCE_TOP_K)
+
+    async def _lookup_evidence(self, search: "asyncio.Task", hypothesis: str) -> List[Dict[str, Any]]:
+        # Evidence comes from the vector index, which the search fills with the retrieved papers.
+        await asyncio.shield(search)
+        return (await self.retriever.asearch_evidence([hypothesis], DEFAULT_EVIDENCE_TOP_K))[0]
+
+    async def _run_data_scientist(self, record: Dict[str, Any]) -> None:
+        record["data_analysis_results"] = await self.data_scientist.aanalyze_data(
+            record["research_problem"], record["hypotheses"], papers=record.get("papers"))
+
+    async def _run_experiment(self, record: Dict[str, Any]) -> None:
+        record["experiment_results"] = await self.experiment_agent.arun_simulation(
+            record["hypotheses"], record["data_analysis_results"])
+
+    async def _run_critic(self, record: Dict[str, Any]) -> None:
+        record["refined_hypotheses"] = await self.critic.arefine_hypotheses(
+            record["hypotheses"], record["experiment_results"])
+
+    async def _run_stage(self, stage: str, record: Dict[str, Any]) -> None:
+        """Runs one stage on a record, or copies the stage's stored outputs into it."""
+        inputs = {key: record.get(key) for key in STAGE_INPUTS[stage]}
+        if "papers" in inputs:
+            inputs["papers"] = inputs_digest(inputs["papers"])
+
+        async def compute() -> Dict[str, Any]:
+            await self._stage_funcs[stage](record)
+            return {key: record[key] for key in STAGE_OUTPUTS[stage] if key in record}
+
+        record.update(await arun_stage(self.checkpoint, f"problem{record['index']}.{stage}", inputs, compute,
+                                       required=STAGE_REQUIRED[stage]))
+
+    async def _worker(self, stage: str, inbox: asyncio.Queue, outbox: Optional[asyncio.Queue],
+                      record_spans: Dict[int, Span]) -> None:
+        """Processes records from `inbox` and forwards them to `outbox`, ending each record's span after the last stage."""
+        tracer = get_tracer()
+        while True:
+            record = await inbox.get()
+            try:
+                if "error" not in record:
+                    start = time.perf_counter()
+                    # Workers outlive any one record, so stage spans name their record's span as parent explicitly.
+                    with tracer.span(f"pipeline.{stage}", parent=record_spans.get(record["index"]),
+                                     problem_index=record["index"]) as span:
+                        try:
+                            await self._run_stage(stage, record)
+                        except Exception as e:
+                            logger.exception("Stage %s failed for problem %s: %s", stage, record['index'], e)
+                            record["error"] = f"{stage}: {e}"
+                            span.record_exception(e)
+                    record["timings"][stage] = time.perf_counter() - start
+                if outbox is not None:
+                    outbox.put_nowait(record)
+                elif record["index"] in record_spans:
+                    record_span = record_spans.pop(record["index"])
+                    if "error" in record:
+                        record_span.set_status(STATUS_ERROR)
+                        record_span.set_attribute("error", record["error"])
+                    tracer.end_span(record_span)
+            finally:
+                inbox.task_done()
+
+    @traced("pipeline.run", record_args=("research_problems",))
+    async def arun(self, research_problems: List[str]) -> List[Dict[str, Any]]:
+        """
+        Runs every research problem through the pipeline.
+
+        Args:
+            research_problems: A list of research problem descriptions.
+
+        Returns:
+            A list of per-problem result dictionaries, in input order.
+        """
+        queues = [asyncio.Queue() for _ in STAGES]
+        records = [
+            {"index": i, "research_problem": problem, "timings": {}}
+            for i, problem in enumerate(research_problems)
+        ]
+
+        # One span per problem, from the moment it is queued until it clears the last stage.
+        tracer = get_tracer()
+        record_spans = {
+            record["index"]: tracer.start_span("pipeline.problem", {"problem_index": record["index"]})
+            for record in records
+        }
+
+        workers = []
+        for position, stage in enumerate(STAGES):
+            outbox = queues[position + 1] if position + 1 < len(STAGES) else None
+            for _ in range(self.stage_workers[stage]):
+                workers.append(asyncio.create_task(self._worker(stage, queues[position], outbox, record_spans)))
+
+        for record in records:
+            queues[0].put_nowait(record)
+        try:
+            # A record is forwarded before it is marked done, so joining the queues
+            # in stage order waits for every record to clear the whole pipeline.
+            for queue in queues:
+                await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            for record_span in record_spans.values():
+                tracer.end_span(record_span)
+
+        logger.info("ResearchPipeline completed %s research problems.", len(records))
+        return records
+
+    def run(self, research_problems: List[str]) -> List[Dict[str, Any]]:
+        """
+        Synchronous wrapper around `arun`.
+
+        Args:
+            research_problems: A list of research problem descriptions.
+
+        Returns:
+            A list of per-problem result dictionaries, in input order.
+        """
+        return asyncio.run(self.arun(research_problems))
+
+
+if __name__ == "__main__":
+    setup_logging()
+
+    # Example Usage:
+    # 1. Create a `problems.jsonl` file with one research problem per line.
+    # 2. Run the batch runner: `python -m src.main --problems problems.jsonl`
+
+    class EchoAgent:
+        """Stand-in agent that answers immediately without calling the Gemini API."""
+
+        async def astream_hypotheses(self, research_problem):
+            yield f"Hypothesis about {research_problem}"
+
+        async def aanalyze_data(self, research_problem, hypotheses, papers=None):
+            return "analysis"
+
+        async def arun_simulation(self, hypotheses, data_analysis_results):
+            return "results"
+
+        async def arefine_hypotheses(self, hypotheses, experiment_results):
+            return [f"Refined {h}" for h in hypotheses]
+
+    agent = EchoAgent()
+    pipeline = ResearchPipeline(agent, agent, agent, agent, stage_workers={"theorist": 2})
+    for result in pipeline.run(["coral reef bleaching", "solar cell efficiency"]):
+        print(result)
@@ -0,0 +1,377 @@
+import sys
+import os
+import json
+import time
+import uuid
+import hashlib
+import sqlite3
+import logging
+import threading
+from typing import Optional, Dict, Any, List, Callable, Awaitable, Sequence, AsyncIterator
+
+# Local imports
+try:
+    from src.utils.logging_config import setup_logging
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_RUN_STORE_PATH = "runs/runs.sqlite"
+RUN_STATUSES = ("running", "completed", "failed")
+
+
+def new_run_id() -> str:
+    """Returns a fresh run ID: a UTC timestamp plus a random suffix, so IDs sort by start time."""
+    return time.strftime("%Y%m%d-%H%M%S", time.gmtime()) + "-" + uuid.uuid4().hex[:6]
+
+
+def inputs_digest(inputs: Any) -> str:
+    """
+    Computes the content address of a stage's inputs.
+
+    Args:
+        inputs: JSON-serializable stage inputs.
+
+    Returns:
+        A hex SHA-256 digest of the canonical JSON encoding.
+    """
+    payload = json.dumps(inputs, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RunStore:
+    """
+    SQLite store of research runs and the inputs and outputs of their stages.
+
+    Stage results are keyed on (run ID, stage name) and remember a digest of the
+    inputs they were computed from. Resuming a run reuses a stored result only if
+    the stage sees the same inputs again, so a stage whose upstream output changed
+    is recomputed rather than served stale.
+    """
+
+    def __init__(self, path: str = DEFAULT_RUN_STORE_PATH):
+        """
+        Initializes the RunStore.
+
+        Args:
+            path: Path to the SQLite file (":memory:" for a throwaway store).
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            "run_id TEXT PRIMARY KEY, status TEXT NOT NULL, metadata TEXT NOT NULL, "
+            "created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS stages ("
+            "run_id TEXT NOT NULL, stage TEXT NOT NULL, inputs_digest TEXT NOT NULL, "
+            "inputs TEXT NOT NULL, outputs TEXT NOT NULL, created_at REAL NOT NULL, "
+            "PRIMARY KEY (run_id, stage))"
+        )
+        self._conn.commit()
+        logger.info("RunStore opened at %s.", path)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "RunStore":
+        """
+        Creates a RunStore using the `checkpoint` section of the configuration.
+
+        Args:
+            config: The loaded configuration dictionary.
+
+        Returns:
+            A RunStore at `checkpoint.path`.
+        """
+        return cls((config.get('checkpoint') or {}).get('path', DEFAULT_RUN_STORE_PATH))
+
+    def start_run(self, run_id: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Registers a run, or marks an existing run as running again when it is resumed.
+
+        Args:
+            run_id: The run ID.
+            metadata: Optional description of the run (mode, research problems, ...).
+        """
+        now = time.time()
+        with self._lock:
+            updated = self._conn.execute("UPDATE runs SET status = 'running', updated_at = ? WHERE run_id = ?",
+                                         (now, run_id)).rowcount
+            if not updated:
+                self._conn.execute("INSERT INTO runs (run_id, status, metadata, created_at, updated_at) "
+                                   "VALUES (?, 'running', ?, ?, ?)",
+                                   (run_id, json.dumps(metadata or {}, default=str), now, now))
+            self._conn.commit()
+
+    def finish_run(self, run_id: str, status: str = "completed") -> None:
+        """
+        Records how a run ended.
+
+        Args:
+            run_id: The run ID.
+            status: One of RUN_STATUSES.
+        """
+        if status not in RUN_STATUSES:
+            raise ValueError(f"status must be one of {RUN_STATUSES}, got {status!r}")
+        with self._lock:
+            self._conn.execute("UPDATE runs SET status = ?, updated_at = ? WHERE run_id = ?",
+                               (status, time.time(), run_id))
+            self._conn.commit()
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Looks up a run.
+
+        Args:
+            run_id: The run ID.
+
+        Returns:
+            The run's ID, status, metadata and timestamps, or None if it does not exist.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT run_id, status, metadata, created_at, updated_at FROM runs "
+                                     "WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            return None
+        return {"run_id": row[0], "status": row[1], "metadata": json.loads(row[2]),
+                "created_at": row[3], "updated_at": row[4]}
+
+    def latest_run_id(self) -> Optional[str]:
+        """Returns the ID of the most recently started or resumed run, or None if the store is empty."""
+        with self._lock:
+            row = self._conn.execute("SELECT run_id FROM runs ORDER BY updated_at DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    def load_stage(self, run_id: str, stage: str, inputs: Any) -> Optional[Dict[str, Any]]:
+        """
+        Looks up the stored outputs of a stage.
+
+        Args:
+            run_id: The run ID.
+            stage: The stage name (e.g. "theorist" or "round2.critic").
+            inputs: The inputs the stage is about to run with.
+
+        Returns:
+            The stored outputs, or None if the stage has not completed or ran with different inputs.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT inputs_digest, outputs FROM stages WHERE run_id = ? AND stage = ?",
+                                     (run_id, stage)).fetchone()
+        if row is None or row[0] != inputs_digest(inputs):
+            return None
+        return json.loads(row[1])
+
+    def save_stage(self, run_id: str, stage: str, inputs: Any, outputs: Dict[str, Any]) -> None:
+        """
+        Stores the outputs of a completed stage, replacing any earlier result.
+
+        Args:
+            run_id: The run ID.
+            stage: The stage name.
+            inputs: The JSON-serializable inputs the stage ran with.
+            outputs: The JSON-serializable outputs of the stage.
+        """
+        encoded_inputs = json.dumps(inputs, sort_keys=True, default=str)
+        encoded_outputs = json.dumps(outputs, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO stages (run_id, stage, inputs_digest, inputs, outputs, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (run_id, stage, inputs_digest(inputs), encoded_inputs, encoded_outputs, time.time())
+            )
+            self._conn.commit()
+
+    def completed_stages(self, run_id: str) -> List[str]:
+        """Returns the names of the stages of a run that have stored outputs, oldest first."""
+        with self._lock:
+            rows = self._conn.execute("SELECT stage FROM stages WHERE run_id = ? ORDER BY created_at",
+                                      (run_id,)).fetchall()
+        return [row[0] for row in rows]
+
+    def checkpoint(self, run_id: str) -> "RunCheckpoint":
+        """Returns a RunCheckpoint bound to a run of this store."""
+        return RunCheckpoint(self, run_id)
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def outputs_complete(outputs: Dict[str, Any], required: Optional[Sequence[str]] = None) -> bool:
+    """
+    Checks whether stage outputs are worth storing.
+
+    Agents answer a failed model call with an empty result ([] or ""), so an empty
+    output marks a stage that did not really complete and must run again on resume.
+
+    Args:
+        outputs: The stage outputs.
+        required: Output keys that must be non-empty (default: every key).
+
+    Returns:
+        True if there are outputs and none of the required ones is missing or empty.
+    """
+    keys = list(outputs) if required is None else required
+    return bool(outputs) and all(outputs.get(key) not in (None, "", [], {}) for key in keys)
+
+
+class RunCheckpoint:
+    """
+    A run's view of the RunStore, used by the pipeline and refinement loop to skip completed stages.
+
+    Attributes:
+        reused: Names of the stages whose stored outputs were reused.
+    """
+
+    def __init__(self, store: RunStore, run_id: str):
+        """
+        Initializes the RunCheckpoint.
+
+        Args:
+            store: The RunStore holding the run.
+            run_id: The run ID.
+        """
+        self.store = store
+        self.run_id = run_id
+        self.reused: List[str] = []
+
+    def run_stage(self, stage: str, inputs: Any, compute: Callable[[], Dict[str, Any]],
+                  required: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Returns the stored outputs of a stage, or computes and stores them.
+
+        Outputs that are not complete (see `outputs_complete`) are returned but not
+        stored, so the stage runs again when the run is resumed.
+
+        Args:
+            stage: The stage name.
+            inputs: The JSON-serializable inputs of the stage.
+            compute: Runs the stage and returns its JSON-serializable outputs.
+            required: Output keys that must be non-empty for the outputs to be stored (default: every key).
+
+        Returns:
+            The stage outputs.
+        """
+        outputs = self._load(stage, inputs)
+        if outputs is not None:
+            return outputs
+        outputs = compute()
+        self._save(stage, inputs, outputs, required)
+        return outputs
+
+    async def arun_stage(self, stage: str, inputs: Any, compute: Callable[[], Awaitable[Dict[str, Any]]],
+                         required: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Asynchronous counterpart of `run_stage`; `compute` is a coroutine function.
+
+        Args:
+            stage: The stage name.
+            inputs: The JSON-serializable inputs of the stage.
+            compute: Runs the stage and returns its JSON-serializable outputs.
+            required: Output keys that must be non-empty for the outputs to be stored (default: every key).
+
+        Returns:
+            The stage outputs.
+        """
+        outputs = self._load(stage, inputs)
+        if outputs is not None:
+            return outputs
+        outputs = await compute()
+        self._save(stage, inputs, outputs, required)
+        return outputs
+
+    async def astream_stage(self, stage: str, inputs: Any, key: str,
+                            stream: Callable[[], AsyncIterator[Any]]) -> AsyncIterator[Any]:
+        """
+        Streams the items of a stage, storing them as the `key` output once the stream is exhausted.
+
+        Nothing is stored if the stream raises or the caller stops consuming it early,
+        so a resumed run repeats a stage whose items may be incomplete.
+
+        Args:
+            stage: The stage name.
+            inputs: The JSON-serializable inputs of the stage.
+            key: The output under which the list of items is stored.
+            stream: Starts the stage and returns an async iterator of its JSON-serializable items.
+
+        Yields:
+            The stored items, or the items of `stream` as they arrive.
+        """
+        outputs = self._load(stage, inputs)
+        if outputs is not None:
+            for item in outputs[key]:
+                yield item
+            return
+        items = []
+        async for item in stream():
+            items.append(item)
+            yield item
+        self._save(stage, inputs, {key: items}, None)
+
+    def _load(self, stage: str, inputs: Any) -> Optional[Dict[str, Any]]:
+        outputs = self.store.load_stage(self.run_id, stage, inputs)
+        if outputs is not None:
+            self.reused.append(stage)
+            logger.info("Reusing stored outputs of stage %s (run %s).", stage, self.run_id)
+        return outputs
+
+    def _save(self, stage: str, inputs: Any, outputs: Dict[str, Any], required: Optional[Sequence[str]]) -> None:
+        if outputs_complete(outputs, required):
+            self.store.save_stage(self.run_id, stage, inputs, outputs)
+        else:
+            logger.warning("Stage %s returned empty outputs; not storing them, so a resumed run retries it (run %s).",
+                           stage, self.run_id)
+
+
+def run_stage(checkpoint: Optional[RunCheckpoint], stage: str, inputs: Any,
+              compute: Callable[[], Dict[str, Any]], required: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """Runs a stage through `checkpoint.run_stage`, or simply computes it when checkpointing is off."""
+    if checkpoint is None:
+        return compute()
+    return checkpoint.run_stage(stage, inputs, compute, required)
+
+
+async def arun_stage(checkpoint: Optional[RunCheckpoint], stage: str, inputs: Any,
+                     compute: Callable[[], Awaitable[Dict[str, Any]]],
+                     required: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """Asynchronous counterpart of `run_stage`."""
+    if checkpoint is None:
+        return await compute()
+    return await checkpoint.arun_stage(stage, inputs, compute, required)
+
+
+async def astream_stage(checkpoint: Optional[RunCheckpoint], stage: str, inputs: Any, key: str,
+                        stream: Callable[[], AsyncIterator[Any]]) -> AsyncIterator[Any]:
+    """Streams a stage through `checkpoint.astream_stage`, or straight from `stream` when checkpointing is off."""
+    items = stream() if checkpoint is None else checkpoint.astream_stage(stage, inputs, key, stream)
+    async for item in items:
+        yield item
+
+
+if __name__ == "__main__":
+    setup_logging()
+
+    # Example Usage:
+    # 1. Set `checkpoint.enabled: true` in `configs/config.yaml` and run `python -m src.main`.
+    # 2. After a crash, resume the latest run: `python -m src.main --resume`
+    #    (or a specific one: `python -m src.main --resume <run id>`).
+
+    store = RunStore(":memory:")
+    run_id = new_run_id()
+    store.start_run(run_id, {"mode": "example"})
+    checkpoint = store.checkpoint(run_id)
+    for attempt in range(2):
+        outputs = checkpoint.run_stage("theorist", {"research_problem": "coral reef bleaching"},
+                                       lambda: {"hypotheses": ["Warming increases bleaching."]})
+        print(f"Attempt {attempt + 1}: {outputs} (reused: {checkpoint.reused})")
+    store.finish_run(run_id)
+    print(store.get_run(run_id))
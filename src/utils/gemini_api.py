@@ -1,76 +1,535 @@
 import sys
-import os
+import json
+import time
+import asyncio
 import logging
-from typing import Optional
-
-# Dynamically adjust sys.path to allow imports from the project root
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-if PROJECT_ROOT not in sys.path:
-    sys.path.insert(0, PROJECT_ROOT)
+import threading
+from typing import Optional, Dict, Any, Iterator, AsyncIterator, Callable, Awaitable, Tuple
 
 # Local imports
 try:
-    from src.utils.logging_config import setup_logging
+    from src.utils.logging_config import setup_logging, log_response
+    from src.utils.rate_limiter import (
+        RateLimiter, RetryPolicy, CircuitBreaker, CircuitOpenError, is_retryable,
+        get_rate_limiter, get_retry_policy, get_circuit_breaker
+    )
+    from src.utils.response_cache import ResponseCache, get_response_cache
+    from src.utils.tokens import estimate_tokens
+    from src.utils.metrics import MetricsRegistry, get_metrics_registry
+    from src.utils.tracing import traced, get_current_span
+    from src.utils.lazy_import import LazyModule
 except ImportError as e:
     print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
     sys.exit(1)
 
-# Configure logging
-setup_logging()
 logger = logging.getLogger(__name__)
 
-try:
-    import google.generativeai as genai
-except ImportError:
-    logger.error("google-generative-ai library not found. Please install it: pip install google-generative-ai")
-    sys.exit(1)
+# The SDK takes most of a second to import, so it is only loaded when the first model is configured.
+genai = LazyModule("google.generativeai", install_hint="google-generativeai")
+
+
+DEFAULT_MAX_CONCURRENT_REQUESTS = 8
+
+
+class ModelRegistry:
+    """
+    Process-wide registry of the configured API key and pooled GenerativeModel handles.
+
+    `genai.configure` is only re-run when the API key changes, and one model handle
+    is kept per (model name, generation settings) instead of being constructed per call.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty ModelRegistry.
+        """
+        self._lock = threading.Lock()
+        self._api_key: Optional[str] = None
+        self._models: Dict[tuple, Any] = {}
+
+    def configure(self, api_key: str) -> None:
+        """
+        Configures the Gemini client unless it is already configured with `api_key`.
+
+        Args:
+            api_key: The Gemini API key.
+        """
+        with self._lock:
+            if self._api_key == api_key:
+                return
+            genai.configure(api_key=api_key)
+            self._api_key = api_key
+            self._models.clear()
+
+    def get_model(self, model_name: str, generation_config: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Returns the pooled model handle for the given name and generation settings.
+
+        Args:
+            model_name: The name of the Gemini model.
+            generation_config: Optional generation settings bound to the model handle.
+
+        Returns:
+            A `genai.GenerativeModel` instance shared by all callers with the same key.
+        """
+        settings = json.dumps(generation_config, sort_keys=True, default=str) if generation_config else None
+        key = (model_name, settings)
+        model = self._models.get(key)
+        if model is None:
+            with self._lock:
+                model = self._models.get(key)
+                if model is None:
+                    model = genai.GenerativeModel(model_name, generation_config=generation_config)
+                    self._models[key] = model
+        return model
+
+    def clear(self) -> None:
+        """Drops all pooled model handles."""
+        with self._lock:
+            self._models.clear()
+
+
+_model_registry = ModelRegistry()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Returns the process-wide ModelRegistry."""
+    return _model_registry
 
 
 class GeminiAPI:
     """
     Wrapper for interacting with the Gemini API.
+
+    Requests pass through an optional client-side rate limiter, are retried with
+    jittered exponential backoff on transient errors (429, 5xx, timeouts), and are
+    rejected outright while the circuit breaker is open. Every call is recorded in
+    a MetricsRegistry with its agent, model, cache status, tokens and latency.
     """
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+                 cache: Optional[ResponseCache] = None, registry: Optional[ModelRegistry] = None,
+                 rate_limiter: Optional[RateLimiter] = None, retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None, metrics: Optional[MetricsRegistry] = None):
         """
         Initializes the GeminiAPI with the given API key.
 
         Args:
             api_key: The Gemini API key.
+            max_concurrent_requests: Maximum number of in-flight async requests (default: 8).
+            cache: Optional response cache consulted before calling the model.
+            registry: Model registry to pool handles in (default: the process-wide registry).
+            rate_limiter: Optional rate limiter shared by every client of the same quota.
+            retry_policy: Retry policy for transient errors (default: no retries).
+            circuit_breaker: Optional circuit breaker guarding the API.
+            metrics: Metrics registry calls are recorded in (default: the process-wide registry).
         """
+        if max_concurrent_requests < 1:
+            raise ValueError("max_concurrent_requests must be at least 1")
         try:
-            genai.configure(api_key=api_key)
+            self.registry = registry if registry is not None else get_model_registry()
+            self.registry.configure(api_key)
             self.api_key = api_key
+            self.max_concurrent_requests = max_concurrent_requests
+            self.cache = cache
+            self.rate_limiter = rate_limiter
+            self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy(max_retries=0)
+            self.circuit_breaker = circuit_breaker
+            self.metrics = metrics if metrics is not None else get_metrics_registry()
+            self._semaphore: Optional[asyncio.Semaphore] = None
+            self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
             logger.info("Gemini API configured successfully.")
         except Exception as e:
-            logger.error(f"Error configuring Gemini API: {e}")
+            logger.error("Error configuring Gemini API: %s", e)
             raise
 
-    def generate_content(self, prompt: str, model_name: str = 'gemini-2.0-flash') -> str:
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "GeminiAPI":
+        """
+        Creates a GeminiAPI from the loaded configuration.
+
+        Args:
+            config: A dictionary containing configuration parameters, including API keys.
+
+        Returns:
+            A GeminiAPI using the process-wide model registry, shared response cache and
+            shared rate limiter, with retries and circuit breaking from `resilience`.
+        """
+        return cls(
+            api_key=config['gemini_api_key'],
+            max_concurrent_requests=config.get('concurrency', {}).get('max_concurrent_requests', DEFAULT_MAX_CONCURRENT_REQUESTS),
+            cache=get_response_cache(config),
+            rate_limiter=get_rate_limiter(config),
+            retry_policy=get_retry_policy(config),
+            circuit_breaker=get_circuit_breaker(config)
+        )
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """
+        Returns the semaphore bounding concurrent async requests for the running event loop.
+
+        asyncio primitives are bound to the loop they are first used on, so a new
+        semaphore is created whenever the API is used from a different loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def _call(self, request: Callable[[], Any], prompt: str) -> Any:
+        """
+        Sends a request through the rate limiter, retry policy and circuit breaker.
+
+        Args:
+            request: Performs one attempt and returns the raw response.
+            prompt: The prompt, used to estimate the token cost of each attempt.
+
+        Returns:
+            The raw response of the first successful attempt.
+        """
+        prompt_tokens = estimate_tokens(prompt)
+        if self.retry_policy.budget is not None:
+            self.retry_policy.budget.record_request()
+        attempt = 0
+        while True:
+            is_trial = self._admit()
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(prompt_tokens)
+            try:
+                response = request()
+            except Exception as e:
+                delay = self._handle_failure(e, attempt)
+            else:
+                self._handle_success(response)
+                return response
+            finally:
+                if is_trial:
+                    self._release_trial()
+            time.sleep(delay)
+            attempt += 1
+
+    async def _acall(self, request: Callable[[], Awaitable[Any]], prompt: str, keep_slot: bool = False) -> Any:
+        """
+        Asynchronous counterpart of `_call`.
+
+        The concurrency slot is only held while an attempt is in flight, not while
+        waiting for the rate limiter or backing off.
+
+        Args:
+            request: Performs one attempt and returns an awaitable of the raw response.
+            prompt: The prompt, used to estimate the token cost of each attempt.
+            keep_slot: Return with the concurrency slot of the successful attempt still held,
+                e.g. while its stream is consumed; the caller must release it.
+
+        Returns:
+            The raw response of the first successful attempt.
+        """
+        prompt_tokens = estimate_tokens(prompt)
+        if self.retry_policy.budget is not None:
+            self.retry_policy.budget.record_request()
+        attempt = 0
+        while True:
+            is_trial = self._admit()
+            if self.rate_limiter is not None:
+                await self.rate_limiter.aacquire(prompt_tokens)
+            semaphore = self._get_semaphore()
+            await semaphore.acquire()
+            release_slot = True
+            try:
+                response = await request()
+            except Exception as e:
+                semaphore.release()
+                release_slot = False
+                delay = self._handle_failure(e, attempt)
+            else:
+                release_slot = not keep_slot
+                self._handle_success(response)
+                return response
+            finally:
+                if release_slot:
+                    semaphore.release()
+                if is_trial:
+                    self._release_trial()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _handle_failure(self, error: Exception, attempt: int) -> float:
+        """Records a failed attempt and returns the backoff, re-raising if it should not be retried."""
+        if self.circuit_breaker is not None and is_retryable(error):
+            self.circuit_breaker.record_failure()
+        if not self.retry_policy.should_retry(error, attempt):
+            logger.error("Gemini API request failed after %s attempt(s): %s", attempt + 1, error)
+            raise error
+        delay = self.retry_policy.backoff(attempt)
+        logger.warning("Transient Gemini API error (attempt %s): %s. Retrying in %.2fs.", attempt + 1, error, delay)
+        span = get_current_span()
+        span.set_attribute("retries", attempt + 1)
+        span.add_event("retry", {"attempt": attempt + 1, "delay_seconds": delay, "error": type(error).__name__})
+        return delay
+
+    def _admit(self) -> bool:
+        """Admits an attempt through the circuit breaker and returns whether it is the half-open trial."""
+        if self.circuit_breaker is None:
+            return False
+        allowed, is_trial = self.circuit_breaker.admit()
+        if not allowed:
+            raise CircuitOpenError("Gemini API circuit breaker is open; request rejected.")
+        return is_trial
+
+    def _release_trial(self) -> None:
+        """Frees the circuit breaker's trial slot if the attempt ended without a recorded outcome."""
+        # Non-transient errors say nothing about the API's health, and cancellation
+        # (a BaseException) skips _handle_failure altogether.
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.release_trial()
+
+    def _handle_success(self, response: Any) -> None:
+        """Records a successful attempt and charges response tokens to the rate limiter."""
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record_success()
+        if self.rate_limiter is not None:
+            usage = getattr(response, 'usage_metadata', None)
+            self.rate_limiter.record_usage(getattr(usage, 'candidates_token_count', 0) or 0)
+
+    @traced("gemini.generate_content", record_args=("prompt",), record_values=("model_name", "agent"))
+    def generate_content(self, prompt: str, model_name: str = 'gemini-2.0-flash',
+                         generation_config: Optional[Dict[str, Any]] = None, use_cache: bool = True,
+                         agent: Optional[str] = None) -> str:
         """
         Generates content using the Gemini API.
 
         Args:
             prompt: The prompt to send to the API.
             model_name: The name of the Gemini model to use (default: 'gemini-2.0-flash').
+            generation_config: Optional generation settings (temperature, max_output_tokens, ...).
+            use_cache: Whether to consult the response cache for this call.
+            agent: Name of the calling agent, used to attribute metrics.
+
+        Returns:
+            The generated content as a string.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open.
+            Exception: The last error if the request fails after all retries.
+        """
+        start = time.perf_counter()
+        cache_key = self._cache_key(prompt, model_name, generation_config) if use_cache else None
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info("Cache hit for model: %s", model_name)
+                self._record_cache_hit(agent, model_name, start)
+                return cached
+        try:
+            model = self.registry.get_model(model_name, generation_config)
+            response = self._call(lambda: model.generate_content(prompt), prompt)
+            text = response.text
+        except Exception:
+            self.metrics.record_call(agent, model_name, time.perf_counter() - start, success=False)
+            raise
+        logger.info("Generated content using model: %s", model_name)
+        self._record_response(agent, model_name, start, prompt, text, response)
+        self._store(cache_key, text)
+        return text
+
+    @traced("gemini.generate_content", record_args=("prompt",), record_values=("model_name", "agent"))
+    async def agenerate_content(self, prompt: str, model_name: str = 'gemini-2.0-flash',
+                                generation_config: Optional[Dict[str, Any]] = None, use_cache: bool = True,
+                                agent: Optional[str] = None) -> str:
+        """
+        Asynchronously generates content using the Gemini API.
+
+        At most `max_concurrent_requests` calls are in flight at once; additional
+        callers wait on the semaphore instead of hitting the API.
+
+        Args:
+            prompt: The prompt to send to the API.
+            model_name: The name of the Gemini model to use (default: 'gemini-2.0-flash').
+            generation_config: Optional generation settings (temperature, max_output_tokens, ...).
+            use_cache: Whether to consult the response cache for this call.
+            agent: Name of the calling agent, used to attribute metrics.
 
         Returns:
             The generated content as a string.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open.
+            Exception: The last error if the request fails after all retries.
         """
+        start = time.perf_counter()
+        cache_key = self._cache_key(prompt, model_name, generation_config) if use_cache else None
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info("Cache hit for model: %s", model_name)
+                self._record_cache_hit(agent, model_name, start)
+                return cached
         try:
-            model = genai.GenerativeModel(model_name)
-            response = model.generate_content(prompt)
-            logger.info(f"Generated content using model: {model_name}")
-            return response.text
+            model = self.registry.get_model(model_name, generation_config)
+            response = await self._acall(lambda: model.generate_content_async(prompt), prompt)
+            text = response.text
+        except Exception:
+            self.metrics.record_call(agent, model_name, time.perf_counter() - start, success=False)
+            raise
+        logger.info("Generated content asynchronously using model: %s", model_name)
+        self._record_response(agent, model_name, start, prompt, text, response)
+        self._store(cache_key, text)
+        return text
+
+    @traced("gemini.generate_content_stream", record_args=("prompt",), record_values=("model_name", "agent"))
+    def generate_content_stream(self, prompt: str, model_name: str = 'gemini-2.0-flash',
+                                generation_config: Optional[Dict[str, Any]] = None,
+                                use_cache: bool = True, agent: Optional[str] = None) -> Iterator[str]:
+        """
+        Generates content using the Gemini API, yielding text chunks as they arrive.
+
+        A cached response is yielded as a single chunk; a fully streamed response is
+        added to the cache once the stream completes. Only opening the stream is
+        retried; an error after chunks have been yielded is raised to the caller, so a
+        broken stream is never mistaken for a complete one.
+
+        Args:
+            prompt: The prompt to send to the API.
+            model_name: The name of the Gemini model to use (default: 'gemini-2.0-flash').
+            generation_config: Optional generation settings (temperature, max_output_tokens, ...).
+            use_cache: Whether to consult the response cache for this call.
+            agent: Name of the calling agent, used to attribute metrics.
+
+        Yields:
+            Text chunks of the generated content.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open.
+            Exception: If the stream cannot be opened after retries, or breaks partway.
+        """
+        start = time.perf_counter()
+        cache_key = self._cache_key(prompt, model_name, generation_config) if use_cache else None
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info("Cache hit for model: %s", model_name)
+                self._record_cache_hit(agent, model_name, start)
+                yield cached
+                return
+        chunks = []
+        chunk = None
+        try:
+            model = self.registry.get_model(model_name, generation_config)
+            for chunk in self._call(lambda: model.generate_content(prompt, stream=True), prompt):
+                text = chunk.text
+                chunks.append(text)
+                yield text
+            logger.info("Streamed content using model: %s", model_name)
         except Exception as e:
-            logger.exception(f"Error generating content: {e}")
-            return ""
+            logger.exception("Error streaming content: %s", e)
+            self.metrics.record_call(agent, model_name, time.perf_counter() - start, success=False)
+            raise
+        text = "".join(chunks)
+        # Usage metadata of a streamed response is reported on its last chunk.
+        self._record_response(agent, model_name, start, prompt, text, chunk)
+        self._store(cache_key, text)
+
+    @traced("gemini.generate_content_stream", record_args=("prompt",), record_values=("model_name", "agent"))
+    async def agenerate_content_stream(self, prompt: str, model_name: str = 'gemini-2.0-flash',
+                                       generation_config: Optional[Dict[str, Any]] = None,
+                                       use_cache: bool = True, agent: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Asynchronous counterpart of `generate_content_stream`.
 
+        The request holds a concurrency slot until the stream is exhausted; only
+        opening the stream is retried.
+
+        Args:
+            prompt: The prompt to send to the API.
+            model_name: The name of the Gemini model to use (default: 'gemini-2.0-flash').
+            generation_config: Optional generation settings (temperature, max_output_tokens, ...).
+            use_cache: Whether to consult the response cache for this call.
+            agent: Name of the calling agent, used to attribute metrics.
+
+        Yields:
+            Text chunks of the generated content.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open.
+            Exception: If the stream cannot be opened after retries, or breaks partway.
+        """
+        start = time.perf_counter()
+        cache_key = self._cache_key(prompt, model_name, generation_config) if use_cache else None
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info("Cache hit for model: %s", model_name)
+                self._record_cache_hit(agent, model_name, start)
+                yield cached
+                return
+        chunks = []
+        chunk = None
+        try:
+            model = self.registry.get_model(model_name, generation_config)
+            response = await self._acall(lambda: model.generate_content_async(prompt, stream=True), prompt,
+                                         keep_slot=True)
+            try:
+                async for chunk in response:
+                    text = chunk.text
+                    chunks.append(text)
+                    yield text
+            finally:
+                self._get_semaphore().release()
+            logger.info("Streamed content asynchronously using model: %s", model_name)
+        except Exception as e:
+            logger.exception("Error streaming content: %s", e)
+            self.metrics.record_call(agent, model_name, time.perf_counter() - start, success=False)
+            raise
+        text = "".join(chunks)
+        self._record_response(agent, model_name, start, prompt, text, chunk)
+        self._store(cache_key, text)
+
+    @staticmethod
+    def _usage_tokens(response: Any, prompt: str, text: str) -> Tuple[int, int]:
+        """Returns (prompt, response) token counts from `usage_metadata`, estimating any that are missing."""
+        usage = getattr(response, 'usage_metadata', None)
+        prompt_tokens = getattr(usage, 'prompt_token_count', None)
+        response_tokens = getattr(usage, 'candidates_token_count', None)
+        if not isinstance(prompt_tokens, int):
+            prompt_tokens = estimate_tokens(prompt)
+        if not isinstance(response_tokens, int):
+            response_tokens = estimate_tokens(text)
+        return prompt_tokens, response_tokens
+
+    def _record_response(self, agent: Optional[str], model_name: str, start: float, prompt: str,
+                         text: str, response: Any) -> None:
+        """Records a successful model call and sends the full response to the response log."""
+        prompt_tokens, response_tokens = self._usage_tokens(response, prompt, text)
+        latency = time.perf_counter() - start
+        self.metrics.record_call(agent, model_name, latency, prompt_tokens=prompt_tokens, response_tokens=response_tokens)
+        get_current_span().set_attributes({"cache.hit": False, "prompt.tokens": prompt_tokens,
+                                           "response.tokens": response_tokens})
+        log_response(model_name, prompt, text, agent=agent, latency_seconds=latency,
+                     prompt_tokens=prompt_tokens, response_tokens=response_tokens)
+
+    def _record_cache_hit(self, agent: Optional[str], model_name: str, start: float) -> None:
+        """Records a call answered from the response cache."""
+        self.metrics.record_call(agent, model_name, time.perf_counter() - start, cache_hit=True)
+        get_current_span().set_attribute("cache.hit", True)
+
+    def _cache_key(self, prompt: str, model_name: str, generation_config: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Returns the cache key for a request, or None when caching is disabled."""
+        if self.cache is None:
+            return None
+        return ResponseCache.make_key(model_name, prompt, generation_config)
+
+    def _store(self, cache_key: Optional[str], text: str) -> None:
+        """Caches a non-empty response under `cache_key`."""
+        if cache_key is not None and text:
+            self.cache.set(cache_key, text)
 
 if __name__ == "__main__":
+    setup_logging()
+
     # Example Usage:
     # 1. Create a `configs/config.yaml` file with your Gemini API key.
-    # 2. Run this script: `python src/utils/gemini_api.py`
+    # 2. Run this script: `python -m src.utils.gemini_api`
 
     # Replace with your actual API key
     dummy_api_key = "YOUR_API_KEY"
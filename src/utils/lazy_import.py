@@ -0,0 +1,56 @@
+import importlib
+import threading
+from types import ModuleType
+from typing import Any, Optional
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is only imported when one of its attributes is first used.
+
+    Heavy SDKs (google-generativeai, arxiv, numpy) account for most of the startup
+    time of short-lived runs, and many runs never touch some of them. Assigning
+    attributes on the stand-in (as `unittest.mock.patch` does) shadows the module's
+    own attributes.
+    """
+
+    def __init__(self, name: str, install_hint: Optional[str] = None):
+        """
+        Initializes the LazyModule without importing anything.
+
+        Args:
+            name: The absolute module name (e.g. "google.generativeai").
+            install_hint: Package to suggest installing if the import fails.
+        """
+        self.__dict__["_lazy_name"] = name
+        self.__dict__["_lazy_install_hint"] = install_hint
+        self.__dict__["_lazy_module"] = None
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        """Imports the module on first use and returns it."""
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    try:
+                        module = importlib.import_module(self._lazy_name)
+                    except ImportError as e:
+                        hint = self._lazy_install_hint
+                        raise ImportError(f"{self._lazy_name} is required for this operation"
+                                          + (f"; install it with: pip install {hint}" if hint else "")) from e
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the module has been imported."""
+        return self.__dict__["_lazy_module"] is not None
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._load(), attribute)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<LazyModule {self._lazy_name!r} ({state})>"
@@ -1,25 +1,185 @@
-import sys
 import os
+import json
+import queue
+import atexit
 import logging
 import logging.config
+import logging.handlers
+import threading
 import yaml
-from typing import Dict, Any
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
 
-# Dynamically adjust sys.path to allow imports from the project root
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-if PROJECT_ROOT not in sys.path:
-    sys.path.insert(0, PROJECT_ROOT)
 
+DEFAULT_MAX_PAYLOAD_CHARS = 500
+DEFAULT_RESPONSE_LOG_PATH = "logs/responses.jsonl"
+RESPONSE_LOGGER_NAME = "ares.responses"
 
-def setup_logging(default_path: str = 'configs/logging.yaml', default_level: int = logging.INFO, env_key: str = 'LOG_CFG') -> None:
+_configured = False
+_lock = threading.Lock()
+_max_payload_chars = DEFAULT_MAX_PAYLOAD_CHARS
+# Background listeners and the handlers they replaced on their logger, for shutdown_logging().
+_listeners: List[logging.handlers.QueueListener] = []
+_installed: List[tuple] = []
+_atexit_registered = False
+
+
+class Truncated:
+    """
+    Log argument that renders a payload capped at a maximum length.
+
+    The value is only converted to a string when the record is actually formatted,
+    so `logger.info("Results: %s", Truncated(response))` costs nothing when INFO is disabled.
+    """
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value: Any, limit: Optional[int] = None):
+        """
+        Initializes the Truncated wrapper.
+
+        Args:
+            value: The payload (a model response, a list of hypotheses, ...).
+            limit: Maximum number of characters (default: the `max_payload_chars` logging setting).
+        """
+        self.value = value
+        self.limit = limit
+
+    def __str__(self) -> str:
+        text = self.value if isinstance(self.value, str) else str(self.value)
+        limit = self.limit if self.limit is not None else _max_payload_chars
+        if limit <= 0 or len(text) <= limit:
+            return text
+        return f"{text[:limit]}... [{len(text) - limit} more chars]"
+
+    __repr__ = __str__
+
+
+class JsonLinesHandler(logging.Handler):
+    """
+    Handler writing each record as one JSON object per line.
+
+    Attributes passed with `extra=` (agent, model, payload, ...) become fields of the object.
+    It is meant to run behind a QueueListener, off the threads that log.
+    """
+
+    _RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+    def __init__(self, path: str):
+        """
+        Initializes the JsonLinesHandler.
+
+        Args:
+            path: The JSON lines file; its directory is created if needed and records are appended.
+        """
+        super().__init__()
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            entry = {
+                "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+                "logger": record.name,
+                "level": record.levelname,
+                "message": record.getMessage(),
+            }
+            entry.update({key: value for key, value in vars(record).items() if key not in self._RECORD_ATTRIBUTES})
+            self._file.write(json.dumps(entry, default=str) + "\n")
+            self._file.flush()
+        except Exception:
+            self.handleError(record)
+
+    def close(self) -> None:
+        with self.lock:
+            if not self._file.closed:
+                self._file.close()
+        super().close()
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that enqueues records unformatted.
+
+    The stock `prepare` formats the message and copies the record on the logging
+    thread; here the record itself is queued and the listener's handlers format it.
+    Log arguments are therefore rendered later, so they must not be mutated after
+    the logging call.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _install_queue(logger: logging.Logger, handlers: List[logging.Handler]) -> None:
+    """Routes `logger` through a QueueHandler whose listener thread runs `handlers`."""
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    previous = list(logger.handlers)
+    for handler in previous:
+        logger.removeHandler(handler)
+    logger.addHandler(DeferredQueueHandler(records))
+    listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+    _installed.append((logger, previous))
+
+
+def shutdown_logging() -> None:
+    """
+    Stops the background logging threads after they have written every queued record.
+
+    The handlers the queues stood in front of are put back, so logging keeps working
+    (synchronously) afterwards; the response log is closed.
+    """
+    with _lock:
+        for listener in _listeners:
+            listener.stop()
+        for logger, previous in _installed:
+            for handler in list(logger.handlers):
+                logger.removeHandler(handler)
+                if isinstance(handler, logging.handlers.QueueHandler):
+                    continue
+                handler.close()
+            for handler in previous:
+                logger.addHandler(handler)
+        response_logger = logging.getLogger(RESPONSE_LOGGER_NAME)
+        for handler in list(response_logger.handlers):
+            response_logger.removeHandler(handler)
+            handler.close()
+        _listeners.clear()
+        _installed.clear()
+
+
+def setup_logging(default_path: str = 'configs/logging.yaml', default_level: int = logging.INFO, env_key: str = 'LOG_CFG',
+                  force: bool = False, settings: Optional[Dict[str, Any]] = None) -> None:
     """
     Setup logging configuration.
 
+    Library modules only create loggers; entry points call this once at startup.
+    Later calls are no-ops unless `force` is set, so the YAML file is read at most once.
+
+    By default the root logger's handlers are moved behind a queue: logging calls only
+    enqueue the record and a background thread formats and writes it (see
+    `DeferredQueueHandler`), so slow handlers do not add latency to model calls. Full model responses go to a separate
+    JSON lines sink (see `log_response`), written by its own background thread.
+
     Args:
         default_path: Path to the logging configuration file (YAML).
         default_level: Default logging level if no configuration file is found.
         env_key: Environment variable key for specifying the logging configuration file path.
+        force: Re-apply the configuration even if logging was already set up.
+        settings: The `logging` section of the ARES configuration: `level`, `queue` (default true),
+            `max_payload_chars` and `response_log` (`enabled`, `path`).
     """
+    global _configured, _max_payload_chars, _atexit_registered
+    if _configured and not force:
+        return
+    shutdown_logging()
+    _configured = True
+    settings = settings or {}
     path = os.getenv(env_key, default_path)
     if path and os.path.exists(path):
         try:
@@ -27,17 +187,57 @@ def setup_logging(default_path: str = 'configs/logging.yaml', default_level: int
                 config = yaml.safe_load(f)
             logging.config.dictConfig(config)
         except Exception as e:
-            logging.basicConfig(level=default_level)
-            logging.error(f"Error loading logging configuration from {path}: {e}. Using basic configuration.")
+            logging.basicConfig(level=default_level, force=force)
+            logging.error("Error loading logging configuration from %s: %s. Using basic configuration.", path, e)
     else:
-        logging.basicConfig(level=default_level)
-        logging.warning(f"Logging configuration file not found at {path}. Using basic configuration.")
+        logging.basicConfig(level=default_level, force=force)
+        logging.warning("Logging configuration file not found at %s. Using basic configuration.", path)
+
+    root = logging.getLogger()
+    if settings.get('level'):
+        root.setLevel(settings['level'])
+    _max_payload_chars = int(settings.get('max_payload_chars', DEFAULT_MAX_PAYLOAD_CHARS))
+
+    with _lock:
+        if settings.get('queue', True) and root.handlers:
+            _install_queue(root, list(root.handlers))
+        response_settings = settings.get('response_log') or {}
+        response_logger = logging.getLogger(RESPONSE_LOGGER_NAME)
+        response_logger.propagate = False
+        response_logger.setLevel(logging.INFO)
+        if response_settings.get('enabled', False):
+            response_path = response_settings.get('path', DEFAULT_RESPONSE_LOG_PATH)
+            _install_queue(response_logger, [JsonLinesHandler(response_path)])
+        if not _atexit_registered:
+            atexit.register(shutdown_logging)
+            _atexit_registered = True
+
+
+def log_response(model_name: str, prompt: str, response: str, agent: Optional[str] = None, **fields: Any) -> None:
+    """
+    Sends a full model response to the response log, if one is configured.
+
+    Only a reference to the strings is enqueued; serialization and the file write
+    happen on the response log's background thread.
+
+    Args:
+        model_name: The model that produced the response.
+        prompt: The prompt that was sent.
+        response: The complete response text.
+        agent: The agent that made the call.
+        **fields: Further JSON fields (latency, token counts, ...).
+    """
+    response_logger = logging.getLogger(RESPONSE_LOGGER_NAME)
+    if not response_logger.handlers:
+        return
+    response_logger.info("model response", extra={"agent": agent, "model": model_name, "prompt": prompt,
+                                                  "response": response, **fields})
 
 
 if __name__ == '__main__':
     # Example Usage:
     # 1. Create a `configs/logging.yaml` file (see example below).
-    # 2. Run this script: `python src/utils/logging_config.py`
+    # 2. Run this script: `python -m src.utils.logging_config`
     # 3. Check the console for log messages.
 
     # Example `configs/logging.yaml` file:
@@ -57,8 +257,8 @@ if __name__ == '__main__':
     #   handlers: [console]
     # disable_existing_loggers: False
 
-    # Set up logging (using default settings)
-    setup_logging()
+    # Set up queued logging with a response log
+    setup_logging(settings={'max_payload_chars': 40, 'response_log': {'enabled': True, 'path': 'logs/responses.jsonl'}})
 
     # Get a logger
     logger = logging.getLogger(__name__)
@@ -68,4 +268,7 @@ if __name__ == '__main__':
     logger.info("This is an info message.")
     logger.warning("This is a warning message.")
     logger.error("This is an error message.")
-    logger.critical("This is a critical message.")
\ No newline at end of file
+    logger.critical("This is a critical message.")
+    logger.info("A long payload: %s", Truncated("word " * 100))
+    log_response("gemini-2.0-flash", "Say hello.", "Hello!", agent="example")
+    shutdown_logging()
@@ -0,0 +1,290 @@
+import sys
+import os
+import json
+import math
+import logging
+import threading
+from typing import Optional, Dict, Any, List, Tuple, Sequence
+
+# Local imports
+try:
+    from src.utils.logging_config import setup_logging
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+UNKNOWN_AGENT = "unknown"
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape_label_value(value)}"' for name, value in zip(labelnames, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """
+    Monotonically increasing value per label combination.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """
+        Initializes the Counter.
+
+        Args:
+            name: The metric name.
+            documentation: The help text.
+            labelnames: Names of the labels each sample carries.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """
+        Increments the counter for a label combination.
+
+        Args:
+            amount: The non-negative increment.
+            **labels: One value per label name.
+        """
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> Dict[Tuple[str, ...], float]:
+        """Returns a snapshot of the value per label combination."""
+        with self._lock:
+            return dict(self._values)
+
+    def expose(self) -> List[str]:
+        """Renders the counter in Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self.samples().items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram per label combination, tracking count, sum and max.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        """
+        Initializes the Histogram.
+
+        Args:
+            name: The metric name.
+            documentation: The help text.
+            labelnames: Names of the labels each sample carries.
+            buckets: Increasing upper bounds of the buckets (+Inf is implied).
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        """
+        Records one observation.
+
+        Args:
+            value: The observed value.
+            **labels: One value per label name.
+        """
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = {"counts": [0] * len(self.buckets), "count": 0, "sum": 0.0, "max": 0.0}
+                self._series[key] = series
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][i] += 1
+                    break
+            series["count"] += 1
+            series["sum"] += value
+            series["max"] = max(series["max"], value)
+
+    def samples(self) -> Dict[Tuple[str, ...], Dict[str, Any]]:
+        """Returns a snapshot of count, sum, max and per-bucket counts per label combination."""
+        with self._lock:
+            return {key: dict(series, counts=list(series["counts"])) for key, series in self._series.items()}
+
+    def expose(self) -> List[str]:
+        """Renders the histogram in Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for key, series in sorted(self.samples().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series["counts"]):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series['sum'])}")
+            lines.append(f"{self.name}_count{labels} {series['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    In-process registry of model-call metrics.
+
+    Every Gemini call is recorded with the calling agent, model, cache status and
+    outcome, its prompt and response token counts and its wall-clock latency.
+    """
+
+    def __init__(self, latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        """
+        Initializes the MetricsRegistry.
+
+        Args:
+            latency_buckets: Upper bounds of the latency histogram buckets, in seconds.
+        """
+        self.calls = Counter("ares_model_calls_total", "Gemini calls by agent, model, cache status and outcome.",
+                             ("agent", "model", "cache", "status"))
+        self.prompt_tokens = Counter("ares_model_prompt_tokens_total", "Prompt tokens sent to Gemini.",
+                                     ("agent", "model"))
+        self.response_tokens = Counter("ares_model_response_tokens_total", "Response tokens received from Gemini.",
+                                       ("agent", "model"))
+        self.latency = Histogram("ares_model_call_latency_seconds", "Wall-clock latency of Gemini calls, including retries.",
+                                 ("agent", "model"), buckets=latency_buckets)
+
+    def record_call(self, agent: Optional[str], model: str, latency: float, prompt_tokens: int = 0,
+                    response_tokens: int = 0, cache_hit: bool = False, success: bool = True) -> None:
+        """
+        Records one model call.
+
+        Args:
+            agent: The calling agent (None is recorded as "unknown").
+            model: The model name.
+            latency: Wall-clock seconds spent in the call.
+            prompt_tokens: Prompt tokens billed for the call (0 for cache hits).
+            response_tokens: Response tokens billed for the call (0 for cache hits).
+            cache_hit: Whether the response came from the response cache.
+            success: Whether the call produced a response.
+        """
+        agent = agent or UNKNOWN_AGENT
+        self.calls.inc(agent=agent, model=model, cache="hit" if cache_hit else "miss",
+                       status="ok" if success else "error")
+        self.prompt_tokens.inc(prompt_tokens, agent=agent, model=model)
+        self.response_tokens.inc(response_tokens, agent=agent, model=model)
+        self.latency.observe(latency, agent=agent, model=model)
+
+    def to_prometheus(self) -> str:
+        """
+        Renders every metric in the Prometheus text exposition format.
+
+        Returns:
+            The exposition text.
+        """
+        lines: List[str] = []
+        for metric in (self.calls, self.prompt_tokens, self.response_tokens, self.latency):
+            lines.extend(metric.expose())
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Aggregates the metrics per agent.
+
+        Returns:
+            A JSON-serializable dictionary with per-agent and total calls, cache hits,
+            errors, token counts and latency (total, mean and max seconds).
+        """
+        agents: Dict[str, Dict[str, Any]] = {}
+
+        def entry(agent: str) -> Dict[str, Any]:
+            return agents.setdefault(agent, {
+                "calls": 0, "cache_hits": 0, "errors": 0, "prompt_tokens": 0, "response_tokens": 0,
+                "total_latency_seconds": 0.0, "max_latency_seconds": 0.0,
+            })
+
+        for (agent, _model, cache, status), count in self.calls.samples().items():
+            stats = entry(agent)
+            stats["calls"] += int(count)
+            stats["cache_hits"] += int(count) if cache == "hit" else 0
+            stats["errors"] += int(count) if status == "error" else 0
+        for (agent, _model), count in self.prompt_tokens.samples().items():
+            entry(agent)["prompt_tokens"] += int(count)
+        for (agent, _model), count in self.response_tokens.samples().items():
+            entry(agent)["response_tokens"] += int(count)
+        for (agent, _model), series in self.latency.samples().items():
+            stats = entry(agent)
+            stats["total_latency_seconds"] += series["sum"]
+            stats["max_latency_seconds"] = max(stats["max_latency_seconds"], series["max"])
+
+        totals = {key: 0 for key in ("calls", "cache_hits", "errors", "prompt_tokens", "response_tokens")}
+        totals["total_latency_seconds"] = 0.0
+        for stats in agents.values():
+            stats["mean_latency_seconds"] = stats["total_latency_seconds"] / stats["calls"] if stats["calls"] else 0.0
+            for key in totals:
+                totals[key] += stats[key]
+        return {"agents": dict(sorted(agents.items())), "totals": totals}
+
+    def write(self, summary_path: Optional[str] = None, prometheus_path: Optional[str] = None) -> None:
+        """
+        Writes the JSON summary and/or the Prometheus exposition to files.
+
+        Args:
+            summary_path: Optional path of the JSON summary.
+            prometheus_path: Optional path of the Prometheus text file (e.g. for node_exporter's textfile collector).
+        """
+        for path, content in ((summary_path, lambda: json.dumps(self.summary(), indent=2)),
+                              (prometheus_path, self.to_prometheus)):
+            if not path:
+                continue
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content())
+            logger.info("Wrote metrics to %s", path)
+
+
+_metrics_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """
+    Returns the process-wide metrics registry.
+
+    Returns:
+        The shared MetricsRegistry.
+    """
+    return _metrics_registry
+
+
+if __name__ == "__main__":
+    setup_logging()
+
+    # Example Usage:
+    # 1. Run this script: `python -m src.utils.metrics`
+
+    registry = MetricsRegistry()
+    registry.record_call("theorist", "gemini-2.0-flash", 1.2, prompt_tokens=150, response_tokens=400)
+    registry.record_call("critic", "gemini-2.0-flash", 0.001, cache_hit=True)
+    print(registry.to_prometheus())
+    print(json.dumps(registry.summary(), indent=2))
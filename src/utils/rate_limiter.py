@@ -0,0 +1,456 @@
+import sys
+import time
+import random
+import asyncio
+import logging
+import threading
+from typing import Optional, Dict, Any, Tuple
+
+# Local imports
+try:
+    from src.utils.logging_config import setup_logging
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+
+
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_BASE_DELAY = 1.0
+DEFAULT_MAX_DELAY = 30.0
+DEFAULT_BUDGET_RATIO = 0.2
+DEFAULT_BUDGET_MAX = 10.0
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is rejected because the circuit breaker is open."""
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Checks whether an error is transient (rate limiting, overload, timeouts).
+
+    Args:
+        error: The exception raised by the model call.
+
+    Returns:
+        True if retrying the request may succeed.
+    """
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    # Errors raised by the SDK can only exist once it has been imported, so avoid importing it here.
+    google_exceptions = sys.modules.get("google.api_core.exceptions")
+    if google_exceptions is not None and isinstance(error, (
+            google_exceptions.TooManyRequests,
+            google_exceptions.ResourceExhausted,
+            google_exceptions.ServiceUnavailable,
+            google_exceptions.DeadlineExceeded,
+            google_exceptions.InternalServerError)):
+        return True
+    return getattr(error, 'code', None) in (429, 500, 503, 504)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at `rate` tokens per second.
+
+    The balance may go negative when actual usage is charged after the fact, which
+    delays subsequent callers until the debt is repaid.
+    """
+
+    def __init__(self, capacity: float, rate: float):
+        """
+        Initializes a full TokenBucket.
+
+        Args:
+            capacity: Maximum number of tokens the bucket holds (the burst size).
+            rate: Refill rate in tokens per second.
+        """
+        if capacity <= 0 or rate <= 0:
+            raise ValueError("TokenBucket capacity and rate must be positive")
+        self.capacity = float(capacity)
+        self.rate = float(rate)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """
+        Takes `amount` tokens, possibly into debt, and returns how long to wait before proceeding.
+
+        Args:
+            amount: Number of tokens to take (clamped to the capacity).
+
+        Returns:
+            The number of seconds the caller must wait before using the reservation.
+        """
+        amount = min(float(amount), self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= amount
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def debit(self, amount: float) -> None:
+        """
+        Charges tokens that were consumed without a reservation.
+
+        Args:
+            amount: Number of tokens to charge.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= float(amount)
+
+    @property
+    def available(self) -> float:
+        """Current number of tokens in the bucket."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+
+class RateLimiter:
+    """
+    Client-side limiter for requests per minute and tokens per minute.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None):
+        """
+        Initializes the RateLimiter.
+
+        Args:
+            requests_per_minute: Optional request quota per minute.
+            tokens_per_minute: Optional token quota per minute.
+        """
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60.0) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60.0) if tokens_per_minute else None
+
+    def _reserve(self, tokens: int) -> float:
+        delay = 0.0
+        if self.requests is not None:
+            delay = max(delay, self.requests.reserve(1))
+        if self.tokens is not None and tokens:
+            delay = max(delay, self.tokens.reserve(tokens))
+        return delay
+
+    def acquire(self, tokens: int = 0) -> float:
+        """
+        Blocks until one request with `tokens` prompt tokens fits in the quota.
+
+        Args:
+            tokens: Estimated number of prompt tokens for the request.
+
+        Returns:
+            The number of seconds spent waiting.
+        """
+        delay = self._reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def aacquire(self, tokens: int = 0) -> float:
+        """
+        Asynchronous counterpart of `acquire`.
+
+        Args:
+            tokens: Estimated number of prompt tokens for the request.
+
+        Returns:
+            The number of seconds spent waiting.
+        """
+        delay = self._reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def record_usage(self, tokens: int) -> None:
+        """
+        Charges tokens that were not part of the reservation (e.g. response tokens).
+
+        Args:
+            tokens: Number of additional tokens consumed.
+        """
+        if self.tokens is not None and tokens > 0:
+            self.tokens.debit(tokens)
+
+
+class RetryBudget:
+    """
+    Limits retries to a fraction of overall traffic.
+
+    Every first attempt deposits `ratio` into the budget and every retry withdraws
+    one unit, so sustained retries cannot exceed `ratio` of requests plus a burst
+    of `max_balance`.
+    """
+
+    def __init__(self, ratio: float = DEFAULT_BUDGET_RATIO, max_balance: float = DEFAULT_BUDGET_MAX):
+        """
+        Initializes a full RetryBudget.
+
+        Args:
+            ratio: Retries earned per request.
+            max_balance: Maximum number of retries that can be banked.
+        """
+        self.ratio = ratio
+        self.max_balance = max_balance
+        self._balance = max_balance
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        """Deposits the retry allowance earned by a first attempt."""
+        with self._lock:
+            self._balance = min(self.max_balance, self._balance + self.ratio)
+
+    def try_spend(self) -> bool:
+        """
+        Withdraws one retry from the budget.
+
+        Returns:
+            True if the retry is allowed.
+        """
+        with self._lock:
+            if self._balance >= 1.0:
+                self._balance -= 1.0
+                return True
+            return False
+
+
+class RetryPolicy:
+    """
+    Jittered exponential backoff for transient errors, bounded by a retry budget.
+    """
+
+    def __init__(self, max_retries: int = DEFAULT_MAX_RETRIES, base_delay: float = DEFAULT_BASE_DELAY,
+                 max_delay: float = DEFAULT_MAX_DELAY, budget: Optional[RetryBudget] = None):
+        """
+        Initializes the RetryPolicy.
+
+        Args:
+            max_retries: Maximum retries per request.
+            base_delay: Backoff before the first retry, in seconds.
+            max_delay: Upper bound on any single backoff, in seconds.
+            budget: Optional retry budget shared by all requests.
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+
+    def should_retry(self, error: Exception, attempt: int) -> bool:
+        """
+        Decides whether to retry after a failed attempt.
+
+        Args:
+            error: The exception raised by the attempt.
+            attempt: Zero-based number of the attempt that failed.
+
+        Returns:
+            True if the request should be retried.
+        """
+        if attempt >= self.max_retries or not is_retryable(error):
+            return False
+        if self.budget is not None and not self.budget.try_spend():
+            logger.warning("Retry budget exhausted; not retrying.")
+            return False
+        return True
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Returns a "full jitter" backoff for the given attempt.
+
+        Args:
+            attempt: Zero-based number of the attempt that failed.
+
+        Returns:
+            A delay drawn uniformly from [0, min(max_delay, base_delay * 2**attempt)].
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests after repeated transient failures.
+
+    After `failure_threshold` consecutive failures the circuit opens and requests
+    are rejected for `reset_timeout` seconds; then a single trial request is let
+    through, closing the circuit on success or re-opening it on failure. A trial
+    that ends any other way (a non-transient error, cancellation) must call
+    `release_trial` so that the next request can be the trial; only the request
+    that `admit` reported as the trial may do so.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout: float = DEFAULT_RESET_TIMEOUT):
+        """
+        Initializes a closed CircuitBreaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit.
+            reset_timeout: Seconds to wait before allowing a trial request.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def admit(self) -> Tuple[bool, bool]:
+        """
+        Checks whether a request may be sent, taking the trial slot if the circuit is half-open.
+
+        Returns:
+            A tuple (allowed, is_trial): allowed is True if the circuit is closed, or
+            half-open with no trial request in flight; is_trial is True if this
+            request took the trial slot.
+        """
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.CLOSED:
+                return True, False
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True, True
+            return False, False
+
+    def allow_request(self) -> bool:
+        """
+        Checks whether a request may be sent.
+
+        Returns:
+            True if the circuit is closed, or half-open with no trial request in flight.
+        """
+        return self.admit()[0]
+
+    def record_success(self) -> None:
+        """Closes the circuit after a successful request."""
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Frees the half-open trial slot without recording an outcome; a no-op in any other state."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Counts a transient failure, opening the circuit once the threshold is reached."""
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning("Circuit breaker opened after %s consecutive failures.", self._failures)
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+
+_shared_rate_limiters: Dict[Tuple[Optional[float], Optional[float]], RateLimiter] = {}
+_shared_policies_lock = threading.Lock()
+_shared_retry_policies: Dict[Tuple[Any, ...], RetryPolicy] = {}
+_shared_circuit_breakers: Dict[Tuple[Any, ...], CircuitBreaker] = {}
+
+
+def get_rate_limiter(config: Dict[str, Any]) -> Optional[RateLimiter]:
+    """
+    Returns the process-wide RateLimiter described by `resilience.rate_limit`.
+
+    Args:
+        config: The loaded configuration dictionary.
+
+    Returns:
+        A RateLimiter shared by every client with the same quotas, or None if no quota is set.
+    """
+    rate_config = (config.get('resilience') or {}).get('rate_limit') or {}
+    key = (rate_config.get('requests_per_minute'), rate_config.get('tokens_per_minute'))
+    if key == (None, None):
+        return None
+    with _shared_policies_lock:
+        limiter = _shared_rate_limiters.get(key)
+        if limiter is None:
+            limiter = RateLimiter(requests_per_minute=key[0], tokens_per_minute=key[1])
+            _shared_rate_limiters[key] = limiter
+        return limiter
+
+
+def get_retry_policy(config: Dict[str, Any]) -> RetryPolicy:
+    """
+    Returns the process-wide RetryPolicy described by `resilience.retry`.
+
+    Args:
+        config: The loaded configuration dictionary.
+
+    Returns:
+        A RetryPolicy with a retry budget, shared by every client with the same settings.
+    """
+    retry_config = (config.get('resilience') or {}).get('retry') or {}
+    key = (retry_config.get('max_retries', DEFAULT_MAX_RETRIES),
+           retry_config.get('base_delay', DEFAULT_BASE_DELAY),
+           retry_config.get('max_delay', DEFAULT_MAX_DELAY),
+           retry_config.get('budget_ratio', DEFAULT_BUDGET_RATIO),
+           retry_config.get('budget_max', DEFAULT_BUDGET_MAX))
+    with _shared_policies_lock:
+        policy = _shared_retry_policies.get(key)
+        if policy is None:
+            policy = RetryPolicy(max_retries=key[0], base_delay=key[1], max_delay=key[2],
+                                 budget=RetryBudget(ratio=key[3], max_balance=key[4]))
+            _shared_retry_policies[key] = policy
+        return policy
+
+
+def get_circuit_breaker(config: Dict[str, Any]) -> Optional[CircuitBreaker]:
+    """
+    Returns the process-wide CircuitBreaker described by `resilience.circuit_breaker`.
+
+    Args:
+        config: The loaded configuration dictionary.
+
+    Returns:
+        A CircuitBreaker shared by every client with the same settings, or None if
+        `failure_threshold` is set to 0.
+    """
+    breaker_config = (config.get('resilience') or {}).get('circuit_breaker') or {}
+    key = (breaker_config.get('failure_threshold', DEFAULT_FAILURE_THRESHOLD),
+           breaker_config.get('reset_timeout', DEFAULT_RESET_TIMEOUT))
+    if not key[0]:
+        return None
+    with _shared_policies_lock:
+        breaker = _shared_circuit_breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(failure_threshold=key[0], reset_timeout=key[1])
+            _shared_circuit_breakers[key] = breaker
+        return breaker
+
+
+if __name__ == "__main__":
+    setup_logging()
+
+    # Example Usage:
+    # 1. Run this script: `python -m src.utils.rate_limiter`
+
+    # Allow 120 requests per minute (2 per second) with a burst of 120
+    limiter = RateLimiter(requests_per_minute=120)
+    start = time.monotonic()
+    waited = sum(limiter.acquire() for _ in range(125))
+    print(f"125 requests took {time.monotonic() - start:.2f}s (waited {waited:.2f}s in total)")
+
+    # Show the backoff schedule of the default retry policy
+    policy = RetryPolicy()
+    print("Backoff upper bounds:", [min(policy.max_delay, policy.base_delay * 2 ** a) for a in range(policy.max_retries)])
@@ -0,0 +1,303 @@
+import sys
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+# Local imports
+try:
+    from src.utils.logging_config import setup_logging
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CACHE_PATH = "cache/responses.sqlite"
+DEFAULT_MAX_MEMORY_ENTRIES = 256
+DEFAULT_MAX_DISK_BYTES = 100 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+
+
+class ResponseCache:
+    """
+    Two-tier, content-addressed cache for Gemini responses.
+
+    An in-memory LRU tier sits in front of a SQLite file on disk. Entries are keyed
+    on a SHA-256 hash of (model_name, prompt, generation settings), expire after
+    `ttl_seconds`, and the disk tier is trimmed least-recently-used first once it
+    grows beyond `max_disk_bytes`. The disk size is tracked as a running total, so
+    a write only touches its own row unless it triggers eviction.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_CACHE_PATH,
+                 max_memory_entries: int = DEFAULT_MAX_MEMORY_ENTRIES,
+                 max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+                 ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS):
+        """
+        Initializes the ResponseCache.
+
+        Args:
+            path: Path to the SQLite cache file, or None for a memory-only cache.
+            max_memory_entries: Maximum number of entries kept in the in-memory LRU tier.
+            max_disk_bytes: Maximum total size of cached responses on disk.
+            ttl_seconds: Lifetime of a cache entry in seconds, or None for no expiry.
+        """
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_bytes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+            self._conn.commit()
+            self._disk_bytes = self._total_disk_bytes()
+        logger.info("ResponseCache initialized (path: %s).", path)
+
+    @staticmethod
+    def make_key(model_name: str, prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Computes the content address of a request.
+
+        Args:
+            model_name: The name of the Gemini model.
+            prompt: The prompt sent to the model.
+            generation_config: Optional generation settings sent with the prompt.
+
+        Returns:
+            A hex SHA-256 digest identifying the request.
+        """
+        payload = json.dumps(
+            {"model_name": model_name, "prompt": prompt, "generation_config": generation_config or {}},
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @property
+    def hits(self) -> int:
+        """Total number of hits across both tiers."""
+        return self.memory_hits + self.disk_hits
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def _remember(self, key: str, value: str, created_at: float) -> None:
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Looks up a cached response.
+
+        Args:
+            key: The key returned by `make_key`.
+
+        Returns:
+            The cached response, or None on a miss.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if not self._is_expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return value
+                del self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, size, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, size, created_at = row
+                    if not self._is_expired(created_at, now):
+                        self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                        self._conn.commit()
+                        self._remember(key, value, created_at)
+                        self.disk_hits += 1
+                        return value
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                    self._disk_bytes -= size
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Stores a response in both tiers and applies eviction.
+
+        Args:
+            key: The key returned by `make_key`.
+            value: The response text to cache.
+        """
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            if self._conn is None:
+                return
+            size = len(value.encode("utf-8"))
+            replaced = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now)
+            )
+            self._disk_bytes += size - (replaced[0] if replaced else 0)
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict(now)
+            self._conn.commit()
+
+    def _total_disk_bytes(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def _evict(self, now: float) -> None:
+        """
+        Removes expired entries, then least-recently-used entries until under the size limit.
+
+        Only runs once the running total exceeds the limit. The total is then recounted,
+        which also picks up entries written by other processes sharing the file.
+        """
+        if self.ttl_seconds is not None:
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        total = self._total_disk_bytes()
+        if total > self.max_disk_bytes:
+            for key, size in self._conn.execute(
+                    "SELECT key, size FROM responses ORDER BY accessed_at ASC").fetchall():
+                if total <= self.max_disk_bytes:
+                    break
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._memory.pop(key, None)
+                total -= size
+        self._disk_bytes = total
+
+    def clear(self) -> None:
+        """Removes every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM responses")
+                self._conn.commit()
+                self._disk_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns hit/miss counters.
+
+        Returns:
+            A dictionary with memory_hits, disk_hits, hits, misses and memory_entries.
+        """
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "hits": self.hits,
+            "misses": self.misses,
+            "memory_entries": len(self._memory),
+        }
+
+    def close(self) -> None:
+        """Closes the underlying SQLite connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_shared_caches: Dict[Optional[str], ResponseCache] = {}
+_shared_caches_lock = threading.Lock()
+
+
+def is_cache_enabled(config: Dict[str, Any], agent_name: Optional[str] = None) -> bool:
+    """
+    Checks whether response caching is enabled, optionally for a specific agent.
+
+    Args:
+        config: The loaded configuration dictionary.
+        agent_name: Optional agent name looked up under `response_cache.agents`.
+
+    Returns:
+        True if caching is enabled globally and not disabled for the agent.
+    """
+    cache_config = config.get('response_cache') or {}
+    if not cache_config.get('enabled', False):
+        return False
+    if agent_name is not None:
+        return bool((cache_config.get('agents') or {}).get(agent_name, True))
+    return True
+
+
+def get_response_cache(config: Dict[str, Any], agent_name: Optional[str] = None) -> Optional[ResponseCache]:
+    """
+    Returns the process-wide response cache described by the `response_cache` config section.
+
+    Caches are shared per path so that all agents reuse the same memory tier and
+    SQLite connection.
+
+    Args:
+        config: The loaded configuration dictionary.
+        agent_name: Optional agent name; caching can be disabled per agent via
+            `response_cache.agents.<agent_name>: false`.
+
+    Returns:
+        The shared ResponseCache, or None if caching is disabled.
+    """
+    if not is_cache_enabled(config, agent_name):
+        return None
+
+    cache_config = config['response_cache']
+    path = cache_config.get('path', DEFAULT_CACHE_PATH)
+    with _shared_caches_lock:
+        cache = _shared_caches.get(path)
+        if cache is None:
+            cache = ResponseCache(
+                path=path,
+                max_memory_entries=cache_config.get('max_memory_entries', DEFAULT_MAX_MEMORY_ENTRIES),
+                max_disk_bytes=cache_config.get('max_disk_bytes', DEFAULT_MAX_DISK_BYTES),
+                ttl_seconds=cache_config.get('ttl_seconds', DEFAULT_TTL_SECONDS)
+            )
+            _shared_caches[path] = cache
+        return cache
+
+
+if __name__ == "__main__":
+    setup_logging()
+
+    # Example Usage:
+    # 1. Run this script: `python -m src.utils.response_cache`
+
+    # Instantiate a memory-only ResponseCache
+    cache = ResponseCache(path=None)
+
+    # Cache a response
+    key = ResponseCache.make_key("gemini-2.0-flash", "Write a short poem about the stars.")
+    print(f"Before set: {cache.get(key)}")
+    cache.set(key, "Twinkle, twinkle...")
+    print(f"After set: {cache.get(key)}")
+
+    # Print the cache statistics
+    print(f"Cache stats: {cache.stats()}")
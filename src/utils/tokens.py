@@ -0,0 +1,33 @@
+import math
+from typing import Iterable
+
+# Average number of characters per token for English text in Gemini's tokenizer.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates the number of tokens in `text` without calling the API.
+
+    Args:
+        text: The text to measure.
+
+    Returns:
+        The approximate token count.
+    """
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def estimate_tokens_many(texts: Iterable[str]) -> int:
+    """
+    Estimates the combined number of tokens in several texts.
+
+    Args:
+        texts: The texts to measure.
+
+    Returns:
+        The approximate total token count.
+    """
+    return sum(estimate_tokens(text) for text in texts)
@@ -0,0 +1,637 @@
+import sys
+import os
+import json
+import time
+import inspect
+import logging
+import functools
+import threading
+import contextlib
+import contextvars
+from typing import Optional, Dict, Any, List, Iterator, Callable, Sequence, TextIO
+
+# Local imports
+try:
+    from src.utils.logging_config import setup_logging
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_TRACE_PATH = "logs/traces.jsonl"
+TRACE_EXPORTERS = ("file", "console")
+STATUS_OK = "OK"
+STATUS_ERROR = "ERROR"
+
+
+class Span:
+    """
+    A timed operation with attributes and events, modelled on OpenTelemetry spans.
+
+    Spans of one run share a trace id and point at their parent span, so they can
+    be reassembled into a tree for per-stage latency breakdowns.
+    """
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None,
+                 attributes: Optional[Dict[str, Any]] = None):
+        """
+        Initializes and starts the Span.
+
+        Args:
+            name: The operation name (e.g. "theorist.generate_hypotheses").
+            trace_id: Hex id shared by every span of the trace.
+            parent_id: Span id of the enclosing span, or None for a root span.
+            attributes: Initial attributes.
+        """
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.events: List[Dict[str, Any]] = []
+        self.status = STATUS_OK
+        self.start_time_ns = time.time_ns()
+        self._start_perf_ns = time.perf_counter_ns()
+        self.end_time_ns: Optional[int] = None
+
+    @property
+    def is_recording(self) -> bool:
+        """Whether the span collects data (False for the no-op span)."""
+        return True
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Sets one attribute."""
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        """Sets several attributes."""
+        self.attributes.update(attributes)
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        """Records a timestamped event (e.g. a retry) within the span."""
+        self.events.append({"name": name, "time_unix_nano": time.time_ns(), "attributes": dict(attributes or {})})
+
+    def set_status(self, status: str) -> None:
+        """Sets the span status (STATUS_OK or STATUS_ERROR)."""
+        self.status = status
+
+    def record_exception(self, error: BaseException) -> None:
+        """Marks the span as failed and records the exception as an event."""
+        self.set_status(STATUS_ERROR)
+        self.add_event("exception", {"exception.type": type(error).__name__, "exception.message": str(error)})
+
+    def end(self) -> None:
+        """Stops the span's clock; ending twice keeps the first end time."""
+        if self.end_time_ns is None:
+            self.end_time_ns = self.start_time_ns + time.perf_counter_ns() - self._start_perf_ns
+
+    @property
+    def duration_ms(self) -> float:
+        """Milliseconds between start and end (or now, if the span has not ended)."""
+        end = self.end_time_ns if self.end_time_ns is not None else (
+            self.start_time_ns + time.perf_counter_ns() - self._start_perf_ns)
+        return (end - self.start_time_ns) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serializes the span.
+
+        Returns:
+            A JSON-serializable dictionary.
+        """
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time_unix_nano": self.start_time_ns,
+            "end_time_unix_nano": self.end_time_ns,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes,
+            "events": self.events,
+        }
+
+
+class _NonRecordingSpan(Span):
+    """Span handed out while tracing is disabled; every operation is a no-op."""
+
+    def __init__(self):
+        self.name = ""
+        self.trace_id = self.span_id = ""
+        self.parent_id = None
+        self.attributes = {}
+        self.events = []
+        self.status = STATUS_OK
+        self.start_time_ns = self.end_time_ns = 0
+        self._start_perf_ns = 0
+
+    @property
+    def is_recording(self) -> bool:
+        return False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        pass
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        pass
+
+    def set_status(self, status: str) -> None:
+        pass
+
+    def record_exception(self, error: BaseException) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+NON_RECORDING_SPAN = _NonRecordingSpan()
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("ares_current_span", default=None)
+
+
+def get_current_span() -> Span:
+    """
+    Returns the span active in the current thread or asyncio task.
+
+    Returns:
+        The active span, or a no-op span if there is none.
+    """
+    span = _current_span.get()
+    return span if span is not None else NON_RECORDING_SPAN
+
+
+class InMemorySpanExporter:
+    """Keeps finished spans in a list (for tests and ad-hoc analysis)."""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def close(self) -> None:
+        pass
+
+
+class StreamSpanExporter:
+    """Writes each finished span as one JSON line to a text stream."""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        """
+        Initializes the StreamSpanExporter.
+
+        Args:
+            stream: The output stream (default: stderr).
+        """
+        self.stream = stream if stream is not None else sys.stderr
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+    def close(self) -> None:
+        pass
+
+
+class FileSpanExporter(StreamSpanExporter):
+    """Appends each finished span as one JSON line to a file."""
+
+    def __init__(self, path: str = DEFAULT_TRACE_PATH):
+        """
+        Initializes the FileSpanExporter.
+
+        Args:
+            path: The JSONL file to append to; its directory is created if needed.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        super().__init__(open(path, "a", encoding="utf-8"))
+
+    def close(self) -> None:
+        with self._lock:
+            self.stream.close()
+
+
+class Tracer:
+    """
+    Creates spans and hands finished ones to exporters.
+
+    The active span is tracked in a context variable, so nesting follows the call
+    stack within a thread and is inherited by asyncio tasks created under a span.
+    A tracer without exporters is disabled and hands out a shared no-op span.
+    """
+
+    def __init__(self, exporters: Optional[Sequence[Any]] = None):
+        """
+        Initializes the Tracer.
+
+        Args:
+            exporters: Objects with `export(span)` and `close()` methods.
+        """
+        self.exporters: List[Any] = list(exporters or [])
+
+    @property
+    def enabled(self) -> bool:
+        """Whether spans are recorded."""
+        return bool(self.exporters)
+
+    def start_span(self, name: str, attributes: Optional[Dict[str, Any]] = None,
+                   parent: Optional[Span] = None) -> Span:
+        """
+        Starts a span without activating it.
+
+        Args:
+            name: The operation name.
+            attributes: Initial attributes.
+            parent: The parent span (default: the active span).
+
+        Returns:
+            The started span; it must be finished with `end_span`.
+        """
+        if not self.enabled:
+            return NON_RECORDING_SPAN
+        if parent is None:
+            parent = _current_span.get()
+        if parent is not None and parent.is_recording:
+            return Span(name, parent.trace_id, parent.span_id, attributes)
+        return Span(name, os.urandom(16).hex(), None, attributes)
+
+    def end_span(self, span: Span) -> None:
+        """
+        Ends a span and exports it.
+
+        Args:
+            span: A span returned by `start_span`.
+        """
+        if not span.is_recording:
+            return
+        span.end()
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                logger.error("Error exporting span %s: %s", span.name, e)
+
+    @contextlib.contextmanager
+    def activate(self, span: Span) -> Iterator[Span]:
+        """
+        Makes a span the active one for the duration of the block.
+
+        Args:
+            span: The span to activate.
+
+        Yields:
+            The span.
+        """
+        if not span.is_recording:
+            yield span
+            return
+        token = _current_span.set(span)
+        try:
+            yield span
+        finally:
+            try:
+                _current_span.reset(token)
+            except ValueError:
+                # A generator finalized from another context cannot restore the caller's span.
+                pass
+
+    @contextlib.contextmanager
+    def span(self, name: str, parent: Optional[Span] = None, **attributes: Any) -> Iterator[Span]:
+        """
+        Runs a block inside a new active span, recording any exception it raises.
+
+        Args:
+            name: The operation name.
+            parent: The parent span (default: the active span).
+            **attributes: Initial attributes.
+
+        Yields:
+            The span.
+        """
+        span = self.start_span(name, attributes, parent=parent)
+        try:
+            with self.activate(span):
+                yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            self.end_span(span)
+
+    def shutdown(self) -> None:
+        """Closes and detaches every exporter, disabling the tracer."""
+        exporters, self.exporters = self.exporters, []
+        for exporter in exporters:
+            exporter.close()
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """
+    Returns the process-wide tracer.
+
+    Returns:
+        The shared Tracer (disabled until `configure_tracing` enables it).
+    """
+    return _tracer
+
+
+def configure_tracing(config: Dict[str, Any]) -> Tracer:
+    """
+    Configures the process-wide tracer from the `tracing` config section.
+
+    Args:
+        config: The loaded configuration dictionary.
+
+    Returns:
+        The shared Tracer, with the configured exporters (none if tracing is disabled).
+
+    Raises:
+        ValueError: If an unknown exporter is configured.
+    """
+    tracing_config = config.get('tracing') or {}
+    _tracer.shutdown()
+    if not tracing_config.get('enabled', False):
+        return _tracer
+    exporters = tracing_config.get('exporters', ['file'])
+    for name in exporters:
+        if name == 'file':
+            _tracer.exporters.append(FileSpanExporter(tracing_config.get('path', DEFAULT_TRACE_PATH)))
+        elif name == 'console':
+            _tracer.exporters.append(StreamSpanExporter())
+        else:
+            raise ValueError(f"Unknown trace exporter: {name} (expected one of {TRACE_EXPORTERS})")
+    logger.info("Tracing enabled with exporters: %s", exporters)
+    return _tracer
+
+
+def _describe(value: Any) -> Optional[Any]:
+    """Reduces an argument or result to a span attribute value (its size for text and collections)."""
+    if isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, (list, tuple, dict, set)):
+        return len(value)
+    return None
+
+
+def _attribute_name(name: str, value: Any) -> str:
+    if isinstance(value, str):
+        return f"{name}.chars"
+    if isinstance(value, (list, tuple, dict, set)):
+        return f"{name}.count"
+    return name
+
+
+def traced(name: str, record_args: Sequence[str] = (),
+           record_values: Sequence[str] = ()) -> Callable[[Callable], Callable]:
+    """
+    Decorator that runs a function, coroutine function or (async) generator function in a span.
+
+    Arguments named in `record_args` are recorded by size: numbers as-is, text as
+    `<arg>.chars` and collections as `<arg>.count`. The result is described the same
+    way under `result`; for generators, `result.count` is the number of items yielded.
+
+    Args:
+        name: The span name.
+        record_args: Names of the arguments to record by size.
+        record_values: Names of the arguments (e.g. a model name) to record verbatim.
+
+    Returns:
+        The decorator.
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        def start(args: tuple, kwargs: Dict[str, Any]) -> Span:
+            tracer = get_tracer()
+            if not tracer.enabled:
+                return NON_RECORDING_SPAN
+            attributes = {}
+            if record_args or record_values:
+                bound = signature.bind_partial(*args, **kwargs)
+                bound.apply_defaults()
+                for arg in record_args:
+                    value = _describe(bound.arguments.get(arg))
+                    if value is not None:
+                        attributes[_attribute_name(arg, bound.arguments[arg])] = value
+                for arg in record_values:
+                    if bound.arguments.get(arg) is not None:
+                        attributes[arg] = bound.arguments[arg]
+            return tracer.start_span(name, attributes)
+
+        def finish(span: Span, result: Any) -> None:
+            value = _describe(result)
+            if value is not None:
+                span.set_attribute(_attribute_name("result", result), value)
+
+        if inspect.isasyncgenfunction(func):
+            @functools.wraps(func)
+            async def async_gen_wrapper(*args, **kwargs):
+                tracer = get_tracer()
+                span = start(args, kwargs)
+                count = 0
+                generator = func(*args, **kwargs)
+                try:
+                    while True:
+                        # The span is only active while the generator body runs, not while the caller does.
+                        with tracer.activate(span):
+                            try:
+                                item = await generator.__anext__()
+                            except StopAsyncIteration:
+                                break
+                        count += 1
+                        yield item
+                except GeneratorExit:
+                    raise
+                except BaseException as e:
+                    span.record_exception(e)
+                    raise
+                finally:
+                    await generator.aclose()
+                    span.set_attribute("result.count", count)
+                    tracer.end_span(span)
+            return async_gen_wrapper
+
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def gen_wrapper(*args, **kwargs):
+                tracer = get_tracer()
+                span = start(args, kwargs)
+                count = 0
+                generator = func(*args, **kwargs)
+                try:
+                    while True:
+                        with tracer.activate(span):
+                            try:
+                                item = next(generator)
+                            except StopIteration:
+                                break
+                        count += 1
+                        yield item
+                except GeneratorExit:
+                    raise
+                except BaseException as e:
+                    span.record_exception(e)
+                    raise
+                finally:
+                    generator.close()
+                    span.set_attribute("result.count", count)
+                    tracer.end_span(span)
+            return gen_wrapper
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                tracer = get_tracer()
+                span = start(args, kwargs)
+                try:
+                    with tracer.activate(span):
+                        result = await func(*args, **kwargs)
+                    finish(span, result)
+                    return result
+                except BaseException as e:
+                    span.record_exception(e)
+                    raise
+                finally:
+                    tracer.end_span(span)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = get_tracer()
+            span = start(args, kwargs)
+            try:
+                with tracer.activate(span):
+                    result = func(*args, **kwargs)
+                finish(span, result)
+                return result
+            except BaseException as e:
+                span.record_exception(e)
+                raise
+            finally:
+                tracer.end_span(span)
+        return wrapper
+
+    return decorator
+
+
+def load_spans(path: str) -> List[Dict[str, Any]]:
+    """
+    Reads spans written by a FileSpanExporter.
+
+    Args:
+        path: The JSONL trace file.
+
+    Returns:
+        The span dictionaries, skipping malformed lines.
+    """
+    spans = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                spans.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return spans
+
+
+def summarize_spans(spans: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """
+    Breaks latency down by span name.
+
+    Args:
+        spans: Span dictionaries.
+
+    Returns:
+        Per span name: count, errors, and total, mean and max duration in milliseconds,
+        ordered by total duration, largest first.
+    """
+    summary: Dict[str, Dict[str, float]] = {}
+    for span in spans:
+        stats = summary.setdefault(span["name"], {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+        stats["count"] += 1
+        stats["errors"] += span["status"] == STATUS_ERROR
+        stats["total_ms"] += span["duration_ms"]
+        stats["max_ms"] = max(stats["max_ms"], span["duration_ms"])
+    for stats in summary.values():
+        stats["mean_ms"] = stats["total_ms"] / stats["count"]
+    return dict(sorted(summary.items(), key=lambda item: -item[1]["total_ms"]))
+
+
+def critical_path(spans: List[Dict[str, Any]], trace_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Finds the chain of spans that determined the end-to-end latency of a trace.
+
+    Starting from the longest root span, the path repeatedly descends into the
+    child that finished last, i.e. the one the parent was still waiting for.
+
+    Args:
+        spans: Span dictionaries.
+        trace_id: The trace to analyze (default: the trace of the longest root span).
+
+    Returns:
+        The spans on the critical path, outermost first.
+    """
+    if trace_id is not None:
+        spans = [span for span in spans if span["trace_id"] == trace_id]
+    span_ids = {span["span_id"] for span in spans}
+    children: Dict[str, List[Dict[str, Any]]] = {}
+    roots = []
+    for span in spans:
+        if span["parent_id"] in span_ids:
+            children.setdefault(span["parent_id"], []).append(span)
+        else:
+            roots.append(span)
+    if not roots:
+        return []
+    path = [max(roots, key=lambda span: span["duration_ms"])]
+    while children.get(path[-1]["span_id"]):
+        path.append(max(children[path[-1]["span_id"]], key=lambda span: span["end_time_unix_nano"]))
+    return path
+
+
+if __name__ == "__main__":
+    setup_logging()
+
+    # Example Usage:
+    # 1. Set `tracing.enabled: true` in `configs/config.yaml` and run `python -m src.main`.
+    # 2. Analyze the trace: `python -m src.utils.tracing logs/traces.jsonl`
+
+    if len(sys.argv) > 1:
+        spans = load_spans(sys.argv[1])
+    else:
+        exporter = InMemorySpanExporter()
+        tracer = Tracer([exporter])
+        with tracer.span("pipeline.problem"):
+            with tracer.span("theorist.generate_hypotheses"):
+                time.sleep(0.02)
+            with tracer.span("critic.refine_hypotheses"):
+                time.sleep(0.01)
+        spans = [span.to_dict() for span in exporter.spans]
+
+    print("Latency breakdown:")
+    for name, stats in summarize_spans(spans).items():
+        print(f"  {name}: {stats['count']} spans, total {stats['total_ms']:.1f} ms, "
+              f"mean {stats['mean_ms']:.1f} ms, max {stats['max_ms']:.1f} ms, {stats['errors']} errors")
+    print("Critical path:")
+    for span in critical_path(spans):
+        print(f"  {span['name']} ({span['duration_ms']:.1f} ms)")
@@ -1,7 +1,8 @@
 import sys
 import os
+import asyncio
 import unittest
-from unittest.mock import patch
+from unittest.mock import patch, AsyncMock
 from typing import Dict, Any, List
 
 # Dynamically adjust sys.path to allow imports from the project root
@@ -57,6 +58,29 @@ class TestCriticAgent(unittest.TestCase):
         refined_hypotheses = critic_agent.refine_hypotheses(self.hypotheses, self.experiment_results)
         self.assertEqual(len(refined_hypotheses), 0)
 
+    @patch('src.agents.critic_agent.GeminiAPI.agenerate_content', new_callable=AsyncMock)
+    def test_arefine_hypotheses_success(self, mock_agenerate_content):
+        """Test successful asynchronous hypothesis refinement."""
+        mock_agenerate_content.return_value = "1. Refined Hypothesis 1\n2. Refined Hypothesis 2"
+        critic_agent = CriticAgent(config=self.dummy_config)
+        refined_hypotheses = asyncio.run(critic_agent.arefine_hypotheses(self.hypotheses, self.experiment_results))
+        self.assertEqual(refined_hypotheses, ["Refined Hypothesis 1", "Refined Hypothesis 2"])
+
+    @patch('src.agents.critic_agent.GeminiAPI.agenerate_content_stream')
+    def test_astream_refined_hypotheses(self, mock_agenerate_content_stream):
+        """Test asynchronous streaming of refined hypotheses."""
+        async def chunks(*args, **kwargs):
+            for chunk in ["- Refined A\n- Ref", "ined B\n"]:
+                yield chunk
+
+        mock_agenerate_content_stream.side_effect = chunks
+        critic_agent = CriticAgent(config=self.dummy_config)
+
+        async def collect():
+            return [h async for h in critic_agent.astream_refined_hypotheses(self.hypotheses, self.experiment_results)]
+
+        self.assertEqual(asyncio.run(collect()), ["Refined A", "Refined B"])
+
     def test_initialization_missing_api_key(self):
         """Test CriticAgent initialization with a missing API key in the config."""
         with self.assertRaises(KeyError):
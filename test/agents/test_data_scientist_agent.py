@@ -1,7 +1,8 @@
 import sys
 import os
+import asyncio
 import unittest
-from unittest.mock import patch
+from unittest.mock import patch, AsyncMock
 from typing import Dict, Any, List
 
 # Dynamically adjust sys.path to allow imports from the project root
@@ -55,6 +56,25 @@ class TestDataScientistAgent(unittest.TestCase):
         analysis_results = data_scientist.analyze_data(self.research_problem, self.hypotheses)
         self.assertEqual(analysis_results, "")
 
+    @patch('src.agents.data_scientist_agent.GeminiAPI.generate_content')
+    def test_analyze_data_with_papers(self, mock_generate_content):
+        """Test that retrieved papers are included in the analysis prompt."""
+        mock_generate_content.return_value = "Analysis grounded in literature."
+        data_scientist = DataScientistAgent(config=self.dummy_config)
+        papers = [{"title": "Nitrogen fertilizers and yield", "abstract": "A meta-analysis.", "sources": ["pubmed"]}]
+        data_scientist.analyze_data(self.research_problem, self.hypotheses, papers=papers)
+        prompt = mock_generate_content.call_args[0][0]
+        self.assertIn("Relevant Literature:", prompt)
+        self.assertIn("[1] Nitrogen fertilizers and yield: A meta-analysis.", prompt)
+
+    @patch('src.agents.data_scientist_agent.GeminiAPI.agenerate_content', new_callable=AsyncMock)
+    def test_aanalyze_data_success(self, mock_agenerate_content):
+        """Test successful asynchronous data analysis."""
+        mock_agenerate_content.return_value = "Analysis: Fertilizer A is better."
+        data_scientist = DataScientistAgent(config=self.dummy_config)
+        analysis_results = asyncio.run(data_scientist.aanalyze_data(self.research_problem, self.hypotheses))
+        self.assertEqual(analysis_results, "Analysis: Fertilizer A is better.")
+
     def test_initialization_missing_api_key(self):
         """Test DataScientistAgent initialization with a missing API key in the config."""
         with self.assertRaises(KeyError):
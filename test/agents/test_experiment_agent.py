@@ -1,7 +1,8 @@
 import sys
 import os
+import asyncio
 import unittest
-from unittest.mock import patch
+from unittest.mock import patch, AsyncMock
 from typing import Dict, Any, List
 
 # Dynamically adjust sys.path to allow imports from the project root
@@ -11,7 +12,7 @@ if PROJECT_ROOT not in sys.path:
 
 # Local imports
 try:
-    from src.agents.experiment_agent import ExperimentAgent
+    from src.agents.experiment_agent import ExperimentAgent, select_relevant_analysis, merge_simulation_results
 except ImportError as e:
     print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
     sys.exit(1)
@@ -55,6 +56,94 @@ class TestExperimentAgent(unittest.TestCase):
         simulation_results = experiment_agent.run_simulation(self.hypotheses, self.data_analysis_results)
         self.assertEqual(simulation_results, "")
 
+    @patch('src.agents.experiment_agent.GeminiAPI.agenerate_content', new_callable=AsyncMock)
+    def test_arun_simulation_success(self, mock_agenerate_content):
+        """Test successful asynchronous simulation run."""
+        mock_agenerate_content.return_value = "Simulation results: reaction rate increased."
+        experiment_agent = ExperimentAgent(config=self.dummy_config)
+        simulation_results = asyncio.run(experiment_agent.arun_simulation(self.hypotheses, self.data_analysis_results))
+        self.assertIn("Simulation results", simulation_results)
+
+    @patch('src.agents.experiment_agent.GeminiAPI.generate_content')
+    def test_run_simulation_per_hypothesis(self, mock_generate_content):
+        """Test that fan-out sends one request per hypothesis and returns the results in order."""
+        mock_generate_content.side_effect = lambda prompt, **kwargs: "result for " + prompt.split("Hypothesis: ")[1].split("\n")[0]
+        experiment_agent = ExperimentAgent(config=self.dummy_config)
+        results = experiment_agent.run_simulation_per_hypothesis(self.hypotheses, self.data_analysis_results)
+        self.assertEqual(mock_generate_content.call_count, 2)
+        self.assertEqual(results, [{"index": index, "hypothesis": hypothesis, "result": "result for " + hypothesis}
+                                   for index, hypothesis in enumerate(self.hypotheses)])
+
+    @patch('src.agents.experiment_agent.GeminiAPI.agenerate_content', new_callable=AsyncMock)
+    def test_arun_simulation_per_hypothesis_retries_failed_item(self, mock_agenerate_content):
+        """Test that only the hypothesis that failed transiently is retried."""
+        attempts = {}
+
+        async def flaky(prompt, **kwargs):
+            hypothesis = prompt.split("Hypothesis: ")[1].split("\n")[0]
+            attempts[hypothesis] = attempts.get(hypothesis, 0) + 1
+            if hypothesis == self.hypotheses[0] and attempts[hypothesis] == 1:
+                raise TimeoutError("deadline exceeded")
+            return f"ok {attempts[hypothesis]}"
+
+        mock_agenerate_content.side_effect = flaky
+        config = dict(self.dummy_config, experiment_agent={'max_retries': 2})
+        experiment_agent = ExperimentAgent(config=config)
+        results = asyncio.run(experiment_agent.arun_simulation_per_hypothesis(self.hypotheses, self.data_analysis_results))
+        self.assertEqual([record["result"] for record in results], ["ok 2", "ok 1"])
+        self.assertEqual(attempts, {self.hypotheses[0]: 2, self.hypotheses[1]: 1})
+
+    @patch('src.agents.experiment_agent.GeminiAPI.generate_content')
+    def test_non_transient_error_is_not_retried(self, mock_generate_content):
+        """Test that fan-out gives up on a hypothesis at once when its error is not transient."""
+        mock_generate_content.side_effect = ValueError("invalid prompt")
+        config = dict(self.dummy_config, experiment_agent={'max_retries': 3})
+        experiment_agent = ExperimentAgent(config=config)
+        results = experiment_agent.run_simulation_per_hypothesis(self.hypotheses[:1], self.data_analysis_results)
+        self.assertEqual(results, [{"index": 0, "hypothesis": self.hypotheses[0], "result": ""}])
+        self.assertEqual(mock_generate_content.call_count, 1)
+
+    @patch('src.agents.experiment_agent.GeminiAPI.agenerate_content', new_callable=AsyncMock)
+    def test_arun_simulation_fan_out_mode(self, mock_agenerate_content):
+        """Test that fan-out mode merges per-hypothesis results into one report."""
+        mock_agenerate_content.return_value = ""
+        config = dict(self.dummy_config, experiment_agent={'fan_out': True, 'max_retries': 0})
+        experiment_agent = ExperimentAgent(config=config)
+        simulation_results = asyncio.run(experiment_agent.arun_simulation(self.hypotheses, self.data_analysis_results))
+        self.assertEqual(mock_agenerate_content.call_count, 2)
+        self.assertIn("Hypothesis 2: " + self.hypotheses[1], simulation_results)
+        self.assertIn("No simulation results.", simulation_results)
+
+    def test_select_relevant_analysis(self):
+        """Test that each hypothesis only receives the analysis paragraphs about it."""
+        analysis = "Temperature data shows faster reaction rates.\n\nCatalyst studies show lower activation energy.\n\nUnrelated notes."
+        self.assertEqual(select_relevant_analysis(self.hypotheses[0], 0, analysis), "Temperature data shows faster reaction rates.")
+        self.assertEqual(select_relevant_analysis(self.hypotheses[1], 1, analysis), "Catalyst studies show lower activation energy.")
+        self.assertEqual(select_relevant_analysis("Nothing matches", 2, analysis, max_chars=11), "Temperature")
+
+    @patch('src.agents.experiment_agent.GeminiAPI.generate_content')
+    def test_duplicate_hypotheses_keep_their_results(self, mock_generate_content):
+        """Test that fan-out keeps one result per hypothesis even when hypotheses repeat."""
+        mock_generate_content.side_effect = ["first", "second", "third"]
+        config = dict(self.dummy_config, experiment_agent={'max_concurrency': 1})
+        experiment_agent = ExperimentAgent(config=config)
+        hypotheses = [self.hypotheses[0], self.hypotheses[0], self.hypotheses[1]]
+        results = experiment_agent.run_simulation_per_hypothesis(hypotheses, self.data_analysis_results)
+        self.assertEqual([record["result"] for record in results], ["first", "second", "third"])
+        merged = merge_simulation_results(results)
+        self.assertIn("Hypothesis 2: " + self.hypotheses[0] + "\nsecond", merged)
+
+    def test_invalid_fan_out_concurrency(self):
+        """Test that a fan-out concurrency below 1 is rejected at initialization."""
+        with self.assertRaises(ValueError):
+            ExperimentAgent(config=dict(self.dummy_config, experiment_agent={'max_concurrency': 0}))
+
+    def test_merge_simulation_results(self):
+        """Test merging per-hypothesis results."""
+        merged = merge_simulation_results([{"index": 1, "hypothesis": "H2", "result": ""},
+                                           {"index": 0, "hypothesis": "H1", "result": "r1"}])
+        self.assertEqual(merged, "Hypothesis 1: H1\nr1\n\nHypothesis 2: H2\nNo simulation results.")
+
     def test_initialization_missing_api_key(self):
         """Test ExperimentAgent initialization with a missing API key in the config."""
         with self.assertRaises(KeyError):
@@ -0,0 +1,56 @@
+import sys
+import os
+import unittest
+
+# Dynamically adjust sys.path to allow imports from the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Local imports
+try:
+    from src.agents.hypothesis_parser import HypothesisStreamParser, extract_hypotheses, parse_hypothesis_line
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+
+class TestHypothesisParser(unittest.TestCase):
+
+    def test_parse_hypothesis_line(self):
+        """Test parsing numbered, bulleted and plain lines."""
+        self.assertEqual(parse_hypothesis_line("  1. Hypothesis A  "), "Hypothesis A")
+        self.assertEqual(parse_hypothesis_line("- Hypothesis B"), "Hypothesis B")
+        self.assertEqual(parse_hypothesis_line("3."), "3.")
+        self.assertIsNone(parse_hypothesis_line("Introduction"))
+        self.assertIsNone(parse_hypothesis_line("   "))
+
+    def test_stream_emits_on_line_completion(self):
+        """Test that each hypothesis is emitted once its line is terminated."""
+        parser = HypothesisStreamParser()
+        self.assertEqual(parser.feed("Here are some hypotheses:\n1. First hyp"), [])
+        self.assertEqual(parser.feed("othesis\n2. Second"), ["First hypothesis"])
+        self.assertEqual(parser.feed(" hypothesis\n- Third\n"), ["Second hypothesis", "Third"])
+        self.assertEqual(parser.close(), [])
+
+    def test_stream_flushes_final_line(self):
+        """Test that close() emits an unterminated final hypothesis."""
+        parser = HypothesisStreamParser()
+        self.assertEqual(parser.feed("1. Only"), [])
+        self.assertEqual(parser.close(), ["Only"])
+        self.assertEqual(parser.close(), [])
+
+    def test_extract_matches_streamed_result(self):
+        """Test that whole-response and chunked parsing agree."""
+        response = "Intro\n1. Hypothesis P\n\n- Hypothesis Q\n2. Hypothesis R\n"
+        parser = HypothesisStreamParser()
+        streamed = []
+        for i in range(0, len(response), 3):
+            streamed.extend(parser.feed(response[i:i + 3]))
+        streamed.extend(parser.close())
+        self.assertEqual(extract_hypotheses(response), ["Hypothesis P", "Hypothesis Q", "Hypothesis R"])
+        self.assertEqual(streamed, extract_hypotheses(response))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,8 @@
 import sys
 import os
+import asyncio
 import unittest
-from unittest.mock import patch
+from unittest.mock import patch, AsyncMock
 from typing import Dict, Any, List
 
 # Dynamically adjust sys.path to allow imports from the project root
@@ -12,6 +13,7 @@ if PROJECT_ROOT not in sys.path:
 # Local imports
 try:
     from src.agents.theorist_agent import TheoristAgent
+    from src.utils.gemini_api import GeminiAPI
 except ImportError as e:
     print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
     sys.exit(1)
@@ -53,11 +55,56 @@ class TestTheoristAgent(unittest.TestCase):
         hypotheses = theorist.generate_hypotheses(self.research_problem)
         self.assertEqual(len(hypotheses), 0)
 
+    @patch('src.agents.theorist_agent.GeminiAPI.agenerate_content', new_callable=AsyncMock)
+    def test_agenerate_hypotheses_success(self, mock_agenerate_content):
+        """Test successful asynchronous hypothesis generation."""
+        mock_agenerate_content.return_value = "1. Hypothesis 1\n2. Hypothesis 2"
+        theorist = TheoristAgent(config=self.dummy_config)
+        hypotheses = asyncio.run(theorist.agenerate_hypotheses(self.research_problem))
+        self.assertEqual(hypotheses, ["Hypothesis 1", "Hypothesis 2"])
+
+    @patch('src.agents.theorist_agent.GeminiAPI.agenerate_content', new_callable=AsyncMock)
+    def test_agenerate_hypotheses_api_error(self, mock_agenerate_content):
+        """Test asynchronous hypothesis generation when the Gemini API raises an exception."""
+        mock_agenerate_content.side_effect = Exception("API Error")
+        theorist = TheoristAgent(config=self.dummy_config)
+        hypotheses = asyncio.run(theorist.agenerate_hypotheses(self.research_problem))
+        self.assertEqual(hypotheses, [])
+
+    @patch('src.agents.theorist_agent.GeminiAPI.generate_content_stream')
+    def test_stream_hypotheses(self, mock_generate_content_stream):
+        """Test that hypotheses are yielded as soon as their lines complete."""
+        mock_generate_content_stream.return_value = iter(["1. Hypo", "thesis 1\n2. Hyp", "othesis 2"])
+        theorist = TheoristAgent(config=self.dummy_config)
+        stream = theorist.stream_hypotheses(self.research_problem)
+        self.assertEqual(next(stream), "Hypothesis 1")
+        self.assertEqual(list(stream), ["Hypothesis 2"])
+
+    @patch('src.agents.theorist_agent.GeminiAPI.generate_content_stream')
+    def test_stream_hypotheses_propagates_errors(self, mock_generate_content_stream):
+        """Test that a broken model stream is raised instead of ending the hypotheses early."""
+        def broken_stream(*args, **kwargs):
+            yield "1. Hypothesis 1\n"
+            raise RuntimeError("stream reset")
+
+        mock_generate_content_stream.side_effect = broken_stream
+        theorist = TheoristAgent(config=self.dummy_config)
+        stream = theorist.stream_hypotheses(self.research_problem)
+        self.assertEqual(next(stream), "Hypothesis 1")
+        with self.assertRaises(RuntimeError):
+            next(stream)
+
     def test_initialization_missing_api_key(self):
         """Test TheoristAgent initialization with a missing API key in the config."""
         with self.assertRaises(KeyError):
             TheoristAgent(config={'model_name': 'gemini-2.0-flash'})
 
+    def test_initialization_with_shared_gemini_api(self):
+        """Test that an injected GeminiAPI client is reused instead of creating a new one."""
+        gemini_api = GeminiAPI(api_key='TEST_API_KEY')
+        theorist = TheoristAgent(config={'model_name': 'gemini-2.0-flash'}, gemini_api=gemini_api)
+        self.assertIs(theorist.gemini_api, gemini_api)
+
     def test_extract_hypotheses_numbered_list(self):
         """Test extracting hypotheses from a numbered list response."""
         response = "1. Hypothesis A\n2. Hypothesis B\n3. Hypothesis C"
@@ -0,0 +1,100 @@
+import sys
+import os
+import unittest
+
+import numpy as np
+
+# Dynamically adjust sys.path to allow imports from the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Local imports
+try:
+    from src.experimentation.adaptive_design import AdaptiveDesign
+    from src.experimentation.models import MonteCarloModel, register_model, MODEL_REGISTRY
+    from src.experimentation.simulation_engine import SimulationEngine
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+
+class DoseResponseModel(MonteCarloModel):
+    """Noisy response whose slope in the dose turns negative once the context exceeds 10/11."""
+
+    name = "test_dose_response"
+    defaults = {"dose": 1.0, "context": 0.0, "noise": 1.0}
+    observables = ("response",)
+    parameter_keywords = {"dose": ("dose",)}
+    observable_keywords = {"response": ("response",)}
+
+    def draw_noise(self, rng, replicates):
+        return {"error": rng.standard_normal(replicates)}
+
+    def evaluate(self, params, noise):
+        slope = 1.0 - 1.1 * params["context"]
+        return {"response": slope * params["dose"] + params["noise"] * params["dose"] * noise["error"]}
+
+
+class TestAdaptiveDesign(unittest.TestCase):
+    """
+    Unit tests for the AdaptiveDesign class.
+    """
+
+    def setUp(self):
+        """Set up for test methods."""
+        register_model(DoseResponseModel())
+        self.adaptive = AdaptiveDesign(SimulationEngine(seed=3), confidence=0.95)
+        self.hypothesis = "Increasing the dose increases the response."
+
+    def tearDown(self):
+        """Tear down after test methods."""
+        MODEL_REGISTRY.pop(DoseResponseModel.name, None)
+
+    def test_clear_effect_is_confirmed_at_the_first_rung(self):
+        """Test that a strong effect is confirmed with a fraction of the brute-force evaluations."""
+        outcome = self.adaptive.test_hypothesis(self.hypothesis, {"context": (0.0, 0.5)},
+                                                parameters={"noise": 0.2})
+        self.assertEqual(outcome["verdict"], "supported")
+        self.assertTrue(outcome["supported"])
+        self.assertEqual(len(outcome["rungs"]), 1)
+        self.assertLess(outcome["evaluations"] * 10, outcome["brute_force_evaluations"])
+
+    def test_opposite_prediction_is_refuted(self):
+        """Test that the opposite claim is refuted."""
+        outcome = self.adaptive.test_hypothesis("Increasing the dose decreases the response.",
+                                                {"context": (0.0, 0.5)})
+        self.assertEqual(outcome["verdict"], "refuted")
+
+    def test_halving_finds_the_refuting_region(self):
+        """Test that replicates are concentrated on the weakest candidates until the counterexample is found."""
+        outcome = self.adaptive.test_hypothesis(self.hypothesis, {"context": (0.0, 1.0)},
+                                                parameters={"noise": 0.5})
+        self.assertEqual(outcome["verdict"], "refuted")
+        self.assertGreater(outcome["decisive"]["context"], 10 / 11)
+        rungs = outcome["rungs"]
+        self.assertGreater(len(rungs), 1)
+        self.assertEqual([rung["replicates"] for rung in rungs], [16 * 3 ** i for i in range(len(rungs))])
+        self.assertTrue(all(later["candidates"] < earlier["candidates"] for earlier, later in zip(rungs, rungs[1:])))
+        self.assertLess(outcome["evaluations"] * 10, outcome["brute_force_evaluations"])
+
+    def test_null_effect_is_inconclusive(self):
+        """Test that an effect indistinguishable from zero exhausts the budget without a verdict."""
+        outcome = self.adaptive.test_hypothesis(self.hypothesis, parameters={"context": 10 / 11})
+        self.assertEqual(outcome["verdict"], "inconclusive")
+        self.assertEqual(outcome["rungs"][-1]["replicates"], 1296)
+
+    def test_untestable(self):
+        """Test that hypotheses without a model parameter or a direction are untestable."""
+        self.assertEqual(self.adaptive.test_hypothesis("Poetry improves mood.")["verdict"], "untestable")
+        self.assertEqual(self.adaptive.test_hypothesis("The dose affects the response.")["verdict"], "untestable")
+
+    def test_binary_parameters_are_rounded(self):
+        """Test that candidates only take the values 0 and 1 for binary parameters."""
+        table = self.adaptive._candidates("reaction_rate", {"catalyst_present": (0.0, 1.0),
+                                                            "temperature": (10.0, 50.0)}, {}, seed=0)
+        self.assertEqual(set(np.unique(table["catalyst_present"])), {0.0, 1.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import sys
+import os
+import time
+import asyncio
+import unittest
+
+# Dynamically adjust sys.path to allow imports from the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Local imports
+try:
+    from src.experimentation.experiment_runner import ExperimentRunner
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+
+class TestExperimentRunner(unittest.TestCase):
+    """
+    Unit tests for the ExperimentRunner class.
+    """
+
+    def setUp(self):
+        """Set up for test methods."""
+        self.runner = ExperimentRunner(duration=0.2, max_concurrent=50)
+        self.hypotheses = ["Adding a catalyst will increase the reaction rate."]
+
+    def tearDown(self):
+        """Tear down after test methods."""
+        self.runner.shutdown(cancel=True)
+
+    def test_run_experiment(self):
+        """Test that run_experiment still returns the experiment results."""
+        results = self.runner.run_experiment(self.hypotheses, {"temperature": 30, "catalyst_present": True})
+        self.assertEqual(results, {"temperature": 32, "reaction_rate": 0.8})
+
+    def test_batch_runs_concurrently(self):
+        """Test that a batch of experiments takes about one experiment's duration, not the sum."""
+        start = time.monotonic()
+        jobs = [self.runner.submit(self.hypotheses, {"temperature": i}) for i in range(100)]
+        results = [job.result() for job in self.runner.as_completed(jobs, timeout=5)]
+        self.assertEqual(len(results), 100)
+        self.assertEqual(sorted(result["temperature"] for result in results), [i + 2 for i in range(100)])
+        self.assertLess(time.monotonic() - start, 2.0)
+
+    def test_timeout_returns_empty_results(self):
+        """Test that an experiment exceeding its timeout is stopped and run_experiment returns an empty dict."""
+        runner = ExperimentRunner(duration=10, default_timeout=0.05)
+        start = time.monotonic()
+        self.assertEqual(runner.run_experiment(self.hypotheses, {}), {})
+        runner.shutdown()
+        self.assertLess(time.monotonic() - start, 1.0)
+
+    def test_arun_experiment(self):
+        """Test that experiments can be awaited concurrently from asyncio code."""
+        async def main():
+            return await asyncio.gather(*(self.runner.arun_experiment(self.hypotheses, {"temperature": i})
+                                          for i in range(10)))
+        start = time.monotonic()
+        results = asyncio.run(main())
+        self.assertEqual([result["temperature"] for result in results], [i + 2 for i in range(10)])
+        self.assertLess(time.monotonic() - start, 1.0)
+
+    def test_from_config(self):
+        """Test that from_config reads the experimentation.runner section."""
+        runner = ExperimentRunner.from_config({"experimentation": {"runner": {"max_concurrent": 3, "timeout": 9}}})
+        self.assertEqual((runner.scheduler.capacity, runner.default_timeout), (3, 9))
+        runner.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
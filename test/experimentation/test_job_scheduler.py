@@ -0,0 +1,138 @@
+import sys
+import os
+import time
+import asyncio
+import threading
+import unittest
+from concurrent.futures import CancelledError
+
+# Dynamically adjust sys.path to allow imports from the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Local imports
+try:
+    from src.experimentation.job_scheduler import JobScheduler, JobTimeoutError
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+
+def sleeper(seconds: float, value=None, cancel_event: threading.Event = None):
+    """Job that waits `seconds` (or until cancelled) and returns `value`."""
+    cancel_event.wait(seconds)
+    return value
+
+
+class TestJobScheduler(unittest.TestCase):
+    """
+    Unit tests for the JobScheduler class.
+    """
+
+    def setUp(self):
+        """Set up for test methods."""
+        self.scheduler = JobScheduler(capacity=4)
+
+    def tearDown(self):
+        """Tear down after test methods."""
+        self.scheduler.shutdown(cancel=True)
+
+    def test_submit_returns_immediately_and_runs_concurrently(self):
+        """Test that jobs run in the background, up to the capacity at a time."""
+        start = time.monotonic()
+        jobs = [self.scheduler.submit(sleeper, 0.2, i) for i in range(8)]
+        self.assertLess(time.monotonic() - start, 0.1)
+        self.assertEqual([job.result() for job in jobs], list(range(8)))
+        elapsed = time.monotonic() - start
+        self.assertGreaterEqual(elapsed, 0.4)
+        self.assertLess(elapsed, 1.0)
+
+    def test_capacity_is_never_exceeded(self):
+        """Test that running jobs never occupy more resource units than the capacity."""
+        lock = threading.Lock()
+        usage = {"current": 0, "peak": 0}
+
+        def tracked(units, cancel_event=None):
+            with lock:
+                usage["current"] += units
+                usage["peak"] = max(usage["peak"], usage["current"])
+            time.sleep(0.02)
+            with lock:
+                usage["current"] -= units
+
+        jobs = [self.scheduler.submit(tracked, units, resources=units) for units in (1, 3, 2, 4, 1, 2, 3, 1)]
+        for job in jobs:
+            job.result()
+        self.assertLessEqual(usage["peak"], 4)
+        with self.assertRaises(ValueError):
+            self.scheduler.submit(tracked, 5, resources=5)
+
+    def test_priorities(self):
+        """Test that queued jobs start highest priority first, in submission order within a priority."""
+        scheduler = JobScheduler(capacity=1)
+        order = []
+        blocker = scheduler.submit(sleeper, 0.1)
+        jobs = [scheduler.submit(lambda label, cancel_event=None: order.append(label), label, priority=priority)
+                for label, priority in (("low", 0), ("high", 5), ("mid", 1), ("high2", 5))]
+        blocker.result()
+        for job in jobs:
+            job.result()
+        scheduler.shutdown()
+        self.assertEqual(order, ["high", "high2", "mid", "low"])
+
+    def test_cancellation(self):
+        """Test that cancelling stops a running job through its event and keeps a pending job from starting."""
+        scheduler = JobScheduler(capacity=1)
+        running = scheduler.submit(sleeper, 10)
+        pending = scheduler.submit(sleeper, 10)
+        time.sleep(0.05)
+        self.assertTrue(pending.cancel())
+        self.assertTrue(running.cancel())
+        self.assertFalse(running.cancel())
+        self.assertEqual((running.status, pending.status), ("cancelled", "cancelled"))
+        with self.assertRaises(CancelledError):
+            running.result(timeout=1)
+        self.assertEqual(len(list(scheduler.as_completed([running, pending], timeout=1))), 2)
+        self.assertIsNone(pending.started_at)
+        start = time.monotonic()
+        scheduler.shutdown()
+        self.assertLess(time.monotonic() - start, 1.0)
+
+    def test_timeout(self):
+        """Test that a job exceeding its timeout is stopped and reports JobTimeoutError."""
+        job = self.scheduler.submit(sleeper, 10, timeout=0.05)
+        with self.assertRaises(JobTimeoutError):
+            job.result(timeout=2)
+        self.assertEqual(job.status, "timed_out")
+        self.assertTrue(job.cancel_event.is_set())
+
+    def test_failures_and_streaming(self):
+        """Test that results stream back in completion order and errors surface through the handle."""
+        def fail(cancel_event=None):
+            raise RuntimeError("instrument offline")
+
+        slow = self.scheduler.submit(sleeper, 0.3, "slow")
+        fast = self.scheduler.submit(sleeper, 0.01, "fast")
+        broken = self.scheduler.submit(fail)
+        finished = list(self.scheduler.as_completed([slow, fast, broken], timeout=2))
+        self.assertEqual(finished[-1], slow)
+        self.assertEqual(broken.status, "failed")
+        with self.assertRaises(RuntimeError):
+            broken.result()
+
+    def test_aresult(self):
+        """Test that a job can be awaited from asyncio code."""
+        async def main():
+            return await self.scheduler.submit(sleeper, 0.01, 42).aresult()
+        self.assertEqual(asyncio.run(main()), 42)
+
+    def test_submit_after_shutdown(self):
+        """Test that a shut-down scheduler rejects new jobs."""
+        self.scheduler.shutdown()
+        with self.assertRaises(RuntimeError):
+            self.scheduler.submit(sleeper, 0.01)
+
+
+if __name__ == '__main__':
+    unittest.main()
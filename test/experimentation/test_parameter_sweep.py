@@ -0,0 +1,88 @@
+import sys
+import os
+import unittest
+
+import numpy as np
+
+# Dynamically adjust sys.path to allow imports from the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Local imports
+try:
+    from src.experimentation.parameter_sweep import (ParameterSweep, grid_design, latin_hypercube_design,
+                                                     make_design)
+    from src.experimentation.simulation_engine import SimulationEngine
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+
+class TestParameterSweep(unittest.TestCase):
+    """
+    Unit tests for the ParameterSweep class and the sweep designs.
+    """
+
+    def setUp(self):
+        """Set up for test methods."""
+        self.engine = SimulationEngine(replicates=20, seed=5)
+        self.space = {"growth_rate": (0.1, 1.0), "capacity": (50.0, 150.0)}
+
+    def test_grid_design(self):
+        """Test that the grid design is the Cartesian product of the listed values."""
+        design = grid_design({"a": [1, 2, 3], "b": [10, 20]})
+        np.testing.assert_array_equal(design["a"], [1, 1, 2, 2, 3, 3])
+        np.testing.assert_array_equal(design["b"], [10, 20, 10, 20, 10, 20])
+
+    def test_latin_hypercube_hits_every_stratum_once(self):
+        """Test that each parameter of a Latin hypercube sample has one point per stratum."""
+        design = latin_hypercube_design(self.space, 50, seed=1)
+        strata = np.floor((design["growth_rate"] - 0.1) / 0.9 * 50).astype(int)
+        np.testing.assert_array_equal(np.sort(strata), np.arange(50))
+        again = latin_hypercube_design(self.space, 50, seed=1)
+        np.testing.assert_array_equal(design["capacity"], again["capacity"])
+
+    def test_make_design_rejects_bad_input(self):
+        """Test that unknown designs and missing bounds raise ValueError."""
+        with self.assertRaises(ValueError):
+            make_design("sobol", self.space)
+        with self.assertRaises(ValueError):
+            make_design("random", {"growth_rate": [0.1, 0.5, 1.0]})
+
+    def test_run_returns_structured_array(self):
+        """Test that a sweep returns one structured row per parameter set, with parameters and statistics."""
+        results = ParameterSweep(self.engine, workers=1).run("logistic_growth", self.space, "random", samples=30,
+                                                             fixed={"duration": 5.0})
+        self.assertEqual(results.shape, (30,))
+        self.assertIn("final_population_ci_high", results.dtype.names)
+        np.testing.assert_array_equal(results["duration"], 5.0)
+        self.assertTrue(np.all(results["growth_rate"] >= 0.1) and np.all(results["growth_rate"] <= 1.0))
+
+    def test_results_independent_of_workers_and_chunks(self):
+        """Test that process-pool sweeps reproduce the in-process result whatever the chunking."""
+        serial = ParameterSweep(self.engine, workers=1).run("logistic_growth", self.space, "latin_hypercube",
+                                                            samples=200)
+        progress = []
+        parallel = ParameterSweep(self.engine, workers=2, chunk_size=37).run(
+            "logistic_growth", self.space, "latin_hypercube", samples=200,
+            progress=lambda done, total: progress.append((done, total)))
+        np.testing.assert_array_equal(serial, parallel)
+        self.assertEqual(len(progress), 6)
+        self.assertEqual(progress[-1], (200, 200))
+        self.assertEqual([done for done, _ in progress], sorted(done for done, _ in progress))
+
+    def test_run_hypothesis(self):
+        """Test that a hypothesis sweep reports an effect and a verdict per parameter set."""
+        sweep = ParameterSweep(self.engine, workers=1)
+        results = sweep.run_hypothesis("Increasing the temperature will increase the reaction rate.",
+                                       {"temperature": [10, 40], "catalyst_present": [0, 1]})
+        self.assertEqual(len(results), 4)
+        self.assertTrue(np.all(results["verdict"] == "supported"))
+        self.assertTrue(np.all(results["effect_ci_low"] > 0))
+        with self.assertRaises(ValueError):
+            sweep.run_hypothesis("Poetry improves mood.", {"temperature": [10, 40]})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import sys
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+# Dynamically adjust sys.path to allow imports from the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Local imports
+try:
+    from src.experimentation.result_store import ResultStore, get_result_store, result_key, row_keys
+    from src.experimentation.simulation_engine import SimulationEngine
+    from src.experimentation.experiment_runner import ExperimentRunner
+    from src.experimentation.parameter_sweep import ParameterSweep
+    from src.experimentation.models import get_simulation_model
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+
+class TestResultStore(unittest.TestCase):
+    """
+    Unit tests for the ResultStore class and its use by the SimulationEngine and ExperimentRunner.
+    """
+
+    def setUp(self):
+        """Set up for test methods."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = ResultStore(os.path.join(self.temp_dir, "results.sqlite"))
+        self.engine = SimulationEngine(replicates=30, store=self.store)
+
+    def tearDown(self):
+        """Tear down after test methods."""
+        self.store.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_keys_are_canonical(self):
+        """Test that keys ignore dict order and distinguish every input."""
+        self.assertEqual(result_key({"a": 1, "b": [1, 2]}), result_key({"b": [1, 2], "a": 1}))
+        self.assertNotEqual(result_key({"a": 1}), result_key({"a": 1.5}))
+        keys = row_keys({"seed": 0}, {"x": np.array([1.0, 2.0, 1.0]), "y": np.array([0.0, 0.0, 0.0])})
+        self.assertEqual(keys[0], keys[2])
+        self.assertNotEqual(keys[0], keys[1])
+
+    def test_rows_round_trip(self):
+        """Test that numeric rows are stored exactly and missing rows are reported."""
+        values = np.array([[1.0, np.pi], [2.0, np.e]])
+        self.store.save_rows("m", "1", ["k1", "k2"], values)
+        loaded, found = self.store.load_rows("m", "1", ["k2", "k3", "k1"], width=2)
+        np.testing.assert_array_equal(found, [True, False, True])
+        np.testing.assert_array_equal(loaded[[0, 2]], values[[1, 0]])
+        self.assertEqual(self.store.stats()["hits"], 2)
+
+    def test_simulate_computes_only_new_points(self):
+        """Test that a repeated simulation only evaluates parameter sets without stored results."""
+        rates = np.linspace(0.1, 0.5, 20)
+        first = self.engine.simulate("sir_epidemic", {"transmission_rate": rates})
+        model = get_simulation_model("sir_epidemic")
+        with patch.object(model, "evaluate", wraps=model.evaluate) as evaluate:
+            second = self.engine.simulate("sir_epidemic", {"transmission_rate": np.append(rates, 0.6)})
+        self.assertEqual(evaluate.call_count, 1)
+        self.assertEqual(len(evaluate.call_args[0][0]["transmission_rate"]), 1)
+        uncached = SimulationEngine(replicates=30).simulate("sir_epidemic",
+                                                            {"transmission_rate": np.append(rates, 0.6)})
+        for name in uncached:
+            np.testing.assert_array_equal(second[name], uncached[name])
+            np.testing.assert_array_equal(second[name][:20], first[name])
+
+    def test_settings_are_part_of_the_key(self):
+        """Test that another seed or replicate count is computed rather than served from the store."""
+        self.engine.simulate("logistic_growth", {"growth_rate": [0.3]})
+        self.engine.simulate("logistic_growth", {"growth_rate": [0.3]}, seed=1)
+        self.engine.simulate("logistic_growth", {"growth_rate": [0.3]}, replicates=10)
+        self.assertEqual(self.store.stats()["entries"], 3)
+
+    def test_effects_are_memoized(self):
+        """Test that hypothesis effects are stored and reused, with verdicts recomputed from the stored values."""
+        hypothesis = "Increasing the temperature will increase the reaction rate."
+        first = self.engine.test_hypothesis(hypothesis)
+        hits = self.store.stats()["hits"]
+        second = self.engine.test_hypothesis(hypothesis)
+        self.assertEqual(first, second)
+        self.assertEqual(self.store.stats()["hits"], hits + 1)
+        opposite = self.engine.test_hypothesis("Increasing the temperature will decrease the reaction rate.")
+        self.assertEqual(opposite["verdict"], "refuted")
+        self.assertEqual(self.store.stats()["hits"], hits + 2)
+
+    def test_model_version_change_invalidates(self):
+        """Test that results of an older model version are deleted and recomputed."""
+        model = get_simulation_model("logistic_growth")
+        self.engine.simulate(model, {"growth_rate": [0.3, 0.4]})
+        self.assertEqual(self.store.stats()["entries"], 2)
+        with patch.object(model, "version", "2"):
+            engine = SimulationEngine(replicates=30, store=ResultStore(self.store.path))
+            engine.simulate(model, {"growth_rate": [0.3]})
+            self.assertEqual(engine.store.stats(), {"hits": 0, "misses": 1, "entries": 1})
+            engine.store.close()
+
+    def test_experiment_runner_reuses_results(self):
+        """Test that an experiment with the same hypotheses and parameters is not run again."""
+        runner = ExperimentRunner(duration=0.05, store=self.store)
+        first = runner.run_experiment(["H"], {"temperature": 30})
+        with patch.object(runner, "_execute") as execute:
+            job = runner.submit(["H"], {"temperature": 30})
+            self.assertTrue(job.done())
+            self.assertEqual(job.result(), first)
+            runner.run_experiment(["H"], {"temperature": 31})
+            execute.assert_called_once()
+        runner.shutdown()
+
+    def test_store_survives_pickling(self):
+        """Test that engines with a store can be sent to ParameterSweep worker processes."""
+        engine = pickle.loads(pickle.dumps(self.engine))
+        engine.simulate("logistic_growth", {"growth_rate": [0.5]})
+        self.assertEqual(self.store.stats()["entries"], 1)
+        engine.store.close()
+        results = ParameterSweep(self.engine, workers=2, chunk_size=2).run("logistic_growth",
+                                                                           {"growth_rate": [0.1, 0.2, 0.5]})
+        self.assertEqual(len(results), 3)
+        self.assertEqual(self.store.stats()["entries"], 3)
+
+    def test_get_result_store(self):
+        """Test that the configured store is shared and disabled by default."""
+        self.assertIsNone(get_result_store({}))
+        config = {"experimentation": {"result_store": {"enabled": True,
+                                                       "path": os.path.join(self.temp_dir, "shared.sqlite")}}}
+        self.assertIs(get_result_store(config), get_result_store(config))
+        self.assertIs(SimulationEngine.from_config(config).store, get_result_store(config))
+        get_result_store(config).close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import sys
+import os
+import unittest
+
+import numpy as np
+
+# Dynamically adjust sys.path to allow imports from the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Local imports
+try:
+    from src.experimentation.models import get_simulation_model
+    from src.experimentation.simulation_engine import SimulationEngine, summarize, parameter_table, STATISTICS
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+
+class TestSimulationEngine(unittest.TestCase):
+    """
+    Unit tests for the SimulationEngine class.
+    """
+
+    def setUp(self):
+        """Set up for test methods."""
+        self.engine = SimulationEngine(replicates=100, seed=7)
+
+    def test_summarize(self):
+        """Test that summarize reduces the last axis to the mean, spread and a normal confidence interval."""
+        samples = np.array([[1.0, 2.0, 3.0, 4.0], [5.0, 5.0, 5.0, 5.0]])
+        summary = summarize(samples, 0.95)
+        self.assertEqual(set(summary), set(STATISTICS))
+        np.testing.assert_allclose(summary["mean"], [2.5, 5.0])
+        np.testing.assert_allclose(summary["sem"], [np.std([1, 2, 3, 4], ddof=1) / 2, 0.0])
+        np.testing.assert_allclose(summary["ci_high"] - summary["mean"], 1.959964 * summary["sem"], rtol=1e-5)
+        np.testing.assert_allclose(summary["ci_low"][1], 5.0)
+
+    def test_parameter_table(self):
+        """Test that parameter_table fills in defaults, broadcasts scalars and rejects unknown parameters."""
+        model = get_simulation_model("logistic_growth")
+        table = parameter_table(model, {"growth_rate": [0.1, 0.2, 0.3], "capacity": 50})
+        self.assertEqual(set(table), set(model.defaults))
+        np.testing.assert_allclose(table["capacity"], [50.0] * 3)
+        np.testing.assert_allclose(table["duration"], [model.defaults["duration"]] * 3)
+        rows = parameter_table(model, [{"growth_rate": 0.1}, {"capacity": 20}])
+        np.testing.assert_allclose(rows["growth_rate"], [0.1, model.defaults["growth_rate"]])
+        with self.assertRaises(ValueError):
+            parameter_table(model, {"growth_rat": [0.1]})
+        with self.assertRaises(ValueError):
+            parameter_table(model, {"growth_rate": [0.1, 0.2], "capacity": [1.0, 2.0, 3.0]})
+
+    def test_logistic_matches_analytic_solution(self):
+        """Test that the RK4 integration reproduces the closed-form logistic curve without uncertainty."""
+        rates = np.linspace(0.1, 1.0, 25)
+        columns = self.engine.simulate("logistic_growth", {"growth_rate": rates, "uncertainty": 0.0})
+        capacity, initial, duration = 100.0, 5.0, 10.0
+        expected = capacity / (1 + (capacity - initial) / initial * np.exp(-rates * duration))
+        np.testing.assert_allclose(columns["final_population_mean"], expected, rtol=1e-4)
+        np.testing.assert_allclose(columns["final_population_std"], 0.0, atol=1e-9)
+
+    def test_simulate_is_deterministic_and_independent_of_batching(self):
+        """Test that a row's statistics depend only on its parameters and the seed, not on its batch."""
+        rates = np.linspace(0.1, 0.5, 40)
+        columns = self.engine.simulate("sir_epidemic", {"transmission_rate": rates})
+        again = self.engine.simulate("sir_epidemic", {"transmission_rate": rates})
+        np.testing.assert_array_equal(columns["attack_rate_mean"], again["attack_rate_mean"])
+
+        chunked = SimulationEngine(replicates=100, seed=7, max_batch_elements=300)
+        single = chunked.simulate("sir_epidemic", {"transmission_rate": rates[17:18]})
+        np.testing.assert_allclose(single["attack_rate_mean"], columns["attack_rate_mean"][17:18])
+        np.testing.assert_allclose(chunked.simulate("sir_epidemic", {"transmission_rate": rates})["peak_infected_ci_low"],
+                                   columns["peak_infected_ci_low"])
+
+        other_seed = self.engine.simulate("sir_epidemic", {"transmission_rate": rates}, seed=8)
+        self.assertFalse(np.allclose(other_seed["attack_rate_mean"], columns["attack_rate_mean"]))
+
+    def test_match_hypothesis(self):
+        """Test that hypotheses are mapped to a model parameter, an observable and a direction."""
+        match = self.engine.match_hypothesis("Increasing the temperature will increase the reaction rate.")
+        self.assertEqual(match, {"model": "reaction_rate", "parameter": "temperature",
+                                 "observable": "reaction_rate", "direction": 1})
+        match = self.engine.match_hypothesis("Higher vaccination coverage reduces the attack rate.")
+        self.assertEqual((match["model"], match["parameter"], match["direction"]),
+                         ("sir_epidemic", "vaccinated", -1))
+        self.assertIsNone(self.engine.match_hypothesis("Poetry improves mood."))
+
+    def test_test_hypothesis_verdicts(self):
+        """Test that the verdict follows the sign of the simulated effect relative to the prediction."""
+        supported = self.engine.test_hypothesis("Increasing the temperature will increase the reaction rate.")
+        self.assertEqual(supported["verdict"], "supported")
+        self.assertGreater(supported["effect_ci"][0], 0.0)
+
+        refuted = self.engine.test_hypothesis("Increasing the temperature will decrease the reaction rate.")
+        self.assertEqual(refuted["verdict"], "refuted")
+        self.assertFalse(refuted["supported"])
+
+        catalyst = self.engine.test_hypothesis("Adding a catalyst will increase the reaction rate.")
+        self.assertEqual((catalyst["low"], catalyst["high"], catalyst["verdict"]), (0.0, 1.0, "supported"))
+
+        self.assertEqual(self.engine.test_hypothesis("Poetry improves mood.")["verdict"], "untestable")
+
+    def test_run_simulation_keeps_legacy_keys(self):
+        """Test that run_simulation reports a boolean result and the test details per hypothesis."""
+        results = self.engine.run_simulation(
+            ["Increasing the temperature will increase the reaction rate.", "Poetry improves mood."],
+            {"temperature": 25, "catalyst_present": True, "simulation_time": 100}
+        )
+        self.assertIs(results["hypothesis_1_result"], True)
+        self.assertIs(results["hypothesis_2_result"], False)
+        self.assertEqual(results["hypothesis_1"]["model"], "reaction_rate")
+        self.assertEqual(results["hypothesis_2"]["verdict"], "untestable")
+
+    def test_from_config(self):
+        """Test that from_config reads the experimentation.simulation section."""
+        engine = SimulationEngine.from_config({"experimentation": {"simulation": {"replicates": 10, "seed": 3}}})
+        self.assertEqual((engine.replicates, engine.seed), (10, 3))
+        with self.assertRaises(ValueError):
+            SimulationEngine(replicates=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import sys
+import os
+import unittest
+
+# Dynamically adjust sys.path to allow imports from the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Local imports
+try:
+    from src.knowledge_retrieval.context_builder import ContextBuilder, compress_abstract, truncate_to_tokens
+    from src.utils.tokens import estimate_tokens
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+
+ABSTRACT = (
+    "Coral reefs host a quarter of marine species. "
+    "Marine heatwaves cause heat stress that expels symbiotic algae and bleaches corals. "
+    "Funding for reef monitoring varies widely between countries. "
+    "Recovery after bleaching takes a decade or more."
+)
+
+PAPERS = [
+    {"title": "Heatwaves and coral bleaching", "abstract": ABSTRACT, "doi": "10.1/heat"},
+    {"title": "Heatwaves and Coral Bleaching.", "abstract": "A duplicate from another source.", "doi": ""},
+    {"title": "Reef acidification", "abstract": "Lower pH slows calcification in corals.", "doi": "10.1/ph"},
+    {"title": "Duplicate by DOI", "abstract": "Same DOI as the first paper.", "doi": "10.1/HEAT"},
+    {"title": "Ocean warming trends", "abstract": "Sea surface temperatures rose 0.9 degrees.", "doi": ""},
+]
+
+
+class TestContextBuilder(unittest.TestCase):
+
+    def test_truncate_to_tokens(self):
+        """Test word-boundary truncation within the budget."""
+        self.assertEqual(truncate_to_tokens("short text", 10), "short text")
+        truncated = truncate_to_tokens("one two three four five six seven eight", 5)
+        self.assertTrue(truncated.endswith("..."))
+        self.assertLessEqual(estimate_tokens(truncated), 5)
+
+    def test_compress_abstract_keeps_relevant_sentences(self):
+        """Test that the most query-relevant sentences survive, in their original order."""
+        compressed = compress_abstract(ABSTRACT, {"heat", "stress", "bleaching", "recovery"}, 40)
+        self.assertLessEqual(estimate_tokens(compressed), 40)
+        self.assertIn("heat stress", compressed)
+        self.assertIn("Recovery after bleaching", compressed)
+        self.assertNotIn("Funding", compressed)
+        self.assertLess(compressed.index("heat stress"), compressed.index("Recovery"))
+
+    def test_build_dedupes_and_respects_budget(self):
+        """Test deduplication by DOI and title and that every budget is honoured."""
+        context = ContextBuilder(max_tokens=1000).build(PAPERS, query="heat stress")
+        self.assertEqual(context.count("\n") + 1, 3)
+        self.assertTrue(context.startswith("[1] Heatwaves and coral bleaching: "))
+        self.assertIn("[2] Reef acidification: ", context)
+        self.assertNotIn("duplicate", context.lower())
+
+        for max_tokens in (30, 60, 90, 150):
+            context = ContextBuilder(max_tokens=max_tokens, max_abstract_tokens=25).build(PAPERS, query="heat stress")
+            self.assertLessEqual(estimate_tokens(context), max_tokens)
+            self.assertTrue(context.startswith("[1] Heatwaves"))
+
+        self.assertEqual(ContextBuilder(max_papers=1).build(PAPERS).count("["), 1)
+        self.assertEqual(ContextBuilder().build([]), "")
+
+    def test_from_config(self):
+        """Test reading budgets from retrieval.context."""
+        builder = ContextBuilder.from_config({"retrieval": {"context": {"max_tokens": 300, "max_papers": 2}}})
+        self.assertEqual((builder.max_tokens, builder.max_papers), (300, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import sys
+import os
+import gzip
+import json
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Dynamically adjust sys.path to allow imports from the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Local imports
+try:
+    from src.knowledge_retrieval.local_index import LocalPaperIndex, build_match_query, iter_arxiv_metadata
+    from src.knowledge_retrieval.ingest import main as ingest_main
+    from src.knowledge_retrieval.arxiv_retriever import ArxivRetriever
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+
+ARXIV_RECORDS = [
+    {"id": "2101.00001", "title": "Quantum error\n  correction codes", "abstract": "Surface codes for qubits.",
+     "categories": "quant-ph", "doi": "10.1000/QEC"},
+    {"id": "2101.00002", "title": "Coral reef bleaching", "abstract": "Ocean warming and quantum yield of algae.",
+     "categories": "q-bio.PE"},
+    {"id": "2101.00003", "title": "Graph neural networks", "abstract": "Message passing on graphs.",
+     "categories": "cs.LG"},
+]
+
+
+class TestLocalPaperIndex(unittest.TestCase):
+
+    def setUp(self):
+        """Set up for test methods."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.index_path = os.path.join(self.tmp_dir.name, "index", "papers.sqlite")
+        self.dump_path = os.path.join(self.tmp_dir.name, "arxiv.json.gz")
+        with gzip.open(self.dump_path, "wt", encoding="utf-8") as f:
+            for record in ARXIV_RECORDS:
+                f.write(json.dumps(record) + "\n")
+            f.write("not json\n")
+
+    def tearDown(self):
+        """Clean up the temporary index directory."""
+        self.tmp_dir.cleanup()
+
+    def test_build_match_query_quotes_terms(self):
+        """Test that FTS5 operators in user input are neutralized."""
+        self.assertEqual(build_match_query('Quantum NEAR "codes" quantum*'), '"quantum" OR "near" OR "codes"')
+        self.assertEqual(build_match_query("  ?! "), "")
+
+    def test_build_match_query_drops_stopwords(self):
+        """Test that stopwords are left out of the MATCH expression unless the query has nothing else."""
+        match = build_match_query("The effect of the learning rate on the convergence of SGD")
+        self.assertEqual(match, '"effect" OR "learning" OR "rate" OR "convergence" OR "sgd"')
+        for stopword in ("the", "of", "on"):
+            self.assertNotIn(f'"{stopword}"', match)
+        self.assertEqual(build_match_query("to be or not to be"), '"to" OR "be" OR "or" OR "not"')
+
+    def test_iter_arxiv_metadata_skips_malformed_lines(self):
+        """Test that gzipped dumps are streamed and malformed records skipped."""
+        papers = list(iter_arxiv_metadata(self.dump_path))
+        self.assertEqual([p["paper_id"] for p in papers], ["arxiv:2101.00001", "arxiv:2101.00002", "arxiv:2101.00003"])
+        self.assertEqual(papers[0]["url"], "https://arxiv.org/abs/2101.00001")
+
+    def test_search_ranks_title_matches_first(self):
+        """Test BM25 search with title weighting, source filtering and upserts."""
+        index = LocalPaperIndex(self.index_path)
+        self.assertEqual(index.add_papers(iter_arxiv_metadata(self.dump_path), batch_size=2), 3)
+        results = index.search("quantum", max_results=5)
+        self.assertEqual([r["paper_id"] for r in results], ["arxiv:2101.00001", "arxiv:2101.00002"])
+        self.assertEqual(results[0]["title"], "Quantum error correction codes")
+        self.assertEqual(results[0]["doi"], "10.1000/qec")
+        self.assertEqual(index.search("quantum", source="pubmed"), [])
+
+        # Re-ingesting updates rather than duplicates, and the FTS index follows the update.
+        index.add_papers([{"paper_id": "arxiv:2101.00003", "source": "arxiv", "title": "Quantum graphs", "abstract": ""}])
+        self.assertEqual(index.count(), 3)
+        self.assertEqual(index.search("message passing"), [])
+        self.assertEqual(index.search("quantum graphs", max_results=1)[0]["paper_id"], "arxiv:2101.00003")
+        index.close()
+
+    @patch('src.knowledge_retrieval.arxiv_retriever.arxiv.Client')
+    def test_ingest_command_and_local_retriever(self, mock_client):
+        """Test the ingestion command and the retriever's local and local_first modes."""
+        with patch('builtins.print'):
+            self.assertEqual(ingest_main(["--index", self.index_path, "arxiv", self.dump_path]), 3)
+
+        retriever = ArxivRetriever.from_config({"arxiv": {"mode": "local", "index_path": self.index_path}})
+        papers = retriever.search_arxiv("error correction", max_results=3)
+        self.assertEqual(papers[0]["title"], "Quantum error correction codes")
+        self.assertEqual(retriever.search_arxiv("photosynthesis"), [])
+        mock_client.return_value.results.assert_not_called()
+
+        mock_client.return_value.results.return_value = []
+        retriever = ArxivRetriever(index_path=self.index_path, mode="local_first")
+        self.assertEqual(retriever.search_arxiv("photosynthesis"), [])
+        mock_client.return_value.results.assert_called_once()
+
+    def test_local_mode_requires_index_path(self):
+        """Test that local modes without an index path are rejected."""
+        with self.assertRaises(ValueError):
+            ArxivRetriever(mode="local")
+        with self.assertRaises(ValueError):
+            ArxivRetriever(mode="offline")
+
+
+if __name__ == '__main__':
+    unittest.main()
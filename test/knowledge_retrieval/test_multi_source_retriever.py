@@ -0,0 +1,103 @@
+import sys
+import os
+import time
+import unittest
+
+# Dynamically adjust sys.path to allow imports from the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Local imports
+try:
+    from src.knowledge_retrieval.multi_source_retriever import (
+        MultiSourceRetriever, reciprocal_rank_fusion, create_retriever
+    )
+    from src.knowledge_retrieval.papers import normalize_title
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+
+SOURCE_DELAY = 0.2
+
+
+def make_source(papers, delay=SOURCE_DELAY, error=None):
+    def search(query, max_results):
+        time.sleep(delay)
+        if error is not None:
+            raise error
+        return papers[:max_results]
+    return search
+
+
+class TestReciprocalRankFusion(unittest.TestCase):
+
+    def test_normalize_title(self):
+        """Test that case, punctuation and whitespace differences are ignored."""
+        self.assertEqual(normalize_title("  Deep-Learning:  A Review. "), "deep learning a review")
+
+    def test_dedupes_by_doi_and_title(self):
+        """Test that duplicates merge across sources and rank above single-source papers."""
+        rankings = {
+            "arxiv": [
+                {"title": "Only on arXiv", "doi": ""},
+                {"title": "Shared Paper", "doi": "10.1/X", "url": "https://arxiv.org/abs/1"},
+                {"title": "Titled differently", "doi": "10.1/y"},
+            ],
+            "pubmed": [
+                {"title": "shared paper.", "doi": "", "pmid": "7"},
+                {"title": "Titled Differently on PubMed", "doi": "10.1/Y"},
+            ],
+        }
+        fused = reciprocal_rank_fusion(rankings, k=60)
+        self.assertEqual(len(fused), 3)
+        # The PubMed copy ranks higher, so it is the base; the arXiv copy fills in DOI and URL.
+        self.assertEqual(fused[0]["title"], "shared paper.")
+        self.assertEqual(fused[0]["sources"], ["pubmed", "arxiv"])
+        self.assertEqual((fused[0]["pmid"], fused[0]["doi"]), ("7", "10.1/X"))
+        self.assertEqual(fused[0]["url"], "https://arxiv.org/abs/1")
+        self.assertAlmostEqual(fused[0]["score"], 1 / 62 + 1 / 61)
+        self.assertEqual(fused[1]["title"], "Titled Differently on PubMed")
+        self.assertEqual(fused[1]["sources"], ["pubmed", "arxiv"])
+        self.assertEqual(fused[2]["title"], "Only on arXiv")
+
+
+class TestMultiSourceRetriever(unittest.TestCase):
+
+    def test_sources_run_concurrently(self):
+        """Test that latency is the slowest source rather than the sum of sources."""
+        retriever = MultiSourceRetriever({
+            "arxiv": make_source([{"title": "A", "doi": "10.1/a"}]),
+            "pubmed": make_source([{"title": "B", "doi": ""}]),
+        })
+        start = time.perf_counter()
+        papers = retriever.search("query", max_results=5)
+        elapsed = time.perf_counter() - start
+        retriever.close()
+        self.assertEqual(sorted(p["title"] for p in papers), ["A", "B"])
+        self.assertLess(elapsed, 1.5 * SOURCE_DELAY)
+
+    def test_timeouts_and_failures_are_isolated(self):
+        """Test that a slow or failing source does not block or break the others."""
+        retriever = MultiSourceRetriever({
+            "fast": make_source([{"title": "Fast"}], delay=0.0),
+            "slow": make_source([{"title": "Slow"}], delay=1.0),
+            "broken": make_source([], delay=0.0, error=RuntimeError("down")),
+        }, timeouts={"slow": 0.1})
+        start = time.perf_counter()
+        papers = retriever.search("query")
+        elapsed = time.perf_counter() - start
+        retriever.close()
+        self.assertEqual([p["title"] for p in papers], ["Fast"])
+        self.assertLess(elapsed, 0.5)
+
+    def test_create_retriever_respects_enabled_flag(self):
+        """Test that retrieval is opt-in and unknown sources are rejected."""
+        self.assertIsNone(create_retriever({}))
+        with self.assertRaises(ValueError):
+            create_retriever({"retrieval": {"enabled": True, "sources": ["scholar"]}})
+
+
+if __name__ == '__main__':
+    unittest.main()
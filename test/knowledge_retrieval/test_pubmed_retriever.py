@@ -0,0 +1,120 @@
+import sys
+import os
+import gzip
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+# Dynamically adjust sys.path to allow imports from the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Local imports
+try:
+    from src.knowledge_retrieval.pubmed_retriever import PubmedRetriever
+    from src.knowledge_retrieval.local_index import iter_pubmed_articles
+    from src.knowledge_retrieval.ingest import ingest_pubmed
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+
+def make_article(pmid: str, title: str, abstract: str, doi: str = "") -> str:
+    article_ids = f'<ArticleId IdType="doi">{doi}</ArticleId>' if doi else ""
+    return f"""
+    <PubmedArticle>
+      <MedlineCitation>
+        <PMID Version="1">{pmid}</PMID>
+        <Article>
+          <ArticleTitle>{title}</ArticleTitle>
+          <Abstract>
+            <AbstractText Label="BACKGROUND">{abstract}</AbstractText>
+            <AbstractText Label="RESULTS">Results were <i>significant</i>.</AbstractText>
+          </Abstract>
+        </Article>
+        <MeshHeadingList>
+          <MeshHeading><DescriptorName UI="D000001">Neoplasms</DescriptorName></MeshHeading>
+        </MeshHeadingList>
+      </MedlineCitation>
+      <PubmedData><ArticleIdList><ArticleId IdType="pubmed">{pmid}</ArticleId>{article_ids}</ArticleIdList></PubmedData>
+    </PubmedArticle>"""
+
+
+BASELINE_XML = "<PubmedArticleSet>{}{}{}</PubmedArticleSet>".format(
+    make_article("101", "Cancer immunotherapy with checkpoint inhibitors", "T cells attack tumors.", "10.1/ABC"),
+    make_article("102", "Gut microbiome and diet", "Fiber shapes the microbiome."),
+    make_article("103", "Immunotherapy side effects", "Adverse events in cancer patients."),
+)
+
+UPDATE_XML = "<PubmedArticleSet>{}<DeleteCitation><PMID Version=\"1\">103</PMID></DeleteCitation></PubmedArticleSet>".format(
+    make_article("102", "Gut microbiome and diet (revised)", "Fiber shapes the microbiome."),
+)
+
+
+class TestPubmedRetriever(unittest.TestCase):
+
+    def setUp(self):
+        """Set up for test methods."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.index_path = os.path.join(self.tmp_dir.name, "papers.sqlite")
+        self.baseline_path = os.path.join(self.tmp_dir.name, "baseline.xml.gz")
+        self.update_path = os.path.join(self.tmp_dir.name, "update.xml")
+        with gzip.open(self.baseline_path, "wt", encoding="utf-8") as f:
+            f.write(BASELINE_XML)
+        with open(self.update_path, "w", encoding="utf-8") as f:
+            f.write(UPDATE_XML)
+
+    def tearDown(self):
+        """Clean up the temporary files."""
+        self.tmp_dir.cleanup()
+
+    def test_iter_pubmed_articles_streams_records(self):
+        """Test that articles, structured abstracts, MeSH terms, DOIs and deletions are parsed."""
+        deleted = []
+        papers = list(iter_pubmed_articles(self.baseline_path))
+        self.assertEqual([p["paper_id"] for p in papers], ["pubmed:101", "pubmed:102", "pubmed:103"])
+        self.assertEqual(papers[0]["abstract"], "BACKGROUND: T cells attack tumors. RESULTS: Results were significant.")
+        self.assertEqual(papers[0]["categories"], "Neoplasms")
+        self.assertEqual(papers[0]["doi"], "10.1/ABC")
+        list(iter_pubmed_articles(self.update_path, deleted=deleted))
+        self.assertEqual(deleted, ["pubmed:103"])
+
+    def test_search_answers_query_from_index(self):
+        """Test that queries are ranked against ingested baseline and update files."""
+        self.assertEqual(ingest_pubmed([self.baseline_path, self.update_path], index_path=self.index_path), 4)
+        retriever = PubmedRetriever.from_config({"pubmed": {"index_path": self.index_path, "xml_file": None}})
+
+        papers = retriever.search_pubmed("cancer immunotherapy", max_results=5)
+        self.assertEqual([p["pmid"] for p in papers], ["101"])
+        self.assertEqual(papers[0]["url"], "https://pubmed.ncbi.nlm.nih.gov/101/")
+        self.assertEqual(papers[0]["doi"], "10.1/abc")
+        self.assertEqual(retriever.search_pubmed("microbiome")[0]["title"], "Gut microbiome and diet (revised)")
+
+    def test_xml_file_is_ingested_once(self):
+        """Test that a configured XML export builds the index on first use only."""
+        retriever = PubmedRetriever(index_path=self.index_path, xml_file=self.baseline_path)
+        self.assertEqual(len(retriever.search_pubmed("immunotherapy")), 2)
+        os.remove(self.baseline_path)
+        retriever = PubmedRetriever(index_path=self.index_path, xml_file=self.baseline_path)
+        self.assertEqual(len(retriever.search_pubmed("immunotherapy", max_results=1)), 1)
+
+    def test_concurrent_first_searches_build_the_index_once(self):
+        """Test that searches racing on first use open and build a single index."""
+        retriever = PubmedRetriever(index_path=self.index_path, xml_file=self.baseline_path)
+        with patch('src.knowledge_retrieval.pubmed_retriever.iter_pubmed_articles',
+                   wraps=iter_pubmed_articles) as mock_iter:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                counts = list(executor.map(lambda _: len(retriever.search_pubmed("immunotherapy")), range(8)))
+        self.assertEqual(counts, [2] * 8)
+        mock_iter.assert_called_once()
+
+    def test_empty_index_returns_no_results(self):
+        """Test that an empty index without an XML export yields an empty list."""
+        retriever = PubmedRetriever(index_path=self.index_path, xml_file=None)
+        self.assertEqual(retriever.search_pubmed("cancer"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
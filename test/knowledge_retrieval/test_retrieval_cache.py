@@ -0,0 +1,80 @@
+import sys
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+
+# Dynamically adjust sys.path to allow imports from the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Local imports
+try:
+    from src.knowledge_retrieval.retrieval_cache import RetrievalCache, normalize_query, get_retrieval_cache
+    from src.knowledge_retrieval.arxiv_retriever import ArxivRetriever
+    from src.utils.response_cache import ResponseCache
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+
+PAPERS = [{"title": f"Paper {i}", "abstract": "", "url": "", "doi": ""} for i in range(10)]
+
+
+class TestRetrievalCache(unittest.TestCase):
+
+    def setUp(self):
+        """Set up for test methods."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "retrieval.sqlite")
+
+    def tearDown(self):
+        """Clean up the temporary cache directory."""
+        self.tmp_dir.cleanup()
+
+    def test_normalize_query(self):
+        """Test case folding, stopword removal, deduplication and token sorting."""
+        self.assertEqual(normalize_query("The Effects of CO2 on coral reefs"), "co2 coral effects reefs")
+        self.assertEqual(normalize_query("coral reefs: effects of co2, CO2!"), "co2 coral effects reefs")
+        self.assertEqual(normalize_query("To be or not to be"), "be not or to")
+
+    def test_larger_result_serves_smaller_request(self):
+        """Test that a cached search answers requests for fewer, but not more, papers."""
+        cache = RetrievalCache(ResponseCache(path=None))
+        cache.set("arxiv/api", "coral reefs", 10, PAPERS)
+        self.assertEqual(cache.get("arxiv/api", "Reefs, coral", 3), PAPERS[:3])
+        self.assertIsNone(cache.get("arxiv/api", "coral reefs", 20))
+        self.assertIsNone(cache.get("pubmed", "coral reefs", 3))
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 2})
+
+        # A source that returned fewer papers than requested has no more to give.
+        cache.set("pubmed", "rare topic", 10, PAPERS[:2])
+        self.assertEqual(cache.get("pubmed", "rare topic", 50), PAPERS[:2])
+
+    def test_persists_across_instances(self):
+        """Test that results survive a restart via the SQLite tier."""
+        RetrievalCache(ResponseCache(path=self.path)).set("pubmed", "cancer", 5, PAPERS[:5])
+        self.assertEqual(RetrievalCache(ResponseCache(path=self.path)).get("pubmed", "CANCER", 5), PAPERS[:5])
+
+    def test_get_retrieval_cache_is_shared(self):
+        """Test that the configured cache is shared and can be disabled."""
+        config = {"retrieval_cache": {"enabled": True, "path": self.path}}
+        self.assertIs(get_retrieval_cache(config), get_retrieval_cache(config))
+        self.assertIsNone(get_retrieval_cache({"retrieval_cache": {"enabled": False}}))
+
+    @patch('src.knowledge_retrieval.arxiv_retriever.arxiv.Client')
+    def test_arxiv_retriever_uses_cache(self, mock_client):
+        """Test that repeated near-identical ArXiv queries hit the API once."""
+        mock_client.return_value.results.return_value = [
+            MagicMock(title=p["title"], summary="", pdf_url="", doi=None) for p in PAPERS
+        ]
+        retriever = ArxivRetriever(cache=RetrievalCache(ResponseCache(path=None)))
+        first = retriever.search_arxiv("Quantum computing", max_results=10)
+        second = retriever.search_arxiv("computing quantum", max_results=5)
+        self.assertEqual(second, first[:5])
+        mock_client.return_value.results.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
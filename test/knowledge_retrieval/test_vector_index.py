@@ -0,0 +1,141 @@
+import sys
+import os
+import asyncio
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+# Dynamically adjust sys.path to allow imports from the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Local imports
+try:
+    from src.knowledge_retrieval.vector_index import VectorIndex, HashingEmbedder, get_embedder
+    from src.knowledge_retrieval import vector_index as vector_index_module
+    from src.knowledge_retrieval.multi_source_retriever import MultiSourceRetriever
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+
+PAPERS = [
+    {"title": "Coral bleaching under ocean warming", "abstract": "Heat stress expels symbiotic algae from coral.", "doi": "10.1/coral"},
+    {"title": "Graph neural networks for molecules", "abstract": "Message passing over molecular graphs.", "doi": ""},
+    {"title": "Ocean acidification and reef calcification", "abstract": "Lower pH slows coral reef growth.", "doi": ""},
+    {"title": "Transformers for protein folding", "abstract": "Attention predicts protein structure.", "doi": "10.1/fold"},
+]
+
+
+class TestVectorIndex(unittest.TestCase):
+
+    def setUp(self):
+        """Set up for test methods."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "vectors")
+        self.embedder = HashingEmbedder(dim=256)
+
+    def tearDown(self):
+        """Clean up the temporary index directory."""
+        self.tmp_dir.cleanup()
+
+    def test_hashing_embedder_is_deterministic(self):
+        """Test that embeddings are float32, stable and content dependent."""
+        vectors = self.embedder.embed(["coral reefs", "coral reefs", "neural networks", ""])
+        self.assertEqual(vectors.dtype, np.float32)
+        self.assertEqual(vectors.shape, (4, 256))
+        np.testing.assert_array_equal(vectors[0], vectors[1])
+        self.assertFalse(np.array_equal(vectors[0], vectors[2]))
+        self.assertFalse(vectors[3].any())
+
+    def test_search_ranks_by_cosine_similarity(self):
+        """Test single and batched top-k search and deduplication."""
+        index = VectorIndex(self.embedder, path=None)
+        self.assertEqual(index.add_papers(PAPERS + [dict(PAPERS[0], title="Coral bleaching (preprint)")]), 4)
+        self.assertEqual(index.add_papers(PAPERS), 0)
+
+        results = index.search("coral bleaching from heat stress", top_k=2)
+        self.assertEqual(results[0]["doi"], "10.1/coral")
+        self.assertGreaterEqual(results[0]["similarity"], results[1]["similarity"])
+        self.assertLessEqual(results[0]["similarity"], 1.0 + 1e-6)
+
+        batch = index.search_batch(["protein structure attention", "molecular graphs"], top_k=1)
+        self.assertEqual(batch[0][0]["title"], "Transformers for protein folding")
+        self.assertEqual(batch[1][0]["title"], "Graph neural networks for molecules")
+        self.assertEqual(len(index.search("coral", top_k=10)), 4)
+
+    def test_chunked_search_matches_full_scan(self):
+        """Test that the running top-k over chunks equals a brute-force ranking."""
+        papers = [{"title": f"paper {i} topic {i % 7}", "abstract": f"words {i % 5} more {i % 3}"} for i in range(50)]
+        index = VectorIndex(self.embedder, path=None)
+        index.add_papers(papers, batch_size=8)
+        full = [r["title"] for r in index.search("topic 3 words 2", top_k=5)]
+        original = vector_index_module.SEARCH_CHUNK_ROWS
+        vector_index_module.SEARCH_CHUNK_ROWS = 4
+        try:
+            chunked = [r["title"] for r in index.search("topic 3 words 2", top_k=5)]
+        finally:
+            vector_index_module.SEARCH_CHUNK_ROWS = original
+        self.assertEqual(chunked, full)
+
+    def test_persistence_and_memmap(self):
+        """Test that vectors are memory-mapped float32 on disk and survive reopening."""
+        index = VectorIndex(self.embedder, path=self.path)
+        index.add_papers(PAPERS[:2])
+        index.add_papers(PAPERS[2:])
+        self.assertEqual(os.path.getsize(os.path.join(self.path, "vectors.f32")), 4 * 4 * 256)
+
+        reopened = VectorIndex(HashingEmbedder(dim=256), path=self.path)
+        self.assertEqual(len(reopened), 4)
+        self.assertIsInstance(reopened._vectors, np.memmap)
+        self.assertEqual(reopened.search("protein folding", top_k=1)[0]["doi"], "10.1/fold")
+        with self.assertRaises(ValueError):
+            VectorIndex(HashingEmbedder(dim=128), path=self.path)
+
+    def test_torn_write_is_repaired(self):
+        """Test that vectors without metadata (an interrupted append) are discarded."""
+        VectorIndex(self.embedder, path=self.path).add_papers(PAPERS[:2])
+        with open(os.path.join(self.path, "vectors.f32"), "ab") as f:
+            f.write(np.ones(256, dtype=np.float32).tobytes())
+        index = VectorIndex(self.embedder, path=self.path)
+        self.assertEqual(len(index), 2)
+        index.add_papers(PAPERS[2:3])
+        self.assertEqual(index.search("acidification calcification", top_k=1)[0]["title"], PAPERS[2]["title"])
+
+    def test_failed_embedding_is_retried(self):
+        """Test that papers whose embedding failed are not marked as indexed, and ranking fields are not stored."""
+        index = VectorIndex(self.embedder, path=self.path)
+        with patch.object(self.embedder, 'embed', side_effect=RuntimeError("model unavailable")):
+            with self.assertRaises(RuntimeError):
+                index.add_papers(PAPERS)
+        self.assertEqual(len(index), 0)
+        fused = [dict(paper, score=0.5, sources=["arxiv"]) for paper in PAPERS]
+        self.assertEqual(index.add_papers(fused), 4)
+        stored = VectorIndex(self.embedder, path=self.path).search("coral bleaching", top_k=1)[0]
+        self.assertEqual(stored["doi"], "10.1/coral")
+        self.assertNotIn("score", stored)
+        self.assertNotIn("sources", stored)
+
+    def test_get_embedder(self):
+        """Test embedder selection from the config."""
+        self.assertEqual(get_embedder({"vector_index": {"dim": 64}}).dim, 64)
+        with self.assertRaises(ValueError):
+            get_embedder({"vector_index": {"embedder": "word2vec"}})
+
+    def test_retriever_feeds_vector_index(self):
+        """Test that fused retrieval results become locally searchable evidence."""
+        index = VectorIndex(self.embedder, path=None)
+        retriever = MultiSourceRetriever({"arxiv": lambda query, max_results: PAPERS}, vector_index=index)
+        retriever.search("anything")
+        self.assertEqual(len(index), 4)
+        self.assertEqual(retriever.search_evidence(["coral bleaching"], top_k=1)[0][0]["doi"], "10.1/coral")
+        expanded = asyncio.run(retriever.aexpand_with_evidence([{"doi": "10.1/first"}], ["coral bleaching"], top_k=1))
+        retriever.close()
+        self.assertEqual([paper["doi"] for paper in expanded], ["10.1/first", "10.1/coral"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+import sys
+import os
+import asyncio
+import unittest
+from typing import List, AsyncIterator
+
+# Dynamically adjust sys.path to allow imports from the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Local imports
+try:
+    from src.pipeline.refinement_loop import RefinementLoop, hypothesis_similarity, best_match
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+
+class ScriptedAgent:
+    """Fake agent whose Critic returns a scripted sequence of hypothesis sets."""
+
+    def __init__(self, refinements: List[List[str]]):
+        self.refinements = list(refinements)
+        self.analyzed: List[List[str]] = []
+        self.simulated: List[List[str]] = []
+        self.critiqued: List[str] = []
+
+    async def aanalyze_data(self, research_problem: str, hypotheses: List[str], papers=None) -> str:
+        self.analyzed.append(list(hypotheses))
+        return f"analysis {len(self.analyzed)}"
+
+    async def arun_simulation(self, hypotheses: List[str], data_analysis_results: str) -> str:
+        self.simulated.append(list(hypotheses))
+        return f"results {len(self.simulated)}"
+
+    async def arefine_hypotheses(self, hypotheses: List[str], experiment_results: str) -> List[str]:
+        self.critiqued.append(experiment_results)
+        return self.refinements.pop(0) if self.refinements else list(hypotheses)
+
+
+class TestRefinementLoop(unittest.TestCase):
+
+    def make_loop(self, agent: ScriptedAgent, **kwargs) -> RefinementLoop:
+        return RefinementLoop(agent, agent, agent, **kwargs)
+
+    def test_only_changed_hypotheses_are_reevaluated(self):
+        """Test that unchanged hypotheses reuse earlier results."""
+        agent = ScriptedAgent([["H1", "H2 refined further"], ["H1", "H2 refined further"]])
+        outcome = self.make_loop(agent, max_rounds=5).run("problem", ["H1", "H2"])
+        self.assertEqual(agent.analyzed, [["H1", "H2"], ["H2 refined further"]])
+        self.assertEqual(agent.simulated, [["H1", "H2"], ["H2 refined further"]])
+        self.assertEqual(outcome["rounds"][1]["reused"], ["H1"])
+        self.assertEqual(agent.critiqued[1], "results 1\n\nresults 2")
+        self.assertEqual(outcome["stop_reason"], "converged")
+        self.assertEqual(len(outcome["rounds"]), 2)
+
+    def test_stops_at_max_rounds(self):
+        """Test that the loop stops after max_rounds when hypotheses keep changing."""
+        agent = ScriptedAgent([["Alpha"], ["Beta"], ["Gamma"], ["Delta"]])
+        outcome = self.make_loop(agent, max_rounds=3).run("problem", ["Start"])
+        self.assertEqual(outcome["stop_reason"], "max_rounds")
+        self.assertEqual(outcome["hypotheses"], ["Gamma"])
+        self.assertEqual(len(outcome["rounds"]), 3)
+
+    def test_stops_on_token_budget(self):
+        """Test that the loop stops once the estimated token budget is spent."""
+        agent = ScriptedAgent([["Alpha"], ["Beta"], ["Gamma"]])
+        outcome = self.make_loop(agent, max_rounds=3, max_tokens=1).run("problem", ["Start"])
+        self.assertEqual(outcome["stop_reason"], "token_budget")
+        self.assertEqual(len(outcome["rounds"]), 1)
+        self.assertGreater(outcome["estimated_tokens"], 0)
+
+    def test_stops_without_hypotheses(self):
+        """Test that an empty refinement ends the loop."""
+        agent = ScriptedAgent([[]])
+        outcome = self.make_loop(agent, max_rounds=3).run("problem", ["Start"])
+        self.assertEqual(outcome["stop_reason"], "no_hypotheses")
+        self.assertEqual(outcome["hypotheses"], ["Start"])
+
+    def test_streamed_hypotheses_are_evaluated_as_they_arrive(self):
+        """Test that the first round starts on a streamed hypothesis before the next one is generated."""
+        agent = ScriptedAgent([])
+        analyzed_before_second = []
+        evidence_lookups = []
+
+        async def stream() -> AsyncIterator[str]:
+            yield "H1"
+            await asyncio.sleep(0.01)
+            analyzed_before_second.extend(agent.analyzed)
+            yield "H2"
+
+        async def add_evidence(hypotheses: List[str]):
+            evidence_lookups.append(list(hypotheses))
+            return [{"title": hypotheses[0]}]
+
+        outcome = self.make_loop(agent, max_rounds=3, stream_batch_size=1).run("problem", stream(),
+                                                                               add_evidence=add_evidence)
+        self.assertEqual(analyzed_before_second, [["H1"]])
+        self.assertEqual(agent.analyzed, [["H1"], ["H2"]])
+        self.assertEqual(evidence_lookups, [["H1"], ["H2"]])
+        self.assertEqual(outcome["rounds"][0]["reevaluated"], ["H1", "H2"])
+        self.assertEqual(agent.critiqued[0], "results 1\n\nresults 2")
+        self.assertEqual(outcome["stop_reason"], "converged")
+
+    def test_streamed_hypotheses_are_batched(self):
+        """Test that streamed hypotheses are grouped so each batch costs one analysis and one simulation."""
+        agent = ScriptedAgent([])
+
+        async def stream() -> AsyncIterator[str]:
+            for hypothesis in ("H1", "H2", "H3", "H4", "H5"):
+                yield hypothesis
+
+        outcome = self.make_loop(agent, max_rounds=3, stream_batch_size=2).run("problem", stream())
+        self.assertEqual(agent.analyzed, [["H1", "H2"], ["H3", "H4"], ["H5"]])
+        self.assertEqual(agent.simulated, [["H1", "H2"], ["H3", "H4"], ["H5"]])
+        self.assertEqual(outcome["hypotheses"], ["H1", "H2", "H3", "H4", "H5"])
+        self.assertEqual(agent.critiqued[0], "results 1\n\nresults 2\n\nresults 3")
+        self.assertEqual(outcome["stop_reason"], "converged")
+
+    def test_empty_stream(self):
+        """Test that a stream without hypotheses ends the loop before any agent call."""
+        agent = ScriptedAgent([])
+
+        async def stream() -> AsyncIterator[str]:
+            return
+            yield
+
+        outcome = self.make_loop(agent).run("problem", stream())
+        self.assertEqual(outcome["stop_reason"], "no_hypotheses")
+        self.assertEqual(agent.analyzed, [])
+
+    def test_from_config(self):
+        """Test creating the loop from the refinement config section."""
+        agent = ScriptedAgent([])
+        loop = RefinementLoop.from_config({'refinement': {'max_rounds': 7, 'similarity_threshold': 0.8,
+                                                          'stream_batch_size': 2}}, agent, agent, agent)
+        self.assertEqual(loop.max_rounds, 7)
+        self.assertEqual(loop.similarity_threshold, 0.8)
+        self.assertEqual(loop.stream_batch_size, 2)
+        with self.assertRaises(ValueError):
+            RefinementLoop(agent, agent, agent, max_rounds=0)
+        with self.assertRaises(ValueError):
+            RefinementLoop(agent, agent, agent, stream_batch_size=0)
+
+    def test_similarity(self):
+        """Test hypothesis similarity and best-match helpers."""
+        self.assertEqual(hypothesis_similarity("Heat raises rate.", " heat raises rate. "), 1.0)
+        self.assertLess(hypothesis_similarity("Heat raises rate.", "Light lowers yield."), 0.5)
+        self.assertEqual(best_match("Heat raises rates.", ["Light lowers yield.", "Heat raises rate."])[0], "Heat raises rate.")
+        self.assertEqual(best_match("anything", []), (None, 0.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
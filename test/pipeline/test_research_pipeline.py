@@ -0,0 +1,209 @@
+import sys
+import os
+import time
+import json
+import asyncio
+import tempfile
+import unittest
+from unittest.mock import patch
+from typing import List, Dict, Any, AsyncIterator
+
+# Dynamically adjust sys.path to allow imports from the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Local imports
+try:
+    from src.pipeline.research_pipeline import ResearchPipeline, load_research_problems
+    from src.utils.tracing import Tracer, InMemorySpanExporter
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+
+STAGE_DELAY = 0.05
+
+
+class FakeAgent:
+    """Fake agent implementing every stage with a fixed latency."""
+
+    def __init__(self):
+        self.active_stages = set()
+        self.max_active_stages = 0
+
+    async def _stage(self, name: str):
+        self.active_stages.add(name)
+        self.max_active_stages = max(self.max_active_stages, len(self.active_stages))
+        await asyncio.sleep(STAGE_DELAY)
+        self.active_stages.discard(name)
+
+    async def astream_hypotheses(self, research_problem: str) -> AsyncIterator[str]:
+        await self._stage("theorist")
+        if research_problem == "fail":
+            raise RuntimeError("theorist failed")
+        yield f"H({research_problem})"
+
+    async def aanalyze_data(self, research_problem: str, hypotheses: List[str], papers=None) -> str:
+        await self._stage("data_scientist")
+        if papers:
+            return f"analysis of {hypotheses[0]} citing {papers[0]['title']}"
+        return f"analysis of {hypotheses[0]}"
+
+    async def arun_simulation(self, hypotheses: List[str], data_analysis_results: str) -> str:
+        await self._stage("experiment")
+        return f"results for {data_analysis_results}"
+
+    async def arefine_hypotheses(self, hypotheses: List[str], experiment_results: str) -> List[str]:
+        await self._stage("critic")
+        return [f"refined {h}" for h in hypotheses]
+
+
+class FakeRetriever:
+    """Fake MultiSourceRetriever with the same latency as an agent stage."""
+
+    def __init__(self):
+        self.lookups: List[str] = []
+
+    async def asearch(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
+        await asyncio.sleep(STAGE_DELAY)
+        return [{"title": f"Paper on {query}", "sources": ["arxiv"], "score": 1.0}][:max_results]
+
+    async def asearch_evidence(self, queries: List[str], top_k: int = 5) -> List[List[Dict[str, Any]]]:
+        self.lookups.extend(queries)
+        return [[{"title": f"Evidence for {query}"}] for query in queries]
+
+
+class StreamingTheorist:
+    """Fake Theorist streaming two hypotheses with a pause between them."""
+
+    def __init__(self, retriever: FakeRetriever):
+        self.retriever = retriever
+        self.lookups_before_second: List[str] = []
+
+    async def astream_hypotheses(self, research_problem: str) -> AsyncIterator[str]:
+        yield "H1"
+        await asyncio.sleep(2 * STAGE_DELAY)
+        self.lookups_before_second = list(self.retriever.lookups)
+        yield "H2"
+
+
+class TestResearchPipeline(unittest.TestCase):
+
+    def setUp(self):
+        """Set up for test methods."""
+        self.agent = FakeAgent()
+
+    def make_pipeline(self, **stage_workers) -> ResearchPipeline:
+        return ResearchPipeline(self.agent, self.agent, self.agent, self.agent, stage_workers=stage_workers)
+
+    def test_results_in_input_order(self):
+        """Test that every problem passes through all stages and results keep input order."""
+        results = self.make_pipeline().run(["a", "b", "c"])
+        self.assertEqual([r["research_problem"] for r in results], ["a", "b", "c"])
+        self.assertEqual(results[1]["refined_hypotheses"], ["refined H(b)"])
+        self.assertEqual(results[1]["experiment_results"], "results for analysis of H(b)")
+        self.assertEqual(set(results[0]["timings"]), {"theorist", "data_scientist", "experiment", "critic"})
+
+    def test_stages_overlap(self):
+        """Test that stages of different problems run concurrently."""
+        problems = [str(i) for i in range(8)]
+        start = time.perf_counter()
+        self.make_pipeline().run(problems)
+        elapsed = time.perf_counter() - start
+        serial = len(problems) * 4 * STAGE_DELAY
+        self.assertGreater(self.agent.max_active_stages, 1)
+        self.assertLess(elapsed, serial * 0.6)
+
+    def test_stage_spans(self):
+        """Test that each problem gets a span with one child span per stage under the run span."""
+        exporter = InMemorySpanExporter()
+        with patch('src.utils.tracing._tracer', Tracer([exporter])):
+            self.make_pipeline().run(["a", "b"])
+        run_span, = [span for span in exporter.spans if span.name == "pipeline.run"]
+        problem_spans = [span for span in exporter.spans if span.name == "pipeline.problem"]
+        self.assertEqual(len(problem_spans), 2)
+        for problem_span in problem_spans:
+            self.assertEqual(problem_span.parent_id, run_span.span_id)
+            children = [span.name for span in exporter.spans if span.parent_id == problem_span.span_id]
+            self.assertEqual(sorted(children), sorted(f"pipeline.{stage}" for stage in
+                                                      ("theorist", "data_scientist", "experiment", "critic")))
+
+    def test_stage_workers(self):
+        """Test that per-stage worker counts are honoured."""
+        pipeline = self.make_pipeline(theorist=4)
+        self.assertEqual(pipeline.stage_workers["theorist"], 4)
+        self.assertEqual(pipeline.stage_workers["critic"], 1)
+        with self.assertRaises(ValueError):
+            self.make_pipeline(reviewer=2)
+        with self.assertRaises(ValueError):
+            self.make_pipeline(critic=0)
+
+    def test_failed_stage_skips_remaining_stages(self):
+        """Test that a failing problem is reported without blocking the others."""
+        results = self.make_pipeline().run(["ok", "fail"])
+        self.assertEqual(results[0]["refined_hypotheses"], ["refined H(ok)"])
+        self.assertIn("theorist", results[1]["error"])
+        self.assertNotIn("data_analysis_results", results[1])
+
+    def test_retrieval_overlaps_theorist(self):
+        """Test that papers are retrieved alongside the Theorist and reach the DataScientist."""
+        pipeline = ResearchPipeline(self.agent, self.agent, self.agent, self.agent, retriever=FakeRetriever())
+        results = pipeline.run(["a"])
+        self.assertEqual([p["title"] for p in results[0]["papers"]], ["Paper on a", "Evidence for H(a)"])
+        self.assertEqual(results[0]["data_analysis_results"], "analysis of H(a) citing Paper on a")
+        self.assertLess(results[0]["timings"]["theorist"], 1.8 * STAGE_DELAY)
+
+    def test_evidence_lookups_overlap_theorist_stream(self):
+        """Test that a hypothesis's evidence is looked up while later hypotheses are still being generated."""
+        retriever = FakeRetriever()
+        theorist = StreamingTheorist(retriever)
+        results = ResearchPipeline(theorist, self.agent, self.agent, self.agent, retriever=retriever).run(["a"])
+        self.assertEqual(theorist.lookups_before_second, ["H1"])
+        self.assertEqual(results[0]["hypotheses"], ["H1", "H2"])
+        self.assertEqual([p["title"] for p in results[0]["papers"]],
+                         ["Paper on a", "Evidence for H1", "Evidence for H2"])
+
+    def test_from_config(self):
+        """Test creating the pipeline from the pipeline.workers config section."""
+        config = {'pipeline': {'workers': {'experiment': 3}}}
+        pipeline = ResearchPipeline.from_config(config, self.agent, self.agent, self.agent, self.agent)
+        self.assertEqual(pipeline.stage_workers["experiment"], 3)
+
+
+class TestLoadResearchProblems(unittest.TestCase):
+
+    def setUp(self):
+        """Set up for test methods."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Clean up the temporary directory."""
+        self.tmp_dir.cleanup()
+
+    def write(self, name: str, content: str) -> str:
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def test_load_jsonl(self):
+        """Test loading problems from JSONL strings and objects."""
+        path = self.write("problems.jsonl", json.dumps("first") + "\n\n" + json.dumps({"research_problem": "second"}) + "\n")
+        self.assertEqual(load_research_problems(path), ["first", "second"])
+
+    def test_load_yaml(self):
+        """Test loading problems from a YAML list under research_problems."""
+        path = self.write("problems.yaml", "research_problems:\n  - first\n  - research_problem: second\n")
+        self.assertEqual(load_research_problems(path), ["first", "second"])
+
+    def test_load_invalid(self):
+        """Test that unsupported formats and empty entries are rejected."""
+        with self.assertRaises(ValueError):
+            load_research_problems(self.write("problems.txt", "first"))
+        with self.assertRaises(ValueError):
+            load_research_problems(self.write("problems.jsonl", json.dumps({"problem": "x"}) + "\n"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,208 @@
+import sys
+import os
+import asyncio
+import shutil
+import tempfile
+import unittest
+from typing import List, AsyncIterator
+
+# Dynamically adjust sys.path to allow imports from the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Local imports
+try:
+    from src.pipeline.run_store import RunStore, new_run_id, outputs_complete
+    from src.pipeline.refinement_loop import RefinementLoop
+    from src.pipeline.research_pipeline import ResearchPipeline
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+
+class CountingAgent:
+    """Fake agent counting its calls; the Critic can be made to crash and the experiment to fail."""
+
+    def __init__(self, crash_critic: bool = False, fail_experiment: bool = False):
+        self.crash_critic = crash_critic
+        self.fail_experiment = fail_experiment
+        self.calls: List[str] = []
+
+    async def astream_hypotheses(self, research_problem: str) -> AsyncIterator[str]:
+        self.calls.append("theorist")
+        yield f"H({research_problem})"
+
+    async def aanalyze_data(self, research_problem: str, hypotheses: List[str], papers=None) -> str:
+        self.calls.append("data_scientist")
+        return f"analysis of {hypotheses}"
+
+    async def arun_simulation(self, hypotheses: List[str], data_analysis_results: str) -> str:
+        self.calls.append("experiment")
+        # Like the ExperimentAgent, answer a failed API call with an empty result.
+        return "" if self.fail_experiment else f"results for {hypotheses}"
+
+    async def arefine_hypotheses(self, hypotheses: List[str], experiment_results: str) -> List[str]:
+        self.calls.append("critic")
+        if self.crash_critic:
+            raise RuntimeError("preempted")
+        return list(hypotheses)
+
+
+class TestRunStore(unittest.TestCase):
+
+    def setUp(self):
+        """Set up for test methods."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'runs.sqlite')
+        self.store = RunStore(self.path)
+
+    def tearDown(self):
+        """Tear down after test methods."""
+        self.store.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_stage_round_trip(self):
+        """Test that stored outputs are returned for the same inputs only, across reopening."""
+        self.store.start_run("run-1", {"mode": "single"})
+        self.store.save_stage("run-1", "theorist", {"research_problem": "p"}, {"hypotheses": ["H1"]})
+        self.store.close()
+        self.store = RunStore(self.path)
+        self.assertEqual(self.store.load_stage("run-1", "theorist", {"research_problem": "p"}), {"hypotheses": ["H1"]})
+        self.assertIsNone(self.store.load_stage("run-1", "theorist", {"research_problem": "other"}))
+        self.assertIsNone(self.store.load_stage("run-2", "theorist", {"research_problem": "p"}))
+        self.assertEqual(self.store.completed_stages("run-1"), ["theorist"])
+
+    def test_runs(self):
+        """Test run registration, status updates and the latest run."""
+        self.assertIsNone(self.store.latest_run_id())
+        first, second = new_run_id(), new_run_id()
+        self.assertNotEqual(first, second)
+        self.store.start_run(first, {"problems": "problems.jsonl"})
+        self.store.start_run(second)
+        self.store.finish_run(first, "failed")
+        self.assertEqual(self.store.get_run(first)["status"], "failed")
+        self.assertEqual(self.store.get_run(first)["metadata"], {"problems": "problems.jsonl"})
+        self.assertEqual(self.store.latest_run_id(), first)
+        self.store.start_run(second)
+        self.assertEqual(self.store.latest_run_id(), second)
+        self.assertIsNone(self.store.get_run("missing"))
+        with self.assertRaises(ValueError):
+            self.store.finish_run(first, "unknown")
+
+    def test_checkpoint_skips_completed_stages(self):
+        """Test that a checkpointed stage is computed once and then reused."""
+        checkpoint = self.store.checkpoint("run-1")
+        calls = []
+        compute = lambda: calls.append(1) or {"value": len(calls)}
+        self.assertEqual(checkpoint.run_stage("stage", {"x": 1}, compute), {"value": 1})
+        self.assertEqual(checkpoint.run_stage("stage", {"x": 1}, compute), {"value": 1})
+        self.assertEqual(checkpoint.run_stage("stage", {"x": 2}, compute), {"value": 2})
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(checkpoint.reused, ["stage"])
+
+    def test_streamed_stage_is_replayed(self):
+        """Test that a completed stream is stored and replayed, and a resumed streaming refinement repeats nothing."""
+        crashing = CountingAgent(crash_critic=True)
+        checkpoint = self.store.checkpoint("run-1")
+        with self.assertRaises(RuntimeError):
+            RefinementLoop(crashing, crashing, crashing).run(
+                "problem", checkpoint.astream_stage("theorist", {"research_problem": "problem"}, "hypotheses",
+                                                    lambda: crashing.astream_hypotheses("problem")),
+                checkpoint=checkpoint)
+        self.assertEqual(crashing.calls, ["theorist", "data_scientist", "experiment", "critic"])
+
+        agent = CountingAgent()
+        checkpoint = self.store.checkpoint("run-1")
+        outcome = RefinementLoop(agent, agent, agent).run(
+            "problem", checkpoint.astream_stage("theorist", {"research_problem": "problem"}, "hypotheses",
+                                                lambda: agent.astream_hypotheses("problem")),
+            checkpoint=checkpoint)
+        self.assertEqual(agent.calls, ["critic"])
+        self.assertEqual(outcome["hypotheses"], ["H(problem)"])
+        self.assertIn("theorist", checkpoint.reused)
+
+    def test_broken_stream_is_not_stored(self):
+        """Test that a stream raising partway is not stored, so a resumed run streams the stage again."""
+        async def broken():
+            yield "H1"
+            raise RuntimeError("stream reset")
+
+        async def complete():
+            for item in ("H1", "H2"):
+                yield item
+
+        async def collect(stream):
+            checkpoint = self.store.checkpoint("run-1")
+            return [item async for item in checkpoint.astream_stage("theorist", {"x": 1}, "hypotheses", stream)]
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(collect(broken))
+        self.assertIsNone(self.store.load_stage("run-1", "theorist", {"x": 1}))
+        self.assertEqual(asyncio.run(collect(complete)), ["H1", "H2"])
+        self.assertEqual(self.store.load_stage("run-1", "theorist", {"x": 1}), {"hypotheses": ["H1", "H2"]})
+
+    def test_refinement_resumes_after_crash(self):
+        """Test that a resumed refinement loop does not repeat the agent calls completed before a crash."""
+        crashing = CountingAgent(crash_critic=True)
+        with self.assertRaises(RuntimeError):
+            RefinementLoop(crashing, crashing, crashing).run("problem", ["H1"], checkpoint=self.store.checkpoint("run-1"))
+        self.assertEqual(crashing.calls, ["data_scientist", "experiment", "critic"])
+
+        agent = CountingAgent()
+        outcome = RefinementLoop(agent, agent, agent).run("problem", ["H1"], checkpoint=self.store.checkpoint("run-1"))
+        self.assertEqual(agent.calls, ["critic"])
+        self.assertEqual(outcome["stop_reason"], "converged")
+
+        replayed = CountingAgent()
+        RefinementLoop(replayed, replayed, replayed).run("problem", ["H1"], checkpoint=self.store.checkpoint("run-1"))
+        self.assertEqual(replayed.calls, [])
+
+    def test_pipeline_resumes_after_crash(self):
+        """Test that a resumed batch only runs the stages that did not complete."""
+        crashing = CountingAgent(crash_critic=True)
+        records = ResearchPipeline(crashing, crashing, crashing, crashing,
+                                   checkpoint=self.store.checkpoint("batch")).run(["p1", "p2"])
+        self.assertTrue(all("error" in record for record in records))
+
+        agent = CountingAgent()
+        records = ResearchPipeline(agent, agent, agent, agent,
+                                   checkpoint=self.store.checkpoint("batch")).run(["p1", "p2"])
+        self.assertEqual(agent.calls, ["critic", "critic"])
+        self.assertEqual([record["refined_hypotheses"] for record in records], [["H(p1)"], ["H(p2)"]])
+        self.assertEqual(records[1]["experiment_results"], "results for ['H(p2)']")
+
+    def test_empty_outputs_are_not_stored(self):
+        """Test that stages whose required outputs are empty run again instead of being reused."""
+        self.assertTrue(outputs_complete({"hypotheses": ["H1"], "papers": []}, required=("hypotheses",)))
+        self.assertFalse(outputs_complete({"hypotheses": ["H1"], "papers": []}))
+        self.assertFalse(outputs_complete({}))
+        checkpoint = self.store.checkpoint("run-1")
+        self.assertEqual(checkpoint.run_stage("stage", {"x": 1}, lambda: {"value": ""}), {"value": ""})
+        self.assertEqual(checkpoint.run_stage("stage", {"x": 1}, lambda: {"value": "ok"}), {"value": "ok"})
+        self.assertEqual(checkpoint.reused, [])
+
+    def test_resume_after_api_failure(self):
+        """Test that stages that failed with an empty result are retried on resume, in both loops."""
+        failing = CountingAgent(fail_experiment=True)
+        records = ResearchPipeline(failing, failing, failing, failing,
+                                   checkpoint=self.store.checkpoint("batch")).run(["p1"])
+        self.assertEqual(records[0]["experiment_results"], "")
+        RefinementLoop(failing, failing, failing, max_rounds=1).run("problem", ["H1"],
+                                                                    checkpoint=self.store.checkpoint("run-1"))
+
+        agent = CountingAgent()
+        records = ResearchPipeline(agent, agent, agent, agent,
+                                   checkpoint=self.store.checkpoint("batch")).run(["p1"])
+        self.assertEqual(agent.calls, ["experiment", "critic"])
+        self.assertEqual(records[0]["experiment_results"], "results for ['H(p1)']")
+
+        agent = CountingAgent()
+        outcome = RefinementLoop(agent, agent, agent, max_rounds=1).run("problem", ["H1"],
+                                                                        checkpoint=self.store.checkpoint("run-1"))
+        self.assertEqual(agent.calls, ["experiment", "critic"])
+        self.assertEqual(outcome["rounds"][0]["experiment_results"], "results for ['H1']")
+
+
+if __name__ == '__main__':
+    unittest.main()
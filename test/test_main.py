@@ -0,0 +1,79 @@
+import sys
+import os
+import subprocess
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Dynamically adjust sys.path to allow imports from the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Modules that must not be imported just to start the `ares` entry point.
+HEAVY_MODULES = ("google.generativeai", "arxiv", "numpy")
+# Cumulative import time budget of src.main, in microseconds. Generous so that slow CI
+# machines pass; importing google.generativeai alone takes about a second.
+IMPORT_TIME_BUDGET_US = 500_000
+
+# Local imports
+try:
+    from src.main import run_batch
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+
+def import_times(module: str) -> dict:
+    """Imports a module in a fresh interpreter and returns {module: cumulative microseconds}."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestStartup(unittest.TestCase):
+
+    def setUp(self):
+        """Set up for test methods."""
+        self.times = import_times("src.main")
+
+    def test_no_heavy_imports(self):
+        """Test that importing the entry point does not load the model SDK, arxiv or numpy."""
+        self.assertIn("src.main", self.times)
+        for heavy in HEAVY_MODULES:
+            self.assertNotIn(heavy, self.times)
+
+    def test_import_time_budget(self):
+        """Test that importing the entry point stays within the startup budget."""
+        self.assertLess(self.times["src.main"], IMPORT_TIME_BUDGET_US)
+
+    def test_no_logging_side_effects(self):
+        """Test that importing the entry point does not configure logging."""
+        code = "import logging, src.main; print(len(logging.getLogger().handlers))"
+        result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True,
+                                text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "0")
+
+
+class TestRunBatch(unittest.TestCase):
+
+    @patch('src.main.create_agents', return_value=(None, None, None, None))
+    @patch('src.main.load_research_problems', return_value=["problem"])
+    def test_retriever_closed_on_failure(self, _mock_load, _mock_agents):
+        """Test that the retriever is closed even when the pipeline raises."""
+        retriever = MagicMock()
+        with patch('src.main.create_retriever', return_value=retriever), \
+                patch('src.main.ResearchPipeline.run', side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                run_batch({}, "problems.jsonl")
+        retriever.close.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
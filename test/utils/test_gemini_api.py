@@ -0,0 +1,411 @@
+import sys
+import os
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from google.api_core import exceptions as google_exceptions
+
+# Dynamically adjust sys.path to allow imports from the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Local imports
+try:
+    from src.utils.gemini_api import GeminiAPI, ModelRegistry
+    from src.utils.rate_limiter import RetryPolicy, CircuitBreaker, CircuitOpenError
+    from src.utils.response_cache import ResponseCache
+    from src.utils.metrics import MetricsRegistry
+    from src.utils.tracing import Tracer, InMemorySpanExporter
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+
+class FakeResponse:
+    """Minimal stand-in for a Gemini response object."""
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeUsageMetadata:
+    """Token usage reported alongside a Gemini response."""
+
+    def __init__(self, prompt_token_count: int, candidates_token_count: int):
+        self.prompt_token_count = prompt_token_count
+        self.candidates_token_count = candidates_token_count
+
+
+class UsageGenerativeModel:
+    """Fake backend whose responses report token usage."""
+
+    def __init__(self, model_name: str, **kwargs):
+        self.model_name = model_name
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        response = FakeResponse("answer")
+        response.usage_metadata = FakeUsageMetadata(7, 3)
+        return [response] if stream else response
+
+
+class FakeAsyncStream:
+    """Async iterator over pre-computed response chunks."""
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.chunks:
+            raise StopAsyncIteration
+        await asyncio.sleep(0)
+        chunk = self.chunks.pop(0)
+        if isinstance(chunk, Exception):
+            raise chunk
+        return chunk
+
+
+class FakeGenerativeModel:
+    """Local fake model backend that records peak request concurrency."""
+
+    in_flight = 0
+    peak_in_flight = 0
+
+    def __init__(self, model_name: str, **kwargs):
+        self.model_name = model_name
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        text = f"{self.model_name}: {prompt}"
+        if stream:
+            return [FakeResponse(text[i:i + 4]) for i in range(0, len(text), 4)]
+        return FakeResponse(text)
+
+    async def generate_content_async(self, prompt, stream=False, **kwargs):
+        if stream:
+            return FakeAsyncStream(self.generate_content(prompt, stream=True))
+        FakeGenerativeModel.in_flight += 1
+        FakeGenerativeModel.peak_in_flight = max(FakeGenerativeModel.peak_in_flight, FakeGenerativeModel.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            return FakeResponse(f"{self.model_name}: {prompt}")
+        finally:
+            FakeGenerativeModel.in_flight -= 1
+
+
+class FlakyGenerativeModel(FakeGenerativeModel):
+    """Fake backend that answers the first `failures` requests with HTTP 429."""
+
+    failures = 0
+    calls = 0
+
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        FlakyGenerativeModel.calls += 1
+        if FlakyGenerativeModel.calls <= FlakyGenerativeModel.failures:
+            raise google_exceptions.ResourceExhausted("429 quota exceeded")
+        return super().generate_content(prompt, stream=stream, **kwargs)
+
+    async def generate_content_async(self, prompt, stream=False, **kwargs):
+        return self.generate_content(prompt, stream=stream, **kwargs)
+
+
+
+@patch('src.utils.gemini_api.genai.GenerativeModel', FakeGenerativeModel)
+class TestGeminiAPI(unittest.TestCase):
+
+    def setUp(self):
+        """Set up for test methods."""
+        FakeGenerativeModel.in_flight = 0
+        FakeGenerativeModel.peak_in_flight = 0
+        self.registry = ModelRegistry()
+
+    def test_generate_content(self):
+        """Test synchronous generation against the fake backend."""
+        gemini_api = GeminiAPI(api_key='TEST_API_KEY', registry=self.registry)
+        self.assertEqual(gemini_api.generate_content("hello", model_name="fake"), "fake: hello")
+
+    def test_agenerate_content(self):
+        """Test asynchronous generation against the fake backend."""
+        gemini_api = GeminiAPI(api_key='TEST_API_KEY', registry=self.registry)
+        result = asyncio.run(gemini_api.agenerate_content("hello", model_name="fake"))
+        self.assertEqual(result, "fake: hello")
+
+    def test_agenerate_content_bounded_concurrency(self):
+        """Test that concurrent async calls never exceed max_concurrent_requests."""
+        gemini_api = GeminiAPI(api_key='TEST_API_KEY', max_concurrent_requests=3, registry=self.registry)
+
+        async def run_many():
+            return await asyncio.gather(*(gemini_api.agenerate_content(f"p{i}") for i in range(12)))
+
+        results = asyncio.run(run_many())
+        self.assertEqual(len(results), 12)
+        self.assertEqual(FakeGenerativeModel.peak_in_flight, 3)
+
+    def test_agenerate_content_stream_bounded_concurrency(self):
+        """Test that a stream holds its concurrency slot until it is exhausted."""
+        gemini_api = GeminiAPI(api_key='TEST_API_KEY', max_concurrent_requests=2, registry=self.registry)
+
+        class CountingStream(FakeAsyncStream):
+            """Counts the stream as in flight from creation until exhaustion."""
+
+            def __init__(self, chunks):
+                super().__init__(chunks)
+                FakeGenerativeModel.in_flight += 1
+                FakeGenerativeModel.peak_in_flight = max(FakeGenerativeModel.peak_in_flight,
+                                                         FakeGenerativeModel.in_flight)
+
+            async def __anext__(self):
+                try:
+                    return await super().__anext__()
+                except StopAsyncIteration:
+                    FakeGenerativeModel.in_flight -= 1
+                    raise
+
+        async def open_stream(model, prompt, stream=False, **kwargs):
+            return CountingStream(model.generate_content(prompt, stream=True))
+
+        async def consume(prompt):
+            return "".join([chunk async for chunk in gemini_api.agenerate_content_stream(prompt, use_cache=False)])
+
+        async def run_many():
+            return await asyncio.gather(*(consume(f"p{i}") for i in range(8)))
+
+        with patch.object(FakeGenerativeModel, 'generate_content_async', autospec=True, side_effect=open_stream):
+            results = asyncio.run(run_many())
+        self.assertEqual(len(results), 8)
+        self.assertEqual(FakeGenerativeModel.peak_in_flight, 2)
+        self.assertEqual(FakeGenerativeModel.in_flight, 0)
+
+    def test_agenerate_content_across_event_loops(self):
+        """Test that the API can be reused from successive event loops."""
+        gemini_api = GeminiAPI(api_key='TEST_API_KEY', max_concurrent_requests=2, registry=self.registry)
+        self.assertEqual(asyncio.run(gemini_api.agenerate_content("a", model_name="fake")), "fake: a")
+        self.assertEqual(asyncio.run(gemini_api.agenerate_content("b", model_name="fake")), "fake: b")
+
+    def test_generate_content_uses_cache(self):
+        """Test that identical requests are served from the response cache."""
+        cache = ResponseCache(path=None)
+        gemini_api = GeminiAPI(api_key='TEST_API_KEY', cache=cache, registry=self.registry)
+        with patch.object(FakeGenerativeModel, 'generate_content', autospec=True,
+                          side_effect=lambda self, prompt, **kwargs: FakeResponse(prompt)) as mock_generate:
+            self.assertEqual(gemini_api.generate_content("hello", model_name="fake"), "hello")
+            self.assertEqual(gemini_api.generate_content("hello", model_name="fake"), "hello")
+            self.assertEqual(asyncio.run(gemini_api.agenerate_content("hello", model_name="fake")), "hello")
+            gemini_api.generate_content("hello", model_name="fake", generation_config={"temperature": 0.5})
+        self.assertEqual(mock_generate.call_count, 2)
+        self.assertEqual(cache.stats()["hits"], 2)
+        self.assertEqual(cache.stats()["misses"], 2)
+
+    def test_generate_content_stream(self):
+        """Test that streaming yields chunks and caches the assembled response."""
+        cache = ResponseCache(path=None)
+        gemini_api = GeminiAPI(api_key='TEST_API_KEY', cache=cache, registry=self.registry)
+        chunks = list(gemini_api.generate_content_stream("hello", model_name="fake"))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), "fake: hello")
+        self.assertEqual(list(gemini_api.generate_content_stream("hello", model_name="fake")), ["fake: hello"])
+
+    def test_agenerate_content_stream(self):
+        """Test asynchronous streaming against the fake backend."""
+        gemini_api = GeminiAPI(api_key='TEST_API_KEY', registry=self.registry)
+
+        async def collect():
+            return [chunk async for chunk in gemini_api.agenerate_content_stream("hello", model_name="fake")]
+
+        chunks = asyncio.run(collect())
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), "fake: hello")
+
+    def test_stream_raises_after_retries_exhausted(self):
+        """Test that a stream that cannot be opened raises instead of ending empty."""
+        FlakyGenerativeModel.calls, FlakyGenerativeModel.failures = 0, 10
+        gemini_api = self.make_flaky_api(retry_policy=RetryPolicy(max_retries=1, base_delay=0.001),
+                                         metrics=MetricsRegistry())
+        with self.assertRaises(google_exceptions.ResourceExhausted):
+            list(gemini_api.generate_content_stream("hello", model_name="flaky"))
+        self.assertEqual(FlakyGenerativeModel.calls, 2)
+        self.assertEqual(gemini_api.metrics.summary()["agents"]["unknown"]["errors"], 1)
+
+    def test_agenerate_content_stream_broken_midway(self):
+        """Test that a stream breaking after its first chunk raises and is not cached."""
+        cache = ResponseCache(path=None)
+        gemini_api = GeminiAPI(api_key='TEST_API_KEY', cache=cache, registry=self.registry)
+        broken = FakeAsyncStream([FakeResponse("fake"), google_exceptions.ServiceUnavailable("503 reset")])
+        chunks = []
+
+        async def collect():
+            async for chunk in gemini_api.agenerate_content_stream("hello", model_name="fake"):
+                chunks.append(chunk)
+
+        with patch.object(FakeGenerativeModel, 'generate_content_async', autospec=True, return_value=broken):
+            with self.assertRaises(google_exceptions.ServiceUnavailable):
+                asyncio.run(collect())
+        self.assertEqual(chunks, ["fake"])
+        self.assertEqual(cache.stats()["memory_entries"], 0)
+
+    def make_flaky_api(self, **kwargs) -> GeminiAPI:
+        """Creates a GeminiAPI whose pooled "flaky" model injects 429s."""
+        gemini_api = GeminiAPI(api_key='TEST_API_KEY', registry=self.registry, **kwargs)
+        with patch('src.utils.gemini_api.genai.GenerativeModel', FlakyGenerativeModel):
+            self.registry.get_model("flaky")
+        return gemini_api
+
+    def test_retries_transient_errors(self):
+        """Test that injected 429s are retried with backoff until the request succeeds."""
+        FlakyGenerativeModel.calls, FlakyGenerativeModel.failures = 0, 2
+        gemini_api = self.make_flaky_api(retry_policy=RetryPolicy(max_retries=3, base_delay=0.001))
+        self.assertEqual(gemini_api.generate_content("hello", model_name="flaky"), "flaky: hello")
+        self.assertEqual(FlakyGenerativeModel.calls, 3)
+
+        FlakyGenerativeModel.calls, FlakyGenerativeModel.failures = 0, 1
+        self.assertEqual(asyncio.run(gemini_api.agenerate_content("hello", model_name="flaky")), "flaky: hello")
+        self.assertEqual(FlakyGenerativeModel.calls, 2)
+
+    def test_traces_retries(self):
+        """Test that the model call span records the model, prompt size, token counts and retries."""
+        FlakyGenerativeModel.calls, FlakyGenerativeModel.failures = 0, 2
+        gemini_api = self.make_flaky_api(retry_policy=RetryPolicy(max_retries=3, base_delay=0.001))
+        exporter = InMemorySpanExporter()
+        with patch('src.utils.tracing._tracer', Tracer([exporter])):
+            gemini_api.generate_content("hello", model_name="flaky", agent="critic", use_cache=False)
+        span, = exporter.spans
+        self.assertEqual(span.name, "gemini.generate_content")
+        self.assertEqual(span.attributes["model_name"], "flaky")
+        self.assertEqual(span.attributes["agent"], "critic")
+        self.assertEqual(span.attributes["prompt.chars"], 5)
+        self.assertEqual(span.attributes["retries"], 2)
+        self.assertFalse(span.attributes["cache.hit"])
+        self.assertEqual([event["name"] for event in span.events], ["retry", "retry"])
+
+    def test_raises_after_retries_exhausted(self):
+        """Test that a persistent 429 is raised instead of returning an empty string."""
+        FlakyGenerativeModel.calls, FlakyGenerativeModel.failures = 0, 10
+        gemini_api = self.make_flaky_api(retry_policy=RetryPolicy(max_retries=2, base_delay=0.001))
+        with self.assertRaises(google_exceptions.ResourceExhausted):
+            gemini_api.generate_content("hello", model_name="flaky")
+        self.assertEqual(FlakyGenerativeModel.calls, 3)
+
+    def test_circuit_breaker_rejects_requests(self):
+        """Test that repeated 429s open the circuit and later calls fail fast."""
+        FlakyGenerativeModel.calls, FlakyGenerativeModel.failures = 0, 10
+        gemini_api = self.make_flaky_api(retry_policy=RetryPolicy(max_retries=5, base_delay=0.001),
+                                         circuit_breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+        with self.assertRaises(CircuitOpenError):
+            gemini_api.generate_content("hello", model_name="flaky")
+        self.assertEqual(FlakyGenerativeModel.calls, 2)
+        with self.assertRaises(CircuitOpenError):
+            gemini_api.generate_content("hello", model_name="flaky")
+        self.assertEqual(FlakyGenerativeModel.calls, 2)
+
+    def open_circuit_for_trial(self) -> GeminiAPI:
+        """Opens the circuit of a flaky GeminiAPI and lets its reset timeout pass."""
+        FlakyGenerativeModel.calls, FlakyGenerativeModel.failures = 0, 1
+        gemini_api = self.make_flaky_api(retry_policy=RetryPolicy(max_retries=0),
+                                         circuit_breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0))
+        with self.assertRaises(google_exceptions.ResourceExhausted):
+            gemini_api.generate_content("hello", model_name="flaky")
+        self.assertEqual(gemini_api.circuit_breaker.state, CircuitBreaker.OPEN)
+        return gemini_api
+
+    def test_non_retryable_trial_releases_circuit(self):
+        """Test that a half-open trial failing with a non-transient error does not block later requests."""
+        gemini_api = self.open_circuit_for_trial()
+        with patch.object(FlakyGenerativeModel, 'generate_content', side_effect=ValueError("bad request")):
+            with self.assertRaises(ValueError):
+                gemini_api.generate_content("hello", model_name="flaky", use_cache=False)
+            with self.assertRaises(google_exceptions.InvalidArgument):
+                with patch.object(FlakyGenerativeModel, 'generate_content',
+                                  side_effect=google_exceptions.InvalidArgument("400 bad request")):
+                    asyncio.run(gemini_api.agenerate_content("hello", model_name="flaky", use_cache=False))
+        self.assertEqual(gemini_api.circuit_breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertEqual(gemini_api.generate_content("hello", model_name="flaky"), "flaky: hello")
+        self.assertEqual(gemini_api.circuit_breaker.state, CircuitBreaker.CLOSED)
+
+    def test_cancelled_trial_releases_circuit(self):
+        """Test that cancelling a half-open trial does not block later requests."""
+        gemini_api = self.open_circuit_for_trial()
+
+        async def cancel_trial():
+            with patch.object(FlakyGenerativeModel, 'generate_content_async', side_effect=asyncio.CancelledError):
+                with self.assertRaises(asyncio.CancelledError):
+                    await gemini_api.agenerate_content("hello", model_name="flaky", use_cache=False)
+            return await gemini_api.agenerate_content("hello", model_name="flaky")
+
+        self.assertEqual(asyncio.run(cancel_trial()), "flaky: hello")
+        self.assertEqual(gemini_api.circuit_breaker.state, CircuitBreaker.CLOSED)
+
+    def test_closed_attempt_keeps_other_trial(self):
+        """Test that an attempt admitted while closed does not free another request's trial slot."""
+        FlakyGenerativeModel.calls, FlakyGenerativeModel.failures = 0, 0
+        gemini_api = self.make_flaky_api(retry_policy=RetryPolicy(max_retries=0),
+                                         circuit_breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0))
+        breaker = gemini_api.circuit_breaker
+
+        def fail_after_trial_starts(*args, **kwargs):
+            breaker.record_failure()
+            self.assertEqual(breaker.admit(), (True, True))
+            raise ValueError("bad request")
+
+        with patch.object(FlakyGenerativeModel, 'generate_content', side_effect=fail_after_trial_starts):
+            with self.assertRaises(ValueError):
+                gemini_api.generate_content("hello", model_name="flaky", use_cache=False)
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            gemini_api.generate_content("hello", model_name="flaky", use_cache=False)
+
+    def test_registry_pools_models(self):
+        """Test that model handles are reused per (model name, generation settings)."""
+        model = self.registry.get_model("fake")
+        self.assertIs(model, self.registry.get_model("fake"))
+        self.assertIsNot(model, self.registry.get_model("fake", {"temperature": 0.5}))
+        self.assertIsNot(model, self.registry.get_model("other"))
+
+    def test_registry_configures_once_per_key(self):
+        """Test that genai.configure only runs when the API key changes."""
+        with patch('src.utils.gemini_api.genai.configure') as mock_configure:
+            GeminiAPI(api_key='TEST_API_KEY', registry=self.registry)
+            GeminiAPI(api_key='TEST_API_KEY', registry=self.registry)
+            self.assertEqual(mock_configure.call_count, 1)
+            GeminiAPI(api_key='OTHER_API_KEY', registry=self.registry)
+            self.assertEqual(mock_configure.call_count, 2)
+
+    def test_records_metrics(self):
+        """Test that calls are recorded per agent with tokens, cache status and errors."""
+        metrics = MetricsRegistry()
+        gemini_api = GeminiAPI(api_key='TEST_API_KEY', cache=ResponseCache(path=None), registry=self.registry,
+                               metrics=metrics)
+        gemini_api.generate_content("hello", model_name="fake", agent="theorist")
+        gemini_api.generate_content("hello", model_name="fake", agent="theorist")
+        summary = metrics.summary()["agents"]["theorist"]
+        self.assertEqual(summary["calls"], 2)
+        self.assertEqual(summary["cache_hits"], 1)
+        # Without usage metadata the token counts are estimated.
+        self.assertEqual(summary["prompt_tokens"], 2)
+        self.assertEqual(summary["response_tokens"], 3)
+
+        with patch('src.utils.gemini_api.genai.GenerativeModel', UsageGenerativeModel):
+            usage_api = GeminiAPI(api_key='TEST_API_KEY', registry=ModelRegistry(), metrics=metrics)
+            usage_api.generate_content("hello", model_name="usage", agent="critic", use_cache=False)
+            self.assertEqual("".join(usage_api.generate_content_stream("hi", model_name="usage", agent="critic",
+                                                                       use_cache=False)), "answer")
+        summary = metrics.summary()["agents"]["critic"]
+        self.assertEqual((summary["calls"], summary["prompt_tokens"], summary["response_tokens"]), (2, 14, 6))
+
+        FlakyGenerativeModel.calls, FlakyGenerativeModel.failures = 0, 10
+        flaky_api = self.make_flaky_api(retry_policy=RetryPolicy(max_retries=0), metrics=metrics)
+        with self.assertRaises(google_exceptions.ResourceExhausted):
+            flaky_api.generate_content("hello", model_name="flaky")
+        self.assertEqual(metrics.summary()["agents"]["unknown"]["errors"], 1)
+
+    def test_invalid_max_concurrent_requests(self):
+        """Test that a non-positive concurrency limit is rejected."""
+        with self.assertRaises(ValueError):
+            GeminiAPI(api_key='TEST_API_KEY', max_concurrent_requests=0, registry=self.registry)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import sys
+import os
+import json
+import shutil
+import logging
+import logging.handlers
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+# Dynamically adjust sys.path to allow imports from the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Local imports
+try:
+    from src.utils.logging_config import (
+        setup_logging, shutdown_logging, log_response, Truncated, RESPONSE_LOGGER_NAME
+    )
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+
+class SlowStream:
+    """Log stream whose writes block until released, recording the threads they run on."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.text = ""
+        self.writers = {}
+
+    def write(self, text):
+        self.release.wait(5)
+        self.writers[text] = threading.current_thread()
+        self.text += text
+
+    def flush(self):
+        pass
+
+
+class TestLoggingConfig(unittest.TestCase):
+
+    def setUp(self):
+        """Set up for test methods."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = logging.getLogger()
+        self.saved_handlers = list(self.root.handlers)
+        self.saved_level = self.root.level
+        for handler in self.saved_handlers:
+            self.root.removeHandler(handler)
+        self.stream = SlowStream()
+        self.stream.release.set()
+        self.response_path = os.path.join(self.temp_dir, 'responses.jsonl')
+        # The basic configuration's console handler writes to the (slow) sys.stderr.
+        with patch('sys.stderr', self.stream):
+            setup_logging(default_path=os.path.join(self.temp_dir, 'missing.yaml'), force=True, settings={
+                'level': 'INFO', 'max_payload_chars': 10,
+                'response_log': {'enabled': True, 'path': self.response_path},
+            })
+        # Only block the writes made after setup (not the "file not found" warning).
+        self.stream.release.clear()
+
+    def tearDown(self):
+        """Tear down after test methods."""
+        self.stream.release.set()
+        shutdown_logging()
+        for handler in list(self.root.handlers):
+            self.root.removeHandler(handler)
+        for handler in self.saved_handlers:
+            self.root.addHandler(handler)
+        self.root.setLevel(self.saved_level)
+        shutil.rmtree(self.temp_dir)
+
+    def test_queue_keeps_handlers_off_the_calling_thread(self):
+        """Test that logging returns while a slow handler is still blocked and runs on another thread."""
+        self.assertIsInstance(self.root.handlers[0], logging.handlers.QueueHandler)
+        logging.getLogger("test").info("queued %s", "message")
+        self.assertNotIn("queued message", self.stream.text)
+        self.stream.release.set()
+        shutdown_logging()
+        self.assertIn("queued message", self.stream.text)
+        writer = next(thread for text, thread in self.stream.writers.items() if "queued message" in text)
+        self.assertIsNot(writer, threading.current_thread())
+        self.assertIsInstance(self.root.handlers[0], logging.StreamHandler)
+
+    def test_formatting_runs_on_the_listener_thread(self):
+        """Test that log arguments are rendered by the background thread, not by the logging call."""
+        renderers = []
+
+        class Recording:
+            def __str__(self):
+                renderers.append(threading.current_thread())
+                return "payload"
+
+        logging.getLogger("test").info("deferred %s", Truncated(Recording()))
+        self.stream.release.set()
+        shutdown_logging()
+        self.assertIn("deferred payload", self.stream.text)
+        self.assertNotIn(threading.current_thread(), renderers)
+
+    def test_truncated(self):
+        """Test that payloads are capped by the configured and explicit limits."""
+        self.assertEqual(str(Truncated("x" * 25)), "x" * 10 + "... [15 more chars]")
+        self.assertEqual(str(Truncated("short")), "short")
+        self.assertEqual(str(Truncated(["a", "b"], limit=100)), "['a', 'b']")
+        self.assertEqual(str(Truncated("y" * 5, limit=2)), "yy... [3 more chars]")
+
+    def test_truncated_is_lazy(self):
+        """Test that a truncated payload is not rendered when its level is disabled."""
+        class Exploding:
+            def __str__(self):
+                raise AssertionError("rendered")
+        logging.getLogger("test").debug("payload %s", Truncated(Exploding()))
+
+    def test_response_log(self):
+        """Test that full responses go to the JSON lines sink and not to the root handlers."""
+        self.stream.release.set()
+        log_response("gemini-2.0-flash", "prompt", "r" * 1000, agent="theorist", prompt_tokens=3)
+        shutdown_logging()
+        with open(self.response_path, encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]["response"], "r" * 1000)
+        self.assertEqual(entries[0]["agent"], "theorist")
+        self.assertEqual(entries[0]["model"], "gemini-2.0-flash")
+        self.assertEqual(entries[0]["prompt_tokens"], 3)
+        self.assertNotIn("r" * 1000, self.stream.text)
+
+    def test_response_log_disabled(self):
+        """Test that nothing is written once the response log is shut down."""
+        shutdown_logging()
+        self.assertEqual(logging.getLogger(RESPONSE_LOGGER_NAME).handlers, [])
+        log_response("gemini-2.0-flash", "prompt", "response")
+        self.assertFalse(os.path.exists(self.response_path) and os.path.getsize(self.response_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import sys
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+# Dynamically adjust sys.path to allow imports from the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Local imports
+try:
+    from src.utils.metrics import MetricsRegistry, Counter, Histogram
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        """Set up for test methods."""
+        self.registry = MetricsRegistry(latency_buckets=(0.1, 1.0))
+        self.registry.record_call("theorist", "gemini-2.0-flash", 0.5, prompt_tokens=100, response_tokens=40)
+        self.registry.record_call("theorist", "gemini-2.0-flash", 0.01, cache_hit=True)
+        self.registry.record_call("critic", "gemini-2.0-flash", 2.0, success=False)
+        self.registry.record_call(None, "gemini-2.0-pro", 0.2, prompt_tokens=10, response_tokens=5)
+
+    def test_summary(self):
+        """Test per-agent and total aggregation of calls, tokens and latency."""
+        summary = self.registry.summary()
+        theorist = summary["agents"]["theorist"]
+        self.assertEqual((theorist["calls"], theorist["cache_hits"], theorist["errors"]), (2, 1, 0))
+        self.assertEqual((theorist["prompt_tokens"], theorist["response_tokens"]), (100, 40))
+        self.assertAlmostEqual(theorist["mean_latency_seconds"], 0.255)
+        self.assertAlmostEqual(theorist["max_latency_seconds"], 0.5)
+        self.assertEqual(summary["agents"]["critic"]["errors"], 1)
+        self.assertIn("unknown", summary["agents"])
+        self.assertEqual(summary["totals"]["calls"], 4)
+        self.assertEqual(summary["totals"]["prompt_tokens"], 110)
+        json.dumps(summary)
+
+    def test_prometheus_exposition(self):
+        """Test the Prometheus text format of counters and cumulative histogram buckets."""
+        text = self.registry.to_prometheus()
+        self.assertIn("# TYPE ares_model_calls_total counter", text)
+        self.assertIn('ares_model_calls_total{agent="critic",model="gemini-2.0-flash",cache="miss",status="error"} 1',
+                      text)
+        self.assertIn('ares_model_prompt_tokens_total{agent="theorist",model="gemini-2.0-flash"} 100', text)
+        self.assertIn('ares_model_call_latency_seconds_bucket{agent="theorist",model="gemini-2.0-flash",le="0.1"} 1',
+                      text)
+        self.assertIn('ares_model_call_latency_seconds_bucket{agent="theorist",model="gemini-2.0-flash",le="1"} 2',
+                      text)
+        self.assertIn('ares_model_call_latency_seconds_bucket{agent="critic",model="gemini-2.0-flash",le="+Inf"} 1',
+                      text)
+        self.assertIn('ares_model_call_latency_seconds_count{agent="theorist",model="gemini-2.0-flash"} 2', text)
+
+    def test_label_escaping(self):
+        """Test that quotes and newlines in label values are escaped."""
+        counter = Counter("example_total", "Example.", ("agent",))
+        counter.inc(agent='a"b\nc')
+        self.assertEqual(counter.expose()[-1], 'example_total{agent="a\\"b\\nc"} 1')
+        with self.assertRaises(ValueError):
+            counter.inc(-1, agent="a")
+
+    def test_histogram_overflow_bucket(self):
+        """Test that observations above the largest bound land in the +Inf bucket only."""
+        histogram = Histogram("latency", "Latency.", buckets=(1.0,))
+        histogram.observe(5.0)
+        self.assertEqual(histogram.samples()[()]["counts"], [0, 1])
+
+    def test_write(self):
+        """Test that the summary and exposition are written to files, creating directories."""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        summary_path = os.path.join(temp_dir, "logs", "metrics.json")
+        prometheus_path = os.path.join(temp_dir, "logs", "metrics.prom")
+        self.registry.write(summary_path=summary_path, prometheus_path=prometheus_path)
+        with open(summary_path) as f:
+            self.assertEqual(json.load(f)["totals"]["calls"], 4)
+        with open(prometheus_path) as f:
+            self.assertIn("ares_model_calls_total", f.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
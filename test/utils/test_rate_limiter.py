@@ -0,0 +1,181 @@
+import sys
+import os
+import asyncio
+import unittest
+from unittest.mock import patch, AsyncMock
+
+from google.api_core import exceptions as google_exceptions
+
+# Dynamically adjust sys.path to allow imports from the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Local imports
+try:
+    from src.utils.rate_limiter import (
+        TokenBucket, RateLimiter, RetryBudget, RetryPolicy, CircuitBreaker, is_retryable,
+        get_rate_limiter, get_retry_policy, get_circuit_breaker
+    )
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+
+class FakeClock:
+    """Controllable replacement for time.monotonic."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def setUp(self):
+        """Set up for test methods."""
+        self.clock = FakeClock()
+        patcher = patch('src.utils.rate_limiter.time.monotonic', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reserve_and_refill(self):
+        """Test that a bucket allows a burst, then delays until refilled."""
+        bucket = TokenBucket(capacity=2, rate=1)
+        self.assertEqual(bucket.reserve(1), 0.0)
+        self.assertEqual(bucket.reserve(1), 0.0)
+        self.assertAlmostEqual(bucket.reserve(1), 1.0)
+        self.clock.now += 3
+        self.assertAlmostEqual(bucket.available, 2.0)
+
+    def test_debit_creates_debt(self):
+        """Test that charged usage delays later reservations."""
+        bucket = TokenBucket(capacity=10, rate=5)
+        bucket.debit(20)
+        self.assertAlmostEqual(bucket.reserve(1), 11 / 5)
+
+    def test_invalid_bucket(self):
+        """Test that non-positive capacity or rate is rejected."""
+        with self.assertRaises(ValueError):
+            TokenBucket(capacity=0, rate=1)
+
+    def test_rate_limiter_combines_quotas(self):
+        """Test that the longest wait of the request and token quotas applies."""
+        limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=600)
+        self.assertEqual(limiter._reserve(600), 0.0)
+        self.assertAlmostEqual(limiter._reserve(60), 6.0)
+        with patch('src.utils.rate_limiter.time.sleep') as mock_sleep:
+            limiter.acquire(0)
+            mock_sleep.assert_not_called()
+
+    def test_rate_limiter_async_acquire(self):
+        """Test asynchronous acquisition waits for the computed delay."""
+        limiter = RateLimiter(requests_per_minute=1)
+        with patch('src.utils.rate_limiter.asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+            self.assertEqual(asyncio.run(limiter.aacquire()), 0.0)
+            self.assertAlmostEqual(asyncio.run(limiter.aacquire()), 60.0)
+            mock_sleep.assert_awaited_once()
+
+
+class TestRetryAndCircuitBreaker(unittest.TestCase):
+
+    def test_is_retryable(self):
+        """Test classification of transient and permanent errors."""
+        self.assertTrue(is_retryable(google_exceptions.ResourceExhausted("quota")))
+        self.assertTrue(is_retryable(google_exceptions.ServiceUnavailable("down")))
+        self.assertTrue(is_retryable(TimeoutError()))
+        self.assertFalse(is_retryable(google_exceptions.InvalidArgument("bad prompt")))
+        self.assertFalse(is_retryable(ValueError("blocked")))
+
+    def test_retry_policy(self):
+        """Test retry decisions and bounded full-jitter backoff."""
+        policy = RetryPolicy(max_retries=2, base_delay=1.0, max_delay=3.0)
+        error = google_exceptions.ResourceExhausted("quota")
+        self.assertTrue(policy.should_retry(error, 0))
+        self.assertTrue(policy.should_retry(error, 1))
+        self.assertFalse(policy.should_retry(error, 2))
+        self.assertFalse(policy.should_retry(ValueError(), 0))
+        for attempt in range(5):
+            self.assertLessEqual(policy.backoff(attempt), min(3.0, 2 ** attempt))
+
+    def test_retry_budget(self):
+        """Test that retries are limited to the banked budget."""
+        budget = RetryBudget(ratio=0.5, max_balance=1.0)
+        self.assertTrue(budget.try_spend())
+        self.assertFalse(budget.try_spend())
+        budget.record_request()
+        budget.record_request()
+        self.assertTrue(budget.try_spend())
+        policy = RetryPolicy(max_retries=5, budget=RetryBudget(ratio=0.0, max_balance=0.0))
+        self.assertFalse(policy.should_retry(google_exceptions.ResourceExhausted("quota"), 0))
+
+    def test_circuit_breaker(self):
+        """Test the closed -> open -> half-open -> closed cycle."""
+        clock = FakeClock()
+        with patch('src.utils.rate_limiter.time.monotonic', clock):
+            breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+            breaker.record_failure()
+            self.assertTrue(breaker.allow_request())
+            breaker.record_failure()
+            self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+            self.assertFalse(breaker.allow_request())
+            clock.now += 10
+            self.assertTrue(breaker.allow_request())
+            self.assertFalse(breaker.allow_request())
+            breaker.record_failure()
+            self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+            clock.now += 10
+            self.assertTrue(breaker.allow_request())
+            breaker.record_success()
+            self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+            self.assertTrue(breaker.allow_request())
+
+    def test_circuit_breaker_release_trial(self):
+        """Test that releasing a trial lets the next request be the trial without closing the circuit."""
+        clock = FakeClock()
+        with patch('src.utils.rate_limiter.time.monotonic', clock):
+            breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+            breaker.record_failure()
+            clock.now += 10
+            self.assertTrue(breaker.allow_request())
+            self.assertFalse(breaker.allow_request())
+            breaker.release_trial()
+            self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+            self.assertTrue(breaker.allow_request())
+            breaker.record_failure()
+            breaker.release_trial()
+            self.assertFalse(breaker.allow_request())
+
+    def test_circuit_breaker_admit(self):
+        """Test that admit reports which request holds the half-open trial slot."""
+        clock = FakeClock()
+        with patch('src.utils.rate_limiter.time.monotonic', clock):
+            breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+            self.assertEqual(breaker.admit(), (True, False))
+            breaker.record_failure()
+            self.assertEqual(breaker.admit(), (False, False))
+            clock.now += 10
+            self.assertEqual(breaker.admit(), (True, True))
+            self.assertEqual(breaker.admit(), (False, False))
+
+    def test_config_helpers(self):
+        """Test building the resilience components from config."""
+        self.assertIsNone(get_rate_limiter({}))
+        config = {'resilience': {'rate_limit': {'requests_per_minute': 30},
+                                 'retry': {'max_retries': 2},
+                                 'circuit_breaker': {'failure_threshold': 0}}}
+        limiter = get_rate_limiter(config)
+        self.assertIs(limiter, get_rate_limiter(config))
+        self.assertIsNone(limiter.tokens)
+        self.assertEqual(get_retry_policy(config).max_retries, 2)
+        self.assertIs(get_retry_policy(config), get_retry_policy(config))
+        self.assertIsNot(get_retry_policy(config), get_retry_policy({}))
+        self.assertIsNone(get_circuit_breaker(config))
+        self.assertIsNotNone(get_circuit_breaker({}))
+        self.assertIs(get_circuit_breaker({}), get_circuit_breaker({'resilience': {}}))
+
+
+if __name__ == '__main__':
+    unittest.main()
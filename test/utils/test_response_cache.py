@@ -0,0 +1,124 @@
+import sys
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Dynamically adjust sys.path to allow imports from the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Local imports
+try:
+    from src.utils.response_cache import ResponseCache, get_response_cache
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        """Set up for test methods."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "responses.sqlite")
+
+    def tearDown(self):
+        """Clean up the temporary cache directory."""
+        self.tmp_dir.cleanup()
+
+    def test_make_key_is_content_addressed(self):
+        """Test that keys depend on model, prompt and generation settings only."""
+        key = ResponseCache.make_key("m", "p", {"temperature": 0.1, "top_k": 3})
+        self.assertEqual(key, ResponseCache.make_key("m", "p", {"top_k": 3, "temperature": 0.1}))
+        self.assertNotEqual(key, ResponseCache.make_key("m2", "p", {"temperature": 0.1, "top_k": 3}))
+        self.assertNotEqual(key, ResponseCache.make_key("m", "p", {"temperature": 0.2, "top_k": 3}))
+        self.assertEqual(ResponseCache.make_key("m", "p"), ResponseCache.make_key("m", "p", {}))
+
+    def test_memory_and_disk_hits(self):
+        """Test that entries persist across cache instances and counters are updated."""
+        cache = ResponseCache(path=self.path)
+        self.assertIsNone(cache.get("k"))
+        cache.set("k", "value")
+        self.assertEqual(cache.get("k"), "value")
+        cache.close()
+
+        reopened = ResponseCache(path=self.path)
+        self.assertEqual(reopened.get("k"), "value")
+        self.assertEqual(reopened.get("k"), "value")
+        self.assertEqual(reopened.stats()["disk_hits"], 1)
+        self.assertEqual(reopened.stats()["memory_hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+        reopened.close()
+
+    def test_memory_lru_eviction(self):
+        """Test that the memory tier keeps only the most recently used entries."""
+        cache = ResponseCache(path=None, max_memory_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+        self.assertEqual(cache.get("a"), "1")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), "3")
+
+    def test_ttl_expiry(self):
+        """Test that expired entries are treated as misses."""
+        cache = ResponseCache(path=self.path, ttl_seconds=10)
+        with patch('src.utils.response_cache.time.time', return_value=1000.0):
+            cache.set("k", "value")
+        with patch('src.utils.response_cache.time.time', return_value=1005.0):
+            self.assertEqual(cache.get("k"), "value")
+        with patch('src.utils.response_cache.time.time', return_value=1011.0):
+            self.assertIsNone(cache.get("k"))
+        cache.close()
+
+    def test_disk_size_eviction(self):
+        """Test that the disk tier evicts least-recently-used entries beyond max_disk_bytes."""
+        cache = ResponseCache(path=self.path, max_memory_entries=0, max_disk_bytes=10)
+        with patch('src.utils.response_cache.time.time', return_value=1.0):
+            cache.set("a", "aaaaa")
+        with patch('src.utils.response_cache.time.time', return_value=2.0):
+            cache.set("b", "bbbbb")
+        with patch('src.utils.response_cache.time.time', return_value=3.0):
+            cache.set("c", "ccccc")
+            self.assertIsNone(cache.get("a"))
+            self.assertEqual(cache.get("b"), "bbbbb")
+            self.assertEqual(cache.get("c"), "ccccc")
+        cache.close()
+
+    def test_disk_size_is_tracked_across_writes(self):
+        """Test that replacing an entry and reopening the file keep the running disk size exact."""
+        cache = ResponseCache(path=self.path, max_memory_entries=0, max_disk_bytes=10, ttl_seconds=None)
+        with patch('src.utils.response_cache.time.time', return_value=1.0):
+            cache.set("a", "aaaaaaaa")
+        with patch('src.utils.response_cache.time.time', return_value=2.0):
+            cache.set("a", "aaaa")
+            cache.set("b", "bbbb")
+        self.assertEqual(cache._disk_bytes, 8)
+        self.assertEqual(cache.get("a"), "aaaa")
+        cache.close()
+
+        reopened = ResponseCache(path=self.path, max_memory_entries=0, max_disk_bytes=10, ttl_seconds=None)
+        self.assertEqual(reopened._disk_bytes, 8)
+        with patch('src.utils.response_cache.time.time', return_value=3.0):
+            reopened.set("c", "cccc")
+            self.assertIsNone(reopened.get("b"))
+            self.assertEqual(reopened.get("c"), "cccc")
+        self.assertEqual(reopened._disk_bytes, 8)
+        reopened.close()
+
+    def test_get_response_cache_config(self):
+        """Test that caching is opt-in and can be disabled per agent."""
+        self.assertIsNone(get_response_cache({}))
+        config = {'response_cache': {'enabled': True, 'path': self.path, 'agents': {'critic': False}}}
+        cache = get_response_cache(config, agent_name='theorist')
+        self.assertIsNotNone(cache)
+        self.assertIs(cache, get_response_cache(config, agent_name='experiment'))
+        self.assertIsNone(get_response_cache(config, agent_name='critic'))
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+import sys
+import os
+import json
+import asyncio
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Dynamically adjust sys.path to allow imports from the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Local imports
+try:
+    from src.utils.tracing import (
+        Tracer, InMemorySpanExporter, FileSpanExporter, STATUS_ERROR, traced, get_current_span,
+        configure_tracing, load_spans, summarize_spans, critical_path
+    )
+except ImportError as e:
+    print(f"ImportError: {e}.  Check that the project structure is correct and that the necessary files exist.")
+    sys.exit(1)
+
+
+class Worker:
+    """Object with traced methods of every kind."""
+
+    @traced("worker.run", record_args=("items", "label"), record_values=("mode",))
+    def run(self, items, label="", mode="fast"):
+        return self.inner_step(items)
+
+    @traced("worker.inner")
+    def inner_step(self, items):
+        return list(items)
+
+    @traced("worker.arun")
+    async def arun(self, count):
+        return await asyncio.gather(*(self.inner_async(i) for i in range(count)))
+
+    @traced("worker.inner_async")
+    async def inner_async(self, i):
+        await asyncio.sleep(0.001)
+        return i
+
+    @traced("worker.stream")
+    def stream(self, count):
+        for i in range(count):
+            yield self.inner_step([i])
+
+    @traced("worker.astream")
+    async def astream(self, count):
+        for i in range(count):
+            yield await self.inner_async(i)
+
+    @traced("worker.fail")
+    def fail(self):
+        raise ValueError("boom")
+
+
+class TestTracing(unittest.TestCase):
+
+    def setUp(self):
+        """Set up for test methods."""
+        self.exporter = InMemorySpanExporter()
+        patcher = patch('src.utils.tracing._tracer', Tracer([self.exporter]))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.worker = Worker()
+
+    def spans_named(self, name):
+        return [span for span in self.exporter.spans if span.name == name]
+
+    def test_nested_spans_and_attributes(self):
+        """Test that nested calls produce parent/child spans sharing a trace id, with described arguments."""
+        self.worker.run([1, 2, 3], label="abcd")
+        outer, = self.spans_named("worker.run")
+        inner, = self.spans_named("worker.inner")
+        self.assertEqual(inner.parent_id, outer.span_id)
+        self.assertEqual(inner.trace_id, outer.trace_id)
+        self.assertIsNone(outer.parent_id)
+        self.assertEqual(outer.attributes, {"items.count": 3, "label.chars": 4, "mode": "fast", "result.count": 3})
+        self.assertGreaterEqual(outer.duration_ms, inner.duration_ms)
+
+    def test_async_spans_nest_across_tasks(self):
+        """Test that spans of gathered coroutines nest under the awaiting span."""
+        asyncio.run(self.worker.arun(3))
+        outer, = self.spans_named("worker.arun")
+        inner = self.spans_named("worker.inner_async")
+        self.assertEqual(len(inner), 3)
+        self.assertTrue(all(span.parent_id == outer.span_id for span in inner))
+
+    def test_generator_spans(self):
+        """Test that generator spans cover every item and are only active while the generator runs."""
+        items = []
+        for item in self.worker.stream(2):
+            self.assertFalse(get_current_span().is_recording)
+            items.append(item)
+        self.assertEqual(items, [[0], [1]])
+        outer, = self.spans_named("worker.stream")
+        self.assertEqual(outer.attributes["result.count"], 2)
+        self.assertTrue(all(span.parent_id == outer.span_id for span in self.spans_named("worker.inner")))
+
+        async def consume():
+            return [item async for item in self.worker.astream(3)]
+        self.assertEqual(asyncio.run(consume()), [0, 1, 2])
+        outer, = self.spans_named("worker.astream")
+        self.assertEqual(outer.attributes["result.count"], 3)
+
+    def test_exception_marks_span_failed(self):
+        """Test that exceptions propagate and mark the span as failed."""
+        with self.assertRaises(ValueError):
+            self.worker.fail()
+        span, = self.spans_named("worker.fail")
+        self.assertEqual(span.status, STATUS_ERROR)
+        self.assertEqual(span.events[0]["attributes"]["exception.type"], "ValueError")
+
+    def test_disabled_tracer_records_nothing(self):
+        """Test that a tracer without exporters hands out the no-op span."""
+        with patch('src.utils.tracing._tracer', Tracer()):
+            self.assertEqual(self.worker.run([1]), [1])
+            self.assertFalse(Tracer().start_span("x").is_recording)
+        self.assertEqual(self.exporter.spans, [])
+
+    def test_file_export_and_analysis(self):
+        """Test JSONL export, the per-name breakdown and the critical path."""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        path = os.path.join(temp_dir, "logs", "traces.jsonl")
+        tracer = Tracer([FileSpanExporter(path)])
+        with tracer.span("root"):
+            with tracer.span("fast"):
+                pass
+            with tracer.span("slow") as slow:
+                slow.set_attribute("retries", 2)
+                with tracer.span("leaf"):
+                    pass
+        tracer.shutdown()
+
+        spans = load_spans(path)
+        self.assertEqual([span["name"] for span in spans], ["fast", "leaf", "slow", "root"])
+        self.assertEqual(spans[2]["attributes"], {"retries": 2})
+        json.dumps(spans)
+        self.assertEqual(summarize_spans(spans)["root"]["count"], 1)
+        self.assertEqual(list(summarize_spans(spans))[0], "root")
+        self.assertEqual([span["name"] for span in critical_path(spans)], ["root", "slow", "leaf"])
+
+    def test_configure_tracing(self):
+        """Test that the config section selects exporters and rejects unknown ones."""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        tracer = configure_tracing({"tracing": {"enabled": True, "path": os.path.join(temp_dir, "t.jsonl")}})
+        self.assertTrue(tracer.enabled)
+        self.assertIsInstance(tracer.exporters[0], FileSpanExporter)
+        self.assertFalse(configure_tracing({}).enabled)
+        with self.assertRaises(ValueError):
+            configure_tracing({"tracing": {"enabled": True, "exporters": ["otlp"]}})
+
+
+if __name__ == '__main__':
+    unittest.main()